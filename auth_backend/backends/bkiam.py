@@ -18,6 +18,7 @@ from builtins import str  # noqa
 
 from auth_backend.backends import signals
 from auth_backend.backends.base import AuthBackend
+from auth_backend.backends.cache import decision_cache
 from auth_backend.backends.utils import resource_actions_for, resource_id_for
 
 
@@ -48,6 +49,13 @@ class BKIAMBackend(AuthBackend):
                 instance=instance,
                 scope_id=scope_id
             )
+        else:
+            signals.instance_register_signal.send(
+                sender=self,
+                resource=resource,
+                instances=[instance],
+                scope_id=scope_id
+            )
         return result
 
     def batch_register_instance(self, resource, instances, scope_id=None):
@@ -77,6 +85,13 @@ class BKIAMBackend(AuthBackend):
                 instances=instances,
                 scope_id=scope_id
             )
+        else:
+            signals.instance_register_signal.send(
+                sender=self,
+                resource=resource,
+                instances=instances,
+                scope_id=scope_id
+            )
         return result
 
     def update_instance(self, resource, instance, scope_id=None):
@@ -90,12 +105,20 @@ class BKIAMBackend(AuthBackend):
         )
 
     def delete_instance(self, resource, instance, scope_id=None):
-        return self.client.delete_resource(
+        result = self.client.delete_resource(
             scope_type=resource.scope_type,
             scope_id=self.__real_scope_id(resource, instance, scope_id),
             resource_type=resource.rtype,
             resource_id=resource_id_for(resource, instance)
         )
+        if result['result']:
+            signals.instance_delete_signal.send(
+                sender=self,
+                resource=resource,
+                instances=[instance],
+                scope_id=scope_id
+            )
+        return result
 
     def batch_delete_instance(self, resource, instances, scope_id=None):
         if not instances:
@@ -111,7 +134,15 @@ class BKIAMBackend(AuthBackend):
             } for instance in instances
         ]
 
-        return self.client.batch_delete_resource(resources=iam_resources)
+        result = self.client.batch_delete_resource(resources=iam_resources)
+        if result['result']:
+            signals.instance_delete_signal.send(
+                sender=self,
+                resource=resource,
+                instances=instances,
+                scope_id=scope_id
+            )
+        return result
 
     def verify_perms(self, resource, principal_type, principal_id, action_ids, instance=None, scope_id=None):
         actions = []
@@ -125,11 +156,11 @@ class BKIAMBackend(AuthBackend):
 
             actions.append(action)
 
-        return self.client.batch_verify_resources_perms(principal_type=principal_type,
-                                                        principal_id=principal_id,
-                                                        scope_type=resource.scope_type,
-                                                        scope_id=self.__real_scope_id(resource, instance, scope_id),
-                                                        resources_actions=actions)
+        return self._batch_verify_resources_perms(principal_type=principal_type,
+                                                  principal_id=principal_id,
+                                                  scope_type=resource.scope_type,
+                                                  scope_id=self.__real_scope_id(resource, instance, scope_id),
+                                                  resources_actions=actions)
 
     def batch_verify_perms(self, resource, principal_type, principal_id, action_ids, instances=None, scope_id=None):
         resource_actions = resource_actions_for(resource=resource,
@@ -139,11 +170,11 @@ class BKIAMBackend(AuthBackend):
         if not scope_id:
             scope_id = resource.real_scope_id(instances[0] if instances else None, scope_id)
 
-        return self.client.batch_verify_resources_perms(principal_type=principal_type,
-                                                        principal_id=principal_id,
-                                                        scope_type=resource.scope_type,
-                                                        scope_id=scope_id,
-                                                        resources_actions=resource_actions)
+        return self._batch_verify_resources_perms(principal_type=principal_type,
+                                                  principal_id=principal_id,
+                                                  scope_type=resource.scope_type,
+                                                  scope_id=scope_id,
+                                                  resources_actions=resource_actions)
 
     def verify_multiple_resource_perms(self, principal_type, principal_id, perms_tuples, scope_id=None):
         actions = []
@@ -160,11 +191,26 @@ class BKIAMBackend(AuthBackend):
             scope_type = resource.scope_type
             scope_id = self.__real_scope_id(resource, instance, scope_id)
 
-        return self.client.batch_verify_resources_perms(principal_type=principal_type,
-                                                        principal_id=principal_id,
-                                                        scope_type=scope_type,
-                                                        scope_id=scope_id,
-                                                        resources_actions=actions)
+        return self._batch_verify_resources_perms(principal_type=principal_type,
+                                                  principal_id=principal_id,
+                                                  scope_type=scope_type,
+                                                  scope_id=scope_id,
+                                                  resources_actions=actions)
+
+    def _batch_verify_resources_perms(self, principal_type, principal_id, scope_type, scope_id, resources_actions):
+        def verify(actions):
+            return self.client.batch_verify_resources_perms(principal_type=principal_type,
+                                                            principal_id=principal_id,
+                                                            scope_type=scope_type,
+                                                            scope_id=scope_id,
+                                                            resources_actions=actions)
+
+        return decision_cache.verify(principal_type=principal_type,
+                                     principal_id=principal_id,
+                                     scope_type=scope_type,
+                                     scope_id=scope_id,
+                                     resources_actions=resources_actions,
+                                     verify_func=verify)
 
     def search_authorized_resources(self, resource, principal_type, principal_id, action_ids, scope_id=None):
         actions = [{'action_id': action_id, 'resource_type': resource.rtype} for action_id in action_ids]
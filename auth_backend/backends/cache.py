@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import hashlib
+import json
+import threading
+import uuid
+
+from django.core.cache import caches
+from django.dispatch import receiver
+
+from auth_backend import conf
+from auth_backend.backends import signals
+
+CACHE_PREFIX = 'auth_backend_perm_decision'
+
+# decisions shared in current request, only exist between open_scope and close_scope
+_local = threading.local()
+
+
+def open_scope():
+    """
+    开启请求内的校验结果共享，同一请求内相同的权限只会校验一次
+    """
+    _local.decisions = {}
+
+
+def close_scope():
+    _local.decisions = None
+
+
+def _scope_decisions():
+    return getattr(_local, 'decisions', None)
+
+
+class PermDecisionCache(object):
+    """
+    权限校验结果缓存，以 (主体, 作用域, 操作, 资源实例) 为粒度缓存校验结果，资源实例注册或删除后该资源类型的缓存失效
+    校验结果保存在 cache_name 对应的缓存中，版本号保存在 version_cache_name 对应的共享缓存中，用于跨进程失效
+    """
+
+    def __init__(self, cache_name=None, ttl=None, negative_ttl=None, version_cache_name=None):
+        self.cache_name = cache_name or conf.PERM_DECISION_CACHE
+        self.version_cache_name = version_cache_name or conf.PERM_DECISION_VERSION_CACHE
+        self.ttl = conf.PERM_DECISION_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = conf.PERM_DECISION_NEGATIVE_CACHE_TTL if negative_ttl is None else negative_ttl
+
+    @property
+    def cache(self):
+        return caches[self.cache_name]
+
+    @property
+    def version_cache(self):
+        return caches[self.version_cache_name]
+
+    @property
+    def enabled(self):
+        return bool(self.ttl or self.negative_ttl)
+
+    @staticmethod
+    def _version_key(resource_type):
+        return '{prefix}_version_{resource_type}'.format(prefix=CACHE_PREFIX, resource_type=resource_type)
+
+    def _versions(self, resource_types):
+        if not self.enabled:
+            return {}
+        versions = self.version_cache.get_many([self._version_key(resource_type) for resource_type in resource_types])
+        return {resource_type: versions.get(self._version_key(resource_type), '') for resource_type in resource_types}
+
+    @staticmethod
+    def _decision_key(versions, principal_type, principal_id, scope_type, scope_id, action):
+        raw = json.dumps(
+            [
+                principal_type,
+                principal_id,
+                scope_type,
+                scope_id,
+                action['action_id'],
+                action['resource_type'],
+                action.get('resource_id') or [],
+                versions.get(action['resource_type'], ''),
+            ],
+            sort_keys=True,
+        )
+        return '{prefix}_{digest}'.format(prefix=CACHE_PREFIX, digest=hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+    def invalidate(self, resource_type):
+        """
+        使某个资源类型的所有校验结果缓存失效
+        :param resource_type: 资源类型
+        """
+        decisions = _scope_decisions()
+        if decisions:
+            decisions.clear()
+        if self.enabled:
+            self.version_cache.set(self._version_key(resource_type), uuid.uuid4().hex, None)
+
+    def _store(self, decisions):
+        scope_decisions = _scope_decisions()
+        if scope_decisions is not None:
+            scope_decisions.update({key: copy.deepcopy(item) for key, item in decisions.items()})
+
+        if not self.enabled:
+            return
+
+        passed = {key: copy.deepcopy(item) for key, item in decisions.items() if item.get('is_pass')}
+        denied = {key: copy.deepcopy(item) for key, item in decisions.items() if not item.get('is_pass')}
+        if passed and self.ttl:
+            self.cache.set_many(passed, self.ttl)
+        if denied and self.negative_ttl:
+            self.cache.set_many(denied, self.negative_ttl)
+
+    def verify(self, principal_type, principal_id, scope_type, scope_id, resources_actions, verify_func):
+        """
+        批量校验权限，优先使用请求内共享及缓存中的校验结果，只将未命中的操作交给 verify_func 校验
+        :param principal_type: 主体类型
+        :param principal_id: 主体 ID
+        :param scope_type: 作用域类型
+        :param scope_id: 作用域 ID
+        :param resources_actions: 操作列表，格式与 BKIAMClient.batch_verify_resources_perms 相同
+        :param verify_func: verify_func(resources_actions)，返回 BKIAMClient.batch_verify_resources_perms 格式的结果
+        :return: BKIAMClient.batch_verify_resources_perms 格式的结果
+        """
+        scope_decisions = _scope_decisions()
+        if not resources_actions or (not self.enabled and scope_decisions is None):
+            return verify_func(resources_actions)
+
+        versions = self._versions({action['resource_type'] for action in resources_actions})
+        keys = [
+            self._decision_key(versions, principal_type, principal_id, scope_type, scope_id, action)
+            for action in resources_actions
+        ]
+
+        hits = {}
+        if scope_decisions:
+            hits.update({key: scope_decisions[key] for key in keys if key in scope_decisions})
+        missing = [key for key in set(keys) if key not in hits]
+        if missing and self.enabled:
+            hits.update(self.cache.get_many(missing))
+
+        misses = [action for key, action in zip(keys, resources_actions) if key not in hits]
+        if not misses:
+            return {'result': True, 'code': 0, 'message': 'success', 'data': [copy.deepcopy(hits[key]) for key in keys]}
+
+        result = verify_func(misses if hits else resources_actions)
+        if not result['result']:
+            return result
+
+        verified = {}
+        unmatched = []
+        miss_keys = set(keys) - set(hits)
+        for item in result['data']:
+            key = self._decision_key(versions, principal_type, principal_id, scope_type, scope_id, item)
+            if key in miss_keys:
+                verified[key] = item
+            else:
+                unmatched.append(item)
+        self._store(verified)
+
+        if not hits:
+            return result
+
+        data = [
+            copy.deepcopy(hits[key]) if key in hits else verified[key] for key in keys if key in hits or key in verified
+        ]
+        result = copy.copy(result)
+        result['data'] = data + unmatched
+        return result
+
+
+decision_cache = PermDecisionCache()
+
+
+@receiver(signals.instance_register_signal)
+@receiver(signals.instance_delete_signal)
+def perm_decision_invalidate_handler(sender, resource, **kwargs):
+    decision_cache.invalidate(resource.rtype)
@@ -17,3 +17,5 @@ from django.dispatch import Signal
 
 instance_register_fail_signal = Signal(providing_args=['resource', 'instance', 'scope_id'])
 instance_batch_register_fail_signal = Signal(providing_args=['resource', 'instances', 'scope_id'])
+instance_register_signal = Signal(providing_args=['resource', 'instances', 'scope_id'])
+instance_delete_signal = Signal(providing_args=['resource', 'instances', 'scope_id'])
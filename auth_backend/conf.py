@@ -20,3 +20,11 @@ SCOPE_TYPE_NAMES = getattr(settings, 'SCOPE_TYPE_NAMES', {
     'project': u"项目",
     'system': u"系统"
 })
+# 有权限的校验结果缓存时间（秒），为 0 时不缓存
+PERM_DECISION_CACHE_TTL = getattr(settings, 'AUTH_BACKEND_PERM_DECISION_CACHE_TTL', 10)
+# 无权限的校验结果缓存时间（秒），为 0 时不缓存，用户申请权限后最多需要等待该时长才能生效
+PERM_DECISION_NEGATIVE_CACHE_TTL = getattr(settings, 'AUTH_BACKEND_PERM_DECISION_NEGATIVE_CACHE_TTL', 3)
+# 保存校验结果使用的缓存
+PERM_DECISION_CACHE = getattr(settings, 'AUTH_BACKEND_PERM_DECISION_CACHE', 'locmem')
+# 保存校验结果缓存版本号使用的缓存，需要在所有进程间共享，资源实例注册或删除后所有进程的校验结果缓存才能同时失效
+PERM_DECISION_VERSION_CACHE = getattr(settings, 'AUTH_BACKEND_PERM_DECISION_VERSION_CACHE', 'default')
@@ -13,6 +13,7 @@ specific language governing permissions and limitations under the License.
 
 from django.utils.deprecation import MiddlewareMixin
 
+from auth_backend.backends import cache
 from auth_backend.exceptions import AuthFailedException
 from auth_backend.plugins.http import HttpResponseAuthFailed
 
@@ -22,3 +23,13 @@ class AuthFailedExceptionMiddleware(MiddlewareMixin):
     def process_exception(self, request, exception):
         if isinstance(exception, AuthFailedException):
             return HttpResponseAuthFailed(permission=exception.permissions, status=exception.status)
+
+
+class PermDecisionScopeMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        cache.open_scope()
+
+    def process_response(self, request, response):
+        cache.close_scope()
+        return response
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from django.core.cache import caches
+from django.test import TestCase
+from mock import MagicMock, patch
+
+from auth_backend.backends import cache, signals
+from auth_backend.backends.bkiam import BKIAMBackend
+from auth_backend.backends.cache import PermDecisionCache
+
+CACHE_DECISION_CACHE = 'auth_backend.backends.cache.decision_cache'
+BKIAM_DECISION_CACHE = 'auth_backend.backends.bkiam.decision_cache'
+
+
+class IAMStubClient(object):
+    """
+    本地权限中心桩，只有 granted 中的 (主体, 操作, 资源实例) 有权限
+    """
+
+    def __init__(self, granted):
+        self.granted = granted
+        self.requests = []
+        self.result = True
+
+    def batch_verify_resources_perms(self, principal_type, principal_id, scope_type, scope_id, resources_actions):
+        self.requests.append(resources_actions)
+        if not self.result:
+            return {'result': False, 'code': 500, 'message': 'iam error', 'data': None}
+
+        data = []
+        for action in resources_actions:
+            resource_id = action.get('resource_id') or []
+            instance_id = resource_id[-1]['resource_id'] if resource_id else None
+            data.append(
+                {
+                    'action_id': action['action_id'],
+                    'resource_type': action['resource_type'],
+                    'resource_id': resource_id,
+                    'is_pass': (principal_id, action['action_id'], instance_id) in self.granted,
+                }
+            )
+        return {'result': True, 'code': 0, 'message': 'success', 'data': data}
+
+    def register_resource(self, **kwargs):
+        return {'result': True, 'code': 0, 'message': 'success', 'data': {}}
+
+    def delete_resource(self, **kwargs):
+        return {'result': True, 'code': 0, 'message': 'success', 'data': {}}
+
+
+class PermDecisionCacheTestCase(TestCase):
+
+    def setUp(self):
+        caches['locmem'].clear()
+        self.decision_cache = PermDecisionCache(
+            cache_name='locmem', ttl=10, negative_ttl=3, version_cache_name='default'
+        )
+        self.client = IAMStubClient(granted={('tester', 'view', '1'), ('tester', 'create', None)})
+        self.backend = BKIAMBackend(client=self.client)
+
+        self.resource = MagicMock()
+        self.resource.rtype = 'task'
+        self.resource.scope_type = 'project'
+        self.resource.resource_id = lambda instance: instance
+        self.resource.parent = None
+        self.resource.real_scope_id = MagicMock(return_value='1')
+        self.resource.is_instance_related_action = lambda action_id: action_id != 'create'
+
+        self.patchers = [
+            patch(CACHE_DECISION_CACHE, self.decision_cache),
+            patch(BKIAM_DECISION_CACHE, self.decision_cache),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        cache.close_scope()
+
+    def batch_verify(self, principal_id='tester', instances=('1', '2')):
+        return self.backend.batch_verify_perms(
+            resource=self.resource,
+            principal_type='user',
+            principal_id=principal_id,
+            action_ids=['create', 'view'],
+            instances=list(instances),
+        )
+
+    @staticmethod
+    def passed(result):
+        return sorted(
+            (item['action_id'], item['resource_id'][-1]['resource_id'] if item['resource_id'] else None)
+            for item in result['data']
+            if item['is_pass']
+        )
+
+    def test_verify__cache_decisions(self):
+        first = self.batch_verify()
+        second = self.batch_verify()
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.passed(second), [('create', None), ('view', '1')])
+        self.assertEqual(len(self.client.requests), 1)
+
+    def test_verify__only_verify_missing_decisions(self):
+        self.batch_verify(instances=['1'])
+        result = self.batch_verify(instances=['1', '2'])
+
+        self.assertEqual(self.passed(result), [('create', None), ('view', '1')])
+        self.assertEqual([item['action_id'] for item in result['data']], ['create', 'view', 'view'])
+        self.assertEqual(len(self.client.requests), 2)
+        self.assertEqual(
+            self.client.requests[1],
+            [
+                {
+                    'action_id': 'view',
+                    'resource_type': 'task',
+                    'resource_id': [{'resource_type': 'task', 'resource_id': '2'}],
+                }
+            ],
+        )
+
+    def test_verify__principal_isolated(self):
+        self.batch_verify()
+        result = self.batch_verify(principal_id='other')
+
+        self.assertEqual(self.passed(result), [])
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__negative_ttl(self):
+        self.decision_cache.negative_ttl = 0
+        self.batch_verify()
+        self.batch_verify()
+
+        self.assertEqual(len(self.client.requests), 2)
+        self.assertEqual(
+            self.client.requests[1],
+            [
+                {
+                    'action_id': 'view',
+                    'resource_type': 'task',
+                    'resource_id': [{'resource_type': 'task', 'resource_id': '2'}],
+                }
+            ],
+        )
+
+    def test_verify__disabled(self):
+        self.decision_cache.ttl = 0
+        self.decision_cache.negative_ttl = 0
+        self.batch_verify()
+        self.batch_verify()
+
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__request_scope(self):
+        self.decision_cache.ttl = 0
+        self.decision_cache.negative_ttl = 0
+        cache.open_scope()
+        self.batch_verify()
+        result = self.batch_verify()
+        cache.close_scope()
+        self.batch_verify()
+
+        self.assertEqual(self.passed(result), [('create', None), ('view', '1')])
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__fail_not_cached(self):
+        self.client.result = False
+        self.assertFalse(self.batch_verify()['result'])
+
+        self.client.result = True
+        self.assertTrue(self.batch_verify()['result'])
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__invalidated_by_register(self):
+        cache.open_scope()
+        self.batch_verify()
+        self.client.granted.add(('tester', 'view', '2'))
+        self.backend.register_instance(resource=self.resource, instance='2')
+        result = self.batch_verify()
+
+        self.assertEqual(self.passed(result), [('create', None), ('view', '1'), ('view', '2')])
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__invalidated_by_delete(self):
+        self.batch_verify()
+        signals.instance_delete_signal.send(sender=None, resource=self.resource, instances=['1'], scope_id=None)
+        self.batch_verify()
+
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__invalidated_by_other_process(self):
+        self.batch_verify()
+        # decisions of other process are kept in its own local cache, only versions are shared
+        other_process_cache = PermDecisionCache(
+            cache_name='dummy', ttl=10, negative_ttl=3, version_cache_name='default'
+        )
+        other_process_cache.invalidate('task')
+        self.batch_verify()
+
+        self.assertEqual(len(self.client.requests), 2)
+
+    def test_verify__other_resource_type_not_invalidated(self):
+        self.batch_verify()
+        other = MagicMock()
+        other.rtype = 'flow'
+        signals.instance_register_signal.send(sender=None, resource=other, instances=['1'], scope_id=None)
+        self.batch_verify()
+
+        self.assertEqual(len(self.client.requests), 1)
@@ -15,9 +15,12 @@ from __future__ import absolute_import, unicode_literals
 
 import json
 import logging
+import os
+import threading
 from builtins import object
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 
 from . import conf
@@ -47,6 +50,25 @@ class BKIAMClient(object):
             host=self.bk_iam_inner_host,
             prefix='bkiam/api'
         )
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        # reuse connections to bk_iam between requests, a new session is created after fork (e.g. celery prefork
+        # worker), because sockets in the pool of parent process can not be shared with child processes
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._session_lock:
+                if self._session is None or self._session_pid != pid:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_maxsize=conf.BK_IAM_POOL_MAXSIZE)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                    self._session_pid = pid
+        return self._session
 
     def _request_url(self, path):
         return '{base}/{version}/{path}'.format(base=self._bk_iam_api_base, version=self.version, path=path.lstrip('/'))
@@ -70,7 +92,7 @@ class BKIAMClient(object):
         )
 
     def _request(self, method, url, params=None, data=None, headers=None):
-        method_func = getattr(requests, method)
+        method_func = getattr(self.session, method)
 
         _headers = {
             "X-BK-APP-CODE": self.app_code,
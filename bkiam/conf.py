@@ -20,6 +20,7 @@ try:
     SYSTEM_NAME = getattr(settings, 'BK_IAM_SYSTEM_NAME', APP_CODE)
     BK_IAM_INNER_HOST = getattr(settings, 'BK_IAM_INNER_HOST', '')
     BK_IAM_API_VERSION = getattr(settings, 'BK_IAM_API_VERSION', 'v1')
+    BK_IAM_POOL_MAXSIZE = getattr(settings, 'BK_IAM_POOL_MAXSIZE', 10)
 
 except Exception:
     APP_CODE = ''
@@ -28,3 +29,4 @@ except Exception:
     SYSTEM_NAME = ''
     BK_IAM_INNER_HOST = ''
     BK_IAM_API_VERSION = 'v1'
+    BK_IAM_POOL_MAXSIZE = 10
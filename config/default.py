@@ -117,6 +117,7 @@ MIDDLEWARE += (
     "gcloud.core.middlewares.TimezoneMiddleware",
     "gcloud.core.middlewares.ObjectDoesNotExistExceptionMiddleware",
     "auth_backend.plugins.middlewares.AuthFailedExceptionMiddleware",
+    "auth_backend.plugins.middlewares.PermDecisionScopeMiddleware",
 )
 
 CORS_ORIGIN_ALLOW_ALL = False
@@ -257,6 +258,12 @@ DEFAULT_CACHE_TIME_FOR_USER_UPDATE = 5
 # 针对平台用户接口缓存的时间
 DEFAULT_CACHE_TIME_FOR_AUTH = 5
 
+# 任务状态快照缓存的时间(单位s)，需要开启 PIPELINE_ENGINE_STATE_STAMP_ENABLED
+TASK_STATUS_SNAPSHOT_CACHE_TIME = 10
+
+# 运营数据统计是否从日汇总表读取，未开启时不维护日汇总表，开启后需要执行 python manage.py rebuild_statistics_rollup 生成历史数据
+STATISTICS_ROLLUP_ENABLED = os.getenv("BKAPP_STATISTICS_ROLLUP_ENABLED", "0") == "1"
+
 # 蓝鲸PASS平台URL
 BK_PAAS_HOST = os.getenv("BK_PAAS_HOST", BK_URL)
 
@@ -308,6 +315,10 @@ STATIC_VER = {"DEVELOP": "dev", "PRODUCT": "prod", "STAGING": "stag"}
 # pipeline settings
 PIPELINE_TEMPLATE_CONTEXT = "gcloud.tasktmpl3.utils.get_template_context"
 PIPELINE_INSTANCE_CONTEXT = "gcloud.taskflow3.utils.get_instance_context"
+# 只在开启日汇总表时维护汇总数据
+PIPELINE_STATISTICS_INSTANCE_DIMENSIONS = (
+    "gcloud.taskflow3.utils.get_statistics_dimensions" if STATISTICS_ROLLUP_ENABLED else ""
+)
 
 PIPELINE_PARSER_CLASS = "pipeline_web.parser.WebPipelineAdapter"
 
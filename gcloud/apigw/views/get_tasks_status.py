@@ -59,25 +59,22 @@ def get_tasks_status(request, project_id):
         )
     include_children_status = params.get("include_children_status", False)
 
-    tasks = TaskFlowInstance.objects.filter(id__in=task_ids, project__id=request.project.id)
+    tasks = TaskFlowInstance.objects.filter(id__in=task_ids, project__id=request.project.id).select_related(
+        "pipeline_instance", "project"
+    )
+    statuses = TaskFlowInstance.get_statuses(tasks, include_children=include_children_status)
 
-    data = []
-    for task in tasks:
-        status = task.get_status()
-
-        if not include_children_status:
-            status.pop("children")
-
-        data.append(
-            {
-                "id": task.id,
-                "name": task.name,
-                "status": status,
-                "create_time": format_datetime(task.create_time),
-                "start_time": format_datetime(task.start_time),
-                "finish_time": format_datetime(task.finish_time),
-                "url": task.url,
-            }
-        )
+    data = [
+        {
+            "id": task.id,
+            "name": task.name,
+            "status": statuses[task.id],
+            "create_time": format_datetime(task.create_time),
+            "start_time": format_datetime(task.start_time),
+            "finish_time": format_datetime(task.finish_time),
+            "url": task.url,
+        }
+        for task in tasks
+    ]
 
     return JsonResponse({"result": True, "data": data, "code": err_code.SUCCESS.code})
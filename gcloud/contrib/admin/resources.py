@@ -34,7 +34,8 @@ class AdminTaskTemplateResource(TaskTemplateResource):
 class AdminTaskFlowInstanceResource(TaskFlowInstanceResource):
 
     class Meta(TaskFlowInstanceResource.Meta):
-        queryset = TaskFlowInstance.objects.filter(pipeline_instance__isnull=False)
+        queryset = TaskFlowInstance.objects.filter(pipeline_instance__isnull=False).select_related(
+            'pipeline_instance', 'project')
         resource_name = 'taskflow'
 
 
@@ -101,7 +101,7 @@ def dispatch(group_by, filters=None, page=None, limit=None):
 
     # 查询不同类别、创建方式、流程类型对应的流程数
     if group_by in [AE.category, AE.create_method, AE.flow_type]:
-        result, message, total, groups = TaskFlowInstance.objects.general_group_by(orm_filters, group_by)
+        result, message, total, groups = TaskFlowInstance.objects.general_group_by(orm_filters, group_by, filters)
         if not result:
             return False, message
     else:
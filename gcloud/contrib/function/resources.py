@@ -62,7 +62,9 @@ class FunctionTaskResource(GCloudModelResource):
     status_name = fields.CharField(attribute="status_name", readonly=True, null=True)
 
     class Meta(GCloudModelResource.Meta):
-        queryset = FunctionTask.objects.filter(task__is_deleted=False)
+        queryset = FunctionTask.objects.filter(task__is_deleted=False).select_related(
+            "task__pipeline_instance", "task__project"
+        )
         resource_name = "function_task"
         auth_resource = taskflow_resource
         authorization = FunctionTaskAuthorization(
@@ -79,3 +81,13 @@ class FunctionTaskResource(GCloudModelResource):
             "claim_time": ["gte", "lte"],
         }
         q_fields = ["task__pipeline_instance__name"]
+
+    def alter_list_data_to_serialize(self, request, data):
+        data = super(FunctionTaskResource, self).alter_list_data_to_serialize(request, data)
+        TaskFlowInstanceResource.convert_readable_names([bundle.data["task"] for bundle in data["objects"]])
+        return data
+
+    def alter_detail_data_to_serialize(self, request, data):
+        data = super(FunctionTaskResource, self).alter_detail_data_to_serialize(request, data)
+        TaskFlowInstanceResource.convert_readable_names([data.data["task"]])
+        return data
@@ -35,6 +35,7 @@ ver_utils = importlib.import_module('gcloud.core.utils.sites.%s.utils' % setting
 ver_exports = [
     'convert_group_name',
     'convert_readable_username',
+    'convert_readable_usernames',
     'get_user_business_list',
     'get_all_business_list',
     'get_user_business_detail'
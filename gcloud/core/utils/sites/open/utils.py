@@ -128,5 +128,13 @@ def convert_readable_username(username):
     return username
 
 
+def convert_readable_usernames(usernames):
+    """批量将用户名转换成昵称，需要请求用户服务的版本应在此批量请求并缓存结果
+    :param usernames: 用户名列表
+    :return: {username: 昵称}
+    """
+    return {username: username for username in usernames}
+
+
 def convert_group_name(biz_cc_id, role):
     return "%s\x00%s" % (biz_cc_id, role)
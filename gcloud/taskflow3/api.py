@@ -35,6 +35,7 @@ from gcloud.taskflow3.constants import TASK_CREATE_METHOD, PROJECT
 from gcloud.taskflow3.models import TaskFlowInstance
 from gcloud.taskflow3.permissions import taskflow_resource
 from gcloud.taskflow3.context import TaskContext
+from gcloud.taskflow3.status_cache import get_status_snapshot, get_status_changes
 from gcloud.contrib.analysis.analyse_items import task_flow_instance
 from gcloud.taskflow3.utils import preview_template_tree
 
@@ -61,7 +62,7 @@ def status(request, project_id):
     if not subprocess_id:
         try:
             task = TaskFlowInstance.objects.get(pk=instance_id, project_id=project_id)
-            task_status = task.get_status()
+            _, task_status = get_status_snapshot(task)
             ctx = {"result": True, "data": task_status}
             return JsonResponse(ctx)
         except exceptions.InvalidOperationException:
@@ -87,6 +88,34 @@ def status(request, project_id):
     return JsonResponse(ctx)
 
 
+@require_GET
+def status_changes(request, project_id):
+    """
+    @summary: 返回客户端持有的 revision 之后状态发生变化的节点
+    @param request:
+    @param project_id:
+    @return:
+    """
+    instance_id = request.GET.get("instance_id")
+    revision = request.GET.get("revision")
+
+    try:
+        revision = int(revision) if revision else None
+    except ValueError:
+        return JsonResponse({"result": False, "message": "revision must be an integer"})
+
+    try:
+        task = TaskFlowInstance.objects.get(pk=instance_id, project_id=project_id)
+        ctx = {"result": True, "data": get_status_changes(task, revision=revision)}
+    except exceptions.InvalidOperationException:
+        ctx = {"result": True, "data": {"revision": None, "full": True, "state": states.READY}}
+    except Exception as e:
+        message = "taskflow[id=%s] get status changes error: %s" % (instance_id, e)
+        logger.error(message)
+        ctx = {"result": False, "message": message}
+    return JsonResponse(ctx)
+
+
 @require_GET
 @verify_perms(
     auth_resource=taskflow_resource,
@@ -13,17 +13,23 @@ specific language governing permissions and limitations under the License.
 
 import datetime
 import logging
+from collections import Counter
 
-from django.db.models import Count, Avg
+from django.db.models import Avg, Case, CharField, Count, IntegerField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from blueapps.utils.managermixins import ClassificationCountMixin
 from pipeline.component_framework.models import ComponentModel
 from pipeline.contrib.statistics.models import (
     ComponentExecuteData,
+    ComponentExecuteDailyStatistics,
+    InstanceDailyStatistics,
     InstanceInPipeline
 )
 
+from gcloud.conf import settings
 from gcloud.core.constant import TASK_CATEGORY, AE
 
 from gcloud.core.utils import (
@@ -33,11 +39,98 @@ from gcloud.core.utils import (
     get_month_dates
 )
 from gcloud.contrib.appmaker.models import AppMaker
+from gcloud.core.models import Project
 
 logger = logging.getLogger("root")
 
+# 日汇总表支持的查询维度
+ROLLUP_DIMENSIONS = ('project_id', 'category', 'create_method')
+
+
+def rollup_date(timestamp):
+    """
+    将前端传入的时间戳转换为日汇总表的日期，时间戳不是当前时区的零点时返回 None
+    :param timestamp: 毫秒时间戳
+    :return:
+    """
+    value = timestamp_to_datetime(timestamp)
+    if value is None:
+        return None
+    value = timezone.localtime(value)
+    if value.time() != datetime.time(0):
+        return None
+    return value.date()
+
+
+def rollup_conditions(filters):
+    """
+    将统计条件转换为日汇总表的查询条件
+    :param filters: 统计条件
+    :return: 日汇总表查询条件，未开启日汇总表或条件无法由日汇总表满足时返回 None
+    """
+    if not settings.STATISTICS_ROLLUP_ENABLED:
+        return None
+
+    conditions = {}
+    for cond, value in list(filters.items()):
+        if value in ['None', ''] or cond in ['component_code', 'order_by', 'type']:
+            continue
+        if cond == 'is_deleted':
+            if value is not False:
+                return None
+        elif cond in ROLLUP_DIMENSIONS:
+            conditions[cond] = value
+        elif cond in ['create_time', 'finish_time']:
+            date = rollup_date(value)
+            if date is None:
+                return None
+            conditions['date__gte' if cond == 'create_time' else 'date__lte'] = date
+        else:
+            return None
+    return conditions
+
 
 class TaskFlowStatisticsMixin(ClassificationCountMixin):
+    def component_execute_statistics(self, taskflow, filters):
+        """
+        @summary: 按标准插件聚合任务的执行次数、失败次数及平均耗时，条件满足时从日汇总表读取
+        @param taskflow:
+        @param filters:
+        @return: {component_code: {'execute_times': 1, 'failed_times': 0, 'avg_execute_time': 1.0}}
+        """
+        conditions = rollup_conditions(filters or {})
+        if conditions is not None:
+            component_data = ComponentExecuteDailyStatistics.objects.filter(**conditions).values(
+                'component_code').annotate(
+                execute_times=Sum('execute_times'),
+                failed_times=Sum('failed_times'),
+                elapsed_time_total=Sum('elapsed_time_total'),
+                elapsed_time_count=Sum('elapsed_time_count')).order_by()
+            statistics = {}
+            for component in component_data:
+                count = component['elapsed_time_count']
+                statistics[component['component_code']] = {
+                    'execute_times': component['execute_times'],
+                    'failed_times': component['failed_times'],
+                    'avg_execute_time': component['elapsed_time_total'] * 1.0 / count if count else None
+                }
+            return statistics
+
+        instance_id_list = taskflow.values_list('pipeline_instance__instance_id')
+        component_data = ComponentExecuteData.objects.filter(instance_id__in=instance_id_list).values(
+            'component_code').annotate(
+            execute_times=Count('component_code'),
+            failed_times=Sum(Case(When(status=False, then=Value(1)), default=Value(0), output_field=IntegerField())),
+            avg_execute_time=Avg('elapsed_time')).order_by()
+        return {
+            component['component_code']: {
+                'execute_times': component['execute_times'],
+                'failed_times': component['failed_times'],
+                'avg_execute_time': component['avg_execute_time']
+            }
+            for component in component_data
+        }
+
     def group_by_state(self, taskflow, *args):
         # 按流程执行状态查询流程个数
         total = taskflow.count()
@@ -61,8 +154,24 @@ class TaskFlowStatisticsMixin(ClassificationCountMixin):
         ]
         return total, groups
 
-    def group_by_project_id(self, taskflow, *args):
+    def group_by_project_id(self, taskflow, filters=None, *args):
         # 查询不同业务对应的流程数
+        conditions = rollup_conditions(filters or {})
+        if conditions is not None:
+            instance_data = InstanceDailyStatistics.objects.filter(**conditions).values('project_id').annotate(
+                value=Sum('instance_total')).order_by()
+            project_names = dict(Project.objects.filter(
+                id__in=[data['project_id'] for data in instance_data]).values_list('id', 'name'))
+            groups = [
+                {
+                    'code': data['project_id'],
+                    'name': project_names.get(data['project_id']),
+                    'value': data['value']
+                }
+                for data in instance_data if data['value']
+            ]
+            return sum(group['value'] for group in groups), groups
+
         total = taskflow.count()
         taskflow_list = taskflow.values(AE.project_id, AE.project__name).annotate(
             value=Count('project_id')).order_by()
@@ -96,17 +205,24 @@ class TaskFlowStatisticsMixin(ClassificationCountMixin):
             appmaker_data = appmaker_data.filter(task_template__category=category)
         # 获取所有轻应用数据数量
         total = appmaker_data.count()
-        # 获得每一个轻应用的实例数量并变为 dict 字典数据进行查询
+        # 在数据库中按实例数量倒序分页，create_info 中记录的是字符型的轻应用 ID
+        appmaker_ids = appmaker_data.annotate(str_id=Cast('id', CharField(max_length=255))).values('str_id')
+        instance_totals = taskflow_values.filter(create_info__in=appmaker_ids).annotate(
+            instance_total=Count('create_info'),
+            appmaker_id=Cast('create_info', IntegerField())).order_by('-instance_total', '-appmaker_id')
+        offset = (page - 1) * limit
         total_dict = {
             appmaker['create_info']: appmaker['instance_total']
-            for appmaker in taskflow_values.annotate(instance_total=Count('create_info')).order_by()
+            for appmaker in instance_totals[offset: offset + limit]
         }
-        id_list = appmaker_data.values_list('id')[:]
-
-        id_list = sorted(id_list,
-                         key=lambda tuples_id: -total_dict.get(str(tuples_id[0]), 0))
-        id_list = id_list[(page - 1) * limit: page * limit]
-        app_id_list = [tuples[0] for tuples in id_list]
+        app_id_list = [int(appmaker_id) for appmaker_id in total_dict]
+        # 有实例的轻应用不足一页时，使用没有实例的轻应用补齐
+        if len(app_id_list) < limit:
+            empty_offset = max(offset - instance_totals.count(), 0)
+            empty_id_list = appmaker_data.annotate(str_id=Cast('id', CharField(max_length=255))).exclude(
+                str_id__in=taskflow_values.filter(create_info__in=appmaker_ids).values('create_info')
+            ).order_by('-id').values_list('id', flat=True)[empty_offset: empty_offset + limit - len(app_id_list)]
+            app_id_list.extend(empty_id_list)
         # 获得轻应用对象对应的模板和轻应用名称
         appmaker_data = appmaker_data.filter(id__in=app_id_list).values(
             'id',
@@ -144,85 +260,12 @@ class TaskFlowStatisticsMixin(ClassificationCountMixin):
             groups = sorted(groups, key=lambda group: group.get(order_by))
         return total, groups
 
-    def group_by_atom_execute_times(self, taskflow, *args):
-        # 查询各标准插件被执行次数
-        # 获得标准插件dict列表
-        component_dict = ComponentModel.objects.get_component_dict()
-        component_list = ComponentModel.objects.filter(status=True).values('code')
-
-        instance_id_list = taskflow.values_list('pipeline_instance__instance_id')
-        # 获得标准插件
-        component = ComponentExecuteData.objects.filter(instance_id__in=instance_id_list)
-        component_data = component.values('component_code').annotate(
-            execute_times=Count('component_code')).order_by('component_code')
-        total = component_list.count()
-        execute_data = {}
-        for component in component_data:
-            value = component['execute_times']
-            execute_data[component['component_code']] = value
-
-        groups = []
-        # todo 多版本插件先聚合到一起显示，暂不分开
-        processed_components = set()
-        for data in component_list:
-            code = data.get('code')
-
-            if code in processed_components:
-                continue
-
-            processed_components.add(code)
-            groups.append({
-                'code': code,
-                'name': component_dict.get(code, None),
-                'value': execute_data.get(code, 0)
-            })
-        return total, groups
-
-    def group_by_atom_execute_fail_times(self, taskflow, *args):
-        # 查询各标准插件失败次数
-        component_dict = ComponentModel.objects.get_component_dict()
-        component_list = ComponentModel.objects.filter(status=True).values('code')
-
-        instance_id_list = taskflow.values_list('pipeline_instance__instance_id')
-        # 获得标准插件
-        component_data = ComponentExecuteData.objects.filter(instance_id__in=instance_id_list)
-        component_failed_data = component_data.filter(status=False).values('component_code').annotate(
-            failed_times=Count('component_code')).order_by('component_code')
-        failed_dict = {item['component_code']: item['failed_times'] for item in component_failed_data}
-
-        groups = []
-        # todo 多版本插件先聚合到一起显示，暂不分开
-        processed_components = set()
-        for data in component_list:
-            code = data.get('code')
-
-            if code in processed_components:
-                continue
-            processed_components.add(code)
-
-            groups.append({
-                'code': code,
-                'name': component_dict.get(code, None),
-                'value': failed_dict.get(code, 0)
-            })
-        return component_list.count(), groups
-
-    def group_by_atom_avg_execute_time(self, taskflow, *args):
-        # 查询各标准插件被执行次数
-        # 获得标准插件dict列表
+    def _group_by_component(self, taskflow, filters, get_value):
+        # 按标准插件聚合统计值
         component_dict = ComponentModel.objects.get_component_dict()
         component_list = ComponentModel.objects.filter(status=True).values('code')
-
-        instance_id_list = taskflow.values_list('pipeline_instance__instance_id')
-        # 获得标准插件
-        component = ComponentExecuteData.objects.filter(instance_id__in=instance_id_list)
-        component_data = component.values('component_code').annotate(
-            avg_execute_time=Avg('elapsed_time')).order_by('component_code')
         total = component_list.count()
-        execute_data = {}
-        for component in component_data:
-            value = component['avg_execute_time']
-            execute_data[component['component_code']] = value
+        statistics = self.component_execute_statistics(taskflow, filters)
 
         groups = []
         # todo 多版本插件先聚合到一起显示，暂不分开
@@ -237,49 +280,30 @@ class TaskFlowStatisticsMixin(ClassificationCountMixin):
             groups.append({
                 'code': code,
                 'name': component_dict.get(code, None),
-                'value': execute_data.get(code, 0)
+                'value': get_value(statistics[code]) if code in statistics else 0
             })
         return total, groups
 
-    def group_by_atom_fail_percent(self, taskflow, *args):
-        # 查询各标准插件重试次数
-        component_dict = ComponentModel.objects.get_component_dict()
-        component_list = ComponentModel.objects.filter(status=True).values('code')
-        total = component_list.count()
+    def group_by_atom_execute_times(self, taskflow, filters=None, *args):
+        # 查询各标准插件被执行次数
+        return self._group_by_component(taskflow, filters, lambda item: item['execute_times'])
 
-        instance_id_list = taskflow.values_list('pipeline_instance__instance_id')
-        # 获得标准插件
-        component = ComponentExecuteData.objects.filter(instance_id__in=instance_id_list)
-        component_data = component.values('component_code').annotate(
-            execute_times=Count('component_code')).order_by('component_code')
-        component_failed_data = component_data.filter(status=False).values('component_code').annotate(
-            failed_times=Count('component_code')).order_by('component_code')
-        failed_dict = {item['component_code']: item['failed_times'] for item in component_failed_data}
-        fail_percent = {}
-        for component in component_data:
-            component_code = component['component_code']
-            if component_code in failed_dict:
-                execute_times = component['execute_times']
-                fail_percent[component_code] = '%.2f' % (
-                    (failed_dict[component_code] * 1.00 / execute_times) * 100
-                )
+    def group_by_atom_execute_fail_times(self, taskflow, filters=None, *args):
+        # 查询各标准插件失败次数
+        return self._group_by_component(taskflow, filters, lambda item: item['failed_times'])
 
-        groups = []
-        # todo 多版本插件先聚合到一起显示，暂不分开
-        processed_components = set()
-        for data in component_list:
-            code = data.get('code')
+    def group_by_atom_avg_execute_time(self, taskflow, filters=None, *args):
+        # 查询各标准插件平均耗时
+        return self._group_by_component(taskflow, filters, lambda item: item['avg_execute_time'])
 
-            if code in processed_components:
-                continue
-            processed_components.add(code)
+    def group_by_atom_fail_percent(self, taskflow, filters=None, *args):
+        # 查询各标准插件失败率
+        def fail_percent(item):
+            if not item['failed_times']:
+                return 0
+            return '%.2f' % ((item['failed_times'] * 1.00 / item['execute_times']) * 100)
 
-            groups.append({
-                'code': code,
-                'name': component_dict.get(code, None),
-                'value': fail_percent.get(code, 0)
-            })
-        return total, groups
+        return self._group_by_component(taskflow, filters, fail_percent)
 
     def group_by_atom_instance(self, taskflow, filters, page, limit):
         # 被引用的任务实例列表
@@ -350,7 +374,7 @@ class TaskFlowStatisticsMixin(ClassificationCountMixin):
             }
 
         groups = []
-        for task in taskflow:
+        for task in taskflow.select_related('pipeline_instance', 'project'):
             item = {
                 'instanceId': task.id,
                 'instanceName': task.pipeline_instance.name,
@@ -380,36 +404,53 @@ class TaskFlowStatisticsMixin(ClassificationCountMixin):
 
     def group_by_instance_time(self, taskflow, filters, *args):
         #  按起始时间、业务（可选）、类型（可选）、图表类型（日视图，月视图），查询每一天或每一月的执行数量
-        instance_create_time_list = taskflow.values('pipeline_instance__create_time')
-        total = instance_create_time_list.count()
         group_type = filters.get('type', 'day')
-        create_time = timestamp_to_datetime(filters['create_time'])
-        end_time = timestamp_to_datetime(filters['finish_time']) + datetime.timedelta(days=1)
+        create_time = timezone.localtime(timestamp_to_datetime(filters['create_time']))
+        end_time = timezone.localtime(timestamp_to_datetime(filters['finish_time'])) + datetime.timedelta(days=1)
+
+        # 按当前时区的日期统计每一天的数量
+        conditions = rollup_conditions(filters)
+        if conditions is not None:
+            instance_data = InstanceDailyStatistics.objects.filter(**conditions).values('date').annotate(
+                value=Sum('instance_total')).order_by()
+            day_counter = Counter({item['date']: item['value'] for item in instance_data})
+            total = sum(day_counter.values())
+        else:
+            instance_create_time_list = taskflow.values_list('pipeline_instance__create_time', flat=True)
+            day_counter = Counter(
+                timezone.localtime(instance_time).date() for instance_time in instance_create_time_list)
+            total = sum(day_counter.values())
 
         groups = []
-        date_list = []
-        for instance in instance_create_time_list:
-            instance_time = instance['pipeline_instance__create_time']
-            date_key = ''
-            # 添加在一个list中 之后使用count方法获取对应的数量
-            if group_type == 'day':
-                date_key = instance_time.strftime('%Y-%m-%d')
-            elif group_type == 'month':
-                date_key = instance_time.strftime('%Y-%m')
-            date_list.append(date_key)
         if group_type == 'day':
             #  日视图
             for d in gen_day_dates(create_time, (end_time - create_time).days + 1):
-                date_key = d.strftime('%Y-%m-%d')
-                groups.append({'time': date_key, 'value': date_list.count(date_key)})
+                groups.append({'time': d.strftime('%Y-%m-%d'), 'value': day_counter.get(d.date(), 0)})
         elif group_type == 'month':
             # 月视图
             # 直接拿到对应的（年-月），不需要在字符串拼接
+            month_counter = Counter()
+            for day, value in day_counter.items():
+                month_counter[day.strftime('%Y-%m')] += value
             for date_key in get_month_dates(create_time, end_time):
-                groups.append({'time': date_key, 'value': date_list.count(date_key)})
+                groups.append({'time': date_key, 'value': month_counter.get(date_key, 0)})
         return total, groups
 
-    def general_group_by(self, prefix_filters, group_by):
+    def general_group_by(self, prefix_filters, group_by, filters=None):
+        # 按任务类型、创建方式统计时，条件满足则从日汇总表读取
+        conditions = rollup_conditions(filters or {}) if group_by in ROLLUP_DIMENSIONS else None
+        if conditions is not None:
+            try:
+                choices = self.get_choices(group_by)
+            except Exception as e:
+                message = "query_task_list params conditions[%s] have invalid key or value: %s" % (prefix_filters, e)
+                return False, message, None, None
+            instance_data = InstanceDailyStatistics.objects.filter(**conditions).values(group_by).annotate(
+                value=Sum('instance_total')).order_by()
+            values = {data[group_by]: data['value'] for data in instance_data}
+            groups = [{'code': code, 'name': name, 'value': values.get(code, 0)} for code, name in choices]
+            return True, None, sum(values.values()), groups
+
         try:
             total, groups = self.classified_count(prefix_filters, group_by)
         except Exception as e:
@@ -517,6 +517,9 @@ class TaskFlowInstance(models.Model):
         """
         status_tree.setdefault("children", {})
         status_tree.pop("created_time", "")
+        # 父节点及根节点字段只用于在引擎中构建状态树，不对外返回
+        status_tree.pop("root_pipeline_id", None)
+        status_tree.pop("parent_id", None)
 
         status_tree["start_time"] = format_datetime(status_tree.pop("started_time"))
         status_tree["finish_time"] = format_datetime(status_tree.pop("archived_time"))
@@ -536,21 +539,58 @@ class TaskFlowInstance(models.Model):
             elif not child_status:
                 status_tree["state"] = states.FAILED
 
+    @staticmethod
+    def created_status():
+        return {
+            "start_time": None,
+            "state": "CREATED",
+            "retry": 0,
+            "skip": 0,
+            "finish_time": None,
+            "elapsed_time": 0,
+            "children": {},
+        }
+
     def get_status(self):
         if not self.pipeline_instance.is_started:
-            return {
-                "start_time": None,
-                "state": "CREATED",
-                "retry": 0,
-                "skip": 0,
-                "finish_time": None,
-                "elapsed_time": 0,
-                "children": {},
-            }
+            return TaskFlowInstance.created_status()
         status_tree = pipeline_api.get_status_tree(self.pipeline_instance.instance_id, max_depth=99)
         TaskFlowInstance.format_pipeline_status(status_tree)
         return status_tree
 
+    @staticmethod
+    def get_statuses(tasks, include_children=False):
+        """
+        @summary: 批量获取任务状态，只查询一次根流程状态，不需要子节点状态时只为 BLOCKED 的任务查询状态树
+        @param tasks: 任务列表，需要通过 select_related 预先加载 pipeline_instance
+        @param include_children: 是否返回子节点状态
+        @return: {task_id: status}
+        """
+        instance_ids = [task.pipeline_instance.instance_id for task in tasks if task.pipeline_instance.is_started]
+        if include_children:
+            status_trees = pipeline_api.get_status_trees(instance_ids, max_depth=99)
+        else:
+            status_trees = pipeline_api.get_batch_status(instance_ids)
+            # BLOCKED 的根流程需要根据子节点状态转换
+            blocked_ids = [
+                instance_id for instance_id, status in status_trees.items() if status["state"] == states.BLOCKED
+            ]
+            if blocked_ids:
+                status_trees.update(pipeline_api.get_status_trees(blocked_ids, max_depth=99))
+
+        statuses = {}
+        for task in tasks:
+            status_tree = status_trees.get(task.pipeline_instance.instance_id)
+            # 未开始执行或刚开始执行还未写入状态
+            if status_tree is None:
+                status_tree = TaskFlowInstance.created_status()
+            else:
+                TaskFlowInstance.format_pipeline_status(status_tree)
+            if not include_children:
+                status_tree.pop("children")
+            statuses[task.id] = status_tree
+        return statuses
+
     def get_node_data(self, node_id, username, component_code=None, subprocess_stack=None, loop=None):
         if not self.has_node(node_id):
             message = "node[node_id={node_id}] not found in task[task_id={task_id}]".format(
@@ -30,7 +30,7 @@ from pipeline.exceptions import PipelineException
 from pipeline.models import PipelineInstance
 from pipeline_web.parser.validator import validate_web_pipeline_tree
 
-from gcloud.core.utils import name_handler, pipeline_node_name_handle
+from gcloud.core.utils import convert_readable_usernames, name_handler, pipeline_node_name_handle
 from gcloud.core.constant import TASK_NAME_MAX_LENGTH
 from gcloud.core.permissions import project_resource
 from gcloud.commons.template.models import CommonTemplate
@@ -122,12 +122,13 @@ class TaskFlowInstanceResource(GCloudModelResource):
         attribute='is_revoked',
         readonly=True,
         null=True)
+    # 用户名在序列化前批量转换为昵称，见 convert_readable_names
     creator_name = fields.CharField(
-        attribute='creator_name',
+        attribute='creator',
         readonly=True,
         null=True)
     executor_name = fields.CharField(
-        attribute='executor_name',
+        attribute='executor',
         readonly=True,
         null=True)
     pipeline_tree = fields.DictField(
@@ -141,7 +142,8 @@ class TaskFlowInstanceResource(GCloudModelResource):
         readonly=True)
 
     class Meta(GCloudModelResource.Meta):
-        queryset = TaskFlowInstance.objects.filter(pipeline_instance__isnull=False, is_deleted=False)
+        queryset = TaskFlowInstance.objects.filter(pipeline_instance__isnull=False, is_deleted=False).select_related(
+            'pipeline_instance', 'project')
         resource_name = 'taskflow'
         auth_resource = taskflow_resource
         authorization = CustomCreateDetailAuthorization(auth_resource=auth_resource,
@@ -182,6 +184,33 @@ class TaskFlowInstanceResource(GCloudModelResource):
                     orm_filters['q'] = query
         return orm_filters
 
+    @staticmethod
+    def convert_readable_names(bundles):
+        """
+        @summary: 批量将任务的创建者及执行者转换为昵称
+        @param bundles:
+        @return:
+        """
+        usernames = set()
+        for bundle in bundles:
+            usernames.update([bundle.data.get('creator_name'), bundle.data.get('executor_name')])
+        usernames.discard(None)
+        readable_names = convert_readable_usernames(list(usernames))
+        for bundle in bundles:
+            for field in ['creator_name', 'executor_name']:
+                if bundle.data.get(field) is not None:
+                    bundle.data[field] = readable_names.get(bundle.data[field], bundle.data[field])
+
+    def alter_list_data_to_serialize(self, request, data):
+        data = super(TaskFlowInstanceResource, self).alter_list_data_to_serialize(request, data)
+        self.convert_readable_names(data['objects'])
+        return data
+
+    def alter_detail_data_to_serialize(self, request, data):
+        data = super(TaskFlowInstanceResource, self).alter_detail_data_to_serialize(request, data)
+        self.convert_readable_names([data])
+        return data
+
     @staticmethod
     def handle_task_name_attr(data):
         data['name'] = name_handler(data['name'],
@@ -16,10 +16,12 @@ import logging
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from gcloud.conf import settings
 from gcloud.taskflow3.models import TaskFlowInstance
 from gcloud.taskflow3.signals import taskflow_finished, taskflow_revoked
 from gcloud.taskflow3.tasks import send_taskflow_message
 from gcloud.shortcuts.message import ATOM_FAILED, TASK_FINISHED
+from pipeline.contrib.statistics.rollup import refresh_instance_rollup
 from pipeline.models import PipelineInstance
 
 logger = logging.getLogger('celery')
@@ -48,6 +50,18 @@ def pipeline_post_save_handler(sender, instance, created, **kwargs):
             taskflow_revoked.send(sender=taskflow, username=taskflow.pipeline_instance.executor)
 
 
+@receiver(post_save, sender=TaskFlowInstance)
+def taskflow_post_save_handler(sender, instance, created, **kwargs):
+    # 任务创建及删除时更新统计日汇总表，未开启日汇总表时不维护，避免同一项目下并发创建任务时竞争汇总行
+    if not settings.STATISTICS_ROLLUP_ENABLED or not instance.pipeline_instance_id:
+        return
+
+    try:
+        refresh_instance_rollup(instance.pipeline_instance)
+    except Exception as e:
+        logger.exception('taskflow_post_save_handler[taskflow_id=%s] refresh rollup error: %s' % (instance.id, e))
+
+
 def taskflow_node_failed_handler(sender, pipeline_id, pipeline_activity_id, **kwargs):
     try:
         taskflow = TaskFlowInstance.objects.get(pipeline_instance__instance_id=pipeline_id)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+
+from django.core.cache import cache
+
+from pipeline.engine import api as pipeline_api
+
+from gcloud.conf import settings
+
+
+def _snapshot_key(root_pipeline_id, revision):
+    return "taskflow_status_snapshot_%s_%s" % (root_pipeline_id, revision)
+
+
+def _refresh_elapsed_time(status_tree, delta):
+    """
+    @summary: 为缓存状态树中未结束的节点补上缓存之后经过的耗时
+    @param status_tree: 缓存的状态树
+    @param delta: 距离状态树缓存时经过的秒数
+    """
+    if status_tree.get("start_time") and not status_tree.get("finish_time") and "elapsed_time" in status_tree:
+        status_tree["elapsed_time"] += delta
+
+    for child_tree in status_tree.get("children", {}).values():
+        _refresh_elapsed_time(child_tree, delta)
+
+
+def _get_cached_status_tree(root_pipeline_id, revision):
+    cached = cache.get(_snapshot_key(root_pipeline_id, revision))
+    if cached is None:
+        return None
+
+    cached_at, status_tree = cached
+    _refresh_elapsed_time(status_tree, int(round(time.time() - cached_at)))
+    return status_tree
+
+
+def get_status_snapshot(task):
+    """
+    @summary: 获取任务状态快照，快照以根 pipeline 及其状态戳为键缓存，节点状态变化后状态戳改变，缓存随之失效
+    @param task: TaskFlowInstance
+    @return: (revision, status_tree)，未开启状态戳或状态树不支持状态戳时 revision 为 None 且不使用缓存
+    """
+    if not task.pipeline_instance.is_started:
+        return None, task.get_status()
+
+    root_pipeline_id = task.pipeline_instance.instance_id
+    revision = pipeline_api.get_status_tree_revision(root_pipeline_id)
+    if revision is None:
+        return None, task.get_status()
+
+    status_tree = _get_cached_status_tree(root_pipeline_id, revision)
+    if status_tree is None:
+        # revision must be read before status tree, so the changes during query will be caught by next revision
+        status_tree = pipeline_api.get_status_tree(root_pipeline_id, max_depth=99)
+        cached_at = time.time()
+        # 早于状态树父节点字段引入时执行的流程，节点状态变化时不会更新状态戳，不能缓存，需要在格式化移除该字段前判断
+        stamped = bool(status_tree.get("root_pipeline_id"))
+        task.format_pipeline_status(status_tree)
+        if not stamped:
+            return None, status_tree
+        cache.set(
+            _snapshot_key(root_pipeline_id, revision),
+            (cached_at, status_tree),
+            settings.TASK_STATUS_SNAPSHOT_CACHE_TIME,
+        )
+
+    return revision, status_tree
+
+
+def flat_status_tree(status_tree, flat=None):
+    """
+    @summary: 将状态树展开为 {node_id: 不包含 children 的节点状态}
+    """
+    if flat is None:
+        flat = {}
+
+    for node_id, child_tree in status_tree.get("children", {}).items():
+        flat[node_id] = {k: v for k, v in child_tree.items() if k != "children"}
+        flat_status_tree(child_tree, flat)
+
+    return flat
+
+
+def get_status_changes(task, revision=None):
+    """
+    @summary: 获取自客户端持有的 revision 之后状态发生变化的节点
+    @param task: TaskFlowInstance
+    @param revision: 客户端持有的状态戳，为空时返回完整状态树
+    @return: {
+        "revision": 当前状态戳,
+        "full": 是否返回了完整状态树,
+        "state": 任务状态,
+        "status": 完整状态树（full 为 True 时）,
+        "changes": {node_id: 节点状态}（full 为 False 时）
+    }
+    """
+    current_revision, status_tree = get_status_snapshot(task)
+
+    base_tree = None
+    if revision is not None and current_revision is not None:
+        base_tree = (
+            status_tree
+            if revision == current_revision
+            else _get_cached_status_tree(task.pipeline_instance.instance_id, revision)
+        )
+
+    # revision of client is unknown or expired
+    if base_tree is None:
+        return {"revision": current_revision, "full": True, "state": status_tree["state"], "status": status_tree}
+
+    current_flat = flat_status_tree(status_tree)
+    base_flat = flat_status_tree(base_tree)
+    changes = {
+        node_id: node_status for node_id, node_status in current_flat.items() if base_flat.get(node_id) != node_status
+    }
+
+    return {"revision": current_revision, "full": False, "state": status_tree["state"], "changes": changes}
@@ -18,6 +18,7 @@ from gcloud.taskflow3 import api
 urlpatterns = [
     url(r'^api/context/$', api.context),
     url(r'^api/status/(?P<project_id>\d+)/$', api.status),
+    url(r'^api/status/changes/(?P<project_id>\d+)/$', api.status_changes),
     url(r'^api/clone/(?P<project_id>\d+)/$', api.task_clone),
     url(r'^api/action/(?P<action>\w+)/(?P<project_id>\d+)/$', api.task_action),
     url(r'^api/flow/claim/(?P<project_id>\d+)/$', api.task_func_claim),
@@ -37,6 +37,26 @@ def get_instance_context(pipeline_instance, data_type, username=''):
         return TaskContext(taskflow, username).context()
 
 
+def get_statistics_dimensions(pipeline_instance):
+    """
+    获取任务在统计日汇总表中的维度，已删除或不属于任务的实例不计入汇总
+    :param pipeline_instance: PipelineInstance
+    :return:
+    """
+    taskflow = (
+        TaskFlowInstance.objects.filter(pipeline_instance=pipeline_instance)
+        .values("project_id", "category", "create_method", "is_deleted")
+        .first()
+    )
+    if taskflow is None or taskflow["is_deleted"]:
+        return None
+    return {
+        "project_id": taskflow["project_id"],
+        "category": taskflow["category"],
+        "create_method": taskflow["create_method"],
+    }
+
+
 def preview_template_tree(project_id, template_source, template_id, version, exclude_task_nodes_id):
 
     if template_source == PROJECT:
@@ -221,7 +221,7 @@ class TaskTmplStatisticsMixin(ClassificationCountMixin):
             periodic_dict[periodic_task['template__template_id']] = periodic_task['periodic_total']
 
         # 需要循环执行计算相关节点
-        for template in tasktmpl:
+        for template in tasktmpl.select_related('pipeline_template', 'project'):
             pipeline_template = template.pipeline_template
             template_id = template.id
             pipeline_template_id = pipeline_template.template_id
@@ -11,7 +11,6 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import copy
 import ujson as json
 
 from gcloud.tests.mock import *  # noqa
@@ -39,18 +38,25 @@ class GetTasksStatusAPITest(APITest):
         ),
     )
     def test_get_tasks_status__success_with_children_status(self):
-        task = MockTaskFlowInstance(get_status_return={"children": "children"})
-        status = copy.deepcopy(task.get_status())
-
-        with patch(TASKFLOW_OBJECTS_FILTER, MagicMock(return_value=[task])):
-            response = self.client.post(
-                path=self.url().format(project_id=TEST_PROJECT_ID),
-                data=json.dumps({"task_id_list": [1, 2, 3], "include_children_status": True}),
-                content_type="application/json",
-            )
+        task = MockTaskFlowInstance()
+        status = {"state": "RUNNING", "children": "children"}
+        tasks = [task]
+        filter_result = MagicMock()
+        filter_result.select_related = MagicMock(return_value=tasks)
+
+        with patch(TASKFLOW_OBJECTS_FILTER, MagicMock(return_value=filter_result)):
+            with patch(TASKINSTANCE_GET_STATUSES, MagicMock(return_value={task.id: status})) as get_statuses:
+                response = self.client.post(
+                    path=self.url().format(project_id=TEST_PROJECT_ID),
+                    data=json.dumps({"task_id_list": [1, 2, 3], "include_children_status": True}),
+                    content_type="application/json",
+                )
 
             data = json.loads(response.content)
 
+            filter_result.select_related.assert_called_once_with("pipeline_instance", "project")
+            get_statuses.assert_called_once_with(tasks, include_children=True)
+
             self.assertTrue(data["result"])
             self.assertEqual(data["code"], err_code.SUCCESS.code)
             self.assertEqual(
@@ -77,19 +83,24 @@ class GetTasksStatusAPITest(APITest):
         ),
     )
     def test_get_tasks_status__success_without_children_status(self):
-        task = MockTaskFlowInstance(get_status_return={"children": "children"})
-        status = copy.deepcopy(task.get_status())
-        status.pop("children")
-
-        with patch(TASKFLOW_OBJECTS_FILTER, MagicMock(return_value=[task])):
-            response = self.client.post(
-                path=self.url().format(project_id=TEST_PROJECT_ID),
-                data=json.dumps({"task_id_list": [1, 2, 3]}),
-                content_type="application/json",
-            )
+        task = MockTaskFlowInstance()
+        status = {"state": "RUNNING"}
+        tasks = [task]
+        filter_result = MagicMock()
+        filter_result.select_related = MagicMock(return_value=tasks)
+
+        with patch(TASKFLOW_OBJECTS_FILTER, MagicMock(return_value=filter_result)):
+            with patch(TASKINSTANCE_GET_STATUSES, MagicMock(return_value={task.id: status})) as get_statuses:
+                response = self.client.post(
+                    path=self.url().format(project_id=TEST_PROJECT_ID),
+                    data=json.dumps({"task_id_list": [1, 2, 3]}),
+                    content_type="application/json",
+                )
 
             data = json.loads(response.content)
 
+            get_statuses.assert_called_once_with(tasks, include_children=False)
+
             self.assertTrue(data["result"])
             self.assertEqual(data["code"], err_code.SUCCESS.code)
             self.assertEqual(
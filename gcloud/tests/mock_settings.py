@@ -34,6 +34,7 @@ TASKINSTANCE_CREATE_PIPELINE_INSTANCE = 'gcloud.taskflow3.models.TaskFlowInstanc
 TASKINSTANCE_CREATE = 'gcloud.taskflow3.models.TaskFlowInstance.objects.create'
 TASKINSTANCE_GET = 'gcloud.taskflow3.models.TaskFlowInstance.objects.get'
 TASKINSTANCE_FORMAT_STATUS = 'gcloud.taskflow3.models.TaskFlowInstance.format_pipeline_status'
+TASKINSTANCE_GET_STATUSES = 'gcloud.taskflow3.models.TaskFlowInstance.get_statuses'
 TASKINSTANCE_EXTEN_CLASSIFIED_COUNT = 'gcloud.contrib.analysis.analyse_items.task_flow_instance.dispatch'
 TASKINSTANCE_PREVIEW_TREE = 'gcloud.taskflow3.models.TaskFlowInstance.objects.preview_pipeline_tree_exclude_task_nodes'
 TASKINSTANCE_OBJECTS_CALLBACK = 'gcloud.taskflow3.models.TaskFlowInstance.objects.callback'
@@ -37,3 +37,69 @@ class TaskflowTestCase(TestCase):
                 self.assertTrue(result['result'])
                 self.assertTrue('message' in result)
                 TaskFlowInstance.objects.callback.assert_called_once_with('act_id', 'data')
+
+    def _status(self, state, children=None):
+        return {
+            'id': 'id',
+            'state': state,
+            'started_time': None,
+            'archived_time': None,
+            'retry': 0,
+            'skip': False,
+            'root_pipeline_id': 'root',
+            'parent_id': 'parent',
+            'children': children or {},
+        }
+
+    def _task(self, task_id, is_started=True):
+        return MagicMock(id=task_id, pipeline_instance=MagicMock(instance_id='i%s' % task_id, is_started=is_started))
+
+    def test_get_statuses__without_children(self):
+        tasks = [self._task(1), self._task(2), self._task(3, is_started=False), self._task(4)]
+        batch_status = {'i1': self._status('FINISHED'), 'i2': self._status('BLOCKED')}
+        status_trees = {'i2': self._status('BLOCKED', children={'n1': self._status('FAILED')})}
+
+        with mock.patch('gcloud.taskflow3.models.pipeline_api.get_batch_status',
+                        MagicMock(return_value=batch_status)) as get_batch_status:
+            with mock.patch('gcloud.taskflow3.models.pipeline_api.get_status_trees',
+                            MagicMock(return_value=status_trees)) as get_status_trees:
+                statuses = TaskFlowInstance.get_statuses(tasks)
+
+        get_batch_status.assert_called_once_with(['i1', 'i2', 'i4'])
+        get_status_trees.assert_called_once_with(['i2'], max_depth=99)
+        self.assertEqual(statuses[1]['state'], 'FINISHED')
+        self.assertEqual(statuses[2]['state'], 'FAILED')
+        self.assertEqual(statuses[3]['state'], 'CREATED')
+        self.assertEqual(statuses[4]['state'], 'CREATED')
+        for status in statuses.values():
+            self.assertNotIn('children', status)
+
+    def test_get_statuses__with_children(self):
+        tasks = [self._task(1), self._task(2, is_started=False)]
+        status_trees = {'i1': self._status('RUNNING', children={'n1': self._status('RUNNING')})}
+
+        with mock.patch('gcloud.taskflow3.models.pipeline_api.get_batch_status', MagicMock()) as get_batch_status:
+            with mock.patch('gcloud.taskflow3.models.pipeline_api.get_status_trees',
+                            MagicMock(return_value=status_trees)) as get_status_trees:
+                statuses = TaskFlowInstance.get_statuses(tasks, include_children=True)
+
+        get_batch_status.assert_not_called()
+        get_status_trees.assert_called_once_with(['i1'], max_depth=99)
+        self.assertEqual(statuses[1]['state'], 'RUNNING')
+        self.assertEqual(statuses[1]['children']['n1']['state'], 'RUNNING')
+        self.assertEqual(statuses[2], TaskFlowInstance.created_status())
+
+    def test_format_pipeline_status__internal_fields_removed(self):
+        status_tree = self._status('RUNNING', children={'n1': self._status('RUNNING')})
+
+        TaskFlowInstance.format_pipeline_status(status_tree)
+
+        for status in [status_tree, status_tree['children']['n1']]:
+            self.assertNotIn('root_pipeline_id', status)
+            self.assertNotIn('parent_id', status)
+            self.assertNotIn('started_time', status)
+            self.assertNotIn('archived_time', status)
+        self.assertEqual(
+            set(status_tree.keys()),
+            {'id', 'state', 'start_time', 'finish_time', 'retry', 'skip', 'children'}
+        )
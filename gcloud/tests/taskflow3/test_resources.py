@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.test import TestCase
+
+from gcloud.core.models import Project
+from gcloud.taskflow3.models import TaskFlowInstance
+from gcloud.taskflow3.resources import TaskFlowInstanceResource
+from gcloud.tests.mock import *  # noqa
+from pipeline.models import PipelineInstance
+
+BATCH_VERIFY_PERMS = 'auth_backend.plugins.tastypie.resources.backend.batch_verify_perms'
+
+
+class TaskFlowInstanceResourceTestCase(TestCase):
+
+    def setUp(self):
+        self.resource = TaskFlowInstanceResource(api_name='v3')
+        self.request = MagicMock(GET={}, user=MagicMock(username='admin'))
+        self.projects = [Project.objects.create(name='project_%s' % i, creator='admin') for i in range(2)]
+
+    def create_tasks(self, count):
+        for i in range(count):
+            pipeline_instance = PipelineInstance.objects.create(
+                instance_id='instance_%s' % i,
+                name='task_%s' % i,
+                creator='creator_%s' % (i % 3),
+                executor='executor_%s' % (i % 5))
+            TaskFlowInstance.objects.create(
+                project=self.projects[i % 2],
+                pipeline_instance=pipeline_instance,
+                current_flow='execute_task')
+
+    def get_list_data(self, limit):
+        objects = self.resource.get_object_list(self.request)[:limit]
+        bundles = [
+            self.resource.full_dehydrate(self.resource.build_bundle(obj=obj, request=self.request), for_list=True)
+            for obj in objects
+        ]
+        return self.resource.alter_list_data_to_serialize(self.request, {'meta': {}, 'objects': bundles})
+
+    @patch(BATCH_VERIFY_PERMS, MagicMock(return_value={'result': True, 'data': []}))
+    def test_list__constant_queries(self):
+        self.create_tasks(100)
+
+        with patch('gcloud.taskflow3.resources.convert_readable_usernames',
+                   MagicMock(side_effect=lambda usernames: {u: 'readable_%s' % u for u in usernames})) as convert:
+            with self.assertNumQueries(1):
+                data = self.get_list_data(100)
+
+        self.assertEqual(len(data['objects']), 100)
+        convert.assert_called_once()
+        self.assertEqual(len(convert.call_args[0][0]), 8)
+
+        bundle = data['objects'][-1]
+        self.assertEqual(bundle.data['name'], 'task_0')
+        self.assertEqual(bundle.data['creator_name'], 'readable_creator_0')
+        self.assertEqual(bundle.data['executor_name'], 'readable_executor_0')
+        self.assertEqual(bundle.data['project'].data['name'], 'project_0')
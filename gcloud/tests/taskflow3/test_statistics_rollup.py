@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from gcloud.tests.mock import *  # noqa
+from gcloud.contrib.appmaker.models import AppMaker
+from gcloud.core.models import Project
+from gcloud.taskflow3 import mixins
+from gcloud.taskflow3.models import TaskFlowInstance
+from gcloud.tasktmpl3.models import TaskTemplate
+from pipeline.models import PipelineInstance
+from gcloud.taskflow3.signals import handlers
+from pipeline.contrib.statistics.models import ComponentExecuteDailyStatistics, InstanceDailyStatistics
+
+MIXINS_SETTINGS = "gcloud.taskflow3.mixins.settings"
+HANDLERS_SETTINGS = "gcloud.taskflow3.signals.handlers.settings"
+HANDLERS_REFRESH_INSTANCE_ROLLUP = "gcloud.taskflow3.signals.handlers.refresh_instance_rollup"
+
+
+def local_timestamp(year, month, day, hour=0):
+    value = timezone.make_aware(datetime.datetime(year, month, day, hour), timezone.get_current_timezone())
+    return int(value.timestamp() * 1000)
+
+
+class StatisticsRollupTestCase(TestCase):
+    def setUp(self):
+        self.settings_patcher = patch(MIXINS_SETTINGS, MagicMock(STATISTICS_ROLLUP_ENABLED=True))
+        self.settings_patcher.start()
+
+    def tearDown(self):
+        self.settings_patcher.stop()
+
+    def test_rollup_conditions(self):
+        filters = {
+            "is_deleted": False,
+            "project_id": 1,
+            "category": "None",
+            "create_method": "",
+            "create_time": local_timestamp(2020, 1, 1),
+            "finish_time": local_timestamp(2020, 1, 31),
+            "order_by": "-execute_times",
+            "type": "day",
+        }
+        self.assertEqual(
+            mixins.rollup_conditions(filters),
+            {"project_id": 1, "date__gte": datetime.date(2020, 1, 1), "date__lte": datetime.date(2020, 1, 31)},
+        )
+
+    def test_rollup_conditions__not_covered(self):
+        self.assertIsNone(mixins.rollup_conditions({"is_deleted": True}))
+        self.assertIsNone(mixins.rollup_conditions({"template_id": 1}))
+        self.assertIsNone(mixins.rollup_conditions({"create_time": local_timestamp(2020, 1, 1, 8)}))
+
+    def test_rollup_conditions__not_enabled(self):
+        with patch(MIXINS_SETTINGS, MagicMock(STATISTICS_ROLLUP_ENABLED=False)):
+            self.assertIsNone(mixins.rollup_conditions({"project_id": 1}))
+
+    def test_component_execute_statistics(self):
+        for day, project_id in [(1, 1), (2, 1), (2, 2)]:
+            ComponentExecuteDailyStatistics.objects.create(
+                date=datetime.date(2020, 1, day),
+                project_id=project_id,
+                category="OpsTools",
+                create_method="app",
+                component_code="job",
+                execute_times=3,
+                failed_times=1,
+                elapsed_time_total=30,
+                elapsed_time_count=2,
+            )
+        taskflow = MagicMock()
+
+        statistics = TaskFlowInstance.objects.component_execute_statistics(
+            taskflow, {"is_deleted": False, "project_id": 1, "create_time": local_timestamp(2020, 1, 1)}
+        )
+
+        taskflow.values_list.assert_not_called()
+        self.assertEqual(statistics, {"job": {"execute_times": 6, "failed_times": 2, "avg_execute_time": 15.0}})
+
+    def test_group_by_instance_time(self):
+        for day, project_id, instance_total in [(1, 1, 2), (3, 1, 1), (30, 1, 4), (3, 2, 5)]:
+            InstanceDailyStatistics.objects.create(
+                date=datetime.date(2020, 1, day),
+                project_id=project_id,
+                category="OpsTools",
+                create_method="app",
+                instance_total=instance_total,
+            )
+        filters = {
+            "is_deleted": False,
+            "project_id": 1,
+            "create_time": local_timestamp(2020, 1, 1),
+            "finish_time": local_timestamp(2020, 1, 3),
+            "type": "day",
+        }
+
+        total, groups = TaskFlowInstance.objects.group_by_instance_time(MagicMock(), filters)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(
+            groups,
+            [
+                {"time": "2020-01-01", "value": 2},
+                {"time": "2020-01-02", "value": 0},
+                {"time": "2020-01-03", "value": 1},
+                {"time": "2020-01-04", "value": 0},
+            ],
+        )
+
+        filters.update({"finish_time": local_timestamp(2020, 1, 30), "type": "month"})
+        total, groups = TaskFlowInstance.objects.group_by_instance_time(MagicMock(), filters)
+
+        self.assertEqual(total, 7)
+        self.assertEqual(groups, [{"time": "2020-01", "value": 7}])
+
+    def create_instance_statistics(self):
+        for day, project_id, category, create_method, instance_total in [
+            (1, 1, "OpsTools", "app", 2),
+            (2, 1, "Other", "api", 3),
+            (2, 2, "OpsTools", "app", 4),
+            (3, 3, "OpsTools", "app", 0),
+            (5, 1, "OpsTools", "app", 6),
+        ]:
+            InstanceDailyStatistics.objects.create(
+                date=datetime.date(2020, 1, day),
+                project_id=project_id,
+                category=category,
+                create_method=create_method,
+                instance_total=instance_total,
+            )
+
+    def test_group_by_project_id(self):
+        self.create_instance_statistics()
+        project_1 = Project.objects.create(id=1, name="project_1", creator="admin")
+        project_2 = Project.objects.create(id=2, name="project_2", creator="admin")
+        Project.objects.create(id=3, name="project_3", creator="admin")
+        taskflow = MagicMock()
+        filters = {
+            "is_deleted": False,
+            "create_time": local_timestamp(2020, 1, 1),
+            "finish_time": local_timestamp(2020, 1, 3),
+        }
+
+        total, groups = TaskFlowInstance.objects.group_by_project_id(taskflow, filters, None, None)
+
+        taskflow.count.assert_not_called()
+        self.assertEqual(total, 9)
+        self.assertEqual(
+            sorted(groups, key=lambda group: group["code"]),
+            [
+                {"code": project_1.id, "name": "project_1", "value": 5},
+                {"code": project_2.id, "name": "project_2", "value": 4},
+            ],
+        )
+
+    def test_general_group_by(self):
+        self.create_instance_statistics()
+        filters = {
+            "is_deleted": False,
+            "project_id": 1,
+            "create_time": local_timestamp(2020, 1, 1),
+            "finish_time": local_timestamp(2020, 1, 3),
+        }
+
+        with patch.object(TaskFlowInstance.objects, "classified_count") as classified_count:
+            result, message, total, groups = TaskFlowInstance.objects.general_group_by({}, "category", filters)
+            self.assertTrue(result)
+            self.assertEqual(total, 5)
+            values = {group["code"]: group["value"] for group in groups}
+            self.assertEqual(values["OpsTools"], 2)
+            self.assertEqual(values["Other"], 3)
+            self.assertEqual(sum(values.values()), 5)
+
+            result, message, total, groups = TaskFlowInstance.objects.general_group_by({}, "create_method", filters)
+            self.assertTrue(result)
+            self.assertEqual(total, 5)
+            values = {group["code"]: group["value"] for group in groups}
+            self.assertEqual(values["app"], 2)
+            self.assertEqual(values["api"], 3)
+
+        classified_count.assert_not_called()
+
+    def test_general_group_by__not_rollup_dimension(self):
+        with patch.object(
+            TaskFlowInstance.objects, "classified_count", MagicMock(return_value=(1, []))
+        ) as classified_count:
+            result, message, total, groups = TaskFlowInstance.objects.general_group_by(
+                {"is_deleted": False}, "flow_type", {"is_deleted": False}
+            )
+
+        self.assertEqual((result, message, total, groups), (True, None, 1, []))
+        classified_count.assert_called_once_with({"is_deleted": False}, "flow_type")
+
+
+class GroupByAppmakerInstanceTestCase(TestCase):
+    def setUp(self):
+        project = Project.objects.create(name="project", creator="admin")
+        template = TaskTemplate.objects.model(project=project, category="OpsTools")
+        template.save()
+        self.appmakers = [
+            AppMaker.objects.create(
+                project=project,
+                name="appmaker_%s" % i,
+                code="code_%s" % i,
+                link="http://example.com/",
+                creator="admin",
+                task_template=template,
+            )
+            for i in range(5)
+        ]
+        # 轻应用 0, 1, 2, 3, 4 的实例数量分别为 1, 3, 0, 2, 0
+        for index, count in [(0, 1), (1, 3), (3, 2)]:
+            for i in range(count):
+                pipeline_instance = PipelineInstance.objects.create(
+                    instance_id="instance_%s_%s" % (index, i), name="task", creator="admin"
+                )
+                TaskFlowInstance.objects.create(
+                    project=project,
+                    pipeline_instance=pipeline_instance,
+                    create_method="app_maker",
+                    create_info=str(self.appmakers[index].id),
+                )
+        self.filters = {
+            "order_by": "-instanceTotal",
+            "create_time": int((timezone.now() - datetime.timedelta(days=1)).timestamp() * 1000),
+            "finish_time": int(timezone.now().timestamp() * 1000),
+        }
+
+    def group_by(self, page, limit):
+        total, groups = TaskFlowInstance.objects.group_by_appmaker_instance(
+            TaskFlowInstance.objects.all(), self.filters, page, limit
+        )
+        return total, [(group["templateName"], group["instanceTotal"]) for group in groups]
+
+    def test_group_by_appmaker_instance(self):
+        self.assertEqual(self.group_by(1, 2), (5, [("appmaker_1", 3), ("appmaker_3", 2)]))
+        # 第二页同时包含有实例和没有实例的轻应用，没有实例的按 ID 倒序排列
+        self.assertEqual(self.group_by(2, 2), (5, [("appmaker_0", 1), ("appmaker_4", 0)]))
+        self.assertEqual(self.group_by(3, 2), (5, [("appmaker_2", 0)]))
+        self.assertEqual(self.group_by(4, 2), (5, []))
+
+
+class TaskflowPostSaveHandlerTestCase(TestCase):
+    def test_taskflow_post_save_handler__rollup_enabled(self):
+        taskflow = MagicMock(pipeline_instance_id=1)
+        with patch(HANDLERS_SETTINGS, MagicMock(STATISTICS_ROLLUP_ENABLED=True)):
+            with patch(HANDLERS_REFRESH_INSTANCE_ROLLUP, MagicMock()) as refresh_instance_rollup:
+                handlers.taskflow_post_save_handler(sender=None, instance=taskflow, created=True)
+
+        refresh_instance_rollup.assert_called_once_with(taskflow.pipeline_instance)
+
+    def test_taskflow_post_save_handler__rollup_disabled(self):
+        taskflow = MagicMock(pipeline_instance_id=1)
+        with patch(HANDLERS_SETTINGS, MagicMock(STATISTICS_ROLLUP_ENABLED=False)):
+            with patch(HANDLERS_REFRESH_INSTANCE_ROLLUP, MagicMock()) as refresh_instance_rollup:
+                handlers.taskflow_post_save_handler(sender=None, instance=taskflow, created=True)
+
+        refresh_instance_rollup.assert_not_called()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from gcloud.tests.mock import *  # noqa
+from gcloud.taskflow3 import status_cache
+from gcloud.taskflow3.models import TaskFlowInstance
+
+STATUS_CACHE_GET_REVISION = "gcloud.taskflow3.status_cache.pipeline_api.get_status_tree_revision"
+STATUS_CACHE_GET_STATUS_TREE = "gcloud.taskflow3.status_cache.pipeline_api.get_status_tree"
+
+
+def raw_status_tree(node_state, root_pipeline_id="root"):
+    def node(node_id, state, parent_id):
+        return {
+            "id": node_id,
+            "state": state,
+            "started_time": None,
+            "archived_time": None,
+            "root_pipeline_id": root_pipeline_id,
+            "parent_id": parent_id,
+            "children": {},
+        }
+
+    tree = node("root", "RUNNING", "")
+    tree["children"] = {
+        "node_1": node("node_1", "FINISHED", "root"),
+        "node_2": node("node_2", node_state, "root"),
+    }
+    return tree
+
+
+def status_tree(node_state, root_pipeline_id="root"):
+    tree = raw_status_tree(node_state, root_pipeline_id)
+    TaskFlowInstance.format_pipeline_status(tree)
+    return tree
+
+
+def mock_get_status_tree(node_state, root_pipeline_id="root"):
+    return MagicMock(side_effect=lambda *args, **kwargs: raw_status_tree(node_state, root_pipeline_id))
+
+
+class StatusCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task = MagicMock()
+        self.task.pipeline_instance.is_started = True
+        self.task.pipeline_instance.instance_id = "root"
+        self.task.format_pipeline_status = TaskFlowInstance.format_pipeline_status
+
+    def test_get_status_snapshot__revision_disabled(self):
+        self.task.get_status = MagicMock(return_value=status_tree("RUNNING"))
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=None)):
+            self.assertEqual(status_cache.get_status_snapshot(self.task), (None, status_tree("RUNNING")))
+            status_cache.get_status_snapshot(self.task)
+
+        self.assertEqual(self.task.get_status.call_count, 2)
+
+    def test_get_status_snapshot__cached_by_revision(self):
+        get_status_tree = mock_get_status_tree("RUNNING")
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=1)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, get_status_tree):
+                self.assertEqual(status_cache.get_status_snapshot(self.task), (1, status_tree("RUNNING")))
+                self.assertEqual(status_cache.get_status_snapshot(self.task), (1, status_tree("RUNNING")))
+
+        get_status_tree.assert_called_once_with("root", max_depth=99)
+
+        get_status_tree = mock_get_status_tree("FINISHED")
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=2)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, get_status_tree):
+                self.assertEqual(status_cache.get_status_snapshot(self.task), (2, status_tree("FINISHED")))
+
+        get_status_tree.assert_called_once_with("root", max_depth=99)
+
+    def test_get_status_snapshot__internal_fields_removed(self):
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=1)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, mock_get_status_tree("RUNNING")):
+                _, tree = status_cache.get_status_snapshot(self.task)
+
+        for node in [tree, tree["children"]["node_1"], tree["children"]["node_2"]]:
+            self.assertNotIn("root_pipeline_id", node)
+            self.assertNotIn("parent_id", node)
+
+    def test_get_status_changes(self):
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=1)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, mock_get_status_tree("RUNNING")):
+                full = status_cache.get_status_changes(self.task)
+
+        self.assertTrue(full["full"])
+        self.assertEqual(full["revision"], 1)
+        self.assertEqual(full["status"], status_tree("RUNNING"))
+
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=2)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, mock_get_status_tree("FAILED")):
+                changes = status_cache.get_status_changes(self.task, revision=1)
+
+        self.assertEqual(
+            changes,
+            {
+                "revision": 2,
+                "full": False,
+                "state": "RUNNING",
+                "changes": {"node_2": {"id": "node_2", "state": "FAILED", "start_time": "", "finish_time": ""}},
+            },
+        )
+
+    def test_get_status_changes__revision_expired(self):
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=5)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, mock_get_status_tree("RUNNING")):
+                data = status_cache.get_status_changes(self.task, revision=3)
+
+        self.assertTrue(data["full"])
+        self.assertEqual(data["status"], status_tree("RUNNING"))
+
+    def test_get_status_snapshot__legacy_tree_not_cached(self):
+        get_status_tree = mock_get_status_tree("RUNNING", root_pipeline_id="")
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=0)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, get_status_tree):
+                self.assertEqual(status_cache.get_status_snapshot(self.task), (None, status_tree("RUNNING", "")))
+                data = status_cache.get_status_changes(self.task, revision=0)
+
+        self.assertEqual(get_status_tree.call_count, 2)
+        self.assertTrue(data["full"])
+        self.assertIsNone(data["revision"])
+
+    def test_get_status_snapshot__refresh_elapsed_time(self):
+        tree = status_tree("RUNNING")
+        tree["start_time"] = "2020-01-01 00:00:00 +0800"
+        tree["finish_time"] = None
+        tree["elapsed_time"] = 10
+        tree["children"]["node_1"].update(start_time="2020-01-01 00:00:00 +0800", finish_time=None, elapsed_time=5)
+        tree["children"]["node_2"].update(
+            start_time="2020-01-01 00:00:00 +0800", finish_time="2020-01-01 00:00:03 +0800", elapsed_time=3
+        )
+        cache.set(status_cache._snapshot_key("root", 1), (time.time() - 7, tree), 10)
+
+        with patch(STATUS_CACHE_GET_REVISION, MagicMock(return_value=1)):
+            with patch(STATUS_CACHE_GET_STATUS_TREE, MagicMock()) as get_status_tree:
+                _, cached_tree = status_cache.get_status_snapshot(self.task)
+
+        get_status_tree.assert_not_called()
+        self.assertEqual(cached_tree["elapsed_time"], 17)
+        self.assertEqual(cached_tree["children"]["node_1"]["elapsed_time"], 12)
+        self.assertEqual(cached_tree["children"]["node_2"]["elapsed_time"], 3)
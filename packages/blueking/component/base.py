@@ -11,12 +11,14 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import time
 import logging
 
 import ujson as json
 
 from .exceptions import ComponentAPIException
-from .conf import COMPONENT_SYSTEM_HOST
+from .conf import COMPONENT_SYSTEM_HOST, CLIENT_SLOW_REQUEST_SECONDS
+from .metrics import latency_stats
 
 
 logger = logging.getLogger('component')
@@ -78,13 +80,20 @@ class ComponentAPI(object):
                 raise ComponentAPIException(self, 'Request parameter error (please pass in a dict or json string)')
 
         # Request remote server
+        start = time.time()
         try:
             resp = self.client.request(self.method, self.url, params=params, data=data)
         except Exception as e:
+            latency_stats.record(self.method, self.path, time.time() - start, success=False)
             logger.exception('Error occurred when requesting method=%s url=%s',
                              self.method, self.url)
             raise ComponentAPIException(self, 'Request component error, Exception: %s' % str(e))
 
+        elapsed = time.time() - start
+        latency_stats.record(self.method, self.path, elapsed, success=resp.status_code == self.HTTP_STATUS_OK)
+        if elapsed >= CLIENT_SLOW_REQUEST_SECONDS:
+            logger.warning('Slow component request method=%s url=%s, took %.3fs', self.method, self.url, elapsed)
+
         # Parse result
         if resp.status_code != self.HTTP_STATUS_OK:
             message = 'Request component error, status_code: %s' % resp.status_code
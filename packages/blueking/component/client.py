@@ -23,6 +23,7 @@ import requests
 
 from . import conf
 from . import collections
+from . import session
 from .utils import get_signature
 
 # shutdown urllib3's warning
@@ -109,8 +110,8 @@ class BaseComponentClient(object):
 
         params, data = self.merge_params_data_with_common_args(method, params, data, enable_app_secret=True)
         logger.debug('Calling %s %s with params=%s, data=%s, headers=%s', method, url, params, data, headers)
-        return requests.request(method, url, params=params, data=data, verify=False,
-                                headers=headers, **kwargs)
+        return session.request(method, url, params=params, data=data, verify=False,
+                               headers=headers, **kwargs)
 
     def __getattr__(self, key):
         if key not in self.available_collections:
@@ -148,8 +149,8 @@ class ComponentClientWithSignature(BaseComponentClient):
         params['bk_signature'] = get_signature(method, url_path, self.app_secret, params=params, data=data)
 
         logger.debug('Calling %s %s with params=%s, data=%s', method, url, params, data)
-        return requests.request(method, url, params=params, data=data, verify=False,
-                                headers=headers, **kwargs)
+        return session.request(method, url, params=params, data=data, verify=False,
+                               headers=headers, **kwargs)
 
 
 # 根据是否开启signature来判断使用的Client版本
@@ -18,10 +18,23 @@ try:
     SECRET_KEY = settings.APP_TOKEN
     COMPONENT_SYSTEM_HOST = settings.BK_PAAS_INNER_HOST
     DEFAULT_BK_API_VER = getattr(settings, 'DEFAULT_BK_API_VER', 'v2')
+    # 进程内复用的连接池配置，POOL_MAXSIZE 需要不小于同时发起请求的线程数
+    CLIENT_POOL_ENABLED = getattr(settings, 'COMPONENT_CLIENT_POOL_ENABLED', True)
+    CLIENT_POOL_CONNECTIONS = getattr(settings, 'COMPONENT_CLIENT_POOL_CONNECTIONS', 10)
+    CLIENT_POOL_MAXSIZE = getattr(settings, 'COMPONENT_CLIENT_POOL_MAXSIZE', 32)
+    # 耗时超过该值（秒）的请求会被记录到日志中
+    CLIENT_SLOW_REQUEST_SECONDS = getattr(settings, 'COMPONENT_CLIENT_SLOW_REQUEST_SECONDS', 3)
+    # 每隔该时间（秒）将进程内各接口的耗时统计写入日志并清空，为 0 时不输出
+    CLIENT_STATS_LOG_INTERVAL = getattr(settings, 'COMPONENT_CLIENT_STATS_LOG_INTERVAL', 300)
 except Exception:
     APP_CODE = ''
     SECRET_KEY = ''
     COMPONENT_SYSTEM_HOST = ''
     DEFAULT_BK_API_VER = 'v2'
+    CLIENT_POOL_ENABLED = True
+    CLIENT_POOL_CONNECTIONS = 10
+    CLIENT_POOL_MAXSIZE = 32
+    CLIENT_SLOW_REQUEST_SECONDS = 3
+    CLIENT_STATS_LOG_INTERVAL = 300
 
 CLIENT_ENABLE_SIGNATURE = False
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import logging
+import threading
+import time
+
+from .conf import CLIENT_STATS_LOG_INTERVAL
+
+logger = logging.getLogger('component')
+
+
+class LatencyStats(object):
+    """Latency stats of component APIs called in current process
+
+    Stats are written to log and reset every `log_interval` seconds, set `log_interval` to 0 to disable it
+    """
+
+    def __init__(self, log_interval=CLIENT_STATS_LOG_INTERVAL):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.log_interval = log_interval
+        self._last_log_at = time.time()
+
+    def record(self, method, path, elapsed, success=True):
+        """record an API call
+
+        :param str method: http method
+        :param str path: API path, without host and api version
+        :param float elapsed: seconds used
+        :param bool success: whether response is got with status code 200
+        """
+        with self._lock:
+            stat = self._stats.get((method, path))
+            if stat is None:
+                stat = self._stats[(method, path)] = {'count': 0, 'error': 0, 'total': 0.0, 'max': 0.0}
+            stat['count'] += 1
+            stat['total'] += elapsed
+            stat['max'] = max(stat['max'], elapsed)
+            if not success:
+                stat['error'] += 1
+
+            now = time.time()
+            if not self.log_interval or now - self._last_log_at < self.log_interval:
+                return
+            self._last_log_at = now
+            stats, self._stats = self._stats, {}
+
+        self.log(stats)
+
+    def snapshot(self, reset=False):
+        """get stats of every API
+
+        :param bool reset: whether clear stats after get
+        :return: {(method, path): {'count': 1, 'error': 0, 'total': 0.1, 'max': 0.1, 'avg': 0.1}}
+        """
+        with self._lock:
+            stats = {key: dict(stat, avg=stat['total'] / stat['count']) for key, stat in self._stats.items()}
+            if reset:
+                self._stats = {}
+        return stats
+
+    @staticmethod
+    def log(stats):
+        """write stats of every API to log
+
+        :param dict stats: {(method, path): {'count': 1, 'error': 0, 'total': 0.1, 'max': 0.1}}
+        """
+        for (method, path), stat in sorted(stats.items()):
+            logger.info(
+                'Component latency stats method=%s path=%s count=%s error=%s avg=%.3fs max=%.3fs',
+                method, path, stat['count'], stat['error'], stat['total'] / stat['count'], stat['max']
+            )
+
+
+latency_stats = LatencyStats()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import conf
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+def new_session():
+    """create a session with connection pool sized by settings
+    """
+    session = requests.Session()
+    # session is shared by all users in process, never keep cookies returned by components
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=conf.CLIENT_POOL_CONNECTIONS, pool_maxsize=conf.CLIENT_POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """get the session of current process, connections are kept alive and reused between requests
+
+    A new session is created after fork (e.g. celery prefork worker), because sockets in the pool of
+    parent process can not be shared with child processes.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = new_session()
+                _session_pid = pid
+    return _session
+
+
+def request(method, url, **kwargs):
+    if not conf.CLIENT_POOL_ENABLED:
+        return requests.request(method, url, **kwargs)
+    return get_session().request(method, url, **kwargs)
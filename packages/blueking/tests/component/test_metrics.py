@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from mock import MagicMock, patch
+
+from django.test import TestCase
+
+from packages.blueking.component.metrics import LatencyStats
+
+
+class LatencyStatsTestCase(TestCase):
+    def test_snapshot(self):
+        stats = LatencyStats(log_interval=0)
+        stats.record("GET", "/a/", 0.1)
+        stats.record("GET", "/a/", 0.3, success=False)
+
+        snapshot = stats.snapshot(reset=True)
+
+        self.assertEqual(snapshot[("GET", "/a/")]["count"], 2)
+        self.assertEqual(snapshot[("GET", "/a/")]["error"], 1)
+        self.assertAlmostEqual(snapshot[("GET", "/a/")]["max"], 0.3)
+        self.assertAlmostEqual(snapshot[("GET", "/a/")]["avg"], 0.2)
+        self.assertEqual(stats.snapshot(), {})
+
+    def test_record__log_disabled(self):
+        stats = LatencyStats(log_interval=0)
+        stats._last_log_at = 0
+
+        with patch("packages.blueking.component.metrics.logger") as logger:
+            stats.record("GET", "/a/", 0.1)
+
+        logger.info.assert_not_called()
+        self.assertEqual(stats.snapshot()[("GET", "/a/")]["count"], 1)
+
+    def test_record__log_in_interval(self):
+        stats = LatencyStats(log_interval=60)
+
+        with patch("packages.blueking.component.metrics.logger") as logger:
+            stats.record("GET", "/a/", 0.1)
+
+        logger.info.assert_not_called()
+        self.assertEqual(stats.snapshot()[("GET", "/a/")]["count"], 1)
+
+    def test_record__log_and_reset_after_interval(self):
+        stats = LatencyStats(log_interval=60)
+        stats.record("POST", "/b/", 0.2)
+        stats._last_log_at -= 61
+
+        with patch("packages.blueking.component.metrics.logger", MagicMock()) as logger:
+            stats.record("GET", "/a/", 0.1, success=False)
+
+        self.assertEqual(logger.info.call_count, 2)
+        self.assertEqual(logger.info.call_args_list[0][0][1:4], ("GET", "/a/", 1))
+        self.assertEqual(logger.info.call_args_list[1][0][1:4], ("POST", "/b/", 1))
+        self.assertEqual(stats.snapshot(), {})
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from http.client import HTTPMessage
+
+import requests
+from mock import MagicMock, patch
+from requests.cookies import extract_cookies_to_jar
+
+from django.test import TestCase
+
+from packages.blueking.component import session
+from packages.blueking.component.base import ComponentAPI
+from packages.blueking.component.client import BaseComponentClient
+from packages.blueking.component.exceptions import ComponentAPIException
+from packages.blueking.component.metrics import LatencyStats
+
+
+class GetSessionTestCase(TestCase):
+    def setUp(self):
+        session._session = None
+        session._session_pid = None
+
+    def tearDown(self):
+        session._session = None
+        session._session_pid = None
+
+    def test_get_session__reuse_in_same_process(self):
+        with patch("packages.blueking.component.session.os.getpid", MagicMock(return_value=100)):
+            first = session.get_session()
+            second = session.get_session()
+
+        self.assertIs(first, second)
+
+    def test_get_session__renew_after_fork(self):
+        with patch("packages.blueking.component.session.os.getpid", MagicMock(return_value=100)):
+            parent = session.get_session()
+        with patch("packages.blueking.component.session.os.getpid", MagicMock(return_value=101)):
+            child = session.get_session()
+            child_again = session.get_session()
+
+        self.assertIsNot(parent, child)
+        self.assertIs(child, child_again)
+
+    def test_new_session__pool_size_from_conf(self):
+        with patch("packages.blueking.component.session.conf.CLIENT_POOL_CONNECTIONS", 3):
+            with patch("packages.blueking.component.session.conf.CLIENT_POOL_MAXSIZE", 7):
+                s = session.new_session()
+
+        for prefix in ("http://", "https://"):
+            adapter = s.get_adapter("%sexample.com" % prefix)
+            self.assertEqual(adapter._pool_connections, 3)
+            self.assertEqual(adapter._pool_maxsize, 7)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 7)
+
+    def test_new_session__refuse_cookies(self):
+        s = session.new_session()
+        headers = HTTPMessage()
+        headers["Set-Cookie"] = "bk_token=token; Path=/"
+        response = MagicMock()
+        response._original_response.msg = headers
+
+        extract_cookies_to_jar(s.cookies, requests.Request("GET", "http://example.com/").prepare(), response)
+
+        self.assertEqual(len(s.cookies), 0)
+
+    def test_request__pool_disabled(self):
+        with patch("packages.blueking.component.session.conf.CLIENT_POOL_ENABLED", False):
+            with patch("packages.blueking.component.session.requests.request", MagicMock(return_value="resp")) as r:
+                with patch("packages.blueking.component.session.get_session") as get_session:
+                    self.assertEqual(session.request("GET", "http://example.com", params={"a": 1}), "resp")
+
+        r.assert_called_once_with("GET", "http://example.com", params={"a": 1})
+        get_session.assert_not_called()
+
+
+class ComponentClientRequestTestCase(TestCase):
+    def setUp(self):
+        self.shared_session = MagicMock()
+        self.get_session_patcher = patch(
+            "packages.blueking.component.session.get_session", MagicMock(return_value=self.shared_session)
+        )
+        self.pool_enabled_patcher = patch("packages.blueking.component.session.conf.CLIENT_POOL_ENABLED", True)
+        self.latency_stats = LatencyStats(log_interval=0)
+        self.latency_stats_patcher = patch("packages.blueking.component.base.latency_stats", self.latency_stats)
+        self.get_session_patcher.start()
+        self.pool_enabled_patcher.start()
+        self.latency_stats_patcher.start()
+
+        self.client = BaseComponentClient(app_code="app_code", app_secret="app_secret", language="en")
+        self.api = ComponentAPI(client=self.client, method="GET", path="/api/c/compapi{bk_api_ver}/cc/get_biz/")
+
+    def tearDown(self):
+        self.get_session_patcher.stop()
+        self.pool_enabled_patcher.stop()
+        self.latency_stats_patcher.stop()
+
+    def test_request__use_shared_session(self):
+        self.shared_session.request.return_value = "resp"
+
+        resp = self.client.request("GET", "http://example.com/api/", params={"a": 1})
+
+        self.assertEqual(resp, "resp")
+        self.shared_session.request.assert_called_once()
+        args, kwargs = self.shared_session.request.call_args
+        self.assertEqual(args, ("GET", "http://example.com/api/"))
+        self.assertEqual(kwargs["params"]["a"], 1)
+        self.assertEqual(kwargs["params"]["bk_app_code"], "app_code")
+        self.assertFalse(kwargs["verify"])
+
+    def test_call__record_latency_on_success(self):
+        self.shared_session.request.return_value = MagicMock(
+            status_code=200, json=MagicMock(return_value={"result": True, "data": 1})
+        )
+
+        self.assertEqual(self.api(), {"result": True, "data": 1})
+
+        stat = self.latency_stats.snapshot()[("GET", "/api/c/compapi{bk_api_ver}/cc/get_biz/")]
+        self.assertEqual(stat["count"], 1)
+        self.assertEqual(stat["error"], 0)
+
+    def test_call__record_latency_on_status_error(self):
+        self.shared_session.request.return_value = MagicMock(
+            status_code=502, text="bad gateway", json=MagicMock(side_effect=ValueError)
+        )
+
+        self.assertFalse(self.api()["result"])
+
+        stat = self.latency_stats.snapshot()[("GET", "/api/c/compapi{bk_api_ver}/cc/get_biz/")]
+        self.assertEqual(stat["count"], 1)
+        self.assertEqual(stat["error"], 1)
+
+    def test_call__record_latency_on_exception(self):
+        self.shared_session.request.side_effect = Exception("connection refused")
+
+        self.assertRaises(ComponentAPIException, self.api._call)
+
+        stat = self.latency_stats.snapshot()[("GET", "/api/c/compapi{bk_api_ver}/cc/get_biz/")]
+        self.assertEqual(stat["count"], 1)
+        self.assertEqual(stat["error"], 1)
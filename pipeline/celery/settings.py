@@ -30,6 +30,10 @@ SCHEDULE_DEFAULT_ROUTING_KEY = "schedule_service_priority"
 ADDITIONAL_DEFAULT_QUEUE_NAME = "pipeline_additional_task_priority"
 ADDITIONAL_DEFAULT_ROUTING_KEY = "additional_task_priority"
 
+# 统计数据采集会持续消费待采集队列，使用独立队列避免阻塞其他事件
+STATISTICS_DEFAULT_QUEUE_NAME = "pipeline_statistics_priority"
+STATISTICS_DEFAULT_ROUTING_KEY = "statistics_priority"
+
 SCALABLE_QUEUES_CONFIG = {
     PISH_DEFAULT_QUEUE_NAME: {"name": PISH_DEFAULT_QUEUE_NAME, "routing_key": PUSH_DEFAULT_ROUTING_KEY},
     SCHEDULE_DEFAULT_QUEUE_NAME: {"name": SCHEDULE_DEFAULT_QUEUE_NAME, "routing_key": SCHEDULE_DEFAULT_ROUTING_KEY},
@@ -44,9 +48,15 @@ PIPELINE_ADDITIONAL_PRIORITY_ROUTING = {
     "routing_key": ADDITIONAL_DEFAULT_ROUTING_KEY,
 }
 
+PIPELINE_STATISTICS_PRIORITY_ROUTING = {
+    "queue": STATISTICS_DEFAULT_QUEUE_NAME,
+    "routing_key": STATISTICS_DEFAULT_ROUTING_KEY,
+}
+
 CELERY_ROUTES = {
     # schedule
     "pipeline.engine.tasks.service_schedule": PIPELINE_SCHEDULE_PRIORITY_ROUTING,
+    "pipeline.engine.tasks.service_schedule_batch": PIPELINE_SCHEDULE_PRIORITY_ROUTING,
     # pipeline
     "pipeline.engine.tasks.batch_wake_up": PIPELINE_PRIORITY_ROUTING,
     "pipeline.engine.tasks.dispatch": PIPELINE_PRIORITY_ROUTING,
@@ -60,6 +70,8 @@ CELERY_ROUTES = {
     "pipeline.engine.tasks.node_timeout_check": PIPELINE_ADDITIONAL_PRIORITY_ROUTING,
     "pipeline.contrib.periodic_task.tasks.periodic_task_start": PIPELINE_ADDITIONAL_PRIORITY_ROUTING,
     "pipeline.engine.tasks.heal_zombie_process": PIPELINE_ADDITIONAL_PRIORITY_ROUTING,
+    # statistics
+    "pipeline.contrib.statistics.tasks.collect_statistics": PIPELINE_STATISTICS_PRIORITY_ROUTING,
 }
 
 
@@ -139,6 +151,12 @@ CELERY_QUEUES = (
         routing_key=ADDITIONAL_DEFAULT_ROUTING_KEY,
         queue_arguments={"x-max-priority": PIPELINE_MAX_PRIORITY},
     ),
+    Queue(
+        STATISTICS_DEFAULT_QUEUE_NAME,
+        default_exchange,
+        routing_key=STATISTICS_DEFAULT_ROUTING_KEY,
+        queue_arguments={"x-max-priority": PIPELINE_MAX_PRIORITY},
+    ),
 )
 
 CELERY_DEFAULT_QUEUE = "default"
@@ -15,7 +15,6 @@ import copy
 
 from pipeline.core.data.expression import ConstantTemplate, deformat_constant_key
 from pipeline.exceptions import ConstantNotExistException, ConstantReferenceException
-from pipeline.utils.graph import Graph
 
 
 class ConstantPool(object):
@@ -32,48 +31,56 @@ class ConstantPool(object):
 
         refs = self.get_reference_info()
 
-        nodes = list(refs.keys())
-        flows = []
-        for node in nodes:
-            for ref in refs[node]:
-                if ref in nodes:
-                    flows.append([node, ref])
-        graph = Graph(nodes, flows)
-        # circle reference check
-        trace = graph.get_cycle()
-        if trace:
-            raise ConstantReferenceException("Exist circle reference between constants: %s" % "->".join(trace))
-
-        # resolve the constants reference
+        # resolve the constants reference, constants are resolved after all constants they refer
         pool = {}
         temp_pool = copy.deepcopy(self.raw_pool)
-        # get those constants which are referenced only(not refer other constants)
-        referenced_only = ConstantPool._get_referenced_only(temp_pool)
-        while temp_pool:
-            for ref in referenced_only:
-                value = temp_pool[ref]["value"]
-
-                # resolve those constants which reference the 'ref'
-                for key, info in list(temp_pool.items()):
-                    maps = {deformat_constant_key(ref): value}
-                    temp_pool[key]["value"] = ConstantTemplate(info["value"]).resolve_data(maps)
-
-                pool[ref] = temp_pool[ref]
-                temp_pool.pop(ref)
-            referenced_only = ConstantPool._get_referenced_only(temp_pool)
+        for key in ConstantPool._resolve_order(refs):
+            info = temp_pool[key]
+            if refs[key]:
+                maps = {deformat_constant_key(ref): pool[ref]["value"] for ref in refs[key]}
+                info["value"] = ConstantTemplate(info["value"]).resolve_data(maps)
+            pool[key] = info
 
         self.pool = pool
 
     @staticmethod
-    def _get_referenced_only(pool):
-        referenced_only = []
-        for key, info in list(pool.items()):
-            reference = ConstantTemplate(info["value"]).get_reference()
-            formatted_reference = ["${%s}" % ref for ref in reference]
-            reference = [c for c in formatted_reference if c in pool]
-            if not reference:
-                referenced_only.append(key)
-        return referenced_only
+    def _resolve_order(refs):
+        """
+        按引用关系对常量进行拓扑排序，被引用的常量排在引用它的常量之前，同时检查循环引用
+        :param refs: get_reference_info 返回的常量引用信息
+        :return: 排序后的常量列表
+        """
+        order = []
+        # constants which all references have been sorted
+        sorted_keys = set()
+        for key in refs:
+            if key in sorted_keys:
+                continue
+
+            # iterative depth first search, path keep the constants on the current search path
+            path = [key]
+            on_path = {key}
+            stack = [iter(refs[key])]
+            while stack:
+                for ref in stack[-1]:
+                    if ref in on_path:
+                        trace = path[path.index(ref) :] + [ref]
+                        raise ConstantReferenceException(
+                            "Exist circle reference between constants: %s" % "->".join(trace)
+                        )
+                    if ref not in sorted_keys:
+                        path.append(ref)
+                        on_path.add(ref)
+                        stack.append(iter(refs[ref]))
+                        break
+                else:
+                    stack.pop()
+                    finished = path.pop()
+                    on_path.discard(finished)
+                    sorted_keys.add(finished)
+                    order.append(finished)
+
+        return order
 
     def get_reference_info(self, strict=True):
         refs = {}
@@ -94,3 +94,63 @@ ENGINE_ZOMBIE_PROCESS_DOCTORS = getattr(settings, "ENGINE_ZOMBIE_PROCESS_DOCTORS
 ENGINE_ZOMBIE_PROCESS_HEAL_CRON = getattr(
     settings, "ENGINE_ZOMBIE_PROCESS_HEAL_CRON", {"minute": "*/10"}
 )
+
+# 节点状态戳配置，开启后 run_loop 只在状态戳变化时才会查询 DB 进行休眠及冻结检测（依赖 REDIS 配置）
+PIPELINE_ENGINE_STATE_STAMP_ENABLED = getattr(settings, "PIPELINE_ENGINE_STATE_STAMP_ENABLED", False)
+PIPELINE_ENGINE_STATE_STAMP_EXPIRE_SECONDS = int(
+    getattr(settings, "PIPELINE_ENGINE_STATE_STAMP_EXPIRE_SECONDS", 60 * 60 * 24)
+)
+
+# 节点状态交接配置，开启后节点完成状态的写入会推迟到下一个节点开始执行时，与下一个节点的状态创建及关系建立合并到同一个事务中
+PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED = getattr(settings, "PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED", False)
+
+# 是否继续维护节点关系闭包表（NodeRelationship），关闭后状态树只通过 Status 上的父节点及根节点字段查询
+PIPELINE_ENGINE_CLOSURE_RELATIONSHIP_ENABLED = getattr(settings, "PIPELINE_ENGINE_CLOSURE_RELATIONSHIP_ENABLED", True)
+
+# 变量模板编译结果及引用解析结果的 LRU 缓存大小
+PIPELINE_TEMPLATE_CACHE_SIZE = int(getattr(settings, "PIPELINE_TEMPLATE_CACHE_SIZE", 4096))
+
+# 引擎运行时数据（IOField 及 REDIS 数据后端）的编码配置
+# 可选编码器：pickle、zlib、zstd（依赖 zstandard）、lz4（依赖 lz4），新增编码器的数据带有头部字节，旧数据仍然可以解码
+PIPELINE_DATA_CODEC = getattr(settings, "PIPELINE_DATA_CODEC", "zlib")
+PIPELINE_DATA_BACKEND_CODEC = getattr(settings, "PIPELINE_DATA_BACKEND_CODEC", "pickle")
+# 压缩等级，为 None 时使用编码器的默认等级
+PIPELINE_DATA_COMPRESS_LEVEL = getattr(settings, "PIPELINE_DATA_COMPRESS_LEVEL", None)
+# pickle 协议版本，为 None 时使用 pickle.DEFAULT_PROTOCOL，协议 5 需要 Python 3.8 以上版本，低于 2 的版本会按 2 写入
+PIPELINE_DATA_PICKLE_PROTOCOL = getattr(settings, "PIPELINE_DATA_PICKLE_PROTOCOL", None)
+
+# 是否将进程快照拆分为流程结构及运行时状态分别存储，相同的流程结构只存储一次，每次保存只写入运行时状态
+# 开启后写入的快照无法被未支持该格式的版本读取
+PIPELINE_ENGINE_SNAPSHOT_DELTA_ENABLED = getattr(settings, "PIPELINE_ENGINE_SNAPSHOT_DELTA_ENABLED", False)
+# 进程内缓存的流程结构数量
+PIPELINE_ENGINE_SNAPSHOT_STRUCTURE_CACHE_SIZE = int(
+    getattr(settings, "PIPELINE_ENGINE_SNAPSHOT_STRUCTURE_CACHE_SIZE", 32)
+)
+# 未被快照引用的流程结构的保留时间及清理周期
+PIPELINE_ENGINE_SNAPSHOT_STRUCTURE_EXPIRE_SECONDS = int(
+    getattr(settings, "PIPELINE_ENGINE_SNAPSHOT_STRUCTURE_EXPIRE_SECONDS", 60 * 60 * 24)
+)
+ENGINE_SNAPSHOT_STRUCTURE_CLEAN_CRON = getattr(
+    settings, "ENGINE_SNAPSHOT_STRUCTURE_CLEAN_CRON", {"minute": "0", "hour": "*/6"}
+)
+
+# 是否由独立的调度轮询进程（python manage.py schedule_poller）分发到期的轮询调度，而不是为每次调度发送延时任务
+# 开启后必须启动调度轮询进程，关闭前需要保证已经没有 schedule_date 不为空的调度
+PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED = getattr(settings, "PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED", False)
+# 调度轮询进程查询到期调度的间隔（秒）及每次认领的最大调度数量
+PIPELINE_ENGINE_SCHEDULE_POLLER_INTERVAL = float(getattr(settings, "PIPELINE_ENGINE_SCHEDULE_POLLER_INTERVAL", 1))
+PIPELINE_ENGINE_SCHEDULE_POLLER_BATCH_SIZE = int(getattr(settings, "PIPELINE_ENGINE_SCHEDULE_POLLER_BATCH_SIZE", 1000))
+# 调度被认领后未被执行时，再次认领前等待的时间（秒）
+PIPELINE_ENGINE_SCHEDULE_POLLER_LEASE = int(getattr(settings, "PIPELINE_ENGINE_SCHEDULE_POLLER_LEASE", 60))
+# 合并键相同的轮询调度每次合并调用 schedule_batch 的最大节点数量
+PIPELINE_ENGINE_SCHEDULE_BATCH_MAX_SIZE = int(getattr(settings, "PIPELINE_ENGINE_SCHEDULE_BATCH_MAX_SIZE", 100))
+
+# 统计日汇总表的维度获取函数路径，函数接收 PipelineInstance 对象，返回维度字典（project_id、category、create_method）
+# 返回 None 时实例不计入汇总，为空时不维护日汇总表
+PIPELINE_STATISTICS_INSTANCE_DIMENSIONS = getattr(settings, "PIPELINE_STATISTICS_INSTANCE_DIMENSIONS", "")
+
+# 是否在后台周期任务中批量采集流程模板及实例的统计数据，关闭时在模板及实例保存时同步采集
+PIPELINE_STATISTICS_COLLECT_ASYNC = getattr(settings, "PIPELINE_STATISTICS_COLLECT_ASYNC", True)
+# 后台采集统计数据的周期任务执行周期及每批采集的对象数量
+PIPELINE_STATISTICS_COLLECT_CRON = getattr(settings, "PIPELINE_STATISTICS_COLLECT_CRON", {"minute": "*"})
+PIPELINE_STATISTICS_COLLECT_BATCH_SIZE = int(getattr(settings, "PIPELINE_STATISTICS_COLLECT_BATCH_SIZE", 200))
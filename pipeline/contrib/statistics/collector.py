@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import logging
+from collections import OrderedDict
+from copy import deepcopy
+
+import ujson as json
+from django.db import transaction
+
+from pipeline.component_framework.constants import LEGACY_PLUGINS_VERSION
+from pipeline.conf import settings
+from pipeline.contrib.statistics.models import (
+    ComponentExecuteData,
+    ComponentInTemplate,
+    InstanceInPipeline,
+    PendingStatistics,
+    TemplateInPipeline,
+)
+from pipeline.contrib.statistics.rollup import refresh_instance_rollup
+from pipeline.core.constants import PE
+from pipeline.engine import states
+from pipeline.engine.api import get_activity_histories, get_status_trees
+from pipeline.engine.models import History
+from pipeline.engine.utils import calculate_elapsed_time
+from pipeline.models import PipelineInstance, PipelineTemplate
+
+logger = logging.getLogger("root")
+
+
+def count_pipeline_tree_nodes(pipeline_tree):
+    gateways_total = len(pipeline_tree["gateways"])
+    activities = pipeline_tree["activities"]
+    atom_total = len([act for act in activities.values() if act["type"] == PE.ServiceActivity])
+    subprocess_total = len([act for act in activities.values() if act["type"] == PE.SubProcess])
+    return atom_total, subprocess_total, gateways_total
+
+
+def recursive_collect_components(activities, status_tree, instance_id, stack=None, histories=None):
+    """
+    @summary 递归流程树，获取所有执行成功/失败的插件
+    @param activities: 当前流程树的任务节点信息
+    @param status_tree: 当前流程树的任务节点状态
+    @param instance_id: 根流程的示例 instance_id
+    @param stack: 子流程堆栈
+    @param histories: 重试节点的执行历史 {node_id: [history]}，为 None 时逐个节点查询
+    """
+    if stack is None:
+        stack = []
+        is_sub = False
+    else:
+        is_sub = True
+    component_list = []
+    for act_id, act in activities.items():
+        # 只有执行了才会查询到 status，兼容中途撤销的任务
+        if act_id in status_tree:
+            exec_act = status_tree[act_id]
+            # 属于标准插件节点
+            if act[PE.type] == PE.ServiceActivity:
+                if exec_act["state"] in states.ARCHIVED_STATES:
+                    create_kwargs = {
+                        "component_code": act["component"]["code"],
+                        "instance_id": instance_id,
+                        "is_sub": is_sub,
+                        "node_id": act_id,
+                        "subprocess_stack": json.dumps(stack),
+                        "started_time": exec_act["started_time"],
+                        "archived_time": exec_act["archived_time"],
+                        "elapsed_time": exec_act["elapsed_time"],
+                        "is_skip": exec_act["skip"],
+                        "is_retry": False,
+                        "status": exec_act["state"] == "FINISHED",
+                        "version": act["component"].get("version", LEGACY_PLUGINS_VERSION),
+                    }
+                    component_list.append(ComponentExecuteData(**create_kwargs))
+                    if exec_act["retry"] > 0:
+                        # 需要通过执行历史获得
+                        if histories is None:
+                            history_list = get_activity_histories(act_id)
+                        else:
+                            history_list = histories.get(act_id, [])
+                        for history in history_list:
+                            create_kwargs.update(
+                                {
+                                    "started_time": history["started_time"],
+                                    "archived_time": history["archived_time"],
+                                    "elapsed_time": history["elapsed_time"],
+                                    "is_retry": True,
+                                    "is_skip": False,
+                                    "status": False,
+                                }
+                            )
+                            component_list.append(ComponentExecuteData(**create_kwargs))
+            # 子流程的执行堆栈（子流程的执行过程）
+            elif act[PE.type] == PE.SubProcess:
+                # 递归子流程树
+                sub_activities = act[PE.pipeline][PE.activities]
+                # 防止stack共用
+                copied_stack = deepcopy(stack)
+                copied_stack.insert(0, act_id)
+                component_list += recursive_collect_components(
+                    sub_activities, exec_act["children"], instance_id, copied_stack, histories
+                )
+    return component_list
+
+
+def get_retried_histories(status_trees):
+    """
+    一次查询出状态树中所有重试过的节点的执行历史
+    :param status_trees: 状态树列表
+    :return: {node_id: [{"started_time": ..., "archived_time": ..., "elapsed_time": ...}]}
+    """
+    node_ids = []
+    stack = list(status_trees)
+    while stack:
+        status = stack.pop()
+        if status.get("retry"):
+            node_ids.append(status["id"])
+        stack.extend(status["children"].values())
+
+    histories = {}
+    if not node_ids:
+        return histories
+
+    history_qs = (
+        History.objects.filter(identifier__in=node_ids)
+        .order_by("started_time")
+        .values("identifier", "started_time", "archived_time")
+    )
+    for history in history_qs:
+        history["elapsed_time"] = calculate_elapsed_time(history["started_time"], history["archived_time"])
+        histories.setdefault(history.pop("identifier"), []).append(history)
+    return histories
+
+
+def _save_node_totals(model, id_field, totals):
+    """
+    保存流程中的标准插件个数，子流程个数，网关个数，只更新发生了变化的记录
+    :param model: TemplateInPipeline 或 InstanceInPipeline
+    :param id_field: 模板或实例 ID 字段名
+    :param totals: {object_id: (atom_total, subprocess_total, gateways_total)}
+    """
+    fields = ("atom_total", "subprocess_total", "gateways_total")
+    existing = {}
+    for row in model.objects.filter(**{"{}__in".format(id_field): list(totals.keys())}).values(id_field, *fields):
+        existing[row[id_field]] = tuple(row[field] for field in fields)
+
+    new_objects = []
+    for object_id, values in totals.items():
+        if object_id not in existing:
+            new_objects.append(model(**dict(zip(fields, values), **{id_field: object_id})))
+        elif existing[object_id] != values:
+            model.objects.filter(**{id_field: object_id}).update(**dict(zip(fields, values)))
+    model.objects.bulk_create(new_objects)
+
+
+def _template_components(template_id, data, sub_components):
+    """
+    统计模板中直接及通过子流程间接引用的标准插件
+    :param template_id: 模板 ID
+    :param data: 模板流程树
+    :param sub_components: 子流程引用的标准插件 {template_id: [component]}
+    :return: ComponentInTemplate 列表
+    """
+    components_of_template = []
+    # 任务节点引用标准插件统计（包含间接通过子流程引用）
+    for act_id, act in data[PE.activities].items():
+        # 标准插件节点直接引用
+        if act["type"] == PE.ServiceActivity:
+            component = ComponentInTemplate(
+                component_code=act["component"]["code"],
+                template_id=template_id,
+                node_id=act_id,
+                version=act["component"].get("version", LEGACY_PLUGINS_VERSION),
+            )
+            components_of_template.append(component)
+        # 子流程节点间接引用
+        else:
+            for component_sub in sub_components.get(act["template_id"], []):
+                # 子流程的执行堆栈（子流程的执行过程）
+                stack = json.loads(component_sub["subprocess_stack"])
+                # 添加节点id
+                stack.insert(0, act_id)
+                component = ComponentInTemplate(
+                    component_code=component_sub["component_code"],
+                    template_id=template_id,
+                    node_id=component_sub["node_id"],
+                    is_sub=True,
+                    subprocess_stack=json.dumps(stack),
+                    version=component_sub["version"],
+                )
+                components_of_template.append(component)
+    return components_of_template
+
+
+def collect_template_statistics(templates):
+    """
+    采集模板引用的标准插件及模板的节点个数
+    :param templates: PipelineTemplate 列表，同一批中被引用的子流程需要排在引用它的模板之前
+    """
+    template_data = OrderedDict()
+    sub_template_ids = set()
+    for template in templates:
+        try:
+            data = template.data
+            sub_template_ids.update(
+                act["template_id"] for act in data[PE.activities].values() if act["type"] != PE.ServiceActivity
+            )
+        except Exception:
+            logger.exception("collect template statistics[template_id=%s] raise error" % template.template_id)
+            continue
+        template_data[template.template_id] = data
+    if not template_data:
+        return
+
+    # 一次查询出所有子流程引用的标准插件
+    sub_components = {}
+    sub_component_qs = ComponentInTemplate.objects.filter(template_id__in=sub_template_ids).values(
+        "template_id", "subprocess_stack", "component_code", "node_id", "version"
+    )
+    for component in sub_component_qs:
+        sub_components.setdefault(component.pop("template_id"), []).append(component)
+
+    component_list = []
+    totals = {}
+    for template_id, data in list(template_data.items()):
+        try:
+            components_of_template = _template_components(template_id, data, sub_components)
+            node_totals = count_pipeline_tree_nodes(data)
+        except Exception:
+            # 单个模板数据异常时跳过该模板，不影响同一批中的其他模板
+            logger.exception("collect template statistics[template_id=%s] raise error" % template_id)
+            template_data.pop(template_id)
+            continue
+
+        # 同一批中引用该模板的模板使用刚刚统计的数据
+        sub_components[template_id] = [
+            {
+                "subprocess_stack": component.subprocess_stack,
+                "component_code": component.component_code,
+                "node_id": component.node_id,
+                "version": component.version,
+            }
+            for component in components_of_template
+        ]
+        component_list += components_of_template
+        # 统计流程标准插件个数，子流程个数，网关个数
+        totals[template_id] = node_totals
+
+    # 删除原先该项模板数据（无论是更新还是创建，都需要重新创建统计数据）
+    with transaction.atomic():
+        ComponentInTemplate.objects.filter(template_id__in=list(template_data.keys())).delete()
+        ComponentInTemplate.objects.bulk_create(component_list)
+    _save_node_totals(TemplateInPipeline, "template_id", totals)
+
+
+def collect_instance_statistics(instances):
+    """
+    采集执行完成或撤销的实例的标准插件执行数据，以及所有实例的节点个数
+    :param instances: PipelineInstance 列表
+    """
+    executed = [instance for instance in instances if instance.is_finished or instance.is_revoked]
+    status_trees = get_status_trees([instance.instance_id for instance in executed], 99)
+    histories = get_retried_histories(status_trees.values())
+
+    component_list = []
+    for instance in executed:
+        instance_id = instance.instance_id
+        try:
+            status_tree = status_trees[instance_id]
+            component_list += recursive_collect_components(
+                instance.execution_data[PE.activities], status_tree["children"], instance_id, histories=histories
+            )
+        except Exception as e:
+            logger.error(
+                "collect ComponentExecuteData[instance_id={instance_id}] raise error: {error}".format(
+                    instance_id=instance_id, error=e
+                )
+            )
+
+    # 删除原有标准插件数据
+    with transaction.atomic():
+        ComponentExecuteData.objects.filter(instance_id__in=[instance.instance_id for instance in executed]).delete()
+        ComponentExecuteData.objects.bulk_create(component_list, batch_size=500)
+
+    # 更新日汇总表
+    for instance in executed:
+        try:
+            refresh_instance_rollup(instance)
+        except Exception as e:
+            logger.error(
+                "collect statistics refresh rollup[instance_id={instance_id}] raise error: {error}".format(
+                    instance_id=instance.instance_id, error=e
+                )
+            )
+
+    # 统计流程标准插件个数，子流程个数，网关个数
+    totals = {}
+    for instance in instances:
+        try:
+            totals[instance.instance_id] = count_pipeline_tree_nodes(instance.execution_data)
+        except Exception as e:
+            logger.error(
+                "collect InstanceInPipeline[instance_id={instance_id}] raise error: {error}".format(
+                    instance_id=instance.instance_id, error=e
+                )
+            )
+    _save_node_totals(InstanceInPipeline, "instance_id", totals)
+
+
+def _ordered_objects(queryset, id_field, object_ids):
+    objects = {getattr(obj, id_field): obj for obj in queryset.filter(**{"{}__in".format(id_field): object_ids})}
+    return [objects[object_id] for object_id in object_ids if object_id in objects]
+
+
+def collect_templates(template_ids):
+    """
+    :param template_ids: 模板 ID 列表，按模板保存的先后顺序排列
+    """
+    collect_template_statistics(
+        _ordered_objects(PipelineTemplate.objects.select_related("snapshot"), "template_id", template_ids)
+    )
+
+
+def collect_instances(instance_ids):
+    """
+    :param instance_ids: 实例 ID 列表
+    """
+    collect_instance_statistics(
+        _ordered_objects(PipelineInstance.objects.select_related("execution_snapshot"), "instance_id", instance_ids)
+    )
+
+
+def collect_pending_statistics(batch_size=None):
+    """
+    采集一批待采集的统计数据，同一对象的多条记录只采集一次
+    :param batch_size: 每批处理的待采集记录数量，默认为 PIPELINE_STATISTICS_COLLECT_BATCH_SIZE
+    :return: 本批处理的待采集记录数量
+    """
+    batch_size = batch_size or settings.PIPELINE_STATISTICS_COLLECT_BATCH_SIZE
+    pending = list(PendingStatistics.objects.order_by("id").values_list("id", "kind", "object_id")[:batch_size])
+    if not pending:
+        return 0
+
+    object_ids = {PendingStatistics.KIND_TEMPLATE: OrderedDict(), PendingStatistics.KIND_INSTANCE: OrderedDict()}
+    for _, kind, object_id in pending:
+        if kind in object_ids:
+            object_ids[kind][object_id] = None
+
+    # 采集失败时同样删除本批记录，避免同一批异常数据阻塞后续采集
+    for collect, kind in (
+        (collect_templates, PendingStatistics.KIND_TEMPLATE),
+        (collect_instances, PendingStatistics.KIND_INSTANCE),
+    ):
+        try:
+            collect(list(object_ids[kind].keys()))
+        except Exception:
+            logger.exception("collect pending statistics[kind=%s] raise error" % kind)
+
+    PendingStatistics.objects.filter(id__in=[pending_id for pending_id, _, _ in pending]).delete()
+    return len(pending)
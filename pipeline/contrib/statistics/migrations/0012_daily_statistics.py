@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 09:23
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("statistics", "0011_auto_20200217_0822"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ComponentExecuteDailyStatistics",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="实例创建日期")),
+                ("project_id", models.IntegerField(default=-1, verbose_name="项目ID")),
+                ("category", models.CharField(default="", max_length=255, verbose_name="任务类型")),
+                ("create_method", models.CharField(default="", max_length=30, verbose_name="创建方式")),
+                ("component_code", models.CharField(max_length=255, verbose_name="组件编码")),
+                ("execute_times", models.IntegerField(default=0, verbose_name="执行次数")),
+                ("failed_times", models.IntegerField(default=0, verbose_name="失败次数")),
+                ("elapsed_time_total", models.BigIntegerField(default=0, verbose_name="执行总耗时(s)")),
+                ("elapsed_time_count", models.IntegerField(default=0, verbose_name="有耗时的执行次数")),
+            ],
+            options={
+                "verbose_name": "Pipeline标准插件执行日汇总数据",
+                "verbose_name_plural": "Pipeline标准插件执行日汇总数据",
+            },
+        ),
+        migrations.CreateModel(
+            name="InstanceDailyStatistics",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="实例创建日期")),
+                ("project_id", models.IntegerField(default=-1, verbose_name="项目ID")),
+                ("category", models.CharField(default="", max_length=255, verbose_name="任务类型")),
+                ("create_method", models.CharField(default="", max_length=30, verbose_name="创建方式")),
+                ("instance_total", models.IntegerField(default=0, verbose_name="实例总数")),
+            ],
+            options={
+                "verbose_name": "Pipeline实例日汇总数据",
+                "verbose_name_plural": "Pipeline实例日汇总数据",
+            },
+        ),
+        migrations.CreateModel(
+            name="InstanceRollupRecord",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("instance_id", models.CharField(max_length=32, unique=True, verbose_name="实例ID")),
+                ("date", models.DateField(verbose_name="实例创建日期")),
+                ("project_id", models.IntegerField(default=-1, verbose_name="项目ID")),
+                ("category", models.CharField(default="", max_length=255, verbose_name="任务类型")),
+                ("create_method", models.CharField(default="", max_length=30, verbose_name="创建方式")),
+                (
+                    "components",
+                    models.TextField(
+                        default="{}", help_text="JSON 格式的字典", verbose_name="计入汇总的标准插件执行数据"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pipeline实例汇总记录",
+                "verbose_name_plural": "Pipeline实例汇总记录",
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name="instancedailystatistics",
+            unique_together=set([("date", "project_id", "category", "create_method")]),
+        ),
+        migrations.AlterUniqueTogether(
+            name="componentexecutedailystatistics",
+            unique_together=set([("date", "project_id", "category", "create_method", "component_code")]),
+        ),
+    ]
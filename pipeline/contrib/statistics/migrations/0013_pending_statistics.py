@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 09:29
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("statistics", "0012_daily_statistics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingStatistics",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("instance", "流程实例"), ("template", "流程模板")],
+                        max_length=16,
+                        verbose_name="对象类型",
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=32, verbose_name="对象ID")),
+                ("create_time", models.DateTimeField(auto_now_add=True, verbose_name="添加时间")),
+            ],
+            options={
+                "verbose_name": "Pipeline待采集统计数据",
+                "verbose_name_plural": "Pipeline待采集统计数据",
+            },
+        ),
+    ]
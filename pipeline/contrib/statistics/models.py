@@ -80,3 +80,85 @@ class InstanceInPipeline(models.Model):
 
     def __unicode__(self):
         return "{}_{}_{}_{}".format(self.instance_id, self.atom_total, self.subprocess_total, self.gateways_total)
+
+
+class InstanceDailyStatistics(models.Model):
+    date = models.DateField(_("实例创建日期"))
+    project_id = models.IntegerField(_("项目ID"), default=-1)
+    category = models.CharField(_("任务类型"), max_length=255, default="")
+    create_method = models.CharField(_("创建方式"), max_length=30, default="")
+    instance_total = models.IntegerField(_("实例总数"), default=0)
+
+    class Meta:
+        verbose_name = _("Pipeline实例日汇总数据")
+        verbose_name_plural = _("Pipeline实例日汇总数据")
+        unique_together = ("date", "project_id", "category", "create_method")
+
+    def __unicode__(self):
+        return "{}_{}_{}".format(self.date, self.project_id, self.instance_total)
+
+
+class ComponentExecuteDailyStatistics(models.Model):
+    date = models.DateField(_("实例创建日期"))
+    project_id = models.IntegerField(_("项目ID"), default=-1)
+    category = models.CharField(_("任务类型"), max_length=255, default="")
+    create_method = models.CharField(_("创建方式"), max_length=30, default="")
+    component_code = models.CharField(_("组件编码"), max_length=255)
+    execute_times = models.IntegerField(_("执行次数"), default=0)
+    failed_times = models.IntegerField(_("失败次数"), default=0)
+    elapsed_time_total = models.BigIntegerField(_("执行总耗时(s)"), default=0)
+    elapsed_time_count = models.IntegerField(_("有耗时的执行次数"), default=0)
+
+    class Meta:
+        verbose_name = _("Pipeline标准插件执行日汇总数据")
+        verbose_name_plural = _("Pipeline标准插件执行日汇总数据")
+        unique_together = ("date", "project_id", "category", "create_method", "component_code")
+
+    def __unicode__(self):
+        return "{}_{}_{}".format(self.date, self.component_code, self.execute_times)
+
+
+class InstanceRollupRecord(models.Model):
+    instance_id = models.CharField(_("实例ID"), max_length=32, unique=True)
+    date = models.DateField(_("实例创建日期"))
+    project_id = models.IntegerField(_("项目ID"), default=-1)
+    category = models.CharField(_("任务类型"), max_length=255, default="")
+    create_method = models.CharField(_("创建方式"), max_length=30, default="")
+    components = models.TextField(_("计入汇总的标准插件执行数据"), default="{}", help_text=_("JSON 格式的字典"))
+
+    class Meta:
+        verbose_name = _("Pipeline实例汇总记录")
+        verbose_name_plural = _("Pipeline实例汇总记录")
+
+    def __unicode__(self):
+        return self.instance_id
+
+
+class PendingStatisticsManager(models.Manager):
+    def enqueue(self, kind, object_ids):
+        """
+        添加待采集统计数据的对象，同一对象重复添加会在采集时合并
+        :param kind: 对象类型
+        :param object_ids: 对象 ID 列表
+        """
+        self.bulk_create([self.model(kind=kind, object_id=object_id) for object_id in object_ids])
+
+
+class PendingStatistics(models.Model):
+    KIND_INSTANCE = "instance"
+    KIND_TEMPLATE = "template"
+    KIND_CHOICES = ((KIND_INSTANCE, _("流程实例")), (KIND_TEMPLATE, _("流程模板")))
+
+    id = models.BigAutoField(_("ID"), primary_key=True)
+    kind = models.CharField(_("对象类型"), max_length=16, choices=KIND_CHOICES)
+    object_id = models.CharField(_("对象ID"), max_length=32)
+    create_time = models.DateTimeField(_("添加时间"), auto_now_add=True)
+
+    objects = PendingStatisticsManager()
+
+    class Meta:
+        verbose_name = _("Pipeline待采集统计数据")
+        verbose_name_plural = _("Pipeline待采集统计数据")
+
+    def __unicode__(self):
+        return "{}_{}".format(self.kind, self.object_id)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import ujson as json
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from pipeline.conf import settings
+from pipeline.contrib.statistics.models import (
+    ComponentExecuteData,
+    ComponentExecuteDailyStatistics,
+    InstanceDailyStatistics,
+    InstanceRollupRecord,
+)
+
+DIMENSIONS = ("project_id", "category", "create_method")
+DIMENSION_DEFAULTS = {"project_id": -1, "category": "", "create_method": ""}
+COMPONENT_FIELDS = ("execute_times", "failed_times", "elapsed_time_total", "elapsed_time_count")
+
+
+def rollup_enabled():
+    return bool(settings.PIPELINE_STATISTICS_INSTANCE_DIMENSIONS)
+
+
+def local_date(value):
+    """
+    获取时间在当前时区下的日期
+    :param value: datetime
+    :return: date
+    """
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def get_instance_dimensions(instance):
+    """
+    获取实例的汇总维度
+    :param instance: PipelineInstance
+    :return: 维度字典，实例不计入汇总时返回 None
+    """
+    dimensions = import_string(settings.PIPELINE_STATISTICS_INSTANCE_DIMENSIONS)(instance)
+    if dimensions is None:
+        return None
+    return {dim: dimensions.get(dim, default) for dim, default in DIMENSION_DEFAULTS.items()}
+
+
+def collect_components(instance_id):
+    """
+    聚合实例的标准插件执行数据
+    :param instance_id: 实例 ID
+    :return: {component_code: [execute_times, failed_times, elapsed_time_total, elapsed_time_count]}
+    """
+    rows = (
+        ComponentExecuteData.objects.filter(instance_id=instance_id)
+        .values("component_code")
+        .annotate(
+            execute_times=Count("id"),
+            failed_times=Sum(Case(When(status=False, then=Value(1)), default=Value(0), output_field=IntegerField())),
+            elapsed_time_total=Sum("elapsed_time"),
+            elapsed_time_count=Count("elapsed_time"),
+        )
+        .order_by()
+    )
+    return {row["component_code"]: [row[field] or 0 for field in COMPONENT_FIELDS] for row in rows}
+
+
+def _increase(model, key, deltas):
+    """
+    增加汇总行的计数，行不存在时创建
+    :param model: 汇总表
+    :param key: 汇总行的唯一键
+    :param deltas: {字段: 增量}
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**key).update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**dict(key, **deltas))
+    except IntegrityError:
+        # other instance of the same day created the row
+        model.objects.filter(**key).update(**updates)
+
+
+def _apply(date, dimensions, components, sign):
+    key = dict(dimensions, date=date)
+    _increase(InstanceDailyStatistics, key, {"instance_total": sign})
+    for component_code, values in components.items():
+        deltas = {field: sign * value for field, value in zip(COMPONENT_FIELDS, values)}
+        _increase(ComponentExecuteDailyStatistics, dict(key, component_code=component_code), deltas)
+
+
+def refresh_instance_rollup(instance):
+    """
+    重新计算实例在日汇总表中的数据，先减去上次计入的数据，再加上当前的数据，可以重复调用
+    :param instance: PipelineInstance
+    """
+    if not rollup_enabled():
+        return
+
+    dimensions = get_instance_dimensions(instance)
+    components = collect_components(instance.instance_id) if dimensions is not None else {}
+    date = local_date(instance.create_time)
+
+    with transaction.atomic():
+        record = InstanceRollupRecord.objects.select_for_update().filter(instance_id=instance.instance_id).first()
+        if record is not None:
+            recorded = {dim: getattr(record, dim) for dim in DIMENSIONS}
+            recorded_components = json.loads(record.components)
+            if recorded == dimensions and record.date == date and recorded_components == components:
+                return
+            _apply(record.date, recorded, recorded_components, -1)
+
+        if dimensions is None:
+            if record is not None:
+                record.delete()
+            return
+
+        _apply(date, dimensions, components, 1)
+        InstanceRollupRecord.objects.update_or_create(
+            instance_id=instance.instance_id,
+            defaults=dict(dimensions, date=date, components=json.dumps(components)),
+        )
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import logging
+
+from celery.decorators import periodic_task
+from celery.schedules import crontab
+from django.core.cache import cache
+
+from pipeline.conf import default_settings
+from pipeline.contrib.statistics.collector import collect_pending_statistics
+
+logger = logging.getLogger("celery")
+
+COLLECT_LOCK_KEY = "pipeline_statistics_collect_lock"
+# 采集进程异常退出时锁的最长持有时间
+COLLECT_LOCK_TIMEOUT = 60 * 10
+
+
+@periodic_task(run_every=(crontab(**default_settings.PIPELINE_STATISTICS_COLLECT_CRON)), ignore_result=True)
+def collect_statistics():
+    # 上一次采集还未完成时跳过
+    if not cache.add(COLLECT_LOCK_KEY, 1, COLLECT_LOCK_TIMEOUT):
+        return
+
+    try:
+        batch_size = default_settings.PIPELINE_STATISTICS_COLLECT_BATCH_SIZE
+        collected = 0
+        while True:
+            count = collect_pending_statistics(batch_size)
+            collected += count
+            if count < batch_size:
+                break
+        logger.info("%s pending statistics are collected" % collected)
+    except Exception:
+        logger.exception("An error occurred when collecting statistics")
+    finally:
+        cache.delete(COLLECT_LOCK_KEY)
@@ -11,15 +11,16 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import copy
 import re
 import logging
+from functools import lru_cache
 
 from mako.template import Template
 from mako import lexer, codegen
 from mako.exceptions import MakoException
 
 from pipeline import exceptions
+from pipeline.conf import settings
 from pipeline.core.data.sandbox import SANDBOX
 
 
@@ -46,6 +47,53 @@ def deformat_constant_key(key):
     return key[2:-1]
 
 
+@lru_cache(maxsize=settings.PIPELINE_TEMPLATE_CACHE_SIZE)
+def _compile_template(template):
+    # compiled Template only hold the code of template, so it can be shared between renders
+    return Template(template)
+
+
+@lru_cache(maxsize=settings.PIPELINE_TEMPLATE_CACHE_SIZE)
+def _template_reference(template):
+    lex = lexer.Lexer(template)
+
+    try:
+        node = lex.parse()
+    except MakoException as e:
+        logger.warning("pipeline get template[{}] reference error[{}]".format(template, e))
+        return ()
+
+    # Dummy compiler. _Identifiers class requires one
+    # but only interested in the reserved_names field
+    def compiler():
+        return None
+
+    compiler.reserved_names = set()
+    identifiers = codegen._Identifiers(compiler, node)
+
+    return tuple(identifiers.undeclared)
+
+
+def template_cache_info():
+    """
+    @summary: 获取模板编译及引用解析缓存的命中情况
+    @return: {"template": {"hits", "misses", "maxsize", "currsize"}, "reference": {...}}
+    """
+    return {
+        "template": _compile_template.cache_info()._asdict(),
+        "reference": _template_reference.cache_info()._asdict(),
+    }
+
+
+def clear_template_cache():
+    """
+    @summary: 清空模板编译及引用解析缓存
+    @return:
+    """
+    _compile_template.cache_clear()
+    _template_reference.cache_clear()
+
+
 class ConstantTemplate(object):
     def __init__(self, data):
         self.data = data
@@ -72,23 +120,37 @@ class ConstantTemplate(object):
         return list(set(templates))
 
     def resolve_data(self, value_maps):
-        data = self.data
+        """
+        @summary: 解析数据中的模板，只重建包含模板的路径，未包含模板的子对象直接与原数据共享，原数据不会被修改
+        @param value_maps:
+        @return:
+        """
+        return self._resolve(self.data, value_maps)
+
+    @classmethod
+    def _resolve(cls, data, value_maps):
         if isinstance(data, str):
-            return self.resolve_string(data, value_maps)
-        if isinstance(data, list):
-            ldata = [""] * len(data)
-            for index, item in enumerate(data):
-                ldata[index] = ConstantTemplate(copy.deepcopy(item)).resolve_data(value_maps)
-            return ldata
-        if isinstance(data, tuple):
-            ldata = [""] * len(data)
+            return cls.resolve_string(data, value_maps)
+        if isinstance(data, (list, tuple)):
+            resolved = None
             for index, item in enumerate(data):
-                ldata[index] = ConstantTemplate(copy.deepcopy(item)).resolve_data(value_maps)
-            return tuple(ldata)
+                resolved_item = cls._resolve(item, value_maps)
+                if resolved is None and resolved_item is not item:
+                    resolved = list(data[:index])
+                if resolved is not None:
+                    resolved.append(resolved_item)
+            if resolved is None:
+                return data
+            return resolved if isinstance(data, list) else tuple(resolved)
         if isinstance(data, dict):
-            for key, value in list(data.items()):
-                data[key] = ConstantTemplate(copy.deepcopy(value)).resolve_data(value_maps)
-            return data
+            resolved = None
+            for key, value in data.items():
+                resolved_value = cls._resolve(value, value_maps)
+                if resolved_value is not value:
+                    if resolved is None:
+                        resolved = data.copy()
+                    resolved[key] = resolved_value
+            return data if resolved is None else resolved
         return data
 
     @staticmethod
@@ -97,27 +159,11 @@ class ConstantTemplate(object):
 
     @staticmethod
     def get_template_reference(template):
-        lex = lexer.Lexer(template)
-
-        try:
-            node = lex.parse()
-        except MakoException as e:
-            logger.warning("pipeline get template[{}] reference error[{}]".format(template, e))
-            return []
-
-        # Dummy compiler. _Identifiers class requires one
-        # but only interested in the reserved_names field
-        def compiler():
-            return None
-
-        compiler.reserved_names = set()
-        identifiers = codegen._Identifiers(compiler, node)
-
-        return list(identifiers.undeclared)
+        return list(_template_reference(template))
 
     @staticmethod
     def resolve_string(string, value_maps):
-        if not isinstance(string, str):
+        if not isinstance(string, str) or "${" not in string:
             return string
         templates = ConstantTemplate.get_string_templates(string)
 
@@ -138,7 +184,7 @@ class ConstantTemplate(object):
         if not isinstance(template, str):
             raise exceptions.ConstantTypeException("constant resolve error, template[%s] is not a string" % template)
         try:
-            tm = Template(template)
+            tm = _compile_template(template)
         except (MakoException, SyntaxError) as e:
             logger.error("pipeline resolve template[{}] error[{}]".format(template, e))
             return template
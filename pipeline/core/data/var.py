@@ -13,6 +13,7 @@ specific language governing permissions and limitations under the License.
 
 import logging
 from abc import abstractmethod
+from copy import deepcopy
 
 from pipeline import exceptions
 from pipeline.core.data import library
@@ -122,6 +123,11 @@ class RegisterVariableMeta(type):
 
 
 class LazyVariable(SpliceVariable, metaclass=RegisterVariableMeta):
+    # 是否在流程执行过程中缓存 get_value 的结果，缓存保存在变量对象上，会随进程快照一起序列化
+    memoize = False
+    # get_value 依赖的 pipeline_data 键，与变量值一起作为缓存键，任一值变化时重新计算
+    memoize_data_keys = ()
+
     def __init__(self, name, value, context, pipeline_data):
         super(LazyVariable, self).__init__(name, value, context)
         self.context = context
@@ -131,11 +137,35 @@ class LazyVariable(SpliceVariable, metaclass=RegisterVariableMeta):
     def get(self):
         self.value = super(LazyVariable, self).get()
         try:
+            if self.memoize:
+                return self._get_memoized_value()
             return self.get_value()
         except exceptions as e:
             logger.error("get value[{}] of Variable[{}] error[{}]".format(self.value, self.name, e))
             return self.value
 
+    def memoize_version(self):
+        """
+        get_value 依赖的外部数据版本，与变量值一起作为缓存键，外部数据发生变化时需要返回不同的版本
+        :return:
+        """
+        return None
+
+    def _memo_key(self):
+        pipeline_data = self.pipeline_data or {}
+        return self.value, [pipeline_data.get(key) for key in self.memoize_data_keys], self.memoize_version()
+
+    def _get_memoized_value(self):
+        key = self._memo_key()
+        # variables in snapshot which pickled before memoize was introduced do not have _memo
+        memo = getattr(self, "_memo", None)
+        if memo is not None and memo[0] == key:
+            return deepcopy(memo[1])
+
+        value = self.get_value()
+        self._memo = (deepcopy(key), value)
+        return deepcopy(value)
+
     # get real value by user code
     @abstractmethod
     def get_value(self):
@@ -12,6 +12,7 @@ specific language governing permissions and limitations under the License.
 """
 
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 from copy import deepcopy
 
 from django.utils.translation import ugettext_lazy as _
@@ -20,6 +21,9 @@ from pipeline.core.flow.activity.base import Activity
 from pipeline.core.flow.io import BooleanItemSchema, InputItem, IntItemSchema, OutputItem
 from pipeline.utils.utils import convert_bytes_to_str
 
+# 批量调度中的单个节点，callback_data 为节点的回调数据
+ScheduleNode = namedtuple("ScheduleNode", ["service", "data", "parent_data", "callback_data"])
+
 
 class Service(object, metaclass=ABCMeta):
     schedule_result_attr = "__schedule_finish__"
@@ -80,6 +84,23 @@ class Service(object, metaclass=ABCMeta):
     def schedule(self, data, parent_data, callback_data=None):
         return True
 
+    def schedule_batch_key(self, data, parent_data):
+        """
+        轮询调度合并键，开启调度轮询进程后，同一轮询周期内到期且合并键相同的同类节点会合并为一次 schedule_batch 调用
+        :param data: 节点数据
+        :param parent_data: 父流程数据
+        :return: 合并键，返回 None 时不参与合并
+        """
+        return None
+
+    def schedule_batch(self, nodes):
+        """
+        批量调度，只会在合并组中第一个节点的 service 上调用，需要为每个节点设置输出及调度完成标志
+        :param nodes: ScheduleNode 列表
+        :return: 与 nodes 一一对应的调度结果列表，每个结果的含义与 schedule 的返回值相同
+        """
+        return [node.service.schedule(node.data, node.parent_data, node.callback_data) for node in nodes]
+
     def finish_schedule(self):
         setattr(self, self.schedule_result_attr, True)
 
@@ -177,6 +198,9 @@ class ServiceActivity(Activity):
     def schedule(self, parent_data, callback_data=None):
         self.setup_logger()
         result = self.service.schedule(self.data, parent_data, callback_data)
+        return self.set_schedule_result(result)
+
+    def set_schedule_result(self, result):
         self.set_result_bit(result)
 
         if result is False:
@@ -186,6 +210,13 @@ class ServiceActivity(Activity):
 
         return result
 
+    def schedule_batch_key(self, parent_data):
+        return self.service.schedule_batch_key(self.data, parent_data)
+
+    def schedule_node(self, parent_data, callback_data=None):
+        self.setup_logger()
+        return ScheduleNode(self.service, self.data, parent_data, callback_data)
+
     def is_schedule_done(self):
         return self.service.is_schedule_finished()
 
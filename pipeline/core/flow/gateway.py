@@ -58,8 +58,8 @@ class ExclusiveGateway(Gateway):
         :param data:
         :return:
         """
+        deformatted_data = {deformat_constant_key(key): value for key, value in list(data.items())}
         for condition in self.conditions:
-            deformatted_data = {deformat_constant_key(key): value for key, value in list(data.items())}
             try:
                 resolved_evaluate = ConstantTemplate(condition.evaluate).resolve_data(deformatted_data)
                 result = BoolRule(resolved_evaluate).test(data)
@@ -99,8 +99,8 @@ class ConditionalParallelGateway(Gateway):
 
         targets = []
 
+        deformatted_data = {deformat_constant_key(key): value for key, value in list(data.items())}
         for condition in self.conditions:
-            deformatted_data = {deformat_constant_key(key): value for key, value in list(data.items())}
             try:
                 resolved_evaluate = ConstantTemplate(condition.evaluate).resolve_data(deformatted_data)
                 result = BoolRule(resolved_evaluate).test(data)
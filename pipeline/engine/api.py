@@ -25,6 +25,7 @@ from pipeline.constants import PIPELINE_DEFAULT_PRIORITY, PIPELINE_MAX_PRIORITY,
 from pipeline.core.flow.activity import ServiceActivity
 from pipeline.core.flow.gateway import ExclusiveGateway, ParallelGateway
 from pipeline.engine import exceptions, states
+from pipeline.engine.core import stamp
 from pipeline.engine.core.api import workers
 from pipeline.engine.models import (
     Data,
@@ -367,6 +368,100 @@ def get_status_tree(node_id, max_depth=1):
     :param max_depth:
     :return:
     """
+    root_status = Status.objects.filter(id=node_id).values().first()
+    if root_status and root_status["root_pipeline_id"]:
+        return _get_status_tree_by_parent(root_status, max_depth)
+
+    return _get_status_tree_by_relationship(node_id, max_depth)
+
+
+def get_status_tree_revision(root_pipeline_id):
+    """
+    get revision of status tree, revision will change when any node status of the pipeline changed
+    :param root_pipeline_id:
+    :return: None if state stamp is not enabled
+    """
+    return stamp.tree_stamp_for(root_pipeline_id)
+
+
+def get_batch_status(node_ids):
+    """
+    get state of multiple nodes with one query, children states are not included
+    :param node_ids:
+    :return: {node_id: status}, node which does not exist or has not been executed will be omitted
+    """
+    statuses = {}
+    for status in Status.objects.filter(id__in=node_ids).values():
+        status["elapsed_time"] = calculate_elapsed_time(status["started_time"], status["archived_time"])
+        statuses[status["id"]] = status
+    return statuses
+
+
+def get_status_trees(root_pipeline_ids, max_depth=1):
+    """
+    get status tree for multiple root pipelines with one query of Status
+    :param root_pipeline_ids:
+    :param max_depth:
+    :return: {root_pipeline_id: status tree}, pipeline which does not exist or has not been executed will be omitted
+    """
+    statuses_of_root = {}
+    for status in Status.objects.filter(root_pipeline_id__in=root_pipeline_ids).values():
+        statuses_of_root.setdefault(status["root_pipeline_id"], []).append(status)
+
+    trees = {}
+    for root_pipeline_id in root_pipeline_ids:
+        statuses = statuses_of_root.get(root_pipeline_id)
+        root_status = None
+        for status in statuses or []:
+            if status["id"] == root_pipeline_id:
+                root_status = status
+                break
+
+        if root_status is not None:
+            trees[root_pipeline_id] = _build_status_tree(root_status, statuses, max_depth)
+        else:
+            # status of pipeline executed before parent pointer was introduced
+            try:
+                trees[root_pipeline_id] = _get_status_tree_by_relationship(root_pipeline_id, max_depth)
+            except exceptions.InvalidOperationException:
+                continue
+    return trees
+
+
+def _get_status_tree_by_parent(root_status, max_depth):
+    status_qs = Status.objects.filter(root_pipeline_id=root_status["root_pipeline_id"]).values()
+    return _build_status_tree(root_status, status_qs, max_depth)
+
+
+def _build_status_tree(root_status, statuses, max_depth):
+    node_id = root_status["id"]
+    children_map = {}
+    for status in statuses:
+        if status["id"] == node_id:
+            status = root_status
+        children_map.setdefault(status["parent_id"], []).append(status)
+
+    root_status["elapsed_time"] = calculate_elapsed_time(root_status["started_time"], root_status["archived_time"])
+    root_status["children"] = {}
+    parents = [root_status]
+    depth = 0
+    while parents and depth < max_depth:
+        depth += 1
+        next_parents = []
+        for parent_status in parents:
+            for child_status in children_map.get(parent_status["id"], []):
+                child_status["elapsed_time"] = calculate_elapsed_time(
+                    child_status["started_time"], child_status["archived_time"]
+                )
+                child_status["children"] = {}
+                parent_status["children"][child_status["id"]] = child_status
+                next_parents.append(child_status)
+        parents = next_parents
+
+    return root_status
+
+
+def _get_status_tree_by_relationship(node_id, max_depth):
     rel_qs = NodeRelationship.objects.filter(ancestor_id=node_id, distance__lte=max_depth)
     if not rel_qs.exists():
         raise exceptions.InvalidOperationException("node(%s) does not exist, may have not by executed" % node_id)
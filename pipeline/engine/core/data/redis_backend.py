@@ -11,30 +11,43 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import pickle
-
 from pipeline.conf import settings
 from pipeline.engine.core.data.base_backend import BaseDataBackend
+from pipeline.utils import codec
+
+
+def _encode(obj):
+    return codec.encode(obj, codec=settings.PIPELINE_DATA_BACKEND_CODEC)
 
 
 class RedisDataBackend(BaseDataBackend):
     def set_object(self, key, obj):
-        return settings.redis_inst.set(key, pickle.dumps(obj))
+        return settings.redis_inst.set(key, _encode(obj))
 
     def get_object(self, key):
-        pickle_str = settings.redis_inst.get(key)
-        if not pickle_str:
+        data = settings.redis_inst.get(key)
+        if not data:
             return None
-        return pickle.loads(pickle_str)
+        return codec.decode(data)
 
     def del_object(self, key):
         return settings.redis_inst.delete(key)
 
     def expire_cache(self, key, value, expires):
-        settings.redis_inst.set(key, pickle.dumps(value))
+        settings.redis_inst.set(key, _encode(value))
         settings.redis_inst.expire(key, expires)
         return True
 
     def cache_for(self, key):
         cache = settings.redis_inst.get(key)
-        return pickle.loads(cache) if cache else cache
+        return codec.decode(cache) if cache else cache
+
+    def incr_stamps(self, keys, expires):
+        pipe = settings.redis_inst.pipeline()
+        for key in keys:
+            pipe.incr(key)
+            pipe.expire(key, expires)
+        return pipe.execute()
+
+    def get_stamps(self, keys):
+        return settings.redis_inst.mget(keys)
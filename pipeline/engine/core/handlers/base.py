@@ -16,7 +16,11 @@ from collections import namedtuple
 
 
 class FlowElementHandler(object):
-    HandleResult = namedtuple("HandleResult", "next_node should_return should_sleep")
+    HandleResult = namedtuple("HandleResult", "next_node should_return should_sleep handoff")
+    HandleResult.__new__.__defaults__ = (None,)
+
+    # 等待与下一个节点的启动合并写入的完成操作
+    Handoff = namedtuple("Handoff", "node error_ignorable")
 
     @staticmethod
     @abstractmethod
@@ -27,5 +31,20 @@ class FlowElementHandler(object):
     def handle(self, process, element, status):
         raise NotImplementedError()
 
+    def handoff(self, element, next_node, error_ignorable=False):
+        """
+        推迟 element 完成状态的写入，由 run_loop 在启动 next_node 时合并写入
+        :param element: 已经执行完成的节点
+        :param next_node: 下一个节点
+        :param error_ignorable: 节点是否是出错后自动忽略
+        :return:
+        """
+        return self.HandleResult(
+            next_node=next_node,
+            should_return=False,
+            should_sleep=False,
+            handoff=self.Handoff(node=element, error_ignorable=error_ignorable),
+        )
+
     def __call__(self, *args, **kwargs):
         return self.handle(*args, **kwargs)
@@ -43,19 +43,16 @@ class ConditionalParallelGatewayHandler(FlowElementHandler):
             Status.objects.fail(element, ex_data=str(e))
             return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
 
-        children = []
-
-        for target in targets:
-            try:
-                child = PipelineProcess.objects.fork_child(
-                    parent=process, current_node_id=target.id, destination_id=element.converge_gateway_id
-                )
-            except PipelineException as e:
-                logger.error(traceback.format_exc())
-                Status.objects.fail(element, ex_data=str(e))
-                return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
-
-            children.append(child)
+        try:
+            children = PipelineProcess.objects.fork_children(
+                parent=process,
+                current_node_ids=[target.id for target in targets],
+                destination_id=element.converge_gateway_id,
+            )
+        except PipelineException as e:
+            logger.error(traceback.format_exc())
+            Status.objects.fail(element, ex_data=str(e))
+            return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
 
         process.join(children)
 
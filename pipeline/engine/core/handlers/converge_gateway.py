@@ -14,6 +14,7 @@ specific language governing permissions and limitations under the License.
 import logging
 import traceback
 
+from pipeline.conf import settings as pipeline_settings
 from pipeline.core.flow.gateway import ConvergeGateway
 from pipeline.engine import exceptions
 from pipeline.engine.models import Status
@@ -42,5 +43,8 @@ class ConvergeGatewayHandler(FlowElementHandler):
                 Status.objects.fail(element, ex_data="Sync branch context error, check data backend status please.")
                 return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
 
+        if pipeline_settings.PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED:
+            return self.handoff(element, element.next())
+
         Status.objects.finish(element)
         return self.HandleResult(next_node=element.next(), should_return=False, should_sleep=False)
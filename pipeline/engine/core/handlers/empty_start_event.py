@@ -13,6 +13,7 @@ specific language governing permissions and limitations under the License.
 
 import logging
 
+from pipeline.conf import settings as pipeline_settings
 from pipeline.core.flow.event import EmptyStartEvent
 from pipeline.engine.models import Status
 
@@ -29,5 +30,8 @@ class EmptyStartEventHandler(FlowElementHandler):
         return EmptyStartEvent
 
     def handle(self, process, element, status):
+        if pipeline_settings.PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED:
+            return self.handoff(element, element.next())
+
         Status.objects.finish(element)
         return self.HandleResult(next_node=element.next(), should_return=False, should_sleep=False)
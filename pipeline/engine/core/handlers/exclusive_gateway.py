@@ -14,6 +14,7 @@ specific language governing permissions and limitations under the License.
 import logging
 import traceback
 
+from pipeline.conf import settings as pipeline_settings
 from pipeline.core.data.hydration import hydrate_data
 from pipeline.core.flow.gateway import ExclusiveGateway
 from pipeline.engine.models import Status
@@ -42,5 +43,8 @@ class ExclusiveGatewayHandler(FlowElementHandler):
             logger.error(traceback.format_exc())
             Status.objects.fail(element, ex_data=str(e))
             return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
+        if pipeline_settings.PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED:
+            return self.handoff(element, next_node)
+
         Status.objects.finish(element)
         return self.HandleResult(next_node=next_node, should_return=False, should_sleep=False)
@@ -32,19 +32,17 @@ class ParallelGatewayHandler(FlowElementHandler):
 
     def handle(self, process, element, status):
         targets = element.outgoing.all_target_node()
-        children = []
-
-        for target in targets:
-            try:
-                child = PipelineProcess.objects.fork_child(
-                    parent=process, current_node_id=target.id, destination_id=element.converge_gateway_id
-                )
-            except PipelineException as e:
-                logger.error(traceback.format_exc())
-                Status.objects.fail(element, str(e))
-                return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
-
-            children.append(child)
+
+        try:
+            children = PipelineProcess.objects.fork_children(
+                parent=process,
+                current_node_ids=[target.id for target in targets],
+                destination_id=element.converge_gateway_id,
+            )
+        except PipelineException as e:
+            logger.error(traceback.format_exc())
+            Status.objects.fail(element, str(e))
+            return self.HandleResult(next_node=None, should_return=True, should_sleep=True)
 
         process.join(children)
 
@@ -15,6 +15,7 @@ import logging
 import traceback
 
 from pipeline.conf import default_settings
+from pipeline.conf import settings as pipeline_settings
 from pipeline.core.data.hydration import hydrate_node_data
 from pipeline.core.flow.activity import ServiceActivity
 from pipeline.django_signal_valve import valve
@@ -136,6 +137,9 @@ class ServiceActivityHandler(FlowElementHandler):
                 )
                 logger.info("node {} {} timeout monitor revoke".format(element.id, version))
 
+            if pipeline_settings.PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED:
+                return self.handoff(element, element.next(), error_ignorable)
+
             if not Status.objects.finish(element, error_ignorable):
                 # has been forced failed
                 return self.HandleResult(next_node=None, should_return=False, should_sleep=True)
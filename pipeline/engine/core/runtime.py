@@ -19,6 +19,7 @@ from pipeline.conf import settings as pipeline_settings
 from pipeline.core.flow.activity import SubProcess
 from pipeline.engine import states
 from pipeline.engine.core.handlers import HandlersFactory
+from pipeline.engine.core.stamp import StateChecker
 from pipeline.engine.models import NAME_MAX_LENGTH, FunctionSwitch, NodeRelationship, Status
 
 logger = logging.getLogger("celery")
@@ -35,6 +36,70 @@ def runtime_exception_handler(process):
         process.exit_gracefully(e)
 
 
+class StatusHandoff(object):
+    """
+    run_loop 中等待与下一个节点的启动合并写入的节点完成操作
+    """
+
+    def __init__(self, process):
+        self.process = process
+        self.pending = None
+
+    def defer(self, handoff):
+        self.pending = handoff
+
+    def flush(self):
+        """
+        单独写入等待中的完成操作
+        :return: 写入失败（节点已被强制失败）时返回 False，此时进程的当前节点会回退到该节点
+        """
+        if not self.pending:
+            return True
+
+        handoff, self.pending = self.pending, None
+        if Status.objects.finish(handoff.node, handoff.error_ignorable).result:
+            return True
+
+        logger.warning("node({}) finish failed, it may have been forced failed.".format(handoff.node.id))
+        self.process.current_node_id = handoff.node.id
+        return False
+
+    def start(self, node, name):
+        """
+        尝试将 node 转换为 RUNNING 状态，存在等待中的完成操作时会在同一个事务中完成写入并建立 node 的关系
+        :return: (等待中的完成操作是否写入成功, node 状态转换结果, node 的关系是否已经建立)
+        """
+        if not self.pending:
+            action = Status.objects.transit(id=node.id, to_state=states.RUNNING, start=True, name=name)
+            return True, action, False
+
+        handoff, self.pending = self.pending, None
+        finish_res, action = Status.objects.handoff(
+            handoff.node,
+            next_id=node.id,
+            pipeline_id=self.process.top_pipeline.id,
+            root_pipeline_id=self.process.root_pipeline.id,
+            next_name=name,
+            error_ignorable=handoff.error_ignorable,
+        )
+        if not finish_res.result:
+            logger.warning(
+                "node({}) finish failed, it may have been forced failed. message: {}".format(
+                    handoff.node.id, finish_res.message
+                )
+            )
+            self.process.current_node_id = handoff.node.id
+            return False, None, False
+
+        return True, action, True
+
+
+def _build_relationship(process, node_id):
+    if pipeline_settings.PIPELINE_ENGINE_CLOSURE_RELATIONSHIP_ENABLED:
+        NodeRelationship.objects.build_relationship(process.top_pipeline.id, node_id)
+    Status.objects.bind_tree(node_id, parent_id=process.top_pipeline.id, root_pipeline_id=process.root_pipeline.id)
+
+
 def run_loop(process):
     """
     pipeline 推进主循环
@@ -42,22 +107,40 @@ def run_loop(process):
     :return:
     """
     with runtime_exception_handler(process):
-        while True:
-            current_node = process.top_pipeline.node(process.current_node_id)
-
-            # check child process destination
-            if process.destination_id == current_node.id:
-                try:
-                    process.destroy_and_wake_up_parent(current_node.id)
-                except Exception:
-                    logger.error(traceback.format_exc())
-                logger.info("child process(%s) finish." % process.id)
+        state_checker = StateChecker(process)
+        status_handoff = StatusHandoff(process)
+        try:
+            _run_loop(process, state_checker, status_handoff)
+        except Exception:
+            # do not let the handled node stay in RUNNING
+            status_handoff.flush()
+            raise
+
+
+def _run_loop(process, state_checker, status_handoff):
+    while True:
+        current_node = process.top_pipeline.node(process.current_node_id)
+
+        # check child process destination
+        if process.destination_id == current_node.id:
+            if not status_handoff.flush():
+                process.sleep(adjust_status=True)
                 return
 
+            try:
+                process.destroy_and_wake_up_parent(current_node.id)
+            except Exception:
+                logger.error(traceback.format_exc())
+            logger.info("child process(%s) finish." % process.id)
+            return
+
+        # skip db checks if nothing changed since last check
+        if not state_checker.unchanged():
             # check root pipeline status
             need_sleep, pipeline_state = process.root_sleep_check()
             if need_sleep:
                 logger.info("pipeline(%s) turn to sleep." % process.root_pipeline.id)
+                status_handoff.flush()
                 process.sleep(do_not_save=(pipeline_state == states.REVOKED))
                 return
 
@@ -65,65 +148,72 @@ def run_loop(process):
             need_sleep, subproc_above = process.subproc_sleep_check()
             if need_sleep:
                 logger.info("process(%s) turn to sleep." % process.root_pipeline.id)
+                status_handoff.flush()
                 process.sleep(adjust_status=True, adjust_scope=subproc_above)
                 return
 
             # check engine status
             if FunctionSwitch.objects.is_frozen():
                 logger.info("pipeline(%s) have been frozen." % process.id)
+                status_handoff.flush()
                 process.freeze()
                 return
 
-                # try to transit current node to running state
-            name = (current_node.name or str(current_node.__class__))[:NAME_MAX_LENGTH]
-            action = Status.objects.transit(id=current_node.id, to_state=states.RUNNING, start=True, name=name)
-
-            # check rerun limit
-            if (
-                not isinstance(current_node, SubProcess)
-                and RERUN_MAX_LIMIT != 0
-                and action.extra.loop > RERUN_MAX_LIMIT
-            ):
-                logger.info(
-                    "node({nid}) rerun times exceed max limit: {limit}".format(
-                        nid=current_node.id, limit=RERUN_MAX_LIMIT
-                    )
-                )
+            state_checker.mark_checked()
 
-                # fail
-                action = Status.objects.fail(
-                    current_node, "rerun times exceed max limit: {limit}".format(limit=RERUN_MAX_LIMIT)
-                )
+        # try to transit current node to running state
+        name = (current_node.name or str(current_node.__class__))[:NAME_MAX_LENGTH]
+        finished, action, relationship_built = status_handoff.start(current_node, name)
 
-                if not action.result:
-                    logger.warning(
-                        "can not transit node({}) to running, pipeline({}) turn to sleep. "
-                        "message: {}".format(current_node.id, process.root_pipeline.id, action.message)
-                    )
+        if not finished:
+            process.sleep(adjust_status=True)
+            return
 
-                process.sleep(adjust_status=True)
-                return
+        # check rerun limit
+        if not isinstance(current_node, SubProcess) and RERUN_MAX_LIMIT != 0 and action.extra.loop > RERUN_MAX_LIMIT:
+            logger.info(
+                "node({nid}) rerun times exceed max limit: {limit}".format(nid=current_node.id, limit=RERUN_MAX_LIMIT)
+            )
+
+            # fail
+            action = Status.objects.fail(
+                current_node, "rerun times exceed max limit: {limit}".format(limit=RERUN_MAX_LIMIT)
+            )
 
             if not action.result:
                 logger.warning(
-                    "can not transit node({}) to running, pipeline({}) turn to sleep. message: {}".format(
-                        current_node.id, process.root_pipeline.id, action.message
-                    )
+                    "can not transit node({}) to running, pipeline({}) turn to sleep. "
+                    "message: {}".format(current_node.id, process.root_pipeline.id, action.message)
                 )
-                process.sleep(adjust_status=True)
-                return
 
-            # refresh current node
-            process.refresh_current_node(current_node.id)
+            process.sleep(adjust_status=True)
+            return
 
-            # build relationship
-            NodeRelationship.objects.build_relationship(process.top_pipeline.id, current_node.id)
-            result = HandlersFactory.handlers_for(current_node)(process, current_node, action.extra)
+        if not action.result:
+            logger.warning(
+                "can not transit node({}) to running, pipeline({}) turn to sleep. message: {}".format(
+                    current_node.id, process.root_pipeline.id, action.message
+                )
+            )
+            process.sleep(adjust_status=True)
+            return
 
-            if result.should_return or result.should_sleep:
-                if result.should_sleep:
-                    process.sleep(adjust_status=True)
-                return
+        # refresh current node
+        process.refresh_current_node(current_node.id)
+
+        # build relationship
+        if not relationship_built:
+            _build_relationship(process, current_node.id)
+        result = HandlersFactory.handlers_for(current_node)(process, current_node, action.extra)
+
+        if result.should_return or result.should_sleep:
+            if result.should_sleep:
+                process.sleep(adjust_status=True)
+            return
+
+        # finish current node when next node start
+        if result.handoff:
+            status_handoff.defer(result.handoff)
 
-            # store current node id
-            process.current_node_id = result.next_node.id
+        # store current node id
+        process.current_node_id = result.next_node.id
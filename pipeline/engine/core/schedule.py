@@ -42,12 +42,16 @@ def schedule_exception_handler(process_id, schedule_id):
         delete_parent_data(schedule_id)
 
 
+def release_schedule_lock(schedule_id):
+    ScheduleService.objects.filter(id=schedule_id, is_scheduling=True).update(is_scheduling=False)
+    logger.warning("schedule({}) unlock success.".format(schedule_id))
+
+
 @contextlib.contextmanager
 def auto_release_schedule_lock(schedule_id):
     yield
     # release schedule lock before exit schedule
-    ScheduleService.objects.filter(id=schedule_id, is_scheduling=True).update(is_scheduling=False)
-    logger.warning("schedule({}) unlock success.".format(schedule_id))
+    release_schedule_lock(schedule_id)
 
 
 def schedule(process_id, schedule_id, data_id=None):
@@ -60,67 +64,17 @@ def schedule(process_id, schedule_id, data_id=None):
     """
     with schedule_exception_handler(process_id, schedule_id):
 
-        # schedule maybe destroyed by other schedule
-        try:
-            sched_service = ScheduleService.objects.get(id=schedule_id)
-            # stop if schedule status finished
-            if sched_service.is_finished:
-                logger.warning("schedule already finished, give up, sched_id: {}".format(schedule_id))
-                return
-        except ScheduleService.DoesNotExist:
-            logger.warning("schedule not exist, give up, sched_id: {}".format(schedule_id))
-            return
-
-        # try update lock schedule
-        is_updated = ScheduleService.objects.filter(id=schedule_id, is_scheduling=False).update(is_scheduling=True)
-
-        # lock failed, other worker may locking
-        if is_updated == 0:
-            # retry lock after seconds
-            logger.warning("schedule service lock-{} failed, retry after seconds".format(schedule_id))
-            valve.send(
-                signals,
-                "schedule_ready",
-                sender=ScheduleService,
-                process_id=process_id,
-                schedule_id=schedule_id,
-                data_id=data_id,
-                countdown=2,
-            )
+        sched_service = lock_schedule(process_id, schedule_id, data_id)
+        if sched_service is None:
             return
 
         with auto_release_schedule_lock(schedule_id):
-            service_act = sched_service.service_act
-            act_id = sched_service.activity_id
-            version = sched_service.version
-
-            if not Status.objects.filter(id=act_id, version=version).exists():
-                # forced failed
-                logger.warning(
-                    "schedule service failed, schedule({} - {}) had been forced exit.".format(act_id, version)
-                )
-                sched_service.destroy()
+            schedule_context = prepare_schedule(process_id, sched_service, data_id)
+            if schedule_context is None:
                 return
 
-            # get data
-            parent_data = get_schedule_parent_data(sched_service.id)
-            if parent_data is None:
-                raise exceptions.DataRetrieveError(
-                    "child process({}) retrieve parent_data error, sched_id: {}".format(process_id, schedule_id)
-                )
-
-            # get schedule data
-            if sched_service.multi_callback_enabled and data_id:
-                try:
-                    callback_data = MultiCallbackData.objects.get(id=data_id)
-                    schedule_data = callback_data.data
-                except MultiCallbackData.DoesNotExist:
-                    logger.warning(
-                        "schedule get callback_data failed, give up schedule, sched_id: {}".format(schedule_id)
-                    )
-                    return
-            else:
-                schedule_data = sched_service.callback_data
+            service_act = sched_service.service_act
+            parent_data, schedule_data = schedule_context
 
             # schedule
             ex_data, success = None, False
@@ -129,118 +83,280 @@ def schedule(process_id, schedule_id, data_id=None):
                 if success is None:
                     success = True
             except Exception:
-                if service_act.error_ignorable:
-                    success = True
-                    service_act.ignore_error()
-                    service_act.finish_schedule()
-
+                success = ignore_schedule_error(service_act)
                 ex_data = traceback.format_exc()
                 logging.error(ex_data)
 
-            sched_service.schedule_times += 1
-            set_schedule_data(sched_service.id, parent_data)
-
-            # schedule failed
-            if not success:
-                if not Status.objects.transit(id=act_id, version=version, to_state=states.FAILED).result:
-                    # forced failed
-                    logger.warning(
-                        "FAILED transit failed, schedule({} - {}) had been forced exit.".format(act_id, version)
-                    )
-                    sched_service.destroy()
-                    return
-
-                if service_act.timeout:
-                    signals.service_activity_timeout_monitor_end.send(
-                        sender=service_act.__class__, node_id=service_act.id, version=version
-                    )
-                    logger.info("node {} {} timeout monitor revoke".format(service_act.id, version))
-
-                Data.objects.write_node_data(service_act, ex_data=ex_data)
-
-                with transaction.atomic():
-                    process = PipelineProcess.objects.select_for_update().get(id=sched_service.process_id)
-                    if not process.is_alive:
-                        logger.info("pipeline %s has been revoked, status adjust failed." % process.root_pipeline_id)
-                        return
-
-                    process.adjust_status()
-
-                # send activity error signal
-                try:
-                    service_act.schedule_fail()
-                except Exception:
-                    logger.error("schedule_fail handler fail: %s" % traceback.format_exc())
-
-                signals.service_schedule_fail.send(
-                    sender=ScheduleService, activity_shell=service_act, schedule_service=sched_service, ex_data=ex_data
-                )
-
-                valve.send(
-                    signals,
-                    "activity_failed",
-                    sender=process.root_pipeline,
-                    pipeline_id=process.root_pipeline_id,
-                    pipeline_activity_id=service_act.id,
-                    subprocess_id_stack=process.subprocess_stack,
-                )
-                return
+            handle_schedule_result(sched_service, parent_data, success, ex_data)
+
 
-            # schedule execute finished or one time callback finished
-            if service_act.is_schedule_done() or sched_service.is_one_time_callback():
-                error_ignorable = not service_act.get_result_bit()
-                if not Status.objects.transit(id=act_id, version=version, to_state=states.FINISHED).result:
-                    # forced failed
-                    logger.warning(
-                        "FINISHED transit failed, schedule({} - {}) had been forced exit.".format(act_id, version)
-                    )
-                    sched_service.destroy()
-                    return
-
-                if service_act.timeout:
-                    signals.service_activity_timeout_monitor_end.send(
-                        sender=service_act.__class__, node_id=service_act.id, version=version
-                    )
-                    logger.info("node {} {} timeout monitor revoke".format(service_act.id, version))
-
-                Data.objects.write_node_data(service_act)
-                if error_ignorable:
-                    s = Status.objects.get(id=act_id)
-                    s.error_ignorable = True
-                    s.save()
-
-                # sync parent data
-                with transaction.atomic():
-                    process = PipelineProcess.objects.select_for_update().get(id=sched_service.process_id)
-                    if not process.is_alive:
-                        logger.warning("schedule({} - {}) revoked.".format(act_id, version))
-                        sched_service.destroy()
-                        return
-
-                    process.top_pipeline.data.update_outputs(parent_data.get_outputs())
-                    # extract outputs
-                    process.top_pipeline.context.extract_output(service_act)
-                    process.save(save_snapshot=True)
-
-                # clear temp data
-                delete_parent_data(sched_service.id)
-                # save schedule service
-                sched_service.finish()
-
-                signals.service_schedule_success.send(
-                    sender=ScheduleService, activity_shell=service_act, schedule_service=sched_service
-                )
-
-                valve.send(
-                    signals,
-                    "wake_from_schedule",
-                    sender=ScheduleService,
-                    process_id=sched_service.process_id,
-                    activity_id=sched_service.activity_id,
-                )
+def schedule_batch(schedules):
+    """
+    批量调度服务主函数，调度中的节点的合并键相同，节点 service 的 schedule_batch 只会被调用一次
+    :param schedules: 被调度的节点所属的 PipelineProcess 及调度 ID 列表 [(process_id, schedule_id), ...]
+    :return:
+    """
+    nodes = []
+    for process_id, schedule_id in schedules:
+        with schedule_exception_handler(process_id, schedule_id):
+
+            sched_service = lock_schedule(process_id, schedule_id)
+            if sched_service is None:
+                continue
+
+            schedule_context = prepare_schedule(process_id, sched_service)
+            if schedule_context is None:
+                release_schedule_lock(schedule_id)
+                continue
+
+            nodes.append((process_id, sched_service) + schedule_context)
+
+    if not nodes:
+        return
+
+    # batch schedule
+    results, ex_data = None, None
+    try:
+        schedule_nodes = [
+            sched_service.service_act.schedule_node(parent_data, schedule_data)
+            for _, sched_service, parent_data, schedule_data in nodes
+        ]
+        results = schedule_nodes[0].service.schedule_batch(schedule_nodes)
+        if len(results) != len(schedule_nodes):
+            raise exceptions.InvalidOperationException(
+                "schedule_batch return {} results for {} nodes".format(len(results), len(schedule_nodes))
+            )
+    except Exception:
+        results = None
+        ex_data = traceback.format_exc()
+        logging.error(ex_data)
+
+    for i, (process_id, sched_service, parent_data, _) in enumerate(nodes):
+        with schedule_exception_handler(process_id, sched_service.id):
+            service_act = sched_service.service_act
+
+            if results is None:
+                success = ignore_schedule_error(service_act)
             else:
-                Data.objects.write_node_data(service_act)
-                if sched_service.multi_callback_enabled:
-                    sched_service.save()
-                else:
-                    sched_service.set_next_schedule()
+                success = service_act.set_schedule_result(results[i])
+                if success is None:
+                    success = True
+
+            handle_schedule_result(sched_service, parent_data, success, ex_data)
+            release_schedule_lock(sched_service.id)
+
+
+def lock_schedule(process_id, schedule_id, data_id=None):
+    """
+    获取调度并加锁
+    :param process_id: 被调度的节点所属的 PipelineProcess
+    :param schedule_id: 调度 ID
+    :param data_id: 回调数据ID
+    :return: 加锁成功时返回 ScheduleService，否则返回 None
+    """
+    # schedule maybe destroyed by other schedule
+    try:
+        sched_service = ScheduleService.objects.get(id=schedule_id)
+        # stop if schedule status finished
+        if sched_service.is_finished:
+            logger.warning("schedule already finished, give up, sched_id: {}".format(schedule_id))
+            return None
+    except ScheduleService.DoesNotExist:
+        logger.warning("schedule not exist, give up, sched_id: {}".format(schedule_id))
+        return None
+
+    # try update lock schedule, poll schedule will be set next schedule date by set_next_schedule
+    is_updated = ScheduleService.objects.filter(id=schedule_id, is_scheduling=False).update(
+        is_scheduling=True, schedule_date=None
+    )
+
+    # lock failed, other worker may locking
+    if is_updated == 0:
+        if sched_service.schedule_date is not None:
+            # dispatched by schedule poller, it will claim this schedule again after lease expired
+            logger.warning("schedule service lock-{} failed, wait for poller".format(schedule_id))
+            return None
+
+        # retry lock after seconds
+        logger.warning("schedule service lock-{} failed, retry after seconds".format(schedule_id))
+        valve.send(
+            signals,
+            "schedule_ready",
+            sender=ScheduleService,
+            process_id=process_id,
+            schedule_id=schedule_id,
+            data_id=data_id,
+            countdown=2,
+        )
+        return None
+
+    return sched_service
+
+
+def prepare_schedule(process_id, sched_service, data_id=None):
+    """
+    获取调度所需的父流程数据及回调数据
+    :param process_id: 被调度的节点所属的 PipelineProcess
+    :param sched_service: ScheduleService
+    :param data_id: 回调数据ID
+    :return: (parent_data, schedule_data)，放弃调度时返回 None
+    """
+    act_id = sched_service.activity_id
+    version = sched_service.version
+
+    if not Status.objects.filter(id=act_id, version=version).exists():
+        # forced failed
+        logger.warning("schedule service failed, schedule({} - {}) had been forced exit.".format(act_id, version))
+        sched_service.destroy()
+        return None
+
+    # get data
+    parent_data = get_schedule_parent_data(sched_service.id)
+    if parent_data is None:
+        raise exceptions.DataRetrieveError(
+            "child process({}) retrieve parent_data error, sched_id: {}".format(process_id, sched_service.id)
+        )
+
+    # get schedule data
+    if sched_service.multi_callback_enabled and data_id:
+        try:
+            callback_data = MultiCallbackData.objects.get(id=data_id)
+            schedule_data = callback_data.data
+        except MultiCallbackData.DoesNotExist:
+            logger.warning("schedule get callback_data failed, give up schedule, sched_id: {}".format(sched_service.id))
+            return None
+    else:
+        schedule_data = sched_service.callback_data
+
+    return parent_data, schedule_data
+
+
+def ignore_schedule_error(service_act):
+    """
+    调度抛出异常时，忽略可忽略错误的节点的异常
+    :param service_act: 被调度的节点
+    :return: 是否调度成功
+    """
+    if service_act.error_ignorable:
+        service_act.ignore_error()
+        service_act.finish_schedule()
+        return True
+    return False
+
+
+def handle_schedule_result(sched_service, parent_data, success, ex_data):
+    """
+    根据调度结果推进节点状态
+    :param sched_service: ScheduleService
+    :param parent_data: 父流程数据
+    :param success: 是否调度成功
+    :param ex_data: 异常信息
+    :return:
+    """
+    service_act = sched_service.service_act
+    act_id = sched_service.activity_id
+    version = sched_service.version
+
+    sched_service.schedule_times += 1
+    set_schedule_data(sched_service.id, parent_data)
+
+    # schedule failed
+    if not success:
+        if not Status.objects.transit(id=act_id, version=version, to_state=states.FAILED).result:
+            # forced failed
+            logger.warning("FAILED transit failed, schedule({} - {}) had been forced exit.".format(act_id, version))
+            sched_service.destroy()
+            return
+
+        if service_act.timeout:
+            signals.service_activity_timeout_monitor_end.send(
+                sender=service_act.__class__, node_id=service_act.id, version=version
+            )
+            logger.info("node {} {} timeout monitor revoke".format(service_act.id, version))
+
+        Data.objects.write_node_data(service_act, ex_data=ex_data)
+
+        with transaction.atomic():
+            process = PipelineProcess.objects.select_for_update().get(id=sched_service.process_id)
+            if not process.is_alive:
+                logger.info("pipeline %s has been revoked, status adjust failed." % process.root_pipeline_id)
+                return
+
+            process.adjust_status()
+
+        # send activity error signal
+        try:
+            service_act.schedule_fail()
+        except Exception:
+            logger.error("schedule_fail handler fail: %s" % traceback.format_exc())
+
+        signals.service_schedule_fail.send(
+            sender=ScheduleService, activity_shell=service_act, schedule_service=sched_service, ex_data=ex_data
+        )
+
+        valve.send(
+            signals,
+            "activity_failed",
+            sender=process.root_pipeline,
+            pipeline_id=process.root_pipeline_id,
+            pipeline_activity_id=service_act.id,
+            subprocess_id_stack=process.subprocess_stack,
+        )
+        return
+
+    # schedule execute finished or one time callback finished
+    if service_act.is_schedule_done() or sched_service.is_one_time_callback():
+        error_ignorable = not service_act.get_result_bit()
+        if not Status.objects.transit(id=act_id, version=version, to_state=states.FINISHED).result:
+            # forced failed
+            logger.warning("FINISHED transit failed, schedule({} - {}) had been forced exit.".format(act_id, version))
+            sched_service.destroy()
+            return
+
+        if service_act.timeout:
+            signals.service_activity_timeout_monitor_end.send(
+                sender=service_act.__class__, node_id=service_act.id, version=version
+            )
+            logger.info("node {} {} timeout monitor revoke".format(service_act.id, version))
+
+        Data.objects.write_node_data(service_act)
+        if error_ignorable:
+            s = Status.objects.get(id=act_id)
+            s.error_ignorable = True
+            s.save()
+
+        # sync parent data
+        with transaction.atomic():
+            process = PipelineProcess.objects.select_for_update().get(id=sched_service.process_id)
+            if not process.is_alive:
+                logger.warning("schedule({} - {}) revoked.".format(act_id, version))
+                sched_service.destroy()
+                return
+
+            process.top_pipeline.data.update_outputs(parent_data.get_outputs())
+            # extract outputs
+            process.top_pipeline.context.extract_output(service_act)
+            process.save(save_snapshot=True)
+
+        # clear temp data
+        delete_parent_data(sched_service.id)
+        # save schedule service
+        sched_service.finish()
+
+        signals.service_schedule_success.send(
+            sender=ScheduleService, activity_shell=service_act, schedule_service=sched_service
+        )
+
+        valve.send(
+            signals,
+            "wake_from_schedule",
+            sender=ScheduleService,
+            process_id=sched_service.process_id,
+            activity_id=sched_service.activity_id,
+        )
+    else:
+        Data.objects.write_node_data(service_act)
+        if sched_service.multi_callback_enabled:
+            sched_service.save()
+        else:
+            sched_service.set_next_schedule()
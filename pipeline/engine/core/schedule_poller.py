@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import heapq
+import logging
+import time
+import traceback
+from datetime import datetime
+
+from django.conf import settings as django_settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from pipeline.conf import settings
+from pipeline.django_signal_valve import valve
+from pipeline.engine import signals
+from pipeline.engine.models import ScheduleService
+
+logger = logging.getLogger("celery")
+
+
+def _to_datetime(timestamp):
+    value = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return value if django_settings.USE_TZ else timezone.make_naive(value)
+
+
+def _to_timestamp(value):
+    return (timezone.make_aware(value) if timezone.is_naive(value) else value).timestamp()
+
+
+class SchedulePoller(object):
+    """
+    轮询调度分发器，定期通过 schedule_date 索引查询即将到期的调度并放入最小堆中，
+    到期后批量认领并发送到 service_schedule 任务中执行，以替代每次调度发送一个延时任务
+    """
+
+    def __init__(self, interval=None, batch_size=None, lease=None):
+        self.interval = interval or settings.PIPELINE_ENGINE_SCHEDULE_POLLER_INTERVAL
+        self.batch_size = batch_size or settings.PIPELINE_ENGINE_SCHEDULE_POLLER_BATCH_SIZE
+        self.lease = lease or settings.PIPELINE_ENGINE_SCHEDULE_POLLER_LEASE
+        # (due timestamp, schedule_id)
+        self.heap = []
+        # schedule_id -> due timestamp, heap entries not match it are expired
+        self.due = {}
+        self.next_refresh = 0
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def refresh(self, now):
+        """
+        加载在下次刷新前到期的调度
+        :param now: 当前时间戳
+        :return:
+        """
+        schedules = ScheduleService.objects.due_schedules(
+            until=_to_datetime(now + self.interval), limit=self.batch_size
+        )
+        for schedule_id, _, schedule_date in schedules:
+            due = _to_timestamp(schedule_date)
+            if self.due.get(schedule_id) != due:
+                self.due[schedule_id] = due
+                heapq.heappush(self.heap, (due, schedule_id))
+
+        # there are more schedules due, refresh again after dispatch
+        self.next_refresh = now if len(schedules) >= self.batch_size else now + self.interval
+
+    def pop_due(self, now):
+        """
+        弹出所有已经到期的调度
+        :param now: 当前时间戳
+        :return: 到期的调度 ID 列表
+        """
+        schedule_ids = []
+        while self.heap and self.heap[0][0] <= now:
+            due, schedule_id = heapq.heappop(self.heap)
+            if self.due.get(schedule_id) == due:
+                del self.due[schedule_id]
+                schedule_ids.append(schedule_id)
+        return schedule_ids
+
+    def dispatch(self, schedule_ids, now):
+        """
+        认领调度并发送到 service_schedule 任务中执行，合并键相同的调度会合并发送到 service_schedule_batch 任务中
+        :param schedule_ids: 调度 ID 列表
+        :param now: 当前时间戳
+        :return: 发送的调度数量
+        """
+        dispatched = 0
+        for i in range(0, len(schedule_ids), self.batch_size):
+            claimed = ScheduleService.objects.claim_schedules(
+                schedule_ids[i : i + self.batch_size], self.lease, now=_to_datetime(now)
+            )
+            batches = {}
+            for schedule_id, process_id, batch_key in claimed:
+                if batch_key:
+                    batches.setdefault(batch_key, []).append((process_id, schedule_id))
+                else:
+                    self.send(process_id, schedule_id)
+
+            for schedules in batches.values():
+                self.send_batch(schedules)
+
+            dispatched += len(claimed)
+        return dispatched
+
+    def send(self, process_id, schedule_id):
+        valve.send(
+            signals,
+            "schedule_ready",
+            sender=ScheduleService,
+            process_id=process_id,
+            schedule_id=schedule_id,
+            countdown=0,
+        )
+
+    def send_batch(self, schedules):
+        max_size = settings.PIPELINE_ENGINE_SCHEDULE_BATCH_MAX_SIZE
+        for i in range(0, len(schedules), max_size):
+            batch = schedules[i : i + max_size]
+            if len(batch) == 1:
+                self.send(*batch[0])
+            else:
+                valve.send(signals, "schedule_batch_ready", sender=ScheduleService, schedules=batch)
+
+    def run_once(self, now=None):
+        now = now or time.time()
+        if now >= self.next_refresh:
+            self.refresh(now)
+        return self.dispatch(self.pop_due(now), now)
+
+    def wait_seconds(self, now):
+        wake_at = self.next_refresh
+        if self.heap:
+            wake_at = min(wake_at, self.heap[0][0])
+        return max(0, min(wake_at - now, self.interval))
+
+    def run(self):
+        logger.info("schedule poller start")
+        while not self.stopped:
+            try:
+                close_old_connections()
+                self.run_once()
+            except Exception:
+                logger.error("schedule poller run error: {}".format(traceback.format_exc()))
+                # drop cached schedules, they will be loaded in next refresh
+                self.heap = []
+                self.due = {}
+                self.next_refresh = time.time() + self.interval
+
+            time.sleep(self.wait_seconds(time.time()))
+        logger.info("schedule poller stop")
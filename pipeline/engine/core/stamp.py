@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import logging
+import traceback
+
+from pipeline.conf import settings
+from pipeline.engine.core.data.redis_backend import RedisDataBackend
+
+logger = logging.getLogger("celery")
+
+ENGINE_STAMP_KEY = "__pipeline__engine__state__stamp__"
+
+_backend = RedisDataBackend()
+
+
+def enabled():
+    return settings.PIPELINE_ENGINE_STATE_STAMP_ENABLED and getattr(settings, "redis_inst", None) is not None
+
+
+def stamp_key(id):
+    return "%s_state_stamp" % id
+
+
+def bump(id_list):
+    """
+    更新节点的状态戳，节点状态发生变化时调用
+    :param id_list: 节点 ID 列表
+    :return:
+    """
+    if not id_list or not enabled():
+        return
+
+    try:
+        _backend.incr_stamps(
+            keys=[stamp_key(id) for id in id_list], expires=settings.PIPELINE_ENGINE_STATE_STAMP_EXPIRE_SECONDS
+        )
+    except Exception:
+        logger.error("state stamp bump error: {}".format(traceback.format_exc()))
+
+
+def bump_engine():
+    """
+    更新引擎的状态戳，引擎冻结或解冻时调用
+    :return:
+    """
+    if not enabled():
+        return
+
+    try:
+        _backend.incr_stamps(keys=[ENGINE_STAMP_KEY], expires=settings.PIPELINE_ENGINE_STATE_STAMP_EXPIRE_SECONDS)
+    except Exception:
+        logger.error("engine state stamp bump error: {}".format(traceback.format_exc()))
+
+
+def tree_stamp_key(root_pipeline_id):
+    return "%s_status_tree_stamp" % root_pipeline_id
+
+
+def bump_tree(root_pipeline_id_list):
+    """
+    更新 pipeline 状态树的状态戳，流程中任意节点的状态发生变化时调用
+    :param root_pipeline_id_list: 根 pipeline ID 列表
+    :return:
+    """
+    root_pipeline_id_list = [i for i in root_pipeline_id_list if i]
+    if not root_pipeline_id_list or not enabled():
+        return
+
+    try:
+        _backend.incr_stamps(
+            keys=[tree_stamp_key(id) for id in set(root_pipeline_id_list)],
+            expires=settings.PIPELINE_ENGINE_STATE_STAMP_EXPIRE_SECONDS,
+        )
+    except Exception:
+        logger.error("status tree stamp bump error: {}".format(traceback.format_exc()))
+
+
+def tree_stamp_for(root_pipeline_id):
+    """
+    获取 pipeline 状态树当前的状态戳
+    :param root_pipeline_id: 根 pipeline ID
+    :return: 状态戳，未开启或获取失败时返回 None
+    """
+    if not enabled():
+        return None
+
+    try:
+        value = _backend.get_stamps([tree_stamp_key(root_pipeline_id)])[0]
+    except Exception:
+        logger.error("status tree stamp get error: {}".format(traceback.format_exc()))
+        return None
+
+    return int(value) if value else 0
+
+
+def stamps_for(id_list):
+    """
+    获取节点及引擎当前的状态戳
+    :param id_list: 节点 ID 列表
+    :return: (keys, stamps)，获取失败时返回 None
+    """
+    keys = tuple([ENGINE_STAMP_KEY] + [stamp_key(id) for id in id_list])
+    try:
+        return keys, tuple(_backend.get_stamps(keys))
+    except Exception:
+        logger.error("state stamp get error: {}".format(traceback.format_exc()))
+        return None
+
+
+class StateChecker(object):
+    """
+    记录进程上一次通过休眠及冻结检测时的状态戳，状态戳未发生变化时可以跳过 DB 检测
+    """
+
+    def __init__(self, process, enable=None):
+        self.process = process
+        self.enable = enabled() if enable is None else enable
+        self._checked = None
+        self._pending = None
+
+    def unchanged(self):
+        """
+        root pipeline、子流程栈及引擎的状态自上次检测后是否未发生变化
+        :return:
+        """
+        if not self.enable:
+            return False
+
+        # 必须在 DB 检测前读取状态戳，保证检测过程中发生的状态变化能在下一次检测时被感知
+        id_list = [self.process.root_pipeline.id] + list(self.process.subprocess_stack)
+        self._pending = stamps_for(id_list)
+        return self._pending is not None and self._pending == self._checked
+
+    def mark_checked(self):
+        """
+        标记当前进程通过了 DB 检测
+        :return:
+        """
+        if not self.enable:
+            return
+
+        self._checked = self._pending
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("engine", "0027_sendfailedcelerytask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="status",
+            name="parent_id",
+            field=models.CharField(default="", max_length=32, verbose_name="父 pipeline 的 ID"),
+        ),
+        migrations.AddField(
+            model_name="status",
+            name="root_pipeline_id",
+            field=models.CharField(db_index=True, default="", max_length=32, verbose_name="根 pipeline 的 ID"),
+        ),
+    ]
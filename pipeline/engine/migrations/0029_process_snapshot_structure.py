@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 08:55
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("engine", "0028_status_tree_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SnapshotStructure",
+            fields=[
+                ("key", models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name="结构标识")),
+                ("data", models.BinaryField(verbose_name="流程结构数据")),
+                ("last_used", models.DateTimeField(db_index=True, verbose_name="最近使用时间")),
+            ],
+        ),
+        migrations.AddField(
+            model_name="processsnapshot",
+            name="delta",
+            field=models.BinaryField(null=True, verbose_name="pipeline 运行时状态"),
+        ),
+        migrations.AddField(
+            model_name="processsnapshot",
+            name="structure_key",
+            field=models.CharField(db_index=True, default="", max_length=32, verbose_name="流程结构标识"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 09:03
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("engine", "0029_process_snapshot_structure"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduleservice",
+            name="schedule_date",
+            field=models.DateTimeField(db_index=True, null=True, verbose_name="下次轮询调度时间"),
+        ),
+    ]
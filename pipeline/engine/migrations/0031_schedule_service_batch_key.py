@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 09:09
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("engine", "0030_schedule_service_schedule_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scheduleservice",
+            name="batch_key",
+            field=models.CharField(default="", max_length=32, verbose_name="轮询调度合并键"),
+        ),
+    ]
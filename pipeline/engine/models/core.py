@@ -13,8 +13,12 @@ specific language governing permissions and limitations under the License.
 
 import ujson as json
 import contextlib
+import hashlib
 import logging
+import pickle
 import traceback
+from datetime import timedelta
+from functools import lru_cache
 
 from celery import current_app
 from celery.task.control import revoke
@@ -28,10 +32,13 @@ from pipeline.core.data.base import DataObject
 from pipeline.core.pipeline import Pipeline
 from pipeline.django_signal_valve import valve
 from pipeline.engine import exceptions, signals, states, utils
+from pipeline.engine import snapshot as snapshot_serializer
 from pipeline.engine.core import data as data_service
+from pipeline.engine.core import stamp
 from pipeline.engine.models.fields import IOField
 from pipeline.engine.utils import ActionResult, Stack, calculate_elapsed_time
 from pipeline.log.models import LogEntry
+from pipeline.utils import codec
 from pipeline.utils.uniqid import node_uniqid, uniqid
 
 logger = logging.getLogger("celery")
@@ -53,12 +60,120 @@ class ProcessSnapshotManager(models.Manager):
         return self.create(data=data)
 
 
+class SnapshotStructureManager(models.Manager):
+    def acquire(self, key, data):
+        """
+        刷新结构的最近使用时间，结构不存在时进行创建
+        :param key: 结构标识
+        :param data: 压缩后的结构数据
+        :return:
+        """
+        now = timezone.now()
+        if not self.filter(key=key).update(last_used=now):
+            self.get_or_create(key=key, defaults={"data": data, "last_used": now})
+
+    def clean_unused(self, expire_seconds):
+        """
+        删除超过 expire_seconds 未被使用且没有快照引用的结构
+        :param expire_seconds: 结构保留时间
+        :return: 删除的结构数量
+        """
+        expired = self.filter(last_used__lt=timezone.now() - timedelta(seconds=expire_seconds))
+        used = ProcessSnapshot.objects.exclude(structure_key="").values_list("structure_key", flat=True)
+        return expired.exclude(key__in=used).delete()[0]
+
+
+class SnapshotStructure(models.Model):
+    key = models.CharField(_("结构标识"), max_length=32, primary_key=True)
+    data = models.BinaryField(verbose_name=_("流程结构数据"))
+    last_used = models.DateTimeField(_("最近使用时间"), db_index=True)
+
+    objects = SnapshotStructureManager()
+
+
+@lru_cache(maxsize=pipeline_settings.PIPELINE_ENGINE_SNAPSHOT_STRUCTURE_CACHE_SIZE)
+def _structure_raw(key):
+    # structure is keyed by its digest, so cached content never expire
+    return codec.decompress(SnapshotStructure.objects.get(key=key).data)
+
+
+def _snapshot_digest(structure_key, raw):
+    return hashlib.md5(structure_key.encode("utf-8") + raw).hexdigest()
+
+
 class ProcessSnapshot(models.Model):
     id = models.BigAutoField(_("ID"), primary_key=True)
     data = IOField(verbose_name=_("pipeline 运行时数据"))
+    structure_key = models.CharField(_("流程结构标识"), max_length=32, default="", db_index=True)
+    delta = models.BinaryField(_("pipeline 运行时状态"), null=True)
 
     objects = ProcessSnapshotManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(ProcessSnapshot, cls).from_db(db, field_names, values)
+        if "data" not in instance.__dict__:
+            return instance
+
+        if instance.__dict__.get("structure_key") and instance.__dict__.get("delta") is not None:
+            objects = snapshot_serializer.load_structure(_structure_raw(instance.structure_key))
+            instance.data = snapshot_serializer.load_state(codec.decompress(instance.delta), objects)
+            instance.delta = None
+            index = snapshot_serializer.object_index(objects)
+            instance._structure = (instance.data, objects, index, instance.structure_key)
+
+            # pickle of loaded objects may differ from the stored one, so the digest is computed from loaded data
+            if pipeline_settings.PIPELINE_ENGINE_SNAPSHOT_DELTA_ENABLED:
+                raw = snapshot_serializer.dump_state(instance.data, objects, index)
+                instance._digest = _snapshot_digest(instance.structure_key, raw)
+
+        # without delta, the first save after load always writes, skip the extra pickle on load
+        return instance
+
+    def save(self, *args, **kwargs):
+        if pipeline_settings.PIPELINE_ENGINE_SNAPSHOT_DELTA_ENABLED:
+            structure_key, raw = self._dump_delta()
+        else:
+            structure_key, raw = "", pickle.dumps(self.data, codec.pickle_protocol())
+
+        digest = _snapshot_digest(structure_key, raw)
+        if not self._state.adding and digest == getattr(self, "_digest", None):
+            # nothing changed since last load or save
+            return
+
+        data = self.data
+        if structure_key:
+            self.data = codec.Encoded(codec.encode(None))
+            self.delta = codec.compress(raw)
+        else:
+            self.data = codec.Encoded(codec.compress(raw))
+            self.delta = None
+        self.structure_key = structure_key
+
+        try:
+            super(ProcessSnapshot, self).save(*args, **kwargs)
+        finally:
+            self.data = data
+            self.delta = None
+
+        self._digest = digest
+
+    def _dump_delta(self):
+        """
+        序列化运行时状态，流程结构发生变化时重新生成结构
+        :return: (结构标识, 序列化后的运行时状态)
+        """
+        structure = getattr(self, "_structure", None)
+        if structure is None or structure[0] is not self.data:
+            objects = snapshot_serializer.collect_structure(self.data)
+            raw = snapshot_serializer.dump_structure(objects)
+            key = hashlib.md5(raw).hexdigest()
+            SnapshotStructure.objects.acquire(key, codec.compress(raw))
+            structure = self._structure = (self.data, objects, snapshot_serializer.object_index(objects), key)
+
+        _, objects, index, key = structure
+        return key, snapshot_serializer.dump_state(self.data, objects, index)
+
     @property
     def pipeline_stack(self):
         return self.data["_pipeline_stack"]
@@ -80,6 +195,8 @@ class ProcessSnapshot(models.Model):
 
     def prune_top_pipeline(self, keep_from, keep_to):
         self.data["_pipeline_stack"].top().prune(keep_from, keep_to)
+        # flows of pipeline structure changed
+        self._structure = None
 
 
 class ProcessManager(models.Manager):
@@ -114,36 +231,57 @@ class ProcessManager(models.Manager):
         :param destination_id:
         :return:
         """
-        # init runtime info
+        return self.fork_children(parent, [current_node_id], destination_id)[0]
 
+    def fork_children(self, parent, current_node_ids, destination_id):
+        """
+        批量创建上下文信息与当前 parent 一致的 child process
+        :param parent:
+        :param current_node_ids: 每个 child 的起始节点 ID
+        :param destination_id: child 的终点节点 ID
+        :return: 与 current_node_ids 顺序一致的 child 列表
+        """
         # clear parent's change
         parent.top_pipeline.context.clear_change_keys()
 
-        pipeline_stack = Stack([parent.top_pipeline])
-        root_pipeline_shell = parent.root_pipeline.shell()
-        snapshot = ProcessSnapshot.objects.create_snapshot(
-            pipeline_stack=pipeline_stack,
-            children=[],
-            root_pipeline=root_pipeline_shell,
-            subprocess_stack=parent.subprocess_stack,
+        # every child loads its own copy from the same dumps, avoid keep the same ref to parent.top_pipeline
+        shared = pickle.dumps(
+            {
+                "_pipeline_stack": Stack([parent.top_pipeline]),
+                "_subprocess_stack": parent.subprocess_stack,
+                "_children": [],
+                "_root_pipeline": parent.root_pipeline.shell(),
+            },
+            pipeline_settings.PIPELINE_DATA_PICKLE_PROTOCOL,
         )
-        # refresh first, avoid keep the same ref to parent.top_pipeline
-        snapshot.refresh_from_db()
-        snapshot.prune_top_pipeline(current_node_id, destination_id)
-        snapshot.save()
 
-        child = self.create(
-            id=node_uniqid(),
-            root_pipeline_id=parent.root_pipeline.id,
-            current_node_id=current_node_id,
-            destination_id=destination_id,
-            parent_id=parent.id,
-            snapshot=snapshot,
-        )
-        for subproc_id in parent.subprocess_stack:
-            SubProcessRelationship.objects.add_relation(subproc_id, child.id)
+        children = []
+        relationships = []
+        with transaction.atomic():
+            for current_node_id in current_node_ids:
+                # bulk_create can not set auto increment pk of snapshot on mysql, so snapshots are saved one by one
+                snapshot = ProcessSnapshot(data=pickle.loads(shared))
+                snapshot.prune_top_pipeline(current_node_id, destination_id)
+                snapshot.save()
+
+                child = self.model(
+                    id=node_uniqid(),
+                    root_pipeline_id=parent.root_pipeline.id,
+                    current_node_id=current_node_id,
+                    destination_id=destination_id,
+                    parent_id=parent.id,
+                    snapshot=snapshot,
+                )
+                children.append(child)
+                relationships.extend(
+                    SubProcessRelationship(subprocess_id=subproc_id, process_id=child.id)
+                    for subproc_id in parent.subprocess_stack
+                )
+
+            self.bulk_create(children)
+            SubProcessRelationship.objects.bulk_create(relationships)
 
-        return child
+        return children
 
     def process_ready(self, process_id, current_node_id=None, call_from_child=False):
         """
@@ -662,6 +800,15 @@ class RelationshipManager(models.Manager):
         if self.filter(ancestor_id=ancestor_id, descendant_id=descendant_id).exists():
             # already build
             return
+        self.build_relationship_for_new_node(ancestor_id, descendant_id)
+
+    def build_relationship_for_new_node(self, ancestor_id, descendant_id):
+        """
+        为首次执行的节点建立关系，调用方需保证 descendant_id 的关系尚未建立
+        :param ancestor_id: 节点所在的 pipeline ID
+        :param descendant_id: 节点 ID
+        :return:
+        """
         ancestors = self.filter(descendant_id=ancestor_id)
         relationships = [
             NodeRelationship(
@@ -731,6 +878,7 @@ class StatusManager(models.Manager):
 
         # reservation or first creation
         if created:
+            transaction.on_commit(lambda: stamp.bump([id]))
             return ActionResult(result=True, message="success", extra=status)
 
         with transaction.atomic():
@@ -800,6 +948,7 @@ class StatusManager(models.Manager):
                 status.state = to_state
                 status.state_refresh_at = timezone.now()
                 status.save()
+                transaction.on_commit(lambda: stamp.bump([id]))
                 return ActionResult(result=True, message="success", extra=status)
             else:
                 return ActionResult(
@@ -831,6 +980,78 @@ class StatusManager(models.Manager):
             kwargs["state"] = from_state
         with transaction.atomic():
             self.select_for_update().filter(**kwargs).update(state=state)
+        transaction.on_commit(lambda: stamp.bump(kwargs["id__in"]))
+
+        if stamp.enabled():
+            root_pipeline_ids = set(self.filter(id__in=kwargs["id__in"]).values_list("root_pipeline_id", flat=True))
+            transaction.on_commit(lambda: stamp.bump_tree(root_pipeline_ids))
+
+    def handoff(self, node, next_id, pipeline_id, root_pipeline_id, next_name="", error_ignorable=False):
+        """
+        在同一个事务中完成当前节点，并将下一个节点转换为 RUNNING 状态、建立下一个节点与 pipeline 的关系
+        :param node: 需要完成的节点
+        :param next_id: 下一个节点 ID
+        :param pipeline_id: 下一个节点所在的 pipeline ID
+        :param root_pipeline_id: 根 pipeline ID
+        :param next_name: 下一个节点名称
+        :param error_ignorable: 当前节点是否是出错后自动忽略
+        :return: (完成当前节点的结果, 下一个节点转换为 RUNNING 的结果)，当前节点完成失败时后者为 None
+        """
+        with transaction.atomic():
+            try:
+                status = self.select_for_update().get(id=node.id)
+            except Status.DoesNotExist:
+                return ActionResult(result=False, message="node not exists or not be executed yet"), None
+
+            if not states.can_transit(from_state=status.state, to_state=states.FINISHED):
+                return (
+                    ActionResult(
+                        result=False,
+                        message="can't transit state({}) from {} to {}".format(
+                            node.id, status.state, states.FINISHED
+                        ),
+                        extra=status,
+                    ),
+                    None,
+                )
+
+            now = timezone.now()
+            status.state = states.FINISHED
+            status.archived_time = now
+            status.state_refresh_at = now
+            if error_ignorable:
+                status.error_ignorable = True
+            status.save()
+            Data.objects.write_node_data(node)
+            transaction.on_commit(lambda: stamp.bump([node.id]))
+            finish_res = ActionResult(result=True, message="success", extra=status)
+
+            if self.filter(id=next_id).exists():
+                # rerun, follow the normal transit path
+                start_res = self.transit(
+                    id=next_id, to_state=states.RUNNING, start=True, name=next_name
+                )
+                if start_res.result:
+                    if pipeline_settings.PIPELINE_ENGINE_CLOSURE_RELATIONSHIP_ENABLED:
+                        NodeRelationship.objects.build_relationship(pipeline_id, next_id)
+                    self.bind_tree(next_id, parent_id=pipeline_id, root_pipeline_id=root_pipeline_id)
+                return finish_res, start_res
+
+            next_status = self.create(
+                id=next_id,
+                name=next_name,
+                state=states.RUNNING,
+                version=uniqid(),
+                started_time=now,
+                state_refresh_at=now,
+                root_pipeline_id=root_pipeline_id,
+                parent_id=pipeline_id,
+            )
+            if pipeline_settings.PIPELINE_ENGINE_CLOSURE_RELATIONSHIP_ENABLED:
+                NodeRelationship.objects.build_relationship_for_new_node(pipeline_id, next_id)
+            transaction.on_commit(lambda: stamp.bump([next_id]))
+
+        return finish_res, ActionResult(result=True, message="success", extra=next_status)
 
     def state_for(self, id, may_not_exist=False, version=None):
         """
@@ -856,6 +1077,19 @@ class StatusManager(models.Manager):
     def states_for(self, id_list):
         return [s.state for s in self.filter(id__in=id_list)]
 
+    def bind_tree(self, id, parent_id, root_pipeline_id):
+        """
+        记录节点所在的父 pipeline 及根 pipeline，用于一次查询出整个流程的状态树
+        :param id: 节点 ID
+        :param parent_id: 父 pipeline ID，根 pipeline 为空字符串
+        :param root_pipeline_id: 根 pipeline ID
+        :return:
+        """
+        updated = self.filter(id=id, root_pipeline_id="").update(parent_id=parent_id, root_pipeline_id=root_pipeline_id)
+        if updated:
+            transaction.on_commit(lambda: stamp.bump_tree([root_pipeline_id]))
+        return updated
+
     def prepare_for_pipeline(self, pipeline):
         cls_str = str(pipeline.__class__)
         cls_name = pipeline.__class__.__name__[:NAME_MAX_LENGTH]
@@ -997,12 +1231,21 @@ class Status(models.Model):
     archived_time = models.DateTimeField(_("归档时间"), null=True)
     version = models.CharField(_("版本"), max_length=32)
     state_refresh_at = models.DateTimeField(_("上次状态更新的时间"), null=True)
+    root_pipeline_id = models.CharField(_("根 pipeline 的 ID"), max_length=32, default="", db_index=True)
+    parent_id = models.CharField(_("父 pipeline 的 ID"), max_length=32, default="")
 
     objects = StatusManager()
 
     class Meta:
         ordering = ["-created_time"]
 
+    def save(self, *args, **kwargs):
+        super(Status, self).save(*args, **kwargs)
+        # notify the status tree of root pipeline changed
+        if self.root_pipeline_id:
+            root_pipeline_id = self.root_pipeline_id
+            transaction.on_commit(lambda: stamp.bump_tree([root_pipeline_id]))
+
     def is_state_for_subproc(self):
         return self.name.endswith("SubProcess")
 
@@ -1116,6 +1359,27 @@ class History(models.Model):
     objects = HistoryManager()
 
 
+def _schedule_batch_key(service_act, parent_data):
+    key = service_act.schedule_batch_key(parent_data)
+    if key is None:
+        return ""
+
+    # different services may return same key
+    service_cls = service_act.service.__class__
+    key = "{}.{}:{}".format(service_cls.__module__, service_cls.__name__, key)
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+def _poll_schedule_date(count_down, batch_key):
+    schedule_date = timezone.now() + timedelta(seconds=count_down)
+    if batch_key:
+        # align to poller interval, so schedules with same batch key due in one interval can be claimed together
+        interval = timedelta(seconds=pipeline_settings.PIPELINE_ENGINE_SCHEDULE_POLLER_INTERVAL)
+        elapsed = schedule_date - schedule_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        schedule_date += (interval - elapsed % interval) % interval
+    return schedule_date
+
+
 class ScheduleServiceManager(models.Manager):
     def set_schedule(self, activity_id, service_act, process_id, version, parent_data):
         wait_callback = service_act.service.interval is None
@@ -1133,14 +1397,19 @@ class ScheduleServiceManager(models.Manager):
 
         if not wait_callback:
             count_down = service_act.service.interval.next()
-            valve.send(
-                signals,
-                "schedule_ready",
-                sender=ScheduleService,
-                process_id=process_id,
-                schedule_id=schedule.id,
-                countdown=count_down,
-            )
+            if pipeline_settings.PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED:
+                schedule.batch_key = _schedule_batch_key(service_act, parent_data)
+                schedule.schedule_date = _poll_schedule_date(count_down, schedule.batch_key)
+                self.filter(id=schedule.id).update(schedule_date=schedule.schedule_date, batch_key=schedule.batch_key)
+            else:
+                valve.send(
+                    signals,
+                    "schedule_ready",
+                    sender=ScheduleService,
+                    process_id=process_id,
+                    schedule_id=schedule.id,
+                    countdown=count_down,
+                )
 
         return schedule
 
@@ -1150,6 +1419,40 @@ class ScheduleServiceManager(models.Manager):
     def delete_schedule(self, activity_id, version):
         return self.filter(activity_id=activity_id, version=version).delete()
 
+    def due_schedules(self, until, limit):
+        """
+        获取 until 之前到期的轮询调度
+        :param until: 截止时间
+        :param limit: 最大数量
+        :return: [(schedule_id, process_id, schedule_date), ...]
+        """
+        return list(
+            self.filter(schedule_date__lte=until)
+            .order_by("schedule_date")
+            .values_list("id", "process_id", "schedule_date")[:limit]
+        )
+
+    def claim_schedules(self, schedule_ids, lease_seconds, now=None):
+        """
+        认领已经到期的调度，并将其下次调度时间推迟 lease_seconds，调度未被执行时会在租期过后被再次认领
+        :param schedule_ids: 调度 ID 列表
+        :param lease_seconds: 租期
+        :param now: 当前时间，默认为 timezone.now()
+        :return: 认领成功的 [(schedule_id, process_id, batch_key), ...]
+        """
+        now = now or timezone.now()
+        with transaction.atomic():
+            claimed = list(
+                self.select_for_update()
+                .filter(id__in=schedule_ids, schedule_date__lte=now)
+                .values_list("id", "process_id", "batch_key")
+            )
+            if claimed:
+                self.filter(id__in=[schedule[0] for schedule in claimed]).update(
+                    schedule_date=now + timedelta(seconds=lease_seconds)
+                )
+        return claimed
+
     def update_celery_info(
         self, id, lock, celery_id, schedule_date, is_scheduling=False
     ):
@@ -1177,6 +1480,8 @@ class ScheduleService(models.Model):
     is_finished = models.BooleanField(_("是否已完成"), default=False)
     version = models.CharField(_("Activity 的版本"), max_length=32, db_index=True)
     is_scheduling = models.BooleanField(_("是否正在被调度"), default=False, db_index=True)
+    schedule_date = models.DateTimeField(_("下次轮询调度时间"), null=True, db_index=True)
+    batch_key = models.CharField(_("轮询调度合并键"), max_length=32, default="")
 
     objects = ScheduleServiceManager()
 
@@ -1187,6 +1492,13 @@ class ScheduleService(models.Model):
             )
         count_down = self.service_act.service.interval.next()
         self.is_scheduling = False
+        if pipeline_settings.PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED:
+            # schedule poller will dispatch it when due
+            self.schedule_date = _poll_schedule_date(count_down, self.batch_key)
+            self.save()
+            ScheduleCeleryTask.objects.unbind(self.id)
+            return
+
         self.save()
         ScheduleCeleryTask.objects.unbind(self.id)
 
@@ -1209,6 +1521,7 @@ class ScheduleService(models.Model):
         self.is_finished = True
         self.service_act = None
         self.is_scheduling = False
+        self.schedule_date = None
         self.save()
         ScheduleCeleryTask.objects.destroy(self.id)
 
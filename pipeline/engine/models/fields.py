@@ -11,31 +11,32 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
-import pickle
 import traceback
-import zlib
 
 from django.db import models
 
+from pipeline.utils import codec
 from pipeline.utils.utils import convert_bytes_to_str
 
 
 class IOField(models.BinaryField):
-    def __init__(self, compress_level=6, *args, **kwargs):
+    def __init__(self, compress_level=None, *args, **kwargs):
         super(IOField, self).__init__(*args, **kwargs)
         self.compress_level = compress_level
 
     def get_prep_value(self, value):
         value = super(IOField, self).get_prep_value(value)
-        return zlib.compress(pickle.dumps(value), self.compress_level)
+        if isinstance(value, codec.Encoded):
+            return value.data
+        return codec.encode(value, level=self.compress_level)
 
     def to_python(self, value):
         try:
             value = super(IOField, self).to_python(value)
-            return pickle.loads(zlib.decompress(value))
+            return codec.decode(value)
         except UnicodeDecodeError:
             # py2 pickle data process
-            return convert_bytes_to_str(pickle.loads(zlib.decompress(value), encoding="bytes"))
+            return convert_bytes_to_str(codec.decode(value, encoding="bytes"))
         except Exception:
             return "IOField to_python raise error: {}".format(traceback.format_exc())
 
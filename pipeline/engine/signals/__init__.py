@@ -21,6 +21,7 @@ process_ready = Signal(providing_args=["parent_id", "current_node_id", "call_fro
 batch_process_ready = Signal(providing_args=["process_id_list", "pipeline_id"])
 wake_from_schedule = Signal(providing_args=["process_id, activity_id"])
 schedule_ready = Signal(providing_args=["schedule_id", "countdown", "process_id", "data_id"])
+schedule_batch_ready = Signal(providing_args=["schedules"])
 process_unfreeze = Signal(providing_args=["process_id"])
 # activity failed signal
 activity_failed = Signal(providing_args=["pipeline_id", "pipeline_activity_id", "subprocess_id_stack"])
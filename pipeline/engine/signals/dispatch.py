@@ -73,6 +73,12 @@ def dispatch_schedule_ready():
     )
 
 
+def dispatch_schedule_batch_ready():
+    signals.schedule_batch_ready.connect(
+        handlers.schedule_batch_ready_handler, sender=models.ScheduleService, dispatch_uid="_schedule_batch_ready"
+    )
+
+
 def dispatch_process_unfreeze():
     signals.process_unfreeze.connect(
         handlers.process_unfreeze_handler, sender=models.PipelineProcess, dispatch_uid="_process_unfreeze"
@@ -103,6 +109,7 @@ def dispatch():
     dispatch_batch_process_ready()
     dispatch_wake_from_schedule()
     dispatch_schedule_ready()
+    dispatch_schedule_batch_ready()
     dispatch_process_unfreeze()
     dispatch_service_activity_timeout_monitor_start()
     dispatch_service_activity_timeout_monitor_end()
@@ -173,6 +173,23 @@ def schedule_ready_handler(
         )
 
 
+def schedule_batch_ready_handler(sender, schedules, **kwargs):
+    task = tasks.service_schedule_batch
+    # schedules in one batch share same service, use the first process's queue and priority
+    args_resolver = CeleryTaskArgsResolver(schedules[0][0])
+
+    kwargs = {"args": [schedules], **args_resolver.resolve_args(task)}
+
+    with celery_task_send_fail_pass():
+        with SendFailedCeleryTask.watch(
+            name=task.name,
+            kwargs=kwargs,
+            type=SendFailedCeleryTask.TASK_TYPE_EMPTY,
+            extra_kwargs={},
+        ):
+            task.apply_async(**kwargs)
+
+
 def service_activity_timeout_monitor_start_handler(
     sender, node_id, version, root_pipeline_id, countdown, **kwargs
 ):
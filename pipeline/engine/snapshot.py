@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import io
+import pickle
+
+from pipeline.core.flow.base import FlowNode, SequenceFlow, SequenceFlowCollection
+from pipeline.core.flow.gateway import Condition
+from pipeline.core.pipeline import Pipeline, PipelineSpec
+from pipeline.utils.codec import pickle_protocol
+
+# ProcessSnapshot 中的流程对象图被拆分为两部分：
+# 结构（structure）：流程、节点间的连线及条件等解析后不再变化的属性，相同结构只存储一次
+# 状态（state）：节点数据、service 运行时属性、上下文及进程栈等运行时会变化的部分，每次保存时写入
+# 结构中的属性只会被 PipelineSpec.prune 修改，修改后需要调用方重新生成结构
+# 结构中不能包含引用上下文的对象（如节点重入数据 _prepared_inputs 中的 SpliceVariable），否则上下文会被冻结在结构中
+STRUCTURE_ATTRS = (
+    (Pipeline, None),
+    (SequenceFlow, None),
+    (SequenceFlowCollection, None),
+    (Condition, None),
+    (PipelineSpec, {"start_event", "end_event", "flows", "activities", "gateways", "objects"}),
+    (FlowNode, {"id", "name", "incoming", "outgoing", "conditions", "pipeline"}),
+)
+STRUCTURE_TYPES = tuple(cls for cls, _ in STRUCTURE_ATTRS)
+
+
+def _structure_attrs(obj):
+    for cls, attrs in STRUCTURE_ATTRS:
+        if isinstance(obj, cls):
+            return attrs
+    return None
+
+
+def _obj_state(obj):
+    # FlowNode.__getstate__ drop runtime logger
+    getstate = getattr(obj, "__getstate__", None)
+    state = getstate() if getstate else obj.__dict__
+    return state if state is not None else {}
+
+
+def _split_state(obj):
+    """
+    将对象的属性拆分为结构属性及状态属性
+    :param obj: 结构对象
+    :return: (结构属性, 状态属性)
+    """
+    attrs = _structure_attrs(obj)
+    state = _obj_state(obj)
+    if attrs is None:
+        return dict(state), {}
+
+    static, mutable = {}, {}
+    for key, value in state.items():
+        if key in attrs:
+            static[key] = value
+        else:
+            mutable[key] = value
+    return static, mutable
+
+
+def collect_structure(data):
+    """
+    收集快照数据中所有可以从流程栈及根流程访问到的结构对象
+    :param data: ProcessSnapshot.data
+    :return: 结构对象列表，对象在列表中的下标即为其引用标识
+    """
+    objects = []
+    index = {}
+    pending = []
+
+    def add(value):
+        if isinstance(value, STRUCTURE_TYPES) and id(value) not in index:
+            index[id(value)] = len(objects)
+            objects.append(value)
+            pending.append(value)
+
+    def add_all(value):
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                add(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                add(item)
+        else:
+            add(value)
+
+    for pipeline in data["_pipeline_stack"]:
+        add(pipeline)
+    add(data["_root_pipeline"])
+
+    while pending:
+        static, _ = _split_state(pending.pop())
+        for value in static.values():
+            add_all(value)
+
+    return objects
+
+
+class _RefPickler(pickle.Pickler):
+    def __init__(self, file, protocol, index):
+        super(_RefPickler, self).__init__(file, protocol)
+        self.index = index
+
+    def persistent_id(self, obj):
+        return self.index.get(id(obj))
+
+
+class _RefUnpickler(pickle.Unpickler):
+    def __init__(self, file, objects):
+        super(_RefUnpickler, self).__init__(file)
+        self.objects = objects
+
+    def persistent_load(self, pid):
+        return self.objects[pid]
+
+
+def object_index(objects):
+    return {id(obj): i for i, obj in enumerate(objects)}
+
+
+def dump_structure(objects):
+    """
+    序列化结构对象的类型及结构属性，对象之间的引用被替换为其下标
+    :param objects: collect_structure 返回的结构对象列表
+    :return: bytes
+    """
+    buffer = io.BytesIO()
+    pickler = _RefPickler(buffer, pickle_protocol(), object_index(objects))
+    # 类型需要先于属性加载，以便在加载属性前创建出所有被引用的对象
+    pickler.dump([obj.__class__ for obj in objects])
+    pickler.dump([_split_state(obj)[0] for obj in objects])
+    return buffer.getvalue()
+
+
+def load_structure(raw):
+    """
+    反序列化结构，返回的对象只包含结构属性
+    :param raw: dump_structure 的返回值
+    :return: 结构对象列表
+    """
+    objects = []
+    unpickler = _RefUnpickler(io.BytesIO(raw), objects)
+    for cls in unpickler.load():
+        objects.append(cls.__new__(cls))
+    for obj, static in zip(objects, unpickler.load()):
+        obj.__dict__.update(static)
+    return objects
+
+
+def dump_state(data, objects, index):
+    """
+    序列化快照数据及结构对象的状态属性，结构对象被替换为其下标
+    :param data: ProcessSnapshot.data
+    :param objects: 结构对象列表
+    :param index: object_index 返回的对象下标索引
+    :return: bytes
+    """
+    mutable = {}
+    for i, obj in enumerate(objects):
+        attrs = _split_state(obj)[1]
+        if attrs:
+            mutable[i] = attrs
+
+    buffer = io.BytesIO()
+    _RefPickler(buffer, pickle_protocol(), index).dump((data, mutable))
+    return buffer.getvalue()
+
+
+def load_state(raw, objects):
+    """
+    反序列化快照数据，并将状态属性设置回结构对象中
+    :param raw: dump_state 的返回值
+    :param objects: load_structure 返回的结构对象列表
+    :return: ProcessSnapshot.data
+    """
+    data, mutable = _RefUnpickler(io.BytesIO(raw), objects).load()
+    for i, attrs in mutable.items():
+        objects[i].__dict__.update(attrs)
+    return data
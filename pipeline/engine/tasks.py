@@ -22,7 +22,14 @@ from pipeline.core.pipeline import Pipeline
 from pipeline.engine import api, signals, states
 from pipeline.engine.core import runtime, schedule
 from pipeline.engine.health import zombie
-from pipeline.engine.models import NodeCeleryTask, NodeRelationship, PipelineProcess, ProcessCeleryTask, Status
+from pipeline.engine.models import (
+    NodeCeleryTask,
+    NodeRelationship,
+    PipelineProcess,
+    ProcessCeleryTask,
+    SnapshotStructure,
+    Status,
+)
 
 logger = logging.getLogger("celery")
 
@@ -51,7 +58,9 @@ def start(process_id):
         logger.warning("can not start pipeline({}), message: {}".format(pipeline_id, action_result.message))
         return
 
-    NodeRelationship.objects.build_relationship(pipeline_id, pipeline_id)
+    if default_settings.PIPELINE_ENGINE_CLOSURE_RELATIONSHIP_ENABLED:
+        NodeRelationship.objects.build_relationship(pipeline_id, pipeline_id)
+    Status.objects.bind_tree(pipeline_id, parent_id="", root_pipeline_id=pipeline_id)
 
     runtime.run_loop(process)
 
@@ -129,6 +138,11 @@ def service_schedule(process_id, schedule_id, data_id=None):
     schedule.schedule(process_id, schedule_id, data_id)
 
 
+@task(ignore_result=True)
+def service_schedule_batch(schedules):
+    schedule.schedule_batch(schedules)
+
+
 @task(ignore_result=True)
 def node_timeout_check(node_id, version, root_pipeline_id):
     NodeCeleryTask.objects.destroy(node_id)
@@ -156,3 +170,9 @@ def heal_zombie_process():
         logger.exception("An error occurred when healing zombies")
 
     logger.info("Zombie process heal finish")
+
+
+@periodic_task(run_every=(crontab(**default_settings.ENGINE_SNAPSHOT_STRUCTURE_CLEAN_CRON)), ignore_result=True)
+def clean_unused_snapshot_structure():
+    del_num = SnapshotStructure.objects.clean_unused(default_settings.PIPELINE_ENGINE_SNAPSHOT_STRUCTURE_EXPIRE_SECONDS)
+    logger.info("%s snapshot structures are deleted" % del_num)
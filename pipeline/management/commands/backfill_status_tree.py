@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from pipeline.engine.models import NodeRelationship, Status
+
+
+class Command(BaseCommand):
+    help = "Backfill Status.parent_id and Status.root_pipeline_id from NodeRelationship"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-s", dest="batch_size", type=int, default=1000, help="number of status in one batch")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = ""
+        updated = 0
+
+        while True:
+            id_list = list(
+                Status.objects.filter(root_pipeline_id="", id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not id_list:
+                break
+            last_id = id_list[-1]
+
+            parents = {}
+            roots = {}
+            root_distance = {}
+            for rel in NodeRelationship.objects.filter(descendant_id__in=id_list).values(
+                "ancestor_id", "descendant_id", "distance"
+            ):
+                descendant_id = rel["descendant_id"]
+                if rel["distance"] == 1:
+                    parents[descendant_id] = rel["ancestor_id"]
+                if rel["distance"] >= root_distance.get(descendant_id, -1):
+                    root_distance[descendant_id] = rel["distance"]
+                    roots[descendant_id] = rel["ancestor_id"]
+
+            # group by (parent_id, root_pipeline_id) to update in bulk
+            groups = defaultdict(list)
+            for status_id, root_pipeline_id in roots.items():
+                groups[(parents.get(status_id, ""), root_pipeline_id)].append(status_id)
+
+            for (parent_id, root_pipeline_id), status_id_list in groups.items():
+                updated += Status.objects.filter(id__in=status_id_list, root_pipeline_id="").update(
+                    parent_id=parent_id, root_pipeline_id=root_pipeline_id
+                )
+
+            self.stdout.write("{} status backfilled, last id: {}".format(updated, last_id))
+
+        self.stdout.write("backfill finished, {} status updated".format(updated))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from pipeline.engine.models import Data, DataSnapshot, ProcessSnapshot, ScheduleService
+from pipeline.utils import codec
+
+FIELDS = {
+    "snapshot": (ProcessSnapshot, "data"),
+    "service_act": (ScheduleService, "service_act"),
+    "inputs": (Data, "inputs"),
+    "outputs": (Data, "outputs"),
+    "data_snapshot": (DataSnapshot, "obj"),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare encode/decode time and blob size of codecs on the latest engine runtime data in db"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-f", dest="field", choices=list(FIELDS.keys()), default="snapshot", help="data to test")
+        parser.add_argument("-n", dest="num", type=int, default=200, help="number of rows")
+        parser.add_argument("-l", dest="level", type=int, default=None, help="compress level")
+        parser.add_argument("-p", dest="protocol", type=int, default=None, help="pickle protocol")
+
+    def handle(self, *args, **options):
+        model, field = FIELDS[options["field"]]
+
+        # fetch raw blob to avoid decoding by IOField
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT {field} FROM {table} ORDER BY {pk} DESC LIMIT %s".format(
+                    field=field, table=model._meta.db_table, pk=model._meta.pk.column
+                ),
+                [options["num"]],
+            )
+            blobs = [row[0] for row in cursor.fetchall() if row[0]]
+
+        values = []
+        for blob in blobs:
+            try:
+                values.append(codec.decode(blob))
+            except Exception as e:
+                self.stderr.write("decode error: {}".format(e))
+
+        if not values:
+            self.stdout.write("no {} data found".format(options["field"]))
+            return
+
+        self.stdout.write(
+            "{} rows of {}, available codecs: {}".format(len(values), options["field"], codec.CodecRegistry.names())
+        )
+        for name in codec.CodecRegistry.names():
+            start = time.time()
+            encoded = [
+                codec.encode(value, codec=name, level=options["level"], protocol=options["protocol"])
+                for value in values
+            ]
+            encode_cost = time.time() - start
+
+            start = time.time()
+            for data in encoded:
+                codec.decode(data)
+            decode_cost = time.time() - start
+
+            self.stdout.write(
+                "{:<8} encode {:.3f} ms/row, decode {:.3f} ms/row, size {:.1f} KB/row".format(
+                    name,
+                    encode_cost * 1000 / len(values),
+                    decode_cost * 1000 / len(values),
+                    sum(len(d) for d in encoded) / 1024.0 / len(values),
+                )
+            )
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.core.management.base import BaseCommand
+
+from pipeline.contrib.statistics.collector import collect_instance_statistics, collect_template_statistics
+from pipeline.models import PipelineInstance, PipelineTemplate
+
+
+class Command(BaseCommand):
+    help = "Collect statistics of pipeline templates and instances in batch, used to backfill or replay statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-k", dest="kind", choices=["template", "instance", "all"], default="all", help="kind of objects to collect"
+        )
+        parser.add_argument("-s", dest="batch_size", type=int, default=200, help="number of objects in one batch")
+        parser.add_argument("--start-id", dest="start_id", type=int, default=0, help="collect objects with id > it")
+
+    def handle(self, *args, **options):
+        if options["kind"] in ["template", "all"]:
+            # 子流程模板先于引用它的模板创建，按 ID 顺序采集
+            self.collect(
+                "templates",
+                PipelineTemplate.objects.select_related("snapshot"),
+                collect_template_statistics,
+                options,
+            )
+        if options["kind"] in ["instance", "all"]:
+            self.collect(
+                "instances",
+                PipelineInstance.objects.select_related("execution_snapshot"),
+                collect_instance_statistics,
+                options,
+            )
+
+    def collect(self, name, queryset, collect_func, options):
+        last_id = options["start_id"]
+        collected = 0
+        while True:
+            objects = list(queryset.filter(id__gt=last_id).order_by("id")[: options["batch_size"]])
+            if not objects:
+                break
+            last_id = objects[-1].id
+
+            collect_func(objects)
+            collected += len(objects)
+
+            self.stdout.write("{} {} collected, last id: {}".format(collected, name, last_id))
+
+        self.stdout.write("collect finished, {} {} collected".format(collected, name))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from pipeline.utils.graph import Graph
+
+
+def fan_out_graph(node_num, branch_num):
+    """
+    build graph like: start -> (parallel -> branch_num activities -> converge) * n -> end
+    """
+    nodes = ["start"]
+    flows = []
+    last = "start"
+    index = 0
+
+    while len(nodes) < node_num - 1:
+        parallel = "pg_{}".format(index)
+        converge = "cg_{}".format(index)
+        nodes.extend([parallel, converge])
+        flows.append([last, parallel])
+        for branch in range(branch_num):
+            act = "act_{}_{}".format(index, branch)
+            nodes.append(act)
+            flows.extend([[parallel, act], [act, converge]])
+        last = converge
+        index += 1
+
+    nodes.append("end")
+    flows.append([last, "end"])
+    return nodes, flows
+
+
+class Command(BaseCommand):
+    help = "Show the time cost of graph cycle detection of synthetic templates with heavy parallel fan-out"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", dest="node_num", type=int, default=5000, help="number of nodes")
+        parser.add_argument("-b", dest="branch_num", type=int, default=20, help="branches of each parallel gateway")
+        parser.add_argument("-r", dest="repeat", type=int, default=10, help="repeat times")
+
+    def handle(self, *args, **options):
+        nodes, flows = fan_out_graph(options["node_num"], options["branch_num"])
+        cyclic_flows = flows + [[nodes[-2], nodes[1]]]
+
+        for name, graph_flows in (("acyclic", flows), ("cyclic", cyclic_flows)):
+            start = time.time()
+            for _ in range(options["repeat"]):
+                cycle = Graph(nodes, graph_flows).get_cycle()
+            cost = (time.time() - start) / options["repeat"]
+            self.stdout.write(
+                "{} graph with {} nodes and {} flows: {:.2f} ms per detection, cycle length: {}".format(
+                    name, len(nodes), len(graph_flows), cost * 1000, len(cycle)
+                )
+            )
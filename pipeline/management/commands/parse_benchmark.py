@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from pipeline.builder import (
+    ConvergeGateway,
+    EmptyEndEvent,
+    EmptyStartEvent,
+    ParallelGateway,
+    ServiceActivity,
+    build_tree,
+)
+from pipeline.parser.pipeline_parser import PipelineParser
+
+
+def synthetic_tree(node_num, branch_num, component_code):
+    """
+    build pipeline tree like: start -> (parallel -> branch_num activities -> converge) * n -> end
+    """
+    start = EmptyStartEvent()
+    last = start
+    count = 2
+    while count < node_num:
+        parallel = ParallelGateway()
+        converge = ConvergeGateway()
+        acts = [ServiceActivity(component_code=component_code) for _ in range(branch_num)]
+        last = last.extend(parallel).connect(*acts).converge(converge)
+        count += branch_num + 2
+    last.extend(EmptyEndEvent())
+
+    return build_tree(start)
+
+
+class Command(BaseCommand):
+    help = "Show the time cost of pipeline tree parsing for different template sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-s", dest="sizes", type=str, default="100,500,1500", help="node numbers of templates, split by comma"
+        )
+        parser.add_argument("-b", dest="branch_num", type=int, default=10, help="branches of each parallel gateway")
+        parser.add_argument("-r", dest="repeat", type=int, default=3, help="repeat times")
+        parser.add_argument(
+            "-c", dest="component_code", type=str, default="sleep_timer", help="component code of activities"
+        )
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+
+        for size in [int(s) for s in options["sizes"].split(",")]:
+            tree = synthetic_tree(size, options["branch_num"], options["component_code"])
+            node_num = len(tree["activities"]) + len(tree["gateways"]) + 2
+
+            init_cost = 0
+            parse_cost = 0
+            for _ in range(repeat):
+                start = time.time()
+                parser = PipelineParser(tree)
+                init_cost += time.time() - start
+
+                start = time.time()
+                parser.parse()
+                parse_cost += time.time() - start
+
+            self.stdout.write(
+                "{} nodes, {} flows: validate {:.2f} ms, parse {:.2f} ms".format(
+                    node_num, len(tree["flows"]), init_cost * 1000 / repeat, parse_cost * 1000 / repeat
+                )
+            )
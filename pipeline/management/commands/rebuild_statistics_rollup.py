@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.contrib.statistics.models import (
+    ComponentExecuteDailyStatistics,
+    InstanceDailyStatistics,
+    InstanceRollupRecord,
+)
+from pipeline.contrib.statistics.rollup import refresh_instance_rollup, rollup_enabled
+from pipeline.models import PipelineInstance
+
+
+class Command(BaseCommand):
+    help = "Rebuild statistics daily rollup tables from ComponentExecuteData of all pipeline instances"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-s", dest="batch_size", type=int, default=500, help="number of instances in one batch")
+
+    def handle(self, *args, **options):
+        if not rollup_enabled():
+            raise CommandError("PIPELINE_STATISTICS_INSTANCE_DIMENSIONS is not configured")
+
+        batch_size = options["batch_size"]
+        last_id = 0
+        refreshed = 0
+
+        InstanceRollupRecord.objects.all().delete()
+        InstanceDailyStatistics.objects.all().delete()
+        ComponentExecuteDailyStatistics.objects.all().delete()
+
+        while True:
+            instances = list(PipelineInstance.objects.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not instances:
+                break
+            last_id = instances[-1].id
+
+            for instance in instances:
+                refresh_instance_rollup(instance)
+            refreshed += len(instances)
+
+            self.stdout.write("{} instances rolled up, last id: {}".format(refreshed, last_id))
+
+        self.stdout.write("rebuild finished, {} instances rolled up".format(refreshed))
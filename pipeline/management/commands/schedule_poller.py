@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import signal
+
+from django.core.management.base import BaseCommand
+
+from pipeline.conf import settings
+from pipeline.engine.core.schedule_poller import SchedulePoller
+
+
+class Command(BaseCommand):
+    help = "Dispatch due poll schedules to service_schedule workers, used with PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-i", dest="interval", type=float, default=None, help="seconds between due queries")
+        parser.add_argument("-b", dest="batch_size", type=int, default=None, help="max schedules claimed per query")
+        parser.add_argument("-l", dest="lease", type=int, default=None, help="seconds before reclaim a schedule")
+
+    def handle(self, *args, **options):
+        if not settings.PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED:
+            self.stderr.write(
+                "PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED is False, schedules are still sent with countdown"
+            )
+
+        poller = SchedulePoller(interval=options["interval"], batch_size=options["batch_size"], lease=options["lease"])
+
+        def stop(signum, frame):
+            poller.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        poller.run()
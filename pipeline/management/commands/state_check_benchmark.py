@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from pipeline.engine import states
+from pipeline.engine.core.stamp import StateChecker, enabled
+from pipeline.engine.models import FunctionSwitch, PipelineProcess, ProcessSnapshot, Status
+from pipeline.engine.utils import Stack
+from pipeline.utils.uniqid import node_uniqid
+
+
+class _RootPipelineShell(object):
+    def __init__(self, id):
+        self.id = id
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Show db queries per advanced node of run_loop sleep checks with and without state stamp"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", dest="node_num", type=int, default=200, help="number of nodes to advance")
+
+    def handle(self, *args, **options):
+        node_num = options["node_num"]
+
+        self.stdout.write("state stamp enabled in settings: {}".format(enabled()))
+        for enable in (False, True):
+            if enable and not enabled():
+                self.stdout.write("skip state stamp benchmark: PIPELINE_ENGINE_STATE_STAMP_ENABLED or REDIS not set")
+                continue
+
+            queries = self._benchmark(node_num, enable)
+            self.stdout.write(
+                "state stamp {}: {} queries for {} nodes (node transit included), {:.2f} queries per node".format(
+                    "on" if enable else "off", queries, node_num, queries / float(node_num)
+                )
+            )
+
+    def _benchmark(self, node_num, enable):
+        root_pipeline_id = node_uniqid()
+        process = PipelineProcess(
+            id=node_uniqid(),
+            root_pipeline_id=root_pipeline_id,
+            snapshot=ProcessSnapshot(
+                data={
+                    "_pipeline_stack": Stack(),
+                    "_subprocess_stack": Stack(),
+                    "_children": [],
+                    "_root_pipeline": _RootPipelineShell(root_pipeline_id),
+                }
+            ),
+        )
+        state_checker = StateChecker(process, enable=enable)
+
+        try:
+            with transaction.atomic():
+                Status.objects.create(id=root_pipeline_id, state=states.RUNNING, version=node_uniqid())
+
+                with CaptureQueriesContext(connection) as ctx:
+                    for _ in range(node_num):
+                        # the same checks as run_loop do before transit node to running
+                        if not state_checker.unchanged():
+                            process.root_sleep_check()
+                            process.subproc_sleep_check()
+                            FunctionSwitch.objects.is_frozen()
+                            state_checker.mark_checked()
+
+                        Status.objects.transit(id=node_uniqid(), to_state=states.RUNNING, start=True)
+
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        return len(ctx.captured_queries)
@@ -86,7 +86,13 @@ class PipelineParser(object):
         return self._parse(root_pipeline_data, root_pipeline_context)
 
     def _parse(
-        self, root_pipeline_data=None, root_pipeline_params=None, params=None, is_subprocess=False, parent_context=None
+        self,
+        root_pipeline_data=None,
+        root_pipeline_params=None,
+        params=None,
+        is_subprocess=False,
+        parent_context=None,
+        act_path=None,
     ):
         """
         @summary: parse pipeline and subprocess recursively
@@ -95,6 +101,8 @@ class PipelineParser(object):
         @param params: params from parent for son subprocess
         @param is_subprocess: whither is subprocess
         @param parent_context: parent context for activity of subprocess to resolving inputs
+        @param act_path: subprocess stack and activity id, only the activities on this path will be parsed and the
+            flows and gateways will not be built if it is set
         @return: Pipeline object
         """
         if root_pipeline_data is None:
@@ -132,6 +140,8 @@ class PipelineParser(object):
         acts = self.pipeline_tree[PE.activities]
         act_objs = []
         for act in list(acts.values()):
+            if act_path is not None and act[PE.id] != act_path[0]:
+                continue
             act_cls = FlowNodeClsFactory.get_node_cls(act[PE.type])
             if act[PE.type] == PE.ServiceActivity:
                 component = ComponentLibrary.get_component(
@@ -169,6 +179,7 @@ class PipelineParser(object):
                             params=params,
                             is_subprocess=True,
                             parent_context=context,
+                            act_path=act_path[1:] if act_path and len(act_path) > 1 else None,
                         ),
                         name=act[PE.name],
                     )
@@ -176,6 +187,11 @@ class PipelineParser(object):
             else:
                 raise exceptions.FlowTypeError("Unknown Activity type: %s" % act[PE.type])
 
+        if act_path is not None:
+            context.duplicate_variables()
+            pipeline_spec = PipelineSpec(start_event, end_event, [], act_objs, [], DataObject(pipeline_data), context)
+            return Pipeline(self.pipeline_tree[PE.id], pipeline_spec)
+
         gateways = self.pipeline_tree[PE.gateways]
         flows = self.pipeline_tree[PE.flows]
         gateway_objs = []
@@ -190,18 +206,15 @@ class PipelineParser(object):
             else:
                 raise exceptions.FlowTypeError("Unknown Gateway type: %s" % gw[PE.type])
 
+        node_objs_dict = {node.id: node for node in act_objs + gateway_objs}
+        node_objs_dict[start_event.id] = start_event
+        node_objs_dict[end_event.id] = end_event
+
         flow_objs_dict = {}
         for fl in list(flows.values()):
-            flow_nodes = act_objs + gateway_objs
-            if fl[PE.source] == start[PE.id]:
-                source = start_event
-            else:
-                source = [x for x in flow_nodes if x.id == fl[PE.source]][0]
-            if fl[PE.target] == end[PE.id]:
-                target = end_event
-            else:
-                target = [x for x in flow_nodes if x.id == fl[PE.target]][0]
-            flow_objs_dict[fl[PE.id]] = SequenceFlow(fl[PE.id], source, target)
+            flow_objs_dict[fl[PE.id]] = SequenceFlow(
+                fl[PE.id], node_objs_dict[fl[PE.source]], node_objs_dict[fl[PE.target]]
+            )
         flow_objs = list(flow_objs_dict.values())
 
         # add incoming and outgoing flow to acts
@@ -266,12 +279,13 @@ class PipelineParser(object):
     def get_act(self, act_id, subprocess_stack=None, root_pipeline_data=None, root_pipeline_context=None):
         if subprocess_stack is None:
             subprocess_stack = []
-        pipeline = self.parse(root_pipeline_data, root_pipeline_context)
+        # only parse the activities on the subprocess stack path to act
+        pipeline = self._parse(root_pipeline_data, root_pipeline_context, act_path=list(subprocess_stack) + [act_id])
         for sub_id in subprocess_stack:
-            subprocess_act = [x for x in pipeline.spec.activities if x.id == sub_id][0]
+            subprocess_act = pipeline.spec.objects[sub_id]
             hydrate_subprocess_context(subprocess_act)
             pipeline = subprocess_act.pipeline
-        act = [x for x in pipeline.spec.activities if x.id == act_id][0]
+        act = pipeline.spec.objects[act_id]
         return act
 
     def get_act_inputs(self, act_id, subprocess_stack=None, root_pipeline_data=None, root_pipeline_context=None):
@@ -98,3 +98,28 @@ class TestConstantPool(TestCase):
     def test_resolve_constant(self):
         self.assertEqual(self.pool.resolve_constant("${key_a}"), "haha")
         self.assertRaises(exceptions.ConstantNotExistException, self.pool.resolve_constant, "${key_d}")
+
+    def test_resolve__reference_before_definition(self):
+        data = {
+            "${key_c}": {"value": {"list": ["${key_b}_${key_a}", "${key_d}"], "int": 1}},
+            "${key_b}": {"value": "str_${key_a}"},
+            "${key_a}": {"value": "haha"},
+        }
+        pool = ConstantPool(data)
+        self.assertEqual(pool.pool["${key_c}"]["value"], {"list": ["str_haha_haha", "${key_d}"], "int": 1})
+        self.assertEqual(data["${key_c}"]["value"], {"list": ["${key_b}_${key_a}", "${key_d}"], "int": 1})
+
+    def test_resolve__long_chain(self):
+        data = {"${key_%s}" % i: {"value": "v" + ("_${key_%s}" % (i - 1) if i else "")} for i in range(300)}
+        pool = ConstantPool(data)
+        self.assertEqual(pool.resolve_constant("${key_299}"), "_".join(["v"] * 300))
+
+    def test_resolve__circle_reference(self):
+        data = {
+            "${key_a}": {"value": "haha"},
+            "${key_b}": {"value": "str_${key_c}_${key_a}"},
+            "${key_c}": {"value": "str_${key_d}"},
+            "${key_d}": {"value": "str_${key_b}"},
+        }
+        with self.assertRaisesRegexp(exceptions.ConstantReferenceException, r"\$\{key_b\}->\$\{key_c\}->\$\{key_d\}"):
+            ConstantPool(data)
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import datetime
+
+import ujson as json
+from django.test import TestCase
+from django.utils import timezone
+from mock import MagicMock, PropertyMock, call, patch
+
+from pipeline.contrib.statistics import collector
+from pipeline.contrib.statistics.models import (
+    ComponentExecuteData,
+    ComponentInTemplate,
+    InstanceInPipeline,
+    PendingStatistics,
+    TemplateInPipeline,
+)
+from pipeline.contrib.statistics.signals import handlers
+from pipeline.core.constants import PE
+from pipeline.engine import states
+from pipeline.engine.models import History
+
+COLLECTOR_GET_STATUS_TREES = "pipeline.contrib.statistics.collector.get_status_trees"
+COLLECTOR_GET_ACTIVITY_HISTORIES = "pipeline.contrib.statistics.collector.get_activity_histories"
+COLLECTOR_REFRESH_INSTANCE_ROLLUP = "pipeline.contrib.statistics.collector.refresh_instance_rollup"
+
+
+def service_act(code):
+    return {"type": PE.ServiceActivity, "component": {"code": code, "version": "1.0"}}
+
+
+def subprocess_act(template_id, activities=None):
+    return {"type": PE.SubProcess, "template_id": template_id, "pipeline": {"activities": activities or {}}}
+
+
+def pipeline_tree(activities, gateways=None):
+    return {"activities": activities, "gateways": gateways or {}}
+
+
+def status(node_id, state=states.FINISHED, retry=0, children=None):
+    now = timezone.now()
+    return {
+        "id": node_id,
+        "state": state,
+        "retry": retry,
+        "skip": False,
+        "started_time": now,
+        "archived_time": now,
+        "elapsed_time": 1,
+        "children": children or {},
+    }
+
+
+class CollectInstanceStatisticsTestCase(TestCase):
+    def instance(self, instance_id, data, is_finished=True):
+        return MagicMock(instance_id=instance_id, execution_data=data, is_finished=is_finished, is_revoked=False)
+
+    def test_collect_instance_statistics(self):
+        now = timezone.now()
+        for i in range(2):
+            History.objects.create(
+                identifier="act_2", started_time=now, archived_time=now + datetime.timedelta(seconds=i + 1)
+            )
+        instance_1 = self.instance(
+            "i1",
+            pipeline_tree(
+                {"act_1": service_act("job"), "sub_1": subprocess_act("t1", {"act_2": service_act("cc")})},
+                gateways={"g1": {}},
+            ),
+        )
+        instance_2 = self.instance("i2", pipeline_tree({"act_3": service_act("job")}))
+        instance_3 = self.instance("i3", pipeline_tree({"act_4": service_act("job")}), is_finished=False)
+        status_trees = {
+            "i1": status(
+                "i1",
+                children={
+                    "act_1": status("act_1", state=states.FAILED),
+                    "sub_1": status("sub_1", children={"act_2": status("act_2", retry=2)}),
+                },
+            ),
+            "i2": status("i2", children={"act_3": status("act_3")}),
+        }
+        ComponentExecuteData.objects.create(component_code="old", instance_id="i1", node_id="old", started_time=now)
+
+        with patch(COLLECTOR_GET_STATUS_TREES, MagicMock(return_value=status_trees)) as get_status_trees:
+            with patch(COLLECTOR_GET_ACTIVITY_HISTORIES, MagicMock()) as get_activity_histories:
+                with patch(COLLECTOR_REFRESH_INSTANCE_ROLLUP, MagicMock()) as refresh_instance_rollup:
+                    collector.collect_instance_statistics([instance_1, instance_2, instance_3])
+
+        get_status_trees.assert_called_once_with(["i1", "i2"], 99)
+        get_activity_histories.assert_not_called()
+        refresh_instance_rollup.assert_has_calls([call(instance_1), call(instance_2)])
+        self.assertEqual(refresh_instance_rollup.call_count, 2)
+
+        data = ComponentExecuteData.objects.filter(instance_id="i1")
+        self.assertFalse(data.filter(component_code="old").exists())
+        self.assertEqual(data.get(node_id="act_1").status, False)
+        act_2 = data.filter(node_id="act_2")
+        self.assertEqual(act_2.filter(is_retry=False, status=True).count(), 1)
+        self.assertEqual(sorted(act_2.filter(is_retry=True).values_list("elapsed_time", flat=True)), [1, 2])
+        self.assertEqual(json.loads(act_2.first().subprocess_stack), ["sub_1"])
+        self.assertEqual(ComponentExecuteData.objects.filter(instance_id="i2").count(), 1)
+        self.assertFalse(ComponentExecuteData.objects.filter(instance_id="i3").exists())
+
+        totals = {
+            item["instance_id"]: (item["atom_total"], item["subprocess_total"], item["gateways_total"])
+            for item in InstanceInPipeline.objects.values()
+        }
+        self.assertEqual(totals, {"i1": (1, 1, 1), "i2": (1, 0, 0), "i3": (1, 0, 0)})
+
+    def test_collect_instance_statistics__status_tree_missing(self):
+        instance = self.instance("i1", pipeline_tree({"act_1": service_act("job")}))
+
+        with patch(COLLECTOR_GET_STATUS_TREES, MagicMock(return_value={})):
+            with patch(COLLECTOR_REFRESH_INSTANCE_ROLLUP, MagicMock()):
+                collector.collect_instance_statistics([instance])
+
+        self.assertFalse(ComponentExecuteData.objects.exists())
+        self.assertTrue(InstanceInPipeline.objects.filter(instance_id="i1").exists())
+
+
+class CollectTemplateStatisticsTestCase(TestCase):
+    def template(self, template_id, activities):
+        return MagicMock(template_id=template_id, data=pipeline_tree(activities))
+
+    def test_collect_template_statistics(self):
+        ComponentInTemplate.objects.create(component_code="old", template_id="t2", node_id="old")
+        ComponentInTemplate.objects.create(component_code="bk_notify", template_id="t0", node_id="n0")
+        TemplateInPipeline.objects.create(template_id="t1", atom_total=9, subprocess_total=9, gateways_total=9)
+        templates = [
+            self.template("t1", {"act_1": service_act("job")}),
+            self.template(
+                "t2", {"act_2": service_act("cc"), "sub_1": subprocess_act("t1"), "sub_0": subprocess_act("t0")}
+            ),
+        ]
+
+        collector.collect_template_statistics(templates)
+
+        self.assertEqual(
+            set(
+                ComponentInTemplate.objects.filter(template_id="t2").values_list("component_code", "node_id", "is_sub")
+            ),
+            {("cc", "act_2", False), ("job", "act_1", True), ("bk_notify", "n0", True)},
+        )
+        sub_component = ComponentInTemplate.objects.get(template_id="t2", component_code="job")
+        self.assertEqual(json.loads(sub_component.subprocess_stack), ["sub_1"])
+        self.assertEqual(
+            list(TemplateInPipeline.objects.filter(template_id="t1").values_list("atom_total", "subprocess_total")),
+            [(1, 0)],
+        )
+        self.assertEqual(
+            list(TemplateInPipeline.objects.filter(template_id="t2").values_list("atom_total", "subprocess_total")),
+            [(1, 2)],
+        )
+
+    def test_collect_template_statistics__bad_template(self):
+        missing_snapshot = MagicMock(template_id="t3")
+        type(missing_snapshot).data = PropertyMock(side_effect=Exception("snapshot not found"))
+        templates = [
+            self.template("t1", {"act_1": service_act("job")}),
+            self.template("t2", {"act_2": {"type": PE.ServiceActivity}}),
+            missing_snapshot,
+            self.template("t4", {"act_4": service_act("cc")}),
+        ]
+
+        collector.collect_template_statistics(templates)
+
+        self.assertEqual(
+            set(ComponentInTemplate.objects.values_list("template_id", "component_code")), {("t1", "job"), ("t4", "cc")}
+        )
+        self.assertEqual(set(TemplateInPipeline.objects.values_list("template_id", flat=True)), {"t1", "t4"})
+
+
+class CollectPendingStatisticsTestCase(TestCase):
+    def test_collect_pending_statistics(self):
+        PendingStatistics.objects.enqueue(PendingStatistics.KIND_INSTANCE, ["i2", "i1", "i2"])
+        PendingStatistics.objects.enqueue(PendingStatistics.KIND_TEMPLATE, ["t1"])
+        PendingStatistics.objects.enqueue(PendingStatistics.KIND_INSTANCE, ["i3"])
+
+        with patch("pipeline.contrib.statistics.collector.collect_templates", MagicMock()) as collect_templates:
+            with patch("pipeline.contrib.statistics.collector.collect_instances", MagicMock()) as collect_instances:
+                self.assertEqual(collector.collect_pending_statistics(batch_size=4), 4)
+
+                collect_templates.assert_called_once_with(["t1"])
+                collect_instances.assert_called_once_with(["i2", "i1"])
+                self.assertEqual(list(PendingStatistics.objects.values_list("object_id", flat=True)), ["i3"])
+
+                self.assertEqual(collector.collect_pending_statistics(batch_size=4), 1)
+                self.assertEqual(collector.collect_pending_statistics(batch_size=4), 0)
+
+        self.assertFalse(PendingStatistics.objects.exists())
+
+    def test_collect_pending_statistics__collect_fail(self):
+        PendingStatistics.objects.enqueue(PendingStatistics.KIND_TEMPLATE, ["t1"])
+        PendingStatistics.objects.enqueue(PendingStatistics.KIND_INSTANCE, ["i1"])
+
+        with patch(
+            "pipeline.contrib.statistics.collector.collect_templates", MagicMock(side_effect=Exception)
+        ) as collect_templates:
+            with patch("pipeline.contrib.statistics.collector.collect_instances", MagicMock()) as collect_instances:
+                self.assertEqual(collector.collect_pending_statistics(batch_size=4), 2)
+
+        collect_templates.assert_called_once_with(["t1"])
+        collect_instances.assert_called_once_with(["i1"])
+        self.assertFalse(PendingStatistics.objects.exists())
+
+
+class StatisticsHandlersTestCase(TestCase):
+    def test_pipeline_post_save_handler__async(self):
+        instance = MagicMock(instance_id="i1")
+
+        with patch("pipeline.contrib.statistics.signals.handlers.collect_instance_statistics", MagicMock()) as collect:
+            handlers.pipeline_post_save_handler(sender=None, instance=instance, created=False)
+
+        collect.assert_not_called()
+        self.assertEqual(
+            list(PendingStatistics.objects.values_list("kind", "object_id")), [(PendingStatistics.KIND_INSTANCE, "i1")]
+        )
+
+    def test_pipeline_post_save_handler__sync(self):
+        instance = MagicMock(instance_id="i1")
+
+        with patch("pipeline.contrib.statistics.signals.handlers.settings.PIPELINE_STATISTICS_COLLECT_ASYNC", False):
+            with patch(
+                "pipeline.contrib.statistics.signals.handlers.collect_instance_statistics", MagicMock()
+            ) as collect:
+                handlers.pipeline_post_save_handler(sender=None, instance=instance, created=False)
+
+        collect.assert_called_once_with([instance])
+        self.assertFalse(PendingStatistics.objects.exists())
+
+    def test_template_post_save_handler__async(self):
+        template = MagicMock(template_id="t1")
+
+        handlers.template_post_save_handler(sender=None, instance=template, created=True)
+
+        self.assertEqual(
+            list(PendingStatistics.objects.values_list("kind", "object_id")), [(PendingStatistics.KIND_TEMPLATE, "t1")]
+        )
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from mock import MagicMock, patch
+
+from pipeline.contrib.statistics.models import (
+    ComponentExecuteData,
+    ComponentExecuteDailyStatistics,
+    InstanceDailyStatistics,
+    InstanceRollupRecord,
+)
+from pipeline.contrib.statistics.rollup import refresh_instance_rollup
+
+DIMENSIONS = {}
+
+
+def get_dimensions(instance):
+    return DIMENSIONS.get(instance.instance_id)
+
+
+class RefreshInstanceRollupTestCase(TestCase):
+    def setUp(self):
+        self.settings_patcher = patch(
+            "pipeline.contrib.statistics.rollup.settings",
+            MagicMock(PIPELINE_STATISTICS_INSTANCE_DIMENSIONS="{}.get_dimensions".format(__name__)),
+        )
+        self.settings_patcher.start()
+        DIMENSIONS.clear()
+        # 2020-01-02 00:30 in Asia/Shanghai
+        self.create_time = timezone.make_aware(datetime.datetime(2020, 1, 1, 16, 30), timezone.utc)
+        self.date = datetime.date(2020, 1, 2) if timezone.get_current_timezone_name() == "Asia/Shanghai" else None
+
+    def tearDown(self):
+        self.settings_patcher.stop()
+
+    def instance(self, instance_id, project_id=1):
+        DIMENSIONS[instance_id] = {"project_id": project_id, "category": "OpsTools", "create_method": "app"}
+        return MagicMock(instance_id=instance_id, create_time=self.create_time)
+
+    def add_execute_data(self, instance_id, component_code, status, elapsed_time):
+        ComponentExecuteData.objects.create(
+            component_code=component_code,
+            instance_id=instance_id,
+            node_id="node",
+            started_time=self.create_time,
+            elapsed_time=elapsed_time,
+            status=status,
+        )
+
+    def component_rollup(self, component_code, project_id=1):
+        return ComponentExecuteDailyStatistics.objects.values(
+            "execute_times", "failed_times", "elapsed_time_total", "elapsed_time_count"
+        ).get(component_code=component_code, project_id=project_id)
+
+    def test_refresh(self):
+        instance_1 = self.instance("1")
+        instance_2 = self.instance("2")
+        self.add_execute_data("1", "job", True, 10)
+        self.add_execute_data("1", "job", False, None)
+        self.add_execute_data("2", "job", True, 20)
+        self.add_execute_data("2", "cc", False, 5)
+
+        refresh_instance_rollup(instance_1)
+        refresh_instance_rollup(instance_2)
+        # refresh again change nothing
+        refresh_instance_rollup(instance_1)
+
+        daily = InstanceDailyStatistics.objects.get()
+        self.assertEqual(daily.instance_total, 2)
+        self.assertEqual((daily.project_id, daily.category, daily.create_method), (1, "OpsTools", "app"))
+        if self.date:
+            self.assertEqual(daily.date, self.date)
+        self.assertEqual(
+            self.component_rollup("job"),
+            {"execute_times": 3, "failed_times": 1, "elapsed_time_total": 30, "elapsed_time_count": 2},
+        )
+        self.assertEqual(
+            self.component_rollup("cc"),
+            {"execute_times": 1, "failed_times": 1, "elapsed_time_total": 5, "elapsed_time_count": 1},
+        )
+        self.assertEqual(InstanceRollupRecord.objects.count(), 2)
+
+    def test_refresh__execute_data_changed(self):
+        instance = self.instance("1")
+        self.add_execute_data("1", "job", False, 10)
+        refresh_instance_rollup(instance)
+
+        ComponentExecuteData.objects.filter(instance_id="1").delete()
+        self.add_execute_data("1", "job", True, 30)
+        refresh_instance_rollup(instance)
+
+        self.assertEqual(InstanceDailyStatistics.objects.get().instance_total, 1)
+        self.assertEqual(
+            self.component_rollup("job"),
+            {"execute_times": 1, "failed_times": 0, "elapsed_time_total": 30, "elapsed_time_count": 1},
+        )
+
+    def test_refresh__instance_excluded(self):
+        instance = self.instance("1")
+        self.add_execute_data("1", "job", True, 10)
+        refresh_instance_rollup(instance)
+
+        DIMENSIONS["1"] = None
+        refresh_instance_rollup(instance)
+
+        self.assertEqual(InstanceDailyStatistics.objects.get().instance_total, 0)
+        self.assertEqual(
+            self.component_rollup("job"),
+            {"execute_times": 0, "failed_times": 0, "elapsed_time_total": 0, "elapsed_time_count": 0},
+        )
+        self.assertFalse(InstanceRollupRecord.objects.exists())
+
+    def test_refresh__dimensions_changed(self):
+        instance = self.instance("1")
+        self.add_execute_data("1", "job", True, 10)
+        refresh_instance_rollup(instance)
+
+        self.instance("1", project_id=2)
+        refresh_instance_rollup(instance)
+
+        self.assertEqual(InstanceDailyStatistics.objects.get(project_id=1).instance_total, 0)
+        self.assertEqual(InstanceDailyStatistics.objects.get(project_id=2).instance_total, 1)
+        self.assertEqual(self.component_rollup("job", project_id=2)["execute_times"], 1)
+
+    def test_refresh__not_enabled(self):
+        self.add_execute_data("1", "job", True, 10)
+
+        with patch(
+            "pipeline.contrib.statistics.rollup.settings", MagicMock(PIPELINE_STATISTICS_INSTANCE_DIMENSIONS="")
+        ):
+            refresh_instance_rollup(self.instance("1"))
+
+        self.assertFalse(InstanceDailyStatistics.objects.exists())
+        self.assertFalse(InstanceRollupRecord.objects.exists())
@@ -94,6 +94,42 @@ class TestConstantTemplate(TestCase):
         dict_template = expression.ConstantTemplate({"aaaa": {"a": "${a}", "b": "${a+int(b)}"}})
         self.assertEqual(dict_template.resolve_data({"a": 2, "b": "3"}), {"aaaa": {"a": 2, "b": "5"}})
 
+    def test_resolve__share_untouched_data(self):
+        untouched = {"ip": ["1.1.1.1", "2.2.2.2"], "nested": [{"a": "no template"}]}
+        data = {"untouched": untouched, "touched": ["${a}", {"b": "${b}"}], "tuple": ("x", "y")}
+        resolved = expression.ConstantTemplate(data).resolve_data({"a": 1, "b": "2"})
+
+        self.assertEqual(
+            resolved, {"untouched": untouched, "touched": [1, {"b": "2"}], "tuple": ("x", "y")},
+        )
+        self.assertIs(resolved["untouched"], untouched)
+        self.assertIs(resolved["tuple"], data["tuple"])
+        # origin data should not be changed
+        self.assertEqual(data["touched"], ["${a}", {"b": "${b}"}])
+
+        no_template = [{"a": "1"}, ["2", ("3",)]]
+        self.assertIs(expression.ConstantTemplate(no_template).resolve_data({"a": 1}), no_template)
+
+    def test_template_cache(self):
+        expression.clear_template_cache()
+        cons_tmpl = expression.ConstantTemplate("")
+        for _ in range(3):
+            self.assertEqual(cons_tmpl.resolve_template("${a+1}", {"a": 1}), "2")
+            self.assertEqual(cons_tmpl.get_template_reference("${a+1}"), ["a"])
+
+        info = expression.template_cache_info()
+        self.assertEqual(info["template"]["misses"], 1)
+        self.assertEqual(info["template"]["hits"], 2)
+        self.assertEqual(info["reference"]["misses"], 1)
+        self.assertEqual(info["reference"]["hits"], 2)
+
+        # cached reference result should not be affected by caller
+        cons_tmpl.get_template_reference("${a+1}").append("b")
+        self.assertEqual(cons_tmpl.get_template_reference("${a+1}"), ["a"])
+
+        expression.clear_template_cache()
+        self.assertEqual(expression.template_cache_info()["template"]["currsize"], 0)
+
     def test_get_reference_complex(self):
         all_in_cons_template = expression.ConstantTemplate(["${a}", ["${a}", "${a+int(b)}"]])
         self.assertEqual(set(all_in_cons_template.get_reference()), set(["a", "b", "int"]))
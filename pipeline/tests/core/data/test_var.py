@@ -11,7 +11,10 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+import pickle
+
 from django.test import TestCase
+from mock import MagicMock, patch
 
 from pipeline.core.data import base, context, var
 
@@ -61,3 +64,86 @@ class TestSpliceVariable(TestCase):
             "key2": {"key2_1": "value_1_1_value_1_2_${key_not_exist}"},
         }
         self.assertEqual(sv.get(), test_value)
+
+
+class MemoizedVariable(var.LazyVariable):
+    code = "test_memoized_variable"
+    memoize = True
+    memoize_data_keys = ("project_id",)
+    calls = 0
+
+    def get_value(self):
+        MemoizedVariable.calls += 1
+        return {"value": self.value, "project_id": self.pipeline_data["project_id"]}
+
+
+class NotMemoizedVariable(MemoizedVariable):
+    code = "test_not_memoized_variable"
+    memoize = False
+
+
+class TestLazyVariable(TestCase):
+    def setUp(self):
+        MemoizedVariable.calls = 0
+        self.context = context.Context({})
+        self.context.variables["${ip}"] = "1.1.1.1"
+        self.pipeline_data = {"project_id": 1, "executor": "tester"}
+
+    def test_get__not_memoized(self):
+        lv = NotMemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        lv.get()
+        lv.get()
+        self.assertEqual(MemoizedVariable.calls, 2)
+
+    def test_get__memoized(self):
+        lv = MemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        value = lv.get()
+        value["value"] = "changed"
+
+        self.assertEqual(lv.get(), {"value": "1.1.1.1", "project_id": 1})
+        self.assertEqual(MemoizedVariable.calls, 1)
+
+    def test_get__memo_invalidated_by_value(self):
+        lv = MemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        lv.get()
+        lv._value = "2.2.2.2"
+
+        self.assertEqual(lv.get(), {"value": "2.2.2.2", "project_id": 1})
+        self.assertEqual(MemoizedVariable.calls, 2)
+
+    def test_get__memo_invalidated_by_pipeline_data(self):
+        lv = MemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        lv.get()
+        self.pipeline_data["executor"] = "other"
+        lv.get()
+        self.assertEqual(MemoizedVariable.calls, 1)
+
+        self.pipeline_data["project_id"] = 2
+        self.assertEqual(lv.get(), {"value": "1.1.1.1", "project_id": 2})
+        self.assertEqual(MemoizedVariable.calls, 2)
+
+    def test_get__memo_survive_pickle(self):
+        lv = MemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        lv.get()
+
+        loaded = pickle.loads(pickle.dumps(lv))
+        self.assertEqual(loaded.get(), {"value": "1.1.1.1", "project_id": 1})
+        self.assertEqual(MemoizedVariable.calls, 1)
+
+    def test_get__without_memo_attr(self):
+        lv = MemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        self.assertFalse(hasattr(lv, "_memo"))
+
+        self.assertEqual(lv.get(), {"value": "1.1.1.1", "project_id": 1})
+        self.assertEqual(MemoizedVariable.calls, 1)
+
+    def test_get__memo_invalidated_by_version(self):
+        lv = MemoizedVariable("name", "${ip}", self.context, self.pipeline_data)
+        with patch.object(MemoizedVariable, "memoize_version", MagicMock(return_value=1)):
+            lv.get()
+            lv.get()
+        self.assertEqual(MemoizedVariable.calls, 1)
+
+        with patch.object(MemoizedVariable, "memoize_version", MagicMock(return_value=2)):
+            lv.get()
+        self.assertEqual(MemoizedVariable.calls, 2)
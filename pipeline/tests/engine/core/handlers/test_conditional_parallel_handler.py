@@ -68,7 +68,7 @@ class ConditionalParallelGatewayHandlerTestCase(TestCase):
         status = MockStatus(loop=0)
         process = MockPipelineProcess(top_pipeline_context=MockContext(variables=context_variables))
 
-        with patch(PIPELINE_PROCESS_FORK_CHILD, MagicMock(side_effect=PipelineException(e_message))):
+        with patch(PIPELINE_PROCESS_FORK_CHILDREN, MagicMock(side_effect=PipelineException(e_message))):
             result = handlers.conditional_parallel_handler(process, cpg, status)
             self.assertIsNone(result.next_node)
             self.assertTrue(result.should_return)
@@ -96,7 +96,7 @@ class ConditionalParallelGatewayHandlerTestCase(TestCase):
             status = MockStatus(loop=loop)
             process = MockPipelineProcess(top_pipeline_context=MockContext(variables=context_variables))
 
-            with patch(PIPELINE_PROCESS_FORK_CHILD, MagicMock(side_effect=children)):
+            with patch(PIPELINE_PROCESS_FORK_CHILDREN, MagicMock(return_value=children)):
                 result = handlers.conditional_parallel_handler(process, cpg, status)
                 self.assertIsNone(result.next_node)
                 self.assertTrue(result.should_return)
@@ -109,18 +109,10 @@ class ConditionalParallelGatewayHandlerTestCase(TestCase):
 
                 cpg.targets_meet_condition.assert_called_once_with(hydrate_context)
 
-                PipelineProcess.objects.fork_child.assert_has_calls(
-                    [
-                        mock.call(
-                            parent=process, current_node_id=targets[0].id, destination_id=cpg.converge_gateway_id
-                        ),
-                        mock.call(
-                            parent=process, current_node_id=targets[1].id, destination_id=cpg.converge_gateway_id
-                        ),
-                        mock.call(
-                            parent=process, current_node_id=targets[2].id, destination_id=cpg.converge_gateway_id
-                        ),
-                    ]
+                PipelineProcess.objects.fork_children.assert_called_once_with(
+                    parent=process,
+                    current_node_ids=[target.id for target in targets],
+                    destination_id=cpg.converge_gateway_id,
                 )
 
                 process.join.assert_called_once_with(children)
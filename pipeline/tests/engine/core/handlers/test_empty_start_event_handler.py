@@ -21,6 +21,10 @@ from pipeline.tests.mock_settings import *  # noqa
 
 handlers.empty_start_event_handler = handlers.EmptyStartEventHandler()
 
+HANDOFF_ENABLED = (
+    "pipeline.engine.core.handlers.empty_start_event.pipeline_settings.PIPELINE_ENGINE_STATUS_HANDOFF_ENABLED"
+)
+
 
 class EmptyStartEventHandlerTestCase(TestCase):
     def test_element_cls(self):
@@ -38,3 +42,19 @@ class EmptyStartEventHandlerTestCase(TestCase):
         self.assertEqual(hdl_result.next_node, start_event.next())
         self.assertFalse(hdl_result.should_sleep)
         self.assertFalse(hdl_result.should_return)
+
+    @patch(PIPELINE_STATUS_FINISH, MagicMock())
+    @patch(HANDOFF_ENABLED, True)
+    def test_handle__handoff(self):
+        process = MockPipelineProcess()
+        start_event = StartEventObject()
+
+        hdl_result = handlers.empty_start_event_handler(process, start_event, MockStatus())
+
+        Status.objects.finish.assert_not_called()
+
+        self.assertEqual(hdl_result.next_node, start_event.next())
+        self.assertEqual(hdl_result.handoff.node, start_event)
+        self.assertFalse(hdl_result.handoff.error_ignorable)
+        self.assertFalse(hdl_result.should_sleep)
+        self.assertFalse(hdl_result.should_return)
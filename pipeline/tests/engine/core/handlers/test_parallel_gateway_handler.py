@@ -33,16 +33,14 @@ class ParallelGatewayHandlerTestCase(TestCase):
         parallel_gateway = MockParallelGateway()
         children = [MockPipelineProcess() for _ in range(len(parallel_gateway.outgoing.all_target_node()))]
 
-        with patch(PIPELINE_PROCESS_FORK_CHILD, MagicMock(side_effect=children)):
+        with patch(PIPELINE_PROCESS_FORK_CHILDREN, MagicMock(return_value=children)):
             hdl_result = handlers.parallel_gateway_handler(process, parallel_gateway, MockStatus())
 
-            fork_child_calls = [
-                mock.call(
-                    parent=process, current_node_id=target.id, destination_id=parallel_gateway.converge_gateway_id
-                )
-                for target in parallel_gateway.outgoing.all_target_node()
-            ]
-            PipelineProcess.objects.fork_child.assert_has_calls(fork_child_calls)
+            PipelineProcess.objects.fork_children.assert_called_once_with(
+                parent=process,
+                current_node_ids=[target.id for target in parallel_gateway.outgoing.all_target_node()],
+                destination_id=parallel_gateway.converge_gateway_id,
+            )
 
             process.join.assert_called_once_with(children)
 
@@ -59,10 +57,10 @@ class ParallelGatewayHandlerTestCase(TestCase):
         parallel_gateway = MockParallelGateway()
         e_msg = "e_msg"
 
-        with patch(PIPELINE_PROCESS_FORK_CHILD, MagicMock(side_effect=PipelineException(e_msg))):
+        with patch(PIPELINE_PROCESS_FORK_CHILDREN, MagicMock(side_effect=PipelineException(e_msg))):
             hdl_result = handlers.parallel_gateway_handler(process, parallel_gateway, MockStatus())
 
-            PipelineProcess.objects.fork_child.assert_called()
+            PipelineProcess.objects.fork_children.assert_called()
 
             Status.objects.fail.assert_called_once_with(parallel_gateway, e_msg)
 
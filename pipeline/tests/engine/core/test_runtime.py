@@ -15,12 +15,14 @@ from django.test import TestCase
 
 from pipeline.engine import states
 from pipeline.engine.core import runtime
+from pipeline.engine.core.handlers.base import FlowElementHandler
 from pipeline.engine.models import FunctionSwitch, NodeRelationship, Status
 from pipeline.tests.engine.mock import *  # noqa
 from pipeline.tests.mock_settings import *  # noqa
 
 PIPELINE_BUILD_RELATIONSHIP = "pipeline.engine.models.NodeRelationship.objects.build_relationship"
 PIPELINE_STATUS_TRANSIT = "pipeline.engine.models.Status.objects.transit"
+PIPELINE_STATUS_HANDOFF = "pipeline.engine.models.Status.objects.handoff"
 PIPELINE_ENGINE_IS_FROZEN = "pipeline.engine.models.FunctionSwitch.objects.is_frozen"
 PIPELINE_SETTING_RERUN_MAX_LIMIT = "pipeline.engine.core.runtime.RERUN_MAX_LIMIT"
 
@@ -437,3 +439,120 @@ class RuntimeTestCase(TestCase):
             process.sleep.assert_called_once_with(adjust_status=True)
 
             process.refresh_current_node.assert_not_called()
+
+    @patch(PIPELINE_BUILD_RELATIONSHIP, MagicMock())
+    @patch(PIPELINE_ENGINE_IS_FROZEN, MagicMock(return_value=False))
+    @patch(PIPELINE_SETTING_RERUN_MAX_LIMIT, 0)
+    def test_run_loop__handoff(self):
+        node_1 = IdentifyObject()
+        node_2 = IdentifyObject()
+        destination = IdentifyObject()
+        nodes = {n.id: n for n in [node_1, node_2, destination]}
+        handoff = FlowElementHandler.Handoff(node=node_1, error_ignorable=True)
+
+        top_pipeline = PipelineObject()
+        top_pipeline.node = MagicMock(side_effect=lambda nid: nodes[nid])
+        process = MockPipelineProcess(
+            top_pipeline=top_pipeline, destination_id=destination.id, current_node_id=node_1.id
+        )
+        process.root_sleep_check = MagicMock(return_value=(False, states.RUNNING))
+        process.subproc_sleep_check = MagicMock(return_value=(False, []))
+
+        handler_results = {
+            node_1.id: MockHandlerResult(should_return=False, should_sleep=False, next_node=node_2, handoff=handoff),
+            node_2.id: MockHandlerResult(should_return=False, should_sleep=False, next_node=destination),
+        }
+
+        def handler(process, current_node, status):
+            return handler_results[current_node.id]
+
+        transit = MagicMock(return_value=MockActionResult(result=True, extra=MockStatus()))
+        status_handoff = MagicMock(
+            return_value=(MockActionResult(result=True), MockActionResult(result=True, extra=MockStatus()))
+        )
+        finish = MagicMock()
+
+        with patch(PIPELINE_STATUS_TRANSIT, transit):
+            with patch(PIPELINE_STATUS_HANDOFF, status_handoff):
+                with patch(PIPELINE_STATUS_FINISH, finish):
+                    with patch(
+                        "pipeline.engine.core.runtime.HandlersFactory.handlers_for", MagicMock(return_value=handler)
+                    ):
+                        runtime.run_loop(process)
+
+        name = str(IdentifyObject)
+        transit.assert_called_once_with(id=node_1.id, to_state=states.RUNNING, start=True, name=name)
+        status_handoff.assert_called_once_with(
+            node_1,
+            next_id=node_2.id,
+            pipeline_id=top_pipeline.id,
+            root_pipeline_id=process.root_pipeline.id,
+            next_name=name,
+            error_ignorable=True,
+        )
+        NodeRelationship.objects.build_relationship.assert_called_once_with(top_pipeline.id, node_1.id)
+        finish.assert_not_called()
+        process.destroy_and_wake_up_parent.assert_called_once_with(destination.id)
+
+    @patch(PIPELINE_BUILD_RELATIONSHIP, MagicMock())
+    @patch(PIPELINE_ENGINE_IS_FROZEN, MagicMock(return_value=False))
+    @patch(PIPELINE_SETTING_RERUN_MAX_LIMIT, 0)
+    def test_run_loop__handoff_finish_failed(self):
+        node_1 = IdentifyObject()
+        node_2 = IdentifyObject()
+        nodes = {n.id: n for n in [node_1, node_2]}
+        handoff = FlowElementHandler.Handoff(node=node_1, error_ignorable=False)
+
+        top_pipeline = PipelineObject()
+        top_pipeline.node = MagicMock(side_effect=lambda nid: nodes[nid])
+        process = MockPipelineProcess(top_pipeline=top_pipeline, destination_id=uniqid(), current_node_id=node_1.id)
+        process.root_sleep_check = MagicMock(return_value=(False, states.RUNNING))
+        process.subproc_sleep_check = MagicMock(return_value=(False, []))
+
+        hdl = MagicMock(
+            return_value=MockHandlerResult(should_return=False, should_sleep=False, next_node=node_2, handoff=handoff)
+        )
+        transit = MagicMock(return_value=MockActionResult(result=True, extra=MockStatus()))
+        status_handoff = MagicMock(return_value=(MockActionResult(result=False), None))
+
+        with patch(PIPELINE_STATUS_TRANSIT, transit):
+            with patch(PIPELINE_STATUS_HANDOFF, status_handoff):
+                with patch("pipeline.engine.core.runtime.HandlersFactory.handlers_for", MagicMock(return_value=hdl)):
+                    runtime.run_loop(process)
+
+        status_handoff.assert_called_once()
+        hdl.assert_called_once()
+        process.sleep.assert_called_once_with(adjust_status=True)
+        self.assertEqual(process.current_node_id, node_1.id)
+
+    @patch(PIPELINE_BUILD_RELATIONSHIP, MagicMock())
+    @patch(PIPELINE_SETTING_RERUN_MAX_LIMIT, 0)
+    def test_run_loop__flush_handoff_before_sleep(self):
+        node_1 = IdentifyObject()
+        node_2 = IdentifyObject()
+        nodes = {n.id: n for n in [node_1, node_2]}
+        handoff = FlowElementHandler.Handoff(node=node_1, error_ignorable=False)
+
+        top_pipeline = PipelineObject()
+        top_pipeline.node = MagicMock(side_effect=lambda nid: nodes[nid])
+        process = MockPipelineProcess(top_pipeline=top_pipeline, destination_id=uniqid(), current_node_id=node_1.id)
+        process.root_sleep_check = MagicMock(return_value=(False, states.RUNNING))
+        process.subproc_sleep_check = MagicMock(return_value=(False, []))
+
+        hdl = MagicMock(
+            return_value=MockHandlerResult(should_return=False, should_sleep=False, next_node=node_2, handoff=handoff)
+        )
+        transit = MagicMock(return_value=MockActionResult(result=True, extra=MockStatus()))
+        finish = MagicMock(return_value=MockActionResult(result=True))
+
+        with patch(PIPELINE_STATUS_TRANSIT, transit):
+            with patch(PIPELINE_STATUS_FINISH, finish):
+                with patch(PIPELINE_ENGINE_IS_FROZEN, MagicMock(side_effect=[False, True])):
+                    with patch(
+                        "pipeline.engine.core.runtime.HandlersFactory.handlers_for", MagicMock(return_value=hdl)
+                    ):
+                        runtime.run_loop(process)
+
+        finish.assert_called_once_with(node_1, False)
+        process.freeze.assert_called_once()
+        self.assertEqual(process.current_node_id, node_2.id)
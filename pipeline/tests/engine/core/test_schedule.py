@@ -99,6 +99,41 @@ class ScheduleTestCase(TestCase):
             # reset mock
             mock_ss.destroy.reset_mock()
 
+    @mock.patch(SIGNAL_VALVE_SEND, mock.MagicMock())
+    def test_schedule__lock_failed(self):
+        mock_ss = MockScheduleService()
+        qs = MockQuerySet()
+        qs.update = mock.MagicMock(return_value=0)
+        with mock.patch(PIPELINE_SCHEDULE_SERVICE_GET, mock.MagicMock(return_value=mock_ss)):
+            with mock.patch(PIPELINE_SCHEDULE_SERVICE_FILTER, mock.MagicMock(return_value=qs)):
+                process_id = uniqid()
+
+                schedule.schedule(process_id, mock_ss.id)
+
+                qs.update.assert_called_once_with(is_scheduling=True, schedule_date=None)
+                valve.send.assert_called_once_with(
+                    signals,
+                    "schedule_ready",
+                    sender=ScheduleService,
+                    process_id=process_id,
+                    schedule_id=mock_ss.id,
+                    data_id=None,
+                    countdown=2,
+                )
+                mock_ss.service_act.schedule.assert_not_called()
+
+    @mock.patch(SIGNAL_VALVE_SEND, mock.MagicMock())
+    def test_schedule__lock_failed_and_dispatched_by_poller(self):
+        mock_ss = MockScheduleService(schedule_date="schedule_date")
+        qs = MockQuerySet()
+        qs.update = mock.MagicMock(return_value=0)
+        with mock.patch(PIPELINE_SCHEDULE_SERVICE_GET, mock.MagicMock(return_value=mock_ss)):
+            with mock.patch(PIPELINE_SCHEDULE_SERVICE_FILTER, mock.MagicMock(return_value=qs)):
+                schedule.schedule(uniqid(), mock_ss.id)
+
+                valve.send.assert_not_called()
+                mock_ss.service_act.schedule.assert_not_called()
+
     @mock.patch(PIPELINE_SCHEDULE_SERVICE_FILTER, mock.MagicMock(return_value=MockQuerySet(exists_return=True)))
     @mock.patch(PIPELINE_STATUS_FILTER, mock.MagicMock(return_value=MockQuerySet(exists_return=True)))
     @mock.patch(PIPELINE_PROCESS_GET, mock.MagicMock(return_value=MockPipelineProcess()))
@@ -756,3 +791,52 @@ class ScheduleTestCase(TestCase):
 
                 mock_ss.save.assert_called()
                 mock_ss.set_next_schedule.assert_not_called()
+
+    @mock.patch(PIPELINE_SCHEDULE_SERVICE_FILTER, mock.MagicMock(return_value=MockQuerySet(exists_return=True)))
+    @mock.patch(PIPELINE_STATUS_FILTER, mock.MagicMock(return_value=MockQuerySet(exists_return=True)))
+    @mock.patch(SCHEDULE_GET_SCHEDULE_PARENT_DATA, mock.MagicMock(return_value=PARENT_DATA))
+    @mock.patch(SCHEDULE_SET_SCHEDULE_DATA, mock.MagicMock())
+    @mock.patch(PIPELINE_DATA_WRITE_NODE_DATA, mock.MagicMock())
+    def test_schedule_batch(self):
+        mock_ss_list = [MockScheduleService(schedule_return=True) for _ in range(2)]
+        finished_ss = MockScheduleService(is_finished=True)
+        schedule_batch = mock.MagicMock(return_value=[True, None])
+        mock_ss_list[0].service_act.service.schedule_batch = schedule_batch
+        schedules = {ss.id: ss for ss in mock_ss_list + [finished_ss]}
+
+        with mock.patch(PIPELINE_SCHEDULE_SERVICE_GET, mock.MagicMock(side_effect=lambda id: schedules[id])):
+            schedule.schedule_batch([(ss.process_id, ss.id) for ss in [finished_ss] + mock_ss_list])
+
+        schedule_batch.assert_called_once_with(
+            [
+                ScheduleNode(ss.service_act.service, ss.service_act.data, PARENT_DATA, ss.callback_data)
+                for ss in mock_ss_list
+            ]
+        )
+        for ss, result in zip(mock_ss_list, [True, None]):
+            ss.service_act.schedule.assert_not_called()
+            ss.service_act.set_schedule_result.assert_called_once_with(result)
+            self.assertEqual(ss.schedule_times, 1)
+            ss.set_next_schedule.assert_called_once()
+        schedule.set_schedule_data.assert_has_calls([call(ss.id, PARENT_DATA) for ss in mock_ss_list])
+        self.assertEqual(Data.objects.write_node_data.call_count, 2)
+        self.assertEqual(finished_ss.schedule_times, 0)
+
+    @mock.patch(PIPELINE_SCHEDULE_SERVICE_FILTER, mock.MagicMock(return_value=MockQuerySet(exists_return=True)))
+    @mock.patch(PIPELINE_STATUS_FILTER, mock.MagicMock(return_value=MockQuerySet(exists_return=True)))
+    @mock.patch(SCHEDULE_GET_SCHEDULE_PARENT_DATA, mock.MagicMock(return_value=PARENT_DATA))
+    @mock.patch(SCHEDULE_SET_SCHEDULE_DATA, mock.MagicMock())
+    @mock.patch(PIPELINE_DATA_WRITE_NODE_DATA, mock.MagicMock())
+    def test_schedule_batch__raise_and_error_ignorable(self):
+        mock_ss_list = [MockScheduleService(service_err_ignore=True) for _ in range(2)]
+        mock_ss_list[0].service_act.service.schedule_batch = mock.MagicMock(side_effect=Exception)
+        schedules = {ss.id: ss for ss in mock_ss_list}
+
+        with mock.patch(PIPELINE_SCHEDULE_SERVICE_GET, mock.MagicMock(side_effect=lambda id: schedules[id])):
+            schedule.schedule_batch([(ss.process_id, ss.id) for ss in mock_ss_list])
+
+        for ss in mock_ss_list:
+            ss.service_act.ignore_error.assert_called_once()
+            ss.service_act.finish_schedule.assert_called_once()
+            ss.service_act.set_schedule_result.assert_not_called()
+            ss.set_next_schedule.assert_called_once()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import time
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from pipeline.django_signal_valve import valve
+from pipeline.engine import signals
+from pipeline.engine.core.schedule_poller import SchedulePoller
+from pipeline.engine.models import ScheduleService
+from pipeline.tests.mock import *  # noqa
+from pipeline.tests.mock_settings import *  # noqa
+
+
+class SchedulePollerTestCase(TestCase):
+    def setUp(self):
+        self.now = time.time()
+        self.poller = SchedulePoller(interval=1, batch_size=10, lease=60)
+
+    def create_schedule(self, seconds, batch_key=""):
+        schedule_id = "{}{}".format(uniqid(), uniqid())
+        ScheduleService.objects.create(
+            id=schedule_id,
+            activity_id=schedule_id[:32],
+            process_id=uniqid(),
+            version=schedule_id[32:],
+            service_act=None,
+            schedule_date=self.date(seconds) if seconds is not None else None,
+            batch_key=batch_key,
+        )
+        return schedule_id
+
+    def date(self, seconds):
+        return timezone.now() + timedelta(seconds=self.now + seconds - time.time())
+
+    def dispatched(self):
+        return [c[1]["schedule_id"] for c in valve.send.call_args_list]
+
+    @patch(SIGNAL_VALVE_SEND, MagicMock())
+    def test_run_once(self):
+        due = self.create_schedule(-1)
+        soon = self.create_schedule(0.5)
+        later = self.create_schedule(10)
+        self.create_schedule(None)
+
+        self.assertEqual(self.poller.run_once(self.now), 1)
+        self.assertEqual(self.dispatched(), [due])
+        valve.send.assert_called_once_with(
+            signals,
+            "schedule_ready",
+            sender=ScheduleService,
+            process_id=ScheduleService.objects.get(id=due).process_id,
+            schedule_id=due,
+            countdown=0,
+        )
+        self.assertTrue(ScheduleService.objects.get(id=due).schedule_date >= self.date(59))
+
+        # soon is loaded in last refresh, only claim queries (savepoint, select, update, release) are executed
+        with self.assertNumQueries(4):
+            self.assertEqual(self.poller.run_once(self.now + 0.6), 1)
+        self.assertEqual(self.dispatched(), [due, soon])
+
+        self.assertEqual(self.poller.run_once(self.now + 1), 0)
+        self.assertEqual(self.poller.wait_seconds(self.now + 1), 1)
+        self.assertNotIn(later, self.dispatched())
+
+    @patch(SIGNAL_VALVE_SEND, MagicMock())
+    def test_run_once__schedule_date_changed(self):
+        schedule_id = self.create_schedule(0.5)
+        self.poller.run_once(self.now)
+
+        # set to later by worker after loaded
+        ScheduleService.objects.filter(id=schedule_id).update(schedule_date=self.date(10))
+        self.assertEqual(self.poller.run_once(self.now + 0.6), 0)
+
+        # set to earlier, old entry in heap is ignored
+        ScheduleService.objects.filter(id=schedule_id).update(schedule_date=self.date(1.2))
+        self.poller.run_once(self.now + 1)
+        ScheduleService.objects.filter(id=schedule_id).update(schedule_date=self.date(1.5))
+        self.poller.next_refresh = 0
+        self.assertEqual(self.poller.run_once(self.now + 1.3), 0)
+        self.assertEqual(self.poller.run_once(self.now + 1.6), 1)
+        self.assertEqual(self.dispatched(), [schedule_id])
+
+    @patch(SIGNAL_VALVE_SEND, MagicMock())
+    def test_run_once__more_than_batch_size(self):
+        schedule_ids = {self.create_schedule(-1) for _ in range(15)}
+
+        self.assertEqual(self.poller.run_once(self.now), 10)
+        self.assertEqual(self.poller.wait_seconds(self.now), 0)
+        self.assertEqual(self.poller.run_once(self.now), 5)
+        self.assertEqual(set(self.dispatched()), schedule_ids)
+
+    @patch(SIGNAL_VALVE_SEND, MagicMock())
+    @patch("pipeline.engine.core.schedule_poller.settings.PIPELINE_ENGINE_SCHEDULE_BATCH_MAX_SIZE", 2)
+    def test_run_once__batch_key(self):
+        single = self.create_schedule(-1)
+        batch_1 = [self.create_schedule(-1, batch_key="1" * 32) for _ in range(3)]
+        batch_2 = [self.create_schedule(-1, batch_key="2" * 32)]
+
+        self.assertEqual(self.poller.run_once(self.now), 5)
+
+        process_ids = dict(ScheduleService.objects.values_list("id", "process_id"))
+        batches = []
+        for c in valve.send.call_args_list:
+            if c[0][1] == "schedule_ready":
+                batches.append([c[1]["schedule_id"]])
+            else:
+                self.assertEqual(c[0][1], "schedule_batch_ready")
+                self.assertTrue(
+                    all(process_ids[schedule_id] == process_id for process_id, schedule_id in c[1]["schedules"])
+                )
+                batches.append([schedule_id for _, schedule_id in c[1]["schedules"]])
+
+        # batch_1 is split by PIPELINE_ENGINE_SCHEDULE_BATCH_MAX_SIZE
+        self.assertEqual(sorted(len(batch) for batch in batches), [1, 1, 1, 2])
+        self.assertIn([single], batches)
+        self.assertIn(batch_2, batches)
+        self.assertEqual(sorted(sum([batch for batch in batches if set(batch) <= set(batch_1)], [])), sorted(batch_1))
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.test import TestCase
+
+from pipeline.engine import states
+from pipeline.engine.core import runtime, stamp
+from pipeline.engine.models import FunctionSwitch
+from pipeline.tests.engine.mock import *  # noqa
+from pipeline.tests.mock_settings import *  # noqa
+
+STAMP_ENABLED = "pipeline.engine.core.stamp.enabled"
+STAMP_BACKEND = "pipeline.engine.core.stamp._backend"
+PIPELINE_BUILD_RELATIONSHIP = "pipeline.engine.models.NodeRelationship.objects.build_relationship"
+PIPELINE_ENGINE_IS_FROZEN = "pipeline.engine.models.FunctionSwitch.objects.is_frozen"
+PIPELINE_SETTING_RERUN_MAX_LIMIT = "pipeline.engine.core.runtime.RERUN_MAX_LIMIT"
+RUNTIME_HANDLERS_FOR = "pipeline.engine.core.runtime.HandlersFactory.handlers_for"
+
+
+class StateStampTestCase(TestCase):
+    def test_bump__disabled(self):
+        backend = MagicMock()
+        with patch(STAMP_ENABLED, MagicMock(return_value=False)):
+            with patch(STAMP_BACKEND, backend):
+                stamp.bump(["1", "2"])
+                stamp.bump_engine()
+
+        backend.incr_stamps.assert_not_called()
+
+    def test_bump(self):
+        backend = MagicMock()
+        with patch(STAMP_ENABLED, MagicMock(return_value=True)):
+            with patch(STAMP_BACKEND, backend):
+                stamp.bump(["1", "2"])
+                backend.incr_stamps.assert_called_once()
+                self.assertEqual(
+                    backend.incr_stamps.call_args[1]["keys"], [stamp.stamp_key("1"), stamp.stamp_key("2")]
+                )
+
+                backend.incr_stamps.reset_mock()
+                stamp.bump_engine()
+                backend.incr_stamps.assert_called_once()
+                self.assertEqual(backend.incr_stamps.call_args[1]["keys"], [stamp.ENGINE_STAMP_KEY])
+
+    def test_bump__backend_raise(self):
+        backend = MagicMock()
+        backend.incr_stamps = MagicMock(side_effect=Exception)
+        with patch(STAMP_ENABLED, MagicMock(return_value=True)):
+            with patch(STAMP_BACKEND, backend):
+                stamp.bump(["1"])
+                stamp.bump_engine()
+
+    def test_stamps_for__backend_raise(self):
+        backend = MagicMock()
+        backend.get_stamps = MagicMock(side_effect=Exception)
+        with patch(STAMP_BACKEND, backend):
+            self.assertIsNone(stamp.stamps_for(["1"]))
+
+    def test_state_checker__disabled(self):
+        backend = MagicMock()
+        checker = stamp.StateChecker(MockPipelineProcess(), enable=False)
+        with patch(STAMP_BACKEND, backend):
+            self.assertFalse(checker.unchanged())
+            checker.mark_checked()
+            self.assertFalse(checker.unchanged())
+
+        backend.get_stamps.assert_not_called()
+
+    def test_state_checker(self):
+        backend = MagicMock()
+        backend.get_stamps = MagicMock(return_value=[1, 1])
+        checker = stamp.StateChecker(MockPipelineProcess(), enable=True)
+        with patch(STAMP_BACKEND, backend):
+            # never checked
+            self.assertFalse(checker.unchanged())
+            checker.mark_checked()
+
+            # nothing changed
+            self.assertTrue(checker.unchanged())
+            self.assertTrue(checker.unchanged())
+
+            # stamp changed
+            backend.get_stamps = MagicMock(return_value=[1, 2])
+            self.assertFalse(checker.unchanged())
+            checker.mark_checked()
+            self.assertTrue(checker.unchanged())
+
+            # backend error
+            backend.get_stamps = MagicMock(side_effect=Exception)
+            self.assertFalse(checker.unchanged())
+
+    def test_state_checker__subprocess_stack_changed(self):
+        backend = MagicMock()
+        backend.get_stamps = MagicMock(return_value=[1, 1])
+        process = MockPipelineProcess()
+        checker = stamp.StateChecker(process, enable=True)
+        with patch(STAMP_BACKEND, backend):
+            self.assertFalse(checker.unchanged())
+            checker.mark_checked()
+
+            process.subprocess_stack = ["subproc"]
+            backend.get_stamps = MagicMock(return_value=[1, 1, None])
+            self.assertFalse(checker.unchanged())
+
+    @patch(PIPELINE_BUILD_RELATIONSHIP, MagicMock())
+    @patch(PIPELINE_ENGINE_IS_FROZEN, MagicMock(return_value=False))
+    @patch(PIPELINE_SETTING_RERUN_MAX_LIMIT, 0)
+    @patch(STAMP_ENABLED, MagicMock(return_value=True))
+    def test_run_loop__skip_checks_when_stamp_unchanged(self):
+        backend = MagicMock()
+        backend.get_stamps = MagicMock(return_value=[1, 1])
+
+        node_1 = IdentifyObject()
+        node_2 = IdentifyObject()
+        node_3 = IdentifyObject()
+        destination = IdentifyObject()
+        nodes = {n.id: n for n in [node_1, node_2, node_3, destination]}
+        next_nodes = {node_1.id: node_2, node_2.id: node_3, node_3.id: destination}
+
+        top_pipeline = PipelineObject()
+        top_pipeline.node = MagicMock(side_effect=lambda nid: nodes[nid])
+        process = MockPipelineProcess(
+            top_pipeline=top_pipeline, destination_id=destination.id, current_node_id=node_1.id
+        )
+        process.root_sleep_check = MagicMock(return_value=(False, states.RUNNING))
+        process.subproc_sleep_check = MagicMock(return_value=(False, []))
+
+        def handler(process, current_node, status):
+            return MockHandlerResult(should_return=False, should_sleep=False, next_node=next_nodes[current_node.id])
+
+        transit = MagicMock(return_value=MockActionResult(result=True, extra=MockStatus()))
+
+        with patch(STAMP_BACKEND, backend):
+            with patch(PIPELINE_STATUS_TRANSIT, transit):
+                with patch(RUNTIME_HANDLERS_FOR, MagicMock(return_value=handler)):
+                    runtime.run_loop(process)
+
+        process.destroy_and_wake_up_parent.assert_called_once_with(destination.id)
+        self.assertEqual(transit.call_count, 3)
+        process.root_sleep_check.assert_called_once()
+        process.subproc_sleep_check.assert_called_once()
+        FunctionSwitch.objects.is_frozen.assert_called_once()
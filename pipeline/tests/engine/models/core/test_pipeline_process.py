@@ -62,6 +62,41 @@ class TestPipelineProcess(TestCase):
         self.assertEqual(context.clear_change_keys.call_count, 1)
         child.top_pipeline.prune.assert_called_once_with(current_node_id, destination_id)
 
+    def test_fork_children(self):
+        context = MockContext()
+        context.clear_change_keys = MagicMock()
+        pipeline = PipelineObject(context=context)
+        current_node_ids = [uniqid() for _ in range(3)]
+        destination_id = uniqid()
+
+        process = PipelineProcess.objects.prepare_for_pipeline(pipeline)
+        process.subprocess_stack.push("subprocess_1")
+        process.subprocess_stack.push("subprocess_2")
+
+        # 1 query for each snapshot, children, relationships and savepoint
+        with self.assertNumQueries(len(current_node_ids) + 4):
+            children = PipelineProcess.objects.fork_children(
+                parent=process, current_node_ids=current_node_ids, destination_id=destination_id
+            )
+
+        self.assertEqual(context.clear_change_keys.call_count, 1)
+        self.assertEqual([child.current_node_id for child in children], current_node_ids)
+        self.assertEqual(len({child.snapshot.id for child in children}), len(current_node_ids))
+        for child in children:
+            child.top_pipeline.prune.assert_called_once_with(child.current_node_id, destination_id)
+
+            child = PipelineProcess.objects.get(id=child.id)
+            self.assertEqual(child.parent_id, process.id)
+            self.assertEqual(child.root_pipeline_id, process.root_pipeline_id)
+            self.assertEqual(child.destination_id, destination_id)
+            self.assertEqual(child.subprocess_stack, ["subprocess_1", "subprocess_2"])
+            self.assertEqual(child.top_pipeline.id, pipeline.id)
+            self.assertIsNot(child.top_pipeline, process.top_pipeline)
+            self.assertEqual(
+                set(SubProcessRelationship.objects.filter(process_id=child.id).values_list("subprocess_id", flat=True)),
+                {"subprocess_1", "subprocess_2"},
+            )
+
     @patch(SIGNAL_VALVE_SEND, MagicMock())
     def test_process_ready(self):
         from pipeline.django_signal_valve.valve import send
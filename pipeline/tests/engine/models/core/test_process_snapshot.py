@@ -11,11 +11,39 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from mock import patch
 
-from pipeline.engine.models.core import ProcessSnapshot
+from pipeline.core.data.base import DataObject
+from pipeline.core.data.context import Context
+from pipeline.core.data.var import SpliceVariable
+from pipeline.core.flow.activity import ServiceActivity, SubProcess
+from pipeline.core.flow.base import SequenceFlow
+from pipeline.core.flow.event import EmptyEndEvent, EmptyStartEvent
+from pipeline.core.pipeline import Pipeline, PipelineSpec
+from pipeline.engine.models.core import ProcessSnapshot, SnapshotStructure
 from pipeline.engine.utils import Stack
 
+DELTA_ENABLED = "pipeline.engine.models.core.pipeline_settings.PIPELINE_ENGINE_SNAPSHOT_DELTA_ENABLED"
+
+
+def build_pipeline(id, act, data):
+    start_event = EmptyStartEvent(id="%s_start" % id)
+    end_event = EmptyEndEvent(id="%s_end" % id)
+
+    flow_start = SequenceFlow("%s_flow_start" % id, start_event, act)
+    flow_end = SequenceFlow("%s_flow_end" % id, act, end_event)
+    start_event.outgoing.add_flow(flow_start)
+    act.incoming.add_flow(flow_start)
+    act.outgoing.add_flow(flow_end)
+    end_event.incoming.add_flow(flow_end)
+
+    spec = PipelineSpec(start_event, end_event, [flow_start, flow_end], [act], [], data, Context({}))
+    return Pipeline(id, spec)
+
 
 class TestProcessSnapshot(TestCase):
     def setUp(self):
@@ -39,3 +67,153 @@ class TestProcessSnapshot(TestCase):
     def test_clean_children(self):
         self.snapshot.clean_children()
         self.assertEqual(len(self.snapshot.children), 0)
+
+
+class TestProcessSnapshotDelta(TestCase):
+    def setUp(self):
+        sub_act = ServiceActivity(id="sub_act", service=None, data=DataObject({"input": "value"}))
+        self.sub_pipeline = build_pipeline("sub", sub_act, DataObject({}))
+        self.subprocess = SubProcess(id="subprocess", pipeline=self.sub_pipeline)
+        self.pipeline = build_pipeline("root", self.subprocess, DataObject({}))
+        self.subprocess.data.inputs["splice"] = SpliceVariable("splice", "${a}", self.pipeline.context)
+
+    def create_snapshot(self):
+        snapshot = ProcessSnapshot.objects.create_snapshot(
+            pipeline_stack=Stack(),
+            children=[],
+            root_pipeline=self.pipeline,
+            subprocess_stack=Stack(),
+        )
+        snapshot.pipeline_stack.push(self.pipeline)
+        snapshot.save()
+        return snapshot
+
+    @patch(DELTA_ENABLED, False)
+    def test_save__skip_unchanged(self):
+        snapshot = self.create_snapshot()
+
+        with self.assertNumQueries(0):
+            snapshot.save()
+
+        snapshot.children.append("child")
+        with self.assertNumQueries(1):
+            snapshot.save()
+
+        # digest is not computed on load without delta, the first save after load writes
+        snapshot = ProcessSnapshot.objects.get(id=snapshot.id)
+        self.assertEqual(snapshot.children, ["child"])
+        self.assertIsNone(getattr(snapshot, "_digest", None))
+        with self.assertNumQueries(1):
+            snapshot.save()
+        with self.assertNumQueries(0):
+            snapshot.save()
+
+    @patch(DELTA_ENABLED, True)
+    def test_save__delta_skip_unchanged_after_load(self):
+        snapshot = self.create_snapshot()
+
+        loaded = ProcessSnapshot.objects.get(id=snapshot.id)
+        with self.assertNumQueries(0):
+            loaded.save()
+
+        loaded.children.append("child")
+        with self.assertNumQueries(1):
+            loaded.save()
+
+    @patch(DELTA_ENABLED, True)
+    def test_save__delta(self):
+        snapshot = self.create_snapshot()
+        self.assertEqual(SnapshotStructure.objects.count(), 1)
+
+        sub_act = self.sub_pipeline.node("sub_act")
+        sub_act.data.set_outputs("output", "result")
+        sub_act.next_exec_is_retry()
+        snapshot.pipeline_stack.push(self.sub_pipeline)
+        snapshot.subprocess_stack.push(self.subprocess.id)
+        self.pipeline.context.set_global_var("a", "1")
+        with self.assertNumQueries(1):
+            snapshot.save()
+
+        loaded = ProcessSnapshot.objects.get(id=snapshot.id)
+        pipeline = loaded.root_pipeline
+        subprocess = pipeline.node("subprocess")
+        sub_pipeline = subprocess.pipeline
+        sub_act = sub_pipeline.node("sub_act")
+
+        self.assertIs(loaded.pipeline_stack[0], pipeline)
+        self.assertIs(loaded.pipeline_stack[1], sub_pipeline)
+        self.assertEqual(loaded.subprocess_stack, ["subprocess"])
+        self.assertIs(pipeline.start_event.outgoing.unique_one().target, subprocess)
+        self.assertIs(subprocess.outgoing.unique_one().target, pipeline.end_event)
+        self.assertIs(subprocess.data, sub_pipeline.data)
+        self.assertIs(subprocess.data.inputs["splice"]._refs["a"].context, pipeline.context)
+        self.assertEqual(sub_act.data.get_one_of_outputs("output"), "result")
+        self.assertEqual(sub_act.data.inputs, {"input": "value"})
+        self.assertEqual(sub_act._prepared_inputs, {"input": "value"})
+        self.assertTrue(sub_act.on_retry())
+        self.assertEqual(pipeline.context.get("a"), "1")
+
+        # runtime attributes removed after save are not restored from structure
+        sub_act.retry_at_current_exec()
+        loaded.save()
+        sub_pipeline = ProcessSnapshot.objects.get(id=snapshot.id).pipeline_stack.top()
+        self.assertFalse(sub_pipeline.node("sub_act").on_retry())
+
+    @patch(DELTA_ENABLED, True)
+    def test_prepare_rerun_data__after_delta_load(self):
+        self.pipeline.context.set_global_var("${a}", "old")
+        self.subprocess._prepared_inputs = self.subprocess.data.inputs_copy()
+        snapshot = self.create_snapshot()
+
+        loaded = ProcessSnapshot.objects.get(id=snapshot.id)
+        pipeline = loaded.root_pipeline
+        subprocess = pipeline.node("subprocess")
+        self.assertIs(subprocess._prepared_inputs["splice"]._refs["a"].context, pipeline.context)
+
+        pipeline.context.set_global_var("${a}", "new")
+        subprocess.prepare_rerun_data()
+        self.assertEqual(subprocess.data.inputs["splice"].get(), "new")
+
+    @patch(DELTA_ENABLED, True)
+    def test_save__share_structure(self):
+        self.create_snapshot()
+        self.create_snapshot()
+        self.assertEqual(SnapshotStructure.objects.count(), 1)
+
+    @patch(DELTA_ENABLED, True)
+    def test_prune_top_pipeline__rebuild_structure(self):
+        snapshot = self.create_snapshot()
+        snapshot.prune_top_pipeline("root_start", "subprocess")
+        snapshot.save()
+
+        self.assertEqual(SnapshotStructure.objects.count(), 2)
+        pipeline = ProcessSnapshot.objects.get(id=snapshot.id).pipeline_stack.top()
+        self.assertIsNone(pipeline.node("subprocess").outgoing)
+        self.assertEqual(set(pipeline.all_nodes.keys()), {"root_start", "subprocess"})
+
+    @patch(DELTA_ENABLED, False)
+    def test_load__legacy_and_delta(self):
+        snapshot = self.create_snapshot()
+        with patch(DELTA_ENABLED, True):
+            snapshot.children.append("child")
+            snapshot.save()
+
+        loaded = ProcessSnapshot.objects.get(id=snapshot.id)
+        self.assertNotEqual(loaded.structure_key, "")
+        self.assertEqual(loaded.children, ["child"])
+
+        loaded.children.append("child2")
+        loaded.save()
+        loaded = ProcessSnapshot.objects.get(id=snapshot.id)
+        self.assertEqual(loaded.structure_key, "")
+        self.assertEqual(loaded.children, ["child", "child2"])
+        self.assertEqual(loaded.root_pipeline.node("subprocess").pipeline.node("sub_act").id, "sub_act")
+
+    @patch(DELTA_ENABLED, True)
+    def test_clean_unused_structure(self):
+        snapshot = self.create_snapshot()
+        unused = SnapshotStructure.objects.create(key="unused", data=b"", last_used=timezone.now() - timedelta(days=2))
+        SnapshotStructure.objects.filter(key=snapshot.structure_key).update(last_used=unused.last_used)
+
+        self.assertEqual(SnapshotStructure.objects.clean_unused(60 * 60 * 24), 1)
+        self.assertEqual(list(SnapshotStructure.objects.values_list("key", flat=True)), [snapshot.structure_key])
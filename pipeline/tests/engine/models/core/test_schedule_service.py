@@ -11,7 +11,10 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
 
 from pipeline.django_signal_valve import valve
 from pipeline.engine import signals
@@ -22,6 +25,8 @@ from ..mock import *  # noqa
 
 valve.unload_valve_function()
 
+SCHEDULE_POLLER_ENABLED = "pipeline.engine.models.core.pipeline_settings.PIPELINE_ENGINE_SCHEDULE_POLLER_ENABLED"
+
 
 class TestScheduleService(TestCase):
     @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
@@ -77,6 +82,54 @@ class TestScheduleService(TestCase):
             countdown=interval.interval,
         )
 
+    @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
+    @mock.patch("pipeline.engine.core.data.set_schedule_data", mock.MagicMock())
+    @mock.patch(SCHEDULE_POLLER_ENABLED, True)
+    def test_set_schedule__poller_enabled(self):
+        from pipeline.django_signal_valve.valve import send
+
+        interval = StaticIntervalObject(interval=3)
+        service_act = ServiceActObject(interval=interval)
+        before = timezone.now()
+        schedule = ScheduleService.objects.set_schedule(
+            activity_id=service_act.id,
+            service_act=service_act,
+            process_id=uniqid(),
+            version=uniqid(),
+            parent_data="parent_data",
+        )
+
+        send.assert_not_called()
+        schedule_date = ScheduleService.objects.get(id=schedule.id).schedule_date
+        self.assertEqual(schedule_date, schedule.schedule_date)
+        self.assertTrue(before + timedelta(seconds=3) <= schedule_date <= timezone.now() + timedelta(seconds=3))
+
+    @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
+    @mock.patch("pipeline.engine.core.data.set_schedule_data", mock.MagicMock())
+    @mock.patch(SCHEDULE_POLLER_ENABLED, True)
+    @mock.patch("pipeline.engine.models.core.pipeline_settings.PIPELINE_ENGINE_SCHEDULE_POLLER_INTERVAL", 0.5)
+    def test_set_schedule__poller_enabled_and_batch_key(self):
+        schedules = []
+        for _ in range(2):
+            service_act = ServiceActObject(interval=StaticIntervalObject(interval=3), schedule_batch_key="biz_1")
+            schedules.append(
+                ScheduleService.objects.set_schedule(
+                    activity_id=service_act.id,
+                    service_act=service_act,
+                    process_id=uniqid(),
+                    version=uniqid(),
+                    parent_data="parent_data",
+                )
+            )
+            service_act.schedule_batch_key.assert_called_once_with("parent_data")
+
+        schedule = ScheduleService.objects.get(id=schedules[0].id)
+        self.assertEqual(len(schedule.batch_key), 32)
+        self.assertEqual(schedule.batch_key, schedules[1].batch_key)
+        # aligned to poller interval
+        self.assertEqual(schedule.schedule_date.microsecond % 500000, 0)
+        self.assertEqual(schedule.schedule_date, schedules[1].schedule_date)
+
     @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
     @mock.patch("pipeline.engine.core.data.set_schedule_data", mock.MagicMock())
     def test_schedule_for(self):
@@ -164,6 +217,34 @@ class TestScheduleService(TestCase):
         )
         self.assertRaises(InvalidOperationException, schedule.set_next_schedule)
 
+    @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
+    @mock.patch("pipeline.engine.core.data.set_schedule_data", mock.MagicMock())
+    @mock.patch("pipeline.engine.models.ScheduleCeleryTask.objects.unbind", mock.MagicMock())
+    @mock.patch(SCHEDULE_POLLER_ENABLED, True)
+    def test_set_next_schedule__poller_enabled(self):
+        from pipeline.django_signal_valve.valve import send
+
+        interval = StaticIntervalObject(interval=3)
+        service_act = ServiceActObject(interval=interval)
+        schedule = ScheduleService.objects.set_schedule(
+            activity_id=service_act.id,
+            service_act=service_act,
+            process_id=uniqid(),
+            version=uniqid(),
+            parent_data="parent_data",
+        )
+
+        schedule.is_scheduling = True
+        schedule.schedule_date = None
+        schedule.save()
+        before = timezone.now()
+        schedule.set_next_schedule()
+        schedule.refresh_from_db()
+        self.assertFalse(schedule.is_scheduling)
+        self.assertTrue(before + timedelta(seconds=3) <= schedule.schedule_date)
+        send.assert_not_called()
+        ScheduleCeleryTask.objects.unbind.assert_called_with(schedule.id)
+
     @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
     @mock.patch("pipeline.engine.core.data.set_schedule_data", mock.MagicMock())
     @mock.patch("pipeline.engine.core.data.delete_parent_data", mock.MagicMock())
@@ -206,11 +287,13 @@ class TestScheduleService(TestCase):
             version=version,
             parent_data=parent_data,
         )
+        schedule.schedule_date = timezone.now()
         schedule.finish()
 
         self.assertTrue(schedule.is_finished)
         self.assertIsNone(schedule.service_act)
         self.assertFalse(schedule.is_scheduling)
+        self.assertIsNone(ScheduleService.objects.get(id=schedule.id).schedule_date)
         ScheduleCeleryTask.objects.destroy.assert_called_with(schedule.id)
 
     @mock.patch("pipeline.django_signal_valve.valve.send", mock.MagicMock())
@@ -16,7 +16,7 @@ import copy
 from django.test import TestCase
 
 from pipeline.engine import states
-from pipeline.engine.models import Data, LogEntry, Status, SubProcessRelationship
+from pipeline.engine.models import Data, LogEntry, NodeRelationship, Status, SubProcessRelationship
 from pipeline.tests.mock_settings import *  # noqa
 
 from ..mock import *  # noqa
@@ -344,6 +344,75 @@ class TestStatus(TestCase):
         self.assertFalse(status.error_ignorable)
         self.assertEqual(status.state, states.READY)
 
+    @patch(PIPELINE_DATA_WRITE_NODE_DATA, MagicMock())
+    def test_handoff(self):
+        pipeline_id = uniqid()
+        NodeRelationship.objects.build_relationship(pipeline_id, pipeline_id)
+
+        # new next node
+        node = IdentifyObject()
+        next_id = uniqid()
+        Status.objects.transit(id=node.id, to_state=states.RUNNING, start=True)
+        finish_res, start_res = Status.objects.handoff(
+            node,
+            next_id=next_id,
+            pipeline_id=pipeline_id,
+            root_pipeline_id=pipeline_id,
+            next_name="next",
+            error_ignorable=True,
+        )
+        self.assertTrue(finish_res.result)
+        self.assertTrue(start_res.result)
+        Data.objects.write_node_data.assert_called_with(node)
+        status = Status.objects.get(id=node.id)
+        self.assertEqual(status.state, states.FINISHED)
+        self.assertTrue(status.error_ignorable)
+        self.assertIsNotNone(status.archived_time)
+        next_status = Status.objects.get(id=next_id)
+        self.assertEqual(next_status.state, states.RUNNING)
+        self.assertEqual(next_status.name, "next")
+        self.assertEqual(next_status.loop, 1)
+        self.assertIsNotNone(next_status.started_time)
+        self.assertEqual(next_status.parent_id, pipeline_id)
+        self.assertEqual(next_status.root_pipeline_id, pipeline_id)
+        self.assertEqual(start_res.extra.id, next_id)
+        self.assertEqual(NodeRelationship.objects.get(ancestor_id=pipeline_id, descendant_id=next_id).distance, 1)
+        self.assertEqual(NodeRelationship.objects.get(ancestor_id=next_id, descendant_id=next_id).distance, 0)
+
+        # next node rerun
+        node = IdentifyObject()
+        Status.objects.transit(id=node.id, to_state=states.RUNNING, start=True)
+        Status.objects.transit(id=next_id, to_state=states.FINISHED)
+        with patch(PIPELINE_HISTORY_RECORD, MagicMock(return_value=IdentifyObject())):
+            with patch(PIPELINE_HISTORY_LINK_HISTORY, MagicMock()):
+                finish_res, start_res = Status.objects.handoff(
+                    node, next_id=next_id, pipeline_id=pipeline_id, root_pipeline_id=pipeline_id
+                )
+        self.assertTrue(finish_res.result)
+        self.assertTrue(start_res.result)
+        self.assertEqual(Status.objects.get(id=next_id).loop, 2)
+        self.assertEqual(NodeRelationship.objects.filter(ancestor_id=pipeline_id, descendant_id=next_id).count(), 1)
+
+        # finish failed
+        Data.objects.write_node_data.reset_mock()
+        node = IdentifyObject()
+        next_id = uniqid()
+        Status.objects.transit(id=node.id, to_state=states.FAILED)
+        finish_res, start_res = Status.objects.handoff(
+            node, next_id=next_id, pipeline_id=pipeline_id, root_pipeline_id=pipeline_id
+        )
+        self.assertFalse(finish_res.result)
+        self.assertIsNone(start_res)
+        Data.objects.write_node_data.assert_not_called()
+        self.assertFalse(Status.objects.filter(id=next_id).exists())
+
+        # node not exist
+        finish_res, start_res = Status.objects.handoff(
+            IdentifyObject(), next_id=uniqid(), pipeline_id=pipeline_id, root_pipeline_id=pipeline_id
+        )
+        self.assertFalse(finish_res.result)
+        self.assertIsNone(start_res)
+
     @patch(PIPELINE_DATA_WRITE_NODE_DATA, MagicMock())
     @patch(PIPELINE_HISTORY_LINK_HISTORY, MagicMock())
     @patch(PIPELINE_STATUS_RECOVER_FROM_BLOCK, MagicMock())
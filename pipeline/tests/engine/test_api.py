@@ -663,6 +663,8 @@ class TestEngineAPI(TestCase):
                 "version": s.version,
                 "children": children,
                 "state_refresh_at": None,
+                "root_pipeline_id": s.root_pipeline_id,
+                "parent_id": s.parent_id,
             }
 
         tree_depth_1 = get_status_dict_with_children(
@@ -712,6 +714,122 @@ class TestEngineAPI(TestCase):
         tree = api.get_status_tree(s1.id, 4)
         self.assertDictEqual(tree, tree_depth_3)
 
+    def test_status_tree__by_parent(self):
+        status = {}
+        for name in ["s1", "s2", "s3", "s4", "s5", "s6"]:
+            status[name] = Status.objects.create(
+                id=uniqid(),
+                name=name,
+                state=states.FINISHED,
+                started_time=timezone.now(),
+                archived_time=timezone.now() + timedelta(seconds=3),
+            )
+        s1, s2, s3, s4, s5, s6 = [status[name] for name in ["s1", "s2", "s3", "s4", "s5", "s6"]]
+
+        Status.objects.bind_tree(s1.id, parent_id="", root_pipeline_id=s1.id)
+        Status.objects.bind_tree(s2.id, parent_id=s1.id, root_pipeline_id=s1.id)
+        Status.objects.bind_tree(s3.id, parent_id=s1.id, root_pipeline_id=s1.id)
+        Status.objects.bind_tree(s4.id, parent_id=s2.id, root_pipeline_id=s1.id)
+        Status.objects.bind_tree(s5.id, parent_id=s4.id, root_pipeline_id=s1.id)
+        Status.objects.bind_tree(s6.id, parent_id=s4.id, root_pipeline_id=s1.id)
+
+        # bind twice will not change the tree
+        Status.objects.bind_tree(s6.id, parent_id=s1.id, root_pipeline_id=uniqid())
+
+        for s in [s1, s2, s3, s4, s5, s6]:
+            s.refresh_from_db()
+
+        def get_status_dict_with_children(s, children):
+            return {
+                "archived_time": s.archived_time,
+                "created_time": s.created_time,
+                "elapsed_time": calculate_elapsed_time(s.started_time, s.archived_time),
+                "error_ignorable": s.error_ignorable,
+                "id": s.id,
+                "loop": s.loop,
+                "name": s.name,
+                "retry": s.retry,
+                "skip": s.skip,
+                "started_time": s.started_time,
+                "state": s.state,
+                "version": s.version,
+                "children": children,
+                "state_refresh_at": None,
+                "root_pipeline_id": s.root_pipeline_id,
+                "parent_id": s.parent_id,
+            }
+
+        tree_depth_1 = get_status_dict_with_children(
+            s1,
+            children={
+                s2.id: get_status_dict_with_children(s2, children={}),
+                s3.id: get_status_dict_with_children(s3, children={}),
+            },
+        )
+        self.assertDictEqual(api.get_status_tree(s1.id, 1), tree_depth_1)
+
+        tree_depth_3 = get_status_dict_with_children(
+            s1,
+            children={
+                s2.id: get_status_dict_with_children(
+                    s2,
+                    children={
+                        s4.id: get_status_dict_with_children(
+                            s4,
+                            children={
+                                s5.id: get_status_dict_with_children(s5, {}),
+                                s6.id: get_status_dict_with_children(s6, {}),
+                            },
+                        )
+                    },
+                ),
+                s3.id: get_status_dict_with_children(s3, children={}),
+            },
+        )
+        self.assertDictEqual(api.get_status_tree(s1.id, 3), tree_depth_3)
+        self.assertDictEqual(api.get_status_tree(s1.id, 99), tree_depth_3)
+
+        # subtree of a subprocess
+        subtree = get_status_dict_with_children(
+            s2, children={s4.id: get_status_dict_with_children(s4, children={})}
+        )
+        self.assertDictEqual(api.get_status_tree(s2.id, 1), subtree)
+
+    def test_get_batch_status(self):
+        s1 = Status.objects.create(id=uniqid(), name="s1", state=states.FINISHED, started_time=timezone.now())
+        s2 = Status.objects.create(id=uniqid(), name="s2", state=states.RUNNING, started_time=timezone.now())
+
+        statuses = api.get_batch_status([s1.id, s2.id, uniqid()])
+
+        self.assertEqual(set(statuses.keys()), {s1.id, s2.id})
+        self.assertEqual(statuses[s1.id]["state"], states.FINISHED)
+        self.assertEqual(statuses[s2.id]["state"], states.RUNNING)
+        self.assertIn("elapsed_time", statuses[s2.id])
+        self.assertNotIn("children", statuses[s2.id])
+
+    def test_get_status_trees(self):
+        roots = []
+        for _ in range(2):
+            root = Status.objects.create(id=uniqid(), name="root", state=states.FINISHED, started_time=timezone.now())
+            child = Status.objects.create(id=uniqid(), name="child", state=states.FINISHED, started_time=timezone.now())
+            Status.objects.bind_tree(root.id, parent_id="", root_pipeline_id=root.id)
+            Status.objects.bind_tree(child.id, parent_id=root.id, root_pipeline_id=root.id)
+            roots.append(root.id)
+
+        # pipeline executed before parent pointer was introduced
+        legacy_root = Status.objects.create(id=uniqid(), name="root", state=states.FINISHED)
+        legacy_child = Status.objects.create(id=uniqid(), name="child", state=states.FINISHED)
+        NodeRelationship.objects.build_relationship(legacy_root.id, legacy_root.id)
+        NodeRelationship.objects.build_relationship(legacy_root.id, legacy_child.id)
+
+        not_exist = uniqid()
+        trees = api.get_status_trees(roots + [legacy_root.id, not_exist], 99)
+
+        self.assertEqual(set(trees.keys()), set(roots + [legacy_root.id]))
+        for root_id in roots:
+            self.assertDictEqual(trees[root_id], api.get_status_tree(root_id, 99))
+        self.assertEqual(list(trees[legacy_root.id]["children"].keys()), [legacy_child.id])
+
     @patch(PIPELINE_FUNCTION_SWITCH_IS_FROZEN, MagicMock(return_value=False))
     @patch(PIPELINE_ENGINE_API_WORKERS, MagicMock(return_value=True))
     @patch(PIPELINE_SCHEDULE_SCHEDULE_FOR, MagicMock(side_effect=ScheduleService.DoesNotExist))
@@ -14,6 +14,7 @@ specific language governing permissions and limitations under the License.
 import mock
 from mock import MagicMock, patch  # noqa
 
+from pipeline.core.flow.activity import ScheduleNode
 from pipeline.utils.collections import FancyDict
 from pipeline.utils.uniqid import uniqid
 
@@ -132,6 +133,7 @@ class ServiceActObject(IdentifyObject):
         need_schedule=False,
         multi_callback_enabled=False,
         on_retry=False,
+        schedule_batch_key=None,
     ):
         self.service = Object()
         self.service.interval = interval
@@ -162,6 +164,13 @@ class ServiceActObject(IdentifyObject):
         self.on_retry = mock.MagicMock(return_value=on_retry)
         self.retry_at_current_exec = mock.MagicMock()
         self.setup_runtime_attrs = mock.MagicMock()
+        self.schedule_batch_key = mock.MagicMock(return_value=schedule_batch_key)
+        self.set_schedule_result = mock.MagicMock(side_effect=lambda result: result)
+        self.schedule_node = mock.MagicMock(
+            side_effect=lambda parent_data, callback_data=None: ScheduleNode(
+                self.service, self.data, parent_data, callback_data
+            )
+        )
         super(ServiceActObject, self).__init__(id)
 
     def next(self):
@@ -241,10 +250,11 @@ class MockActionResult(object):
 
 
 class MockHandlerResult(object):
-    def __init__(self, should_return, should_sleep, next_node=None):
+    def __init__(self, should_return, should_sleep, next_node=None, handoff=None):
         self.should_return = should_return
         self.should_sleep = should_sleep
         self.next_node = next_node or IdentifyObject()
+        self.handoff = handoff
 
 
 class MockScheduleService(object):
@@ -268,6 +278,7 @@ class MockScheduleService(object):
         self.multi_callback_enabled = kwargs.get("multi_callback_enabled", False)
         self.process_id = kwargs.get("process_id", uniqid())
         self.is_finished = kwargs.get("is_finished", False)
+        self.schedule_date = kwargs.get("schedule_date")
         self.schedule_times = 0
         self.finish = mock.MagicMock()
         self.set_next_schedule = mock.MagicMock()
@@ -46,6 +46,9 @@ PIPELINE_PROCESS_SELECT_FOR_UPDATE = (
 PIPELINE_PROCESS_FORK_CHILD = (
     "pipeline.engine.models.PipelineProcess.objects.fork_child"
 )
+PIPELINE_PROCESS_FORK_CHILDREN = (
+    "pipeline.engine.models.PipelineProcess.objects.fork_children"
+)
 PIPELINE_PROCESS_PREPARE_FOR_PIPELINE = (
     "pipeline.engine.models.PipelineProcess.objects.prepare_for_pipeline"
 )
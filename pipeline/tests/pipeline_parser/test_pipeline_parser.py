@@ -16,7 +16,7 @@ import unittest
 from pipeline.core.pipeline import Pipeline
 from pipeline.parser.pipeline_parser import PipelineParser
 
-from .data import CONDITIONAL_PARALLEL, PIPELINE_DATA, PIPELINE_WITH_SUB_PROCESS
+from .data import CONDITIONAL_PARALLEL, PIPELINE_DATA, PIPELINE_WITH_SUB_PROCESS, id_list, id_list3
 
 
 class TestPipelineParser(unittest.TestCase):
@@ -48,3 +48,26 @@ class TestPipelineParser(unittest.TestCase):
     def test_conditional_parallel_parser(self):
         parser_obj = PipelineParser(CONDITIONAL_PARALLEL)
         self.assertIsInstance(parser_obj.parse(), Pipeline)
+
+    def test_flow_wiring(self):
+        pipeline = PipelineParser(PIPELINE_DATA).parse()
+        self.assertEqual(len(pipeline.spec.flows), len(PIPELINE_DATA["flows"]))
+        for flow in pipeline.spec.flows:
+            self.assertEqual(flow.source.id, PIPELINE_DATA["flows"][flow.id]["source"])
+            self.assertEqual(flow.target.id, PIPELINE_DATA["flows"][flow.id]["target"])
+
+    def test_get_act(self):
+        act = PipelineParser(PIPELINE_DATA).get_act(id_list[3])
+        self.assertEqual(act.id, id_list[3])
+
+    def test_get_act__in_subprocess(self):
+        act = PipelineParser(PIPELINE_WITH_SUB_PROCESS).get_act(id_list3[3], subprocess_stack=[id_list[4]])
+        self.assertEqual(act.id, id_list3[3])
+
+    def test_parse__act_path(self):
+        pipeline = PipelineParser(PIPELINE_WITH_SUB_PROCESS)._parse(act_path=[id_list[4], id_list3[3]])
+        self.assertEqual([act.id for act in pipeline.spec.activities], [id_list[4]])
+        self.assertEqual(pipeline.spec.flows, [])
+
+        sub_pipeline = pipeline.spec.activities[0].pipeline
+        self.assertEqual([act.id for act in sub_pipeline.spec.activities], [id_list3[3]])
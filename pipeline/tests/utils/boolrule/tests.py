@@ -181,3 +181,13 @@ class BoolRuleTests(TestCase):
         self.assertFalse(BoolRule('(1 > 2 or 2 > 3) and ("s" > "s" or "su" > "st")').test())
         self.assertFalse(BoolRule('(1 > 2 or 2 > 3) and ("s" > "s" or "su" < "st")').test())
         self.assertFalse(BoolRule('(1 < 3 and 2 < 3)  and ("s" > "s" or "su" > "st") and (4 > 5 and 5 < 6)').test())
+
+    def test_compile_cache(self):
+        query = '${a} in ("1", "2") and ${b} == 1'
+        self.assertIs(BoolRule(query)._tokens, BoolRule(query)._tokens)
+
+        # compiled list value should not be changed by test
+        rule = BoolRule(query)
+        for _ in range(3):
+            self.assertTrue(rule.test({"${a}": 1, "${b}": "1"}))
+            self.assertFalse(rule.test({"${a}": 3, "${b}": "1"}))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import pickle
+import zlib
+
+from django.test import TestCase, override_settings
+
+from pipeline.engine.models.fields import IOField
+from pipeline.utils import codec
+
+VALUE = {"key": ["value", 1, 2.0, None], "nested": {"a": b"bytes"}}
+
+
+class CodecTestCase(TestCase):
+    def test_encode_decode(self):
+        for name in codec.CodecRegistry.names():
+            data = codec.encode(VALUE, codec=name)
+            self.assertEqual(data[:1], codec.CodecRegistry.get(name).header)
+            self.assertEqual(codec.decode(data), VALUE)
+            self.assertEqual(codec.decode(memoryview(data)), VALUE)
+
+    def test_encode__default_codec_compatible_with_legacy_data(self):
+        self.assertEqual(codec.encode(VALUE), zlib.compress(pickle.dumps(VALUE), 6))
+        self.assertEqual(codec.encode(VALUE, codec="pickle"), pickle.dumps(VALUE))
+
+    def test_encode__low_pickle_protocol(self):
+        for protocol in [0, 1]:
+            for name in codec.CodecRegistry.names():
+                self.assertEqual(codec.decode(codec.encode(VALUE, codec=name, protocol=protocol)), VALUE)
+
+            with override_settings(PIPELINE_DATA_PICKLE_PROTOCOL=protocol):
+                data = codec.encode(VALUE, codec="pickle")
+                self.assertEqual(data, pickle.dumps(VALUE, codec.MIN_PICKLE_PROTOCOL))
+                self.assertEqual(codec.decode(data), VALUE)
+
+    def test_pickle_protocol(self):
+        self.assertEqual(codec.pickle_protocol(0), 2)
+        self.assertEqual(codec.pickle_protocol(1), 2)
+        self.assertEqual(codec.pickle_protocol(4), 4)
+        self.assertEqual(codec.pickle_protocol(-1), -1)
+        with override_settings(PIPELINE_DATA_PICKLE_PROTOCOL=None):
+            self.assertIsNone(codec.pickle_protocol())
+        with override_settings(PIPELINE_DATA_PICKLE_PROTOCOL=1):
+            self.assertEqual(codec.pickle_protocol(), 2)
+
+    def test_decode__legacy_data(self):
+        self.assertEqual(codec.decode(zlib.compress(pickle.dumps(VALUE), 9)), VALUE)
+        self.assertEqual(codec.decode(pickle.dumps(VALUE, 2)), VALUE)
+
+    def test_decode__unknown_header(self):
+        self.assertRaises(ValueError, codec.decode, b"\xff" + pickle.dumps(VALUE))
+
+    def test_register__header_conflict(self):
+        self.assertRaises(
+            ValueError,
+            codec.CodecRegistry.register,
+            codec.Codec(name="another", header=codec.ZLIB_HEADER, compress=None, decompress=None),
+        )
+        self.assertRaises(
+            ValueError,
+            codec.CodecRegistry.register,
+            codec.Codec(name="another", header=b"\x03\x04", compress=None, decompress=None),
+        )
+
+    def test_get__codec_not_exist(self):
+        self.assertRaises(ValueError, codec.CodecRegistry.get, "not_exist")
+
+    def test_io_field(self):
+        field = IOField()
+        self.assertEqual(field.to_python(field.get_prep_value(VALUE)), VALUE)
+        self.assertEqual(field.to_python(zlib.compress(pickle.dumps(VALUE))), VALUE)
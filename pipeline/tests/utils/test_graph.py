@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from django.test import TestCase
+
+from pipeline.utils.graph import Graph
+
+
+class TestGraph(TestCase):
+    def test_has_cycle__no_cycle(self):
+        graph = Graph([1, 2, 3, 4], [[1, 2], [2, 3], [3, 4]])
+        self.assertFalse(graph.has_cycle())
+        self.assertEqual(graph.get_cycle(), [])
+
+    def test_get_cycle(self):
+        self.assertEqual(Graph([1, 2, 3, 4], [[1, 2], [2, 3], [3, 4], [4, 1]]).get_cycle(), [1, 2, 3, 4, 1])
+        self.assertEqual(Graph([1, 2, 3, 4], [[1, 2], [2, 3], [3, 4], [4, 2]]).get_cycle(), [2, 3, 4, 2])
+        self.assertEqual(Graph([1, 2], [[1, 2], [2, 2]]).get_cycle(), [2, 2])
+
+    def test_get_cycle__cycle_behind_explored_branch(self):
+        # 2 -> 4 is explored before the cycle 3 -> 5 -> 3 is found
+        graph = Graph([1, 2, 3, 4, 5], [[1, 2], [1, 3], [2, 4], [3, 4], [3, 5], [5, 3]])
+        self.assertEqual(graph.get_cycle(), [3, 5, 3])
+
+    def test_has_cycle__diamonds(self):
+        # 200 diamonds in sequence take 2^200 paths without recording explored nodes
+        nodes = [0]
+        flows = []
+        for i in range(200):
+            head = nodes[-1]
+            left, right, tail = 3 * i + 1, 3 * i + 2, 3 * i + 3
+            nodes.extend([left, right, tail])
+            flows.extend([[head, left], [head, right], [left, tail], [right, tail]])
+
+        self.assertFalse(Graph(nodes, flows).has_cycle())
+
+        flows.append([nodes[-1], 0])
+        self.assertTrue(Graph(nodes, flows).has_cycle())
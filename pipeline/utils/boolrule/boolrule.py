@@ -11,6 +11,8 @@ an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express o
 specific language governing permissions and limitations under the License.
 """
 
+from functools import lru_cache
+
 from pyparsing import (
     CaselessLiteral,
     Combine,
@@ -18,7 +20,6 @@ from pyparsing import (
     Group,
     Keyword,
     Optional,
-    ParseException,
     ParseResults,
     QuotedString,
     Suppress,
@@ -151,6 +152,114 @@ def double_equals_trans(lval, rval, operator):
     return lval, rval
 
 
+_OR = "or"
+_AND = "and"
+
+
+def _expand_val(val, context):
+    if type(val) == list:
+        return [_expand_val(v, context) for v in val]
+
+    if isinstance(val, SubstituteVal):
+        return val.get_val(context)
+
+    return val
+
+
+def _static_val(val):
+    # convert ParseResults to list once, so that no ParseResults operation is needed during test
+    if isinstance(val, ParseResults):
+        return [_static_val(x) for x in val.asList()]
+
+    if type(val) == list:
+        return [_static_val(x) for x in val]
+
+    return val
+
+
+def _compile_condition(token):
+    items = token.asDict()
+
+    operator = items["operator"]
+    lval = _static_val(items["lval"][0])
+    rval = _static_val(items["rval"][0])
+
+    def evaluate(context):
+        # expand always return new list for list value, so double_equals_trans will not modify compiled value
+        left, right = double_equals_trans(_expand_val(lval, context), _expand_val(rval, context), operator)
+
+        if operator in ("=", "==", "eq"):
+            return left == right
+        elif operator in ("!=", "ne"):
+            return left != right
+        elif operator in (">", "gt"):
+            return left > right
+        elif operator in (">=", "ge"):
+            return left >= right
+        elif operator in ("<", "lt"):
+            return left < right
+        elif operator in ("<=", "le"):
+            return left <= right
+        elif operator == "in":
+            return left in right
+        elif operator == "notin":
+            return left not in right
+        elif operator == "issuperset":
+            return set(left).issuperset(set(right))
+        elif operator == "notissuperset":
+            return not set(left).issuperset(set(right))
+        else:
+            raise UnknownOperatorException("Unknown operator '{}'".format(operator))
+
+    return evaluate
+
+
+def _compile_tokens(tokens):
+    steps = []
+
+    for token in tokens:
+
+        if not isinstance(token, ParseResults):
+            # append the constants, so that steps can be compared by identity during evaluation
+            if token == _OR:
+                steps.append(_OR)
+            elif token == _AND:
+                steps.append(_AND)
+            continue
+
+        if not token.getName():
+            steps.append(_compile_tokens(token))
+        else:
+            steps.append(_compile_condition(token))
+
+    def evaluate(context):
+        passed = False
+
+        for step in steps:
+            if step is _OR:
+                if passed:
+                    return True
+            elif step is _AND:
+                if not passed:
+                    return False
+            else:
+                passed = step(context)
+
+        return passed
+
+    return evaluate
+
+
+@lru_cache(maxsize=1024)
+def _compile_query(query, strict):
+    """
+    Parse the query and compile the tokens to an evaluate function, the result is cached by query,
+    so the same query will only be parsed by pyparsing once.
+    """
+    tokens = boolExpression.parseString(query, parseAll=strict)
+    return tokens, _compile_tokens(tokens)
+
+
 class BoolRule(object):
     """
     Represents a boolean expression and provides a `test` method to evaluate
@@ -165,6 +274,7 @@ class BoolRule(object):
 
     _compiled = False
     _tokens = None
+    _evaluate = None
     _query = None
 
     def __init__(self, query, lazy=False, strict=True):
@@ -185,7 +295,7 @@ class BoolRule(object):
             return True
 
         self._compile()
-        return self._test_tokens(self._tokens, context)
+        return self._evaluate(context)
 
     def _is_match_all(self):
         return True if self._query == "*" else False
@@ -197,74 +307,10 @@ class BoolRule(object):
             if self._is_match_all():
                 return
 
-            try:
-                self._tokens = boolExpression.parseString(self._query, parseAll=self.strict)
-            except ParseException:
-                raise
+            self._tokens, self._evaluate = _compile_query(self._query, self.strict)
 
             self._compiled = True
 
-    def _expand_val(self, val, context):
-        if type(val) == list:
-            val = [self._expand_val(v, context) for v in val]
-
-        if isinstance(val, SubstituteVal):
-            ret = val.get_val(context)
-            return ret
-
-        if isinstance(val, ParseResults):
-            return [self._expand_val(x, context) for x in val.asList()]
-
-        return val
-
-    def _test_tokens(self, tokens, context):
-        passed = False
-
-        for token in tokens:
-
-            if not isinstance(token, ParseResults):
-                if token == "or" and passed:
-                    return True
-                elif token == "and" and not passed:
-                    return False
-                continue
-
-            if not token.getName():
-                passed = self._test_tokens(token, context)
-                continue
-
-            items = token.asDict()
-
-            operator = items["operator"]
-            lval = self._expand_val(items["lval"][0], context)
-            rval = self._expand_val(items["rval"][0], context)
-            lval, rval = double_equals_trans(lval, rval, operator)
-
-            if operator in ("=", "==", "eq"):
-                passed = lval == rval
-            elif operator in ("!=", "ne"):
-                passed = lval != rval
-            elif operator in (">", "gt"):
-                passed = lval > rval
-            elif operator in (">=", "ge"):
-                passed = lval >= rval
-            elif operator in ("<", "lt"):
-                passed = lval < rval
-            elif operator in ("<=", "le"):
-                passed = lval <= rval
-            elif operator == "in":
-                passed = lval in rval
-            elif operator == "notin":
-                passed = lval not in rval
-            elif operator == "issuperset":
-                passed = set(lval).issuperset(set(rval))
-            elif operator == "notissuperset":
-                passed = not set(lval).issuperset(set(rval))
-            else:
-                raise UnknownOperatorException("Unknown operator '{}'".format(operator))
-
-        return passed
-
 
 class MissingVariableException(Exception):
     """
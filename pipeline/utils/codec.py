@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import pickle
+import zlib
+
+from pipeline.conf import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# zlib stream and pickle with protocol 2+ are self-identifying, so data encoded before codec registry was
+# introduced (IOField: pickle + zlib, RedisDataBackend: pickle) can be decoded without header byte
+ZLIB_HEADER = b"\x78"
+PICKLE_HEADER = b"\x80"
+# 协议 0 及 1 的序列化结果没有 PICKLE_HEADER 头部，无法被 decompress 识别
+MIN_PICKLE_PROTOCOL = 2
+
+
+class Codec(object):
+    def __init__(self, name, header, compress, decompress, default_level=None, prefixed=True):
+        """
+        :param name: 编码器名称
+        :param header: 头部字节，用于解码时识别编码器
+        :param compress: 压缩函数，compress(data, level)
+        :param decompress: 解压函数，decompress(data)
+        :param default_level: 默认压缩等级
+        :param prefixed: 编码结果是否需要添加头部字节，自识别格式（zlib、pickle）不需要添加
+        """
+        self.name = name
+        self.header = header
+        self.compress = compress
+        self.decompress = decompress
+        self.default_level = default_level
+        self.prefixed = prefixed
+
+
+class CodecRegistry(object):
+    codecs = {}
+    headers = {}
+
+    @classmethod
+    def register(cls, codec):
+        if len(codec.header) != 1:
+            raise ValueError("header of codec {} must be a single byte".format(codec.name))
+        if codec.header in cls.headers and cls.headers[codec.header].name != codec.name:
+            raise ValueError(
+                "header {} of codec {} conflict with codec {}".format(
+                    codec.header, codec.name, cls.headers[codec.header].name
+                )
+            )
+
+        cls.codecs[codec.name] = codec
+        cls.headers[codec.header] = codec
+
+    @classmethod
+    def get(cls, name):
+        if name not in cls.codecs:
+            raise ValueError("codec {} does not exist or its dependency is not installed".format(name))
+        return cls.codecs[name]
+
+    @classmethod
+    def for_header(cls, header):
+        if header not in cls.headers:
+            raise ValueError("can not find codec for header {}".format(header))
+        return cls.headers[header]
+
+    @classmethod
+    def names(cls):
+        return list(cls.codecs.keys())
+
+
+CodecRegistry.register(
+    Codec(
+        name="pickle",
+        header=PICKLE_HEADER,
+        compress=lambda data, level: data,
+        decompress=lambda data: data,
+        prefixed=False,
+    )
+)
+CodecRegistry.register(
+    Codec(
+        name="zlib",
+        header=ZLIB_HEADER,
+        compress=zlib.compress,
+        decompress=zlib.decompress,
+        default_level=6,
+        prefixed=False,
+    )
+)
+
+if zstandard is not None:
+    CodecRegistry.register(
+        Codec(
+            name="zstd",
+            header=b"\x01",
+            compress=lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+            decompress=lambda data: zstandard.ZstdDecompressor().decompress(data),
+            default_level=3,
+        )
+    )
+
+if lz4_frame is not None:
+    CodecRegistry.register(
+        Codec(
+            name="lz4",
+            header=b"\x02",
+            compress=lambda data, level: lz4_frame.compress(data, compression_level=level),
+            decompress=lz4_frame.decompress,
+            default_level=0,
+        )
+    )
+
+
+class Encoded(object):
+    def __init__(self, data):
+        """
+        已编码的数据，IOField 等字段遇到此类型时直接写入，不再重复编码
+        :param data: encode 编码的数据
+        """
+        self.data = data
+
+
+def compress(raw, codec=None, level=None):
+    """
+    压缩已序列化的数据
+    :param raw: pickle 序列化后的数据
+    :param codec: 编码器名称，默认为 PIPELINE_DATA_CODEC
+    :param level: 压缩等级，默认为 PIPELINE_DATA_COMPRESS_LEVEL 或编码器的默认等级
+    :return: bytes
+    """
+    codec = CodecRegistry.get(codec or settings.PIPELINE_DATA_CODEC)
+    if level is None:
+        level = settings.PIPELINE_DATA_COMPRESS_LEVEL
+    if level is None:
+        level = codec.default_level
+
+    data = codec.compress(raw, level)
+    return codec.header + data if codec.prefixed else data
+
+
+def decompress(data):
+    """
+    根据头部字节选择编码器解压数据
+    :param data: compress 压缩的数据
+    :return: pickle 序列化后的数据
+    """
+    codec = CodecRegistry.for_header(bytes(data[:1]))
+    if codec.prefixed:
+        data = data[1:]
+    return codec.decompress(data)
+
+
+def pickle_protocol(protocol=None):
+    """
+    获取写入数据时使用的 pickle 协议版本，低于 MIN_PICKLE_PROTOCOL 的协议版本会被提升到 MIN_PICKLE_PROTOCOL
+    :param protocol: pickle 协议版本，默认为 PIPELINE_DATA_PICKLE_PROTOCOL
+    :return: pickle 协议版本，为 None 时使用 pickle.DEFAULT_PROTOCOL
+    """
+    if protocol is None:
+        protocol = settings.PIPELINE_DATA_PICKLE_PROTOCOL
+    # 负数表示使用最高协议版本
+    if protocol is not None and 0 <= protocol < MIN_PICKLE_PROTOCOL:
+        protocol = MIN_PICKLE_PROTOCOL
+    return protocol
+
+
+def encode(value, codec=None, level=None, protocol=None):
+    """
+    序列化并压缩数据
+    :param value: 待编码的数据
+    :param codec: 编码器名称，默认为 PIPELINE_DATA_CODEC
+    :param level: 压缩等级，默认为 PIPELINE_DATA_COMPRESS_LEVEL 或编码器的默认等级
+    :param protocol: pickle 协议版本，默认为 PIPELINE_DATA_PICKLE_PROTOCOL
+    :return: bytes
+    """
+    return compress(pickle.dumps(value, pickle_protocol(protocol)), codec=codec, level=level)
+
+
+def decode(data, **loads_kwargs):
+    """
+    根据头部字节选择编码器，解压并反序列化数据
+    :param data: encode 编码的数据
+    :param loads_kwargs: pickle.loads 参数
+    :return:
+    """
+    return pickle.loads(decompress(data), **loads_kwargs)
@@ -21,21 +21,45 @@ class Graph(object):
 
     def has_cycle(self):
         self.path = []
+        targets = {}
+        for flow in self.flows:
+            targets.setdefault(flow[0], []).append(flow[1])
+
+        # nodes which all descendants have been visited, no cycle can be found from them again
+        explored = set()
         for node in self.nodes:
-            if self.visit(node):
+            if node not in explored and self.visit(node, targets, explored):
                 return True
         return False
 
-    def visit(self, node):
-        self.path.append(node)
-        target_nodes = [flow[1] for flow in self.flows if flow[0] == node]
-        for target in target_nodes:
-            if target in self.path:
-                self.last_visited_node = target
-                return True
-            if self.visit(target):
-                return True
-        self.path.remove(node)
+    def visit(self, node, targets, explored):
+        """
+        iterative depth first search from node, self.path keep the nodes on the current search path
+        :param node: start node
+        :param targets: node -> target nodes of its outgoing flows
+        :param explored: explored nodes
+        :return: whether a cycle is found
+        """
+        self.path = [node]
+        on_path = {node}
+        stack = [iter(targets.get(node, []))]
+
+        while stack:
+            for target in stack[-1]:
+                if target in on_path:
+                    self.last_visited_node = target
+                    return True
+                if target not in explored:
+                    self.path.append(target)
+                    on_path.add(target)
+                    stack.append(iter(targets.get(target, [])))
+                    break
+            else:
+                stack.pop()
+                finished = self.path.pop()
+                on_path.discard(finished)
+                explored.add(finished)
+
         return False
 
     def get_cycle(self):
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+from gcloud.utils.ip import format_sundry_ip
+
+# 拓扑节点可以被筛选的字段，topo 选择器使用 bk_inst_id，筛选及排除条件使用 bk_inst_name
+INDEXED_KEYS = ("bk_inst_id", "bk_inst_name")
+
+
+def host_key(bk_cloud_id, ip):
+    return "{cloud}:{ip}".format(cloud=bk_cloud_id, ip=ip)
+
+
+class HostIndex(object):
+    """
+    业务拓扑及主机的内存索引，同一份拓扑快照只需要构建一次，构建后只读
+    """
+
+    def __init__(self, biz_topo_tree, host_info):
+        """
+        :param biz_topo_tree: 业务拓扑树
+        :param host_info: cmdb.get_business_host_topo 返回的主机列表
+        """
+        self.biz_topo_tree = biz_topo_tree
+        self.host_info = host_info
+        self.hosts = []
+        # bk_host_id -> 主机在 hosts 中的下标
+        self.position = {}
+        # module_id -> hosts
+        self.module_hosts = {}
+        # cloud:ip -> hosts
+        self.cloud_ip_hosts = {}
+
+        for host in host_info:
+            host_innerip = format_sundry_ip(host["host"]["bk_host_innerip"])
+            item = {
+                "bk_host_id": host["host"]["bk_host_id"],
+                "bk_host_innerip": host_innerip,
+                "bk_host_outerip": host["host"]["bk_host_outerip"],
+                "bk_host_name": host["host"]["bk_host_name"],
+                "bk_cloud_id": host["host"]["bk_cloud_id"],
+                "host_modules_id": [mod.get("bk_module_id") or mod.get("bk_inst_id") for mod in host["module"]],
+            }
+            self.position.setdefault(item["bk_host_id"], len(self.hosts))
+            self.hosts.append(item)
+            self.cloud_ip_hosts.setdefault(host_key(item["bk_cloud_id"], host_innerip), []).append(item)
+            for module_id in item["host_modules_id"]:
+                self.module_hosts.setdefault(module_id, []).append(item)
+
+        self.modules = set()
+        # bk_obj_id -> 拓扑路径中包含该层级节点的 module_id
+        self.layer_modules = {}
+        # (comp_key, bk_obj_id, value) -> 该节点下的 module_id
+        self.node_modules = {}
+        self._index_topo(biz_topo_tree)
+
+    def _index_topo(self, biz_topo_tree):
+        # iterative depth first walk, each stack item is (node, ancestors of node)
+        stack = [(biz_topo_tree, ())]
+        while stack:
+            node, ancestors = stack.pop()
+            if node["bk_obj_id"] == "module":
+                module_id = node["bk_inst_id"]
+                self.modules.add(module_id)
+                for obj in ancestors + (node,):
+                    self.layer_modules.setdefault(obj["bk_obj_id"], set()).add(module_id)
+                    for comp_key in INDEXED_KEYS:
+                        key = (comp_key, obj["bk_obj_id"], obj.get(comp_key))
+                        self.node_modules.setdefault(key, set()).add(module_id)
+            else:
+                for child in node.get("child", []):
+                    stack.append((child, ancestors + (node,)))
+
+    def _modules_of(self, comp_key, bk_obj_id, values):
+        modules = set()
+        for value in values:
+            modules |= self.node_modules.get((comp_key, bk_obj_id, value), set())
+        return modules
+
+    def match_modules(self, condition, comp_key):
+        """
+        获取拓扑树中满足条件的所有模块 ID，结果与 utils.get_modules_by_condition 一致：
+        模块路径中出现的条件层级都需要命中，且命中了模块条件，或没有模块条件时命中了任意一个上层节点
+        :param condition: format_condition_dict 格式的拓扑条件
+        :param comp_key: 条件值在拓扑节点中对应的字段
+        :return: set
+        """
+        allowed = set(self.modules)
+        hit = set()
+        for bk_obj_id, values in condition.items():
+            if bk_obj_id == "module":
+                continue
+            matched = self._modules_of(comp_key, bk_obj_id, values)
+            allowed -= self.layer_modules.get(bk_obj_id, set()) - matched
+            hit |= matched
+
+        if "module" in condition:
+            hit = self._modules_of(comp_key, "module", condition["module"])
+        return allowed & hit
+
+    def hosts_of_modules(self, modules_id):
+        """
+        获取模块下的所有主机，按主机在业务主机列表中的顺序返回
+        :param modules_id: 模块 ID 列表
+        :return: list
+        """
+        hosts = {}
+        for module_id in modules_id:
+            for host in self.module_hosts.get(module_id, []):
+                hosts[host["bk_host_id"]] = host
+        return sorted(hosts.values(), key=lambda host: self.position[host["bk_host_id"]])
+
+    def hosts_of_keys(self, keys):
+        """
+        根据 cloud:ip 获取主机，按主机在业务主机列表中的顺序返回
+        :param keys: host_key 格式的主机列表
+        :return: list
+        """
+        hosts = []
+        for key in set(keys):
+            hosts += self.cloud_ip_hosts.get(key, [])
+        return sorted(hosts, key=lambda host: self.position[host["bk_host_id"]])
+
+    def filter_hosts(self, filters_dct, comp_key, hosts=None):
+        """
+        筛选出同时满足所有过滤条件的主机
+        :param filters_dct: format_condition_dict 格式的过滤条件
+        :param comp_key: 过滤条件值在业务拓扑中所属的字段
+        :param hosts: 筛选主机列表，为 None 时在业务所有主机中筛选
+        :return: 筛选后的主机列表，保持 hosts 中的顺序
+        """
+        filters_dct = dict(filters_dct)
+        filter_host = set(filters_dct.pop("host", []))
+
+        if filters_dct:
+            modules_id = self.match_modules(filters_dct, comp_key)
+            if hosts is None:
+                data = self.hosts_of_modules(modules_id)
+            else:
+                data = [host for host in hosts if not modules_id.isdisjoint(host["host_modules_id"])]
+        else:
+            data = self.hosts if hosts is None else hosts
+
+        if filter_host:
+            data = [host for host in data if host["bk_host_innerip"] in filter_host]
+        return list(data)
@@ -21,11 +21,11 @@ from auth_backend.constants import AUTH_FORBIDDEN_CODE
 from auth_backend.exceptions import AuthFailedException
 
 from gcloud.conf import settings
-from gcloud.utils import cmdb
 from gcloud.utils.ip import format_sundry_ip
 from gcloud.utils.handlers import handle_api_error
 
 from .utils import (
+    get_business_host_topo,
     get_cmdb_topo_tree,
     get_objects_of_topo_tree,
     get_modules_of_bk_obj,
@@ -91,7 +91,7 @@ def cmdb_search_host(request, bk_biz_id, bk_supplier_account="", bk_supplier_id=
         result = {"result": False, "code": ERROR_CODES.API_GSE_ERROR, "message": message}
         return JsonResponse(result)
 
-    raw_host_info_list = cmdb.get_business_host_topo(
+    raw_host_info_list = get_business_host_topo(
         request.user.username, bk_biz_id, bk_supplier_account, default_host_fields
     )
 
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import uuid
+
+from django.core.cache import cache, caches
+
+from gcloud.conf import settings
+from gcloud.utils.thread import SingleFlight
+
+# 拓扑及主机数据较大，缓存在进程内，缓存版本号保存在共享缓存中，用于跨进程失效
+local_cache = caches["locmem"]
+single_flight = SingleFlight()
+
+VERSION_KEY = "cmdb_ip_picker_topo_version_{bk_biz_id}"
+DATA_KEY = "cmdb_ip_picker_{kind}_{username}_{bk_biz_id}_{bk_supplier_account}_{version}_{extra}"
+
+
+def get_or_fetch(kind, username, bk_biz_id, bk_supplier_account, fetch, extra="", check=bool):
+    """
+    获取业务拓扑相关数据的缓存，缓存不存在时调用 fetch 获取，同一进程中同一份数据的并发获取只会调用一次 fetch
+    返回的数据在多次调用间共享，调用方不能修改
+    数据按用户缓存，以保证没有业务权限的用户仍然能从 CMDB 得到无权限的返回
+    :param kind: 数据类型
+    :param username: 请求 CMDB 使用的用户名
+    :param bk_biz_id: 业务 CC ID
+    :param bk_supplier_account: 开发商账号
+    :param fetch: 获取数据的函数
+    :param extra: 缓存键的额外部分，用于区分同一类型的不同查询
+    :param check: 校验函数，校验失败的数据不会被缓存
+    :return: 数据
+    """
+    timeout = settings.DEFAULT_CACHE_TIME_FOR_CC
+    if not timeout:
+        return fetch()
+
+    key = DATA_KEY.format(
+        kind=kind,
+        username=username,
+        bk_biz_id=bk_biz_id,
+        bk_supplier_account=bk_supplier_account,
+        version=current_version(bk_biz_id),
+        extra=extra,
+    )
+    data = local_cache.get(key)
+    if data is not None:
+        return data
+
+    def load():
+        # other thread may have loaded it before we become the leader
+        loaded = local_cache.get(key)
+        if loaded is None:
+            loaded = fetch()
+            if check(loaded):
+                local_cache.set(key, loaded, timeout)
+        return loaded
+
+    return single_flight.do(key, load)
+
+
+def current_version(bk_biz_id):
+    """
+    获取业务拓扑缓存的当前版本，业务拓扑缓存失效后版本会发生变化
+    :param bk_biz_id: 业务 CC ID
+    :return: 版本
+    """
+    key = VERSION_KEY.format(bk_biz_id=bk_biz_id)
+    version = cache.get(key)
+    if version is None:
+        # 版本号被缓存淘汰后需要生成新的版本号，不能回退到固定的默认值，否则会重新匹配到失效前的数据
+        new_version = uuid.uuid4().hex
+        version = new_version if cache.add(key, new_version, None) else cache.get(key, new_version)
+    return version
+
+
+def invalidate(bk_biz_id):
+    """
+    使业务的拓扑及主机缓存失效，修改业务拓扑或主机所属模块的插件需要在调用 CMDB 接口后调用
+    :param bk_biz_id: 业务 CC ID
+    :return:
+    """
+    cache.set(VERSION_KEY.format(bk_biz_id=bk_biz_id), uuid.uuid4().hex, None)
@@ -16,10 +16,11 @@ from django.utils.translation import ugettext_lazy as _
 
 from gcloud.conf import settings
 from gcloud.utils import cmdb
-from gcloud.utils.ip import format_sundry_ip
 from gcloud.utils.handlers import handle_api_error
 
+from . import topo_cache
 from .constants import NO_ERROR, ERROR_CODES
+from .host_index import HostIndex, host_key
 
 logger = logging.getLogger("root")
 get_client_by_user = settings.ESB_GET_CLIENT_BY_USER
@@ -40,7 +41,7 @@ def get_ip_picker_result(username, bk_biz_id, bk_supplier_account, kwargs):
         return topo_result
     biz_topo_tree = topo_result["data"][0]
 
-    host_info = cmdb.get_business_host_topo(
+    host_info = get_business_host_topo(
         username,
         bk_biz_id,
         bk_supplier_account,
@@ -61,31 +62,26 @@ def get_ip_picker_result(username, bk_biz_id, bk_supplier_account, kwargs):
             "message": "get_business_host_topo return empty",
         }
 
+    host_index = topo_cache.get_or_fetch(
+        "host_index",
+        username,
+        bk_biz_id,
+        bk_supplier_account,
+        fetch=lambda: HostIndex(biz_topo_tree, host_info),
+        # 索引持有拓扑及主机数据的引用，在索引失效前它们的 id 不会被复用
+        extra="{}_{}".format(id(biz_topo_tree), id(host_info)),
+    )
+
     # IP选择器
     selector = kwargs["selectors"][0]
     if selector == "ip":
-        ip_list = [
-            "{cloud}:{ip}".format(cloud=get_bk_cloud_id_for_host(host, "cloud"), ip=host["bk_host_innerip"])
-            for host in kwargs["ip"]
-        ]
+        data = host_index.hosts_of_keys(
+            [host_key(get_bk_cloud_id_for_host(host, "cloud"), host["bk_host_innerip"]) for host in kwargs["ip"]]
+        )
+    elif selector == "topo":
+        data = host_index.hosts
     else:
-        ip_list = []
-    data = []
-
-    for host in host_info:
-        host_modules_id = get_modules_id(host["module"])
-        host_innerip = format_sundry_ip(host["host"]["bk_host_innerip"])
-        if selector == "topo" or "{cloud}:{ip}".format(cloud=host["host"]["bk_cloud_id"], ip=host_innerip) in ip_list:
-            data.append(
-                {
-                    "bk_host_id": host["host"]["bk_host_id"],
-                    "bk_host_innerip": host_innerip,
-                    "bk_host_outerip": host["host"]["bk_host_outerip"],
-                    "bk_host_name": host["host"]["bk_host_name"],
-                    "bk_cloud_id": host["host"]["bk_cloud_id"],
-                    "host_modules_id": host_modules_id,
-                }
-            )
+        data = []
 
     logger.info(
         "[get_ip_picker_result(biz_id: {bk_biz_id})] kwargs: {kwargs} filter data collect: {data}".format(
@@ -100,7 +96,7 @@ def get_ip_picker_result(username, bk_biz_id, bk_supplier_account, kwargs):
         # 这里需要单独对每个 filter 进行过滤，因为 filter_hosts 过滤的是同时满足所有条件的主机
         for tf in topo_filter:
             user_select_topo_host.update(
-                {host["bk_host_id"]: host for host in filter_hosts(tf, biz_topo_tree, data, "bk_inst_id")}
+                {host["bk_host_id"]: host for host in filter_hosts(tf, biz_topo_tree, None, "bk_inst_id", host_index)}
             )
         data = user_select_topo_host.values()
 
@@ -113,7 +109,7 @@ def get_ip_picker_result(username, bk_biz_id, bk_supplier_account, kwargs):
     # 筛选条件
     filters = kwargs["filters"]
     if filters:
-        data = filter_hosts(filters, biz_topo_tree, data, "bk_inst_name")
+        data = filter_hosts(filters, biz_topo_tree, data, "bk_inst_name", host_index)
 
         logger.info(
             "[get_ip_picker_result(biz_id: {bk_biz_id})] kwargs: {kwargs} data condition filter: {data}".format(
@@ -125,9 +121,9 @@ def get_ip_picker_result(username, bk_biz_id, bk_supplier_account, kwargs):
     excludes = kwargs["excludes"]
     if excludes:
         # 先把 data 中符合全部排除条件的 hosts 找出来，然后筛除
-        exclude_hosts = filter_hosts(excludes, biz_topo_tree, data, "bk_inst_name")
-        exclude_host_ip_list = [host["bk_host_innerip"] for host in exclude_hosts]
-        new_data = [host for host in data if host["bk_host_innerip"] not in exclude_host_ip_list]
+        exclude_hosts = filter_hosts(excludes, biz_topo_tree, data, "bk_inst_name", host_index)
+        exclude_host_ip_set = {host["bk_host_innerip"] for host in exclude_hosts}
+        new_data = [host for host in data if host["bk_host_innerip"] not in exclude_host_ip_set]
         data = new_data
 
         logger.info(
@@ -140,35 +136,25 @@ def get_ip_picker_result(username, bk_biz_id, bk_supplier_account, kwargs):
     return result
 
 
-def filter_hosts(filters, biz_topo_tree, hosts, comp_key):
+def filter_hosts(filters, biz_topo_tree, hosts, comp_key, host_index=None):
     """筛选出同时满足所有过滤条件的主机
 
     :param filters: 过滤条件
     :type filters: list
     :param biz_topo_tree: 业务拓扑
     :type biz_topo_tree: dict
-    :param hosts: 筛选主机列表
+    :param hosts: 筛选主机列表，为 None 时在 host_index 的所有主机中筛选
     :type hosts: list
     :param comp_key: 过滤条件值在业务拓扑 biz_topo_tree 中所属的字段
     :type comp_key: str
+    :param host_index: 业务拓扑及主机索引，为 None 时根据 biz_topo_tree 及 hosts 构建
+    :type host_index: HostIndex
     :return: 在 hosts 上筛选后的主机列表
     :rtype: list
     """
-    filters_dct = format_condition_dict(filters)
-    filter_host = set(filters_dct.pop("host", []))
-
-    if filters_dct:
-        # 把拓扑筛选条件转换成 modules 筛选条件
-        filter_modules = get_modules_by_condition(biz_topo_tree, filters_dct, comp_key)
-        filter_modules_id = get_modules_id(filter_modules)
-        data = [host for host in hosts if set(host["host_modules_id"]) & set(filter_modules_id)]
-    else:
-        # 如果没有拓扑筛选条件，则不进行拓扑筛选操作，直接在 hosts 上再次进行 host ip 过滤
-        data = hosts
-
-    if filter_host:
-        data = [host for host in data if host["bk_host_innerip"] in filter_host]
-    return data
+    if host_index is None:
+        host_index = HostIndex(biz_topo_tree, [])
+    return host_index.filter_hosts(format_condition_dict(filters), comp_key, hosts)
 
 
 def format_condition_dict(conditons):
@@ -410,6 +396,19 @@ def get_cmdb_topo_tree(username, bk_biz_id, bk_supplier_account):
     }
     :rtype: dict
     """
+    return topo_cache.get_or_fetch(
+        "topo",
+        username,
+        bk_biz_id,
+        bk_supplier_account,
+        fetch=lambda: fetch_cmdb_topo_tree(username, bk_biz_id, bk_supplier_account),
+        check=lambda result: result["result"],
+    )
+
+
+def fetch_cmdb_topo_tree(username, bk_biz_id, bk_supplier_account):
+    """不经过缓存，从 CMDB API 获取业务完整拓扑树，参数及返回值同 get_cmdb_topo_tree
+    """
     client = get_client_by_user(username)
     kwargs = {
         "bk_biz_id": bk_biz_id,
@@ -451,6 +450,29 @@ def get_cmdb_topo_tree(username, bk_biz_id, bk_supplier_account):
     return {"result": True, "code": NO_ERROR, "data": data, "messsage": ""}
 
 
+def get_business_host_topo(username, bk_biz_id, bk_supplier_account, host_fields):
+    """获取业务下所有主机信息，结果会按用户及业务缓存，参数及返回值同 gcloud.utils.cmdb.get_business_host_topo
+
+    :param username: 请求 API 使用的用户名
+    :type username: string
+    :param bk_biz_id: 业务 CC ID
+    :type bk_biz_id: int
+    :param bk_supplier_account: 开发商账号
+    :type bk_supplier_account: int
+    :param host_fields: 主机字段
+    :type host_fields: list
+    :rtype: list
+    """
+    return topo_cache.get_or_fetch(
+        "host_topo",
+        username,
+        bk_biz_id,
+        bk_supplier_account,
+        fetch=lambda: cmdb.get_business_host_topo(username, bk_biz_id, bk_supplier_account, host_fields),
+        extra=",".join(sorted(host_fields)),
+    )
+
+
 def get_bk_cloud_id_for_host(host_info, cloud_key="cloud"):
     """从主机信息中获取 bk_cloud_id，cloud_key 不存在时返回默认值
 
@@ -31,6 +31,7 @@ from pipeline_plugins.components.collections.sites.open.cc.base import (
     cc_get_name_id_from_combine_value
 )
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.handlers import handle_api_error
@@ -189,6 +190,7 @@ class CCCreateModuleService(Service):
                 }
                 cc_kwargs["data"].update(cc_module_info)
                 cc_create_module_return = client.cc.create_module(cc_kwargs)
+                topo_cache.invalidate(biz_cc_id)
                 if not cc_create_module_return["result"]:
                     message = cc_handle_api_error("cc.create_module", cc_kwargs, cc_create_module_return)
                     self.logger.error(message)
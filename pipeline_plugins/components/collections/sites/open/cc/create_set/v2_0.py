@@ -31,6 +31,7 @@ from pipeline_plugins.components.collections.sites.open.cc.base import (
     cc_list_select_node_inst_id
 )
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.handlers import handle_api_error
@@ -205,6 +206,7 @@ class CCCreateSetService(Service):
                 }
                 cc_kwargs["data"].update(set_data)
                 cc_result = client.cc.create_set(cc_kwargs)
+                topo_cache.invalidate(biz_cc_id)
                 if not cc_result["result"]:
                     message = cc_handle_api_error("cc.create_set", cc_kwargs, cc_result)
                     self.logger.error(message)
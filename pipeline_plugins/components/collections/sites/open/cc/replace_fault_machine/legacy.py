@@ -22,6 +22,7 @@ from pipeline.core.flow.io import StringItemSchema, ArrayItemSchema, ObjectItemS
 from pipeline.component_framework.component import Component
 
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.utils import cmdb
 from gcloud.utils.ip import get_ip_by_regex
@@ -139,6 +140,8 @@ class CCReplaceFaultMachineService(Service):
 
         update_result = client.cc.batch_update_host(batch_update_kwargs)
 
+        topo_cache.invalidate(biz_cc_id)
+
         if not update_result["result"]:
             message = cc_handle_api_error("cc.batch_update_host", batch_update_kwargs, update_result)
             self.logger.error(message)
@@ -152,6 +155,7 @@ class CCReplaceFaultMachineService(Service):
             "bk_host_id": list(fault_replace_id_map.keys()),
         }
         fault_transfer_result = client.cc.transfer_host_to_faultmodule(fault_transfer_kwargs)
+        topo_cache.invalidate(biz_cc_id)
         if not fault_transfer_result["result"]:
             message = cc_handle_api_error(
                 "cc.transfer_host_to_faultmodule", fault_transfer_kwargs, fault_transfer_result
@@ -179,6 +183,7 @@ class CCReplaceFaultMachineService(Service):
         success = []
         for kwargs in transfer_kwargs_list:
             transfer_result = client.cc.transfer_host_module(kwargs)
+            topo_cache.invalidate(biz_cc_id)
             if not transfer_result["result"]:
                 message = cc_handle_api_error("cc.transfer_host_module", kwargs, transfer_result)
                 self.logger.error(message)
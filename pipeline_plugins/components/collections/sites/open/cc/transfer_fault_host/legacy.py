@@ -22,6 +22,7 @@ from pipeline.core.flow.io import StringItemSchema
 from pipeline.component_framework.component import Component
 
 from pipeline_plugins.components.collections.sites.open.cc.base import cc_get_host_id_by_innerip
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.ip import get_ip_by_regex
@@ -74,6 +75,7 @@ class CmdbTransferFaultHostService(Service):
 
         transfer_params = {"bk_biz_id": biz_cc_id, "bk_host_id": [int(host_id) for host_id in host_result["data"]]}
         transfer_result = client.cc.transfer_host_to_faultmodule(transfer_params)
+        topo_cache.invalidate(biz_cc_id)
         if transfer_result["result"]:
             return True
         else:
@@ -28,6 +28,7 @@ from pipeline_plugins.components.collections.sites.open.cc.base import (
     cc_list_select_node_inst_id,
 )
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.ip import get_ip_by_regex
@@ -132,6 +133,7 @@ class CCTransferHostModuleService(Service):
             "is_increment": True if cc_is_increment == "true" else False,
         }
         cc_result = client.cc.transfer_host_module(cc_kwargs)
+        topo_cache.invalidate(biz_cc_id)
         if cc_result["result"]:
             return True
         else:
@@ -23,6 +23,7 @@ from pipeline.component_framework.component import Component
 
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
 from pipeline_plugins.components.collections.sites.open.cc.base import cc_get_host_id_by_innerip
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.ip import get_ip_by_regex
@@ -82,6 +83,8 @@ class CCTransferHostToIdleService(Service):
 
         transfer_result = client.cc.transfer_host_to_idlemodule(transfer_kwargs)
 
+        topo_cache.invalidate(biz_cc_id)
+
         if transfer_result["result"]:
             return True
         else:
@@ -23,6 +23,7 @@ from pipeline.component_framework.component import Component
 
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
 from pipeline_plugins.components.collections.sites.open.cc.base import cc_format_prop_data, cc_get_host_id_by_innerip
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.ip import get_ip_by_regex
@@ -130,6 +131,7 @@ class CCUpdateHostService(Service):
             "data": {cc_host_property: cc_host_prop_value},
         }
         cc_result = client.cc.update_host(cc_kwargs)
+        topo_cache.invalidate(biz_cc_id)
         if cc_result["result"]:
             return True
         else:
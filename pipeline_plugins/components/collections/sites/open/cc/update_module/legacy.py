@@ -27,6 +27,7 @@ from pipeline_plugins.components.collections.sites.open.cc.base import (
     cc_format_prop_data,
     get_module_set_id
 )
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.handlers import handle_api_error
@@ -114,6 +115,7 @@ class CCUpdateModuleService(Service):
                 }
             }
             cc_result = client.cc.update_module(cc_kwargs)
+            topo_cache.invalidate(biz_cc_id)
             if not cc_result['result']:
                 message = cc_handle_api_error('cc.update_module', cc_kwargs, cc_result)
                 self.logger.error(message)
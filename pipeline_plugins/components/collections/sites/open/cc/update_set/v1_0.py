@@ -29,6 +29,7 @@ from pipeline_plugins.components.collections.sites.open.cc.base import (
     cc_list_select_node_inst_id
 )
 from pipeline_plugins.base.utils.inject import supplier_account_for_business
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 
 from gcloud.conf import settings
 from gcloud.utils.handlers import handle_api_error
@@ -160,6 +161,7 @@ class CCUpdateSetService(Service):
                 "data": {cc_set_property: cc_set_prop_value},
             }
             cc_result = client.cc.update_set(cc_kwargs)
+            topo_cache.invalidate(biz_cc_id)
             if not cc_result["result"]:
                 message = cc_handle_api_error("cc.update_set", cc_kwargs, cc_result)
                 self.logger.error(message)
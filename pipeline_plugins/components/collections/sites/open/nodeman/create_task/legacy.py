@@ -12,6 +12,7 @@ specific language governing permissions and limitations under the License.
 """
 
 import base64
+import traceback
 
 import rsa
 from django.utils.translation import ugettext_lazy as _
@@ -129,10 +130,29 @@ class NodemanCreateTaskService(Service):
             data.set_outputs("ex_data", message)
             return False
 
+    def schedule_batch_key(self, data, parent_data):
+        # 同一执行人的任务状态轮询合并为一次批量调度
+        return parent_data.inputs.executor
+
+    def schedule_batch(self, nodes):
+        # 合并组内的节点共用同一个 client，单个节点调度异常时不影响其他节点
+        client = get_client_by_user(nodes[0].parent_data.inputs.executor)
+        results = []
+        for node in nodes:
+            try:
+                results.append(node.service.query_job_result(client, node.data))
+            except Exception:
+                node.data.set_outputs("ex_data", traceback.format_exc())
+                node.service.finish_schedule()
+                results.append(False)
+        return results
+
     def schedule(self, data, parent_data, callback_data=None):
+        client = get_client_by_user(parent_data.inputs.executor)
+        return self.query_job_result(client, data)
+
+    def query_job_result(self, client, data):
         bk_biz_id = data.inputs.biz_cc_id
-        executor = parent_data.inputs.executor
-        client = get_client_by_user(executor)
 
         job_id = data.get_one_of_outputs("job_id")
 
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import copy
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from pipeline.core.data.expression import ConstantTemplate
+from pipeline_plugins.variables.collections.datatable import DataTable, DataTableValue
+from pipeline_plugins.variables.collections.sites.open.cc import VarCmdbIpSelector
+
+
+def _deepcopy_resolve_data(data, value_maps):
+    # resolve_data before copy-free resolution, kept here for comparison
+    if isinstance(data, str):
+        return ConstantTemplate.resolve_string(data, value_maps)
+    if isinstance(data, (list, tuple)):
+        ldata = [_deepcopy_resolve_data(copy.deepcopy(item), value_maps) for item in data]
+        return ldata if isinstance(data, list) else tuple(ldata)
+    if isinstance(data, dict):
+        for key, value in list(data.items()):
+            data[key] = _deepcopy_resolve_data(copy.deepcopy(value), value_maps)
+        return data
+    return data
+
+
+def _datatable_value(rows):
+    # only the first row refers to other variables, as most of tables do
+    value = [
+        {"ip": "10.0.{}.{}".format(i // 256, i % 256), "port": str(i), "path": "/data/{}".format(i)}
+        for i in range(rows)
+    ]
+    value[0]["path"] = "${base_path}/0"
+    return value
+
+
+def _ip_selector_value(hosts):
+    return {
+        "selectors": ["ip"],
+        "topo": [],
+        "ip": [
+            {
+                "bk_host_id": i,
+                "bk_host_innerip": "10.1.{}.{}".format(i // 256, i % 256),
+                "bk_cloud_id": 0,
+                "cloud": [{"bk_inst_id": 0, "bk_inst_name": "default area"}],
+                "agent": 1,
+            }
+            for i in range(hosts)
+        ],
+        "filters": [{"field": "set", "value": ["${set_name}"]}],
+        "excludes": [],
+        "with_cloud_id": False,
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare time and peak memory of resolving large datatable and ip_selector variable values"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", dest="size", type=int, default=10000, help="rows of table and hosts of ip selector")
+        parser.add_argument("-r", dest="repeat", type=int, default=5, help="repeat times")
+
+    def handle(self, *args, **options):
+        size = options["size"]
+        repeat = options["repeat"]
+        value_maps = {"base_path": "/data/app", "set_name": "set_1"}
+
+        cases = [
+            (DataTable.code, lambda: _datatable_value(size), lambda v: DataTableValue(v)),
+            (VarCmdbIpSelector.code, lambda: _ip_selector_value(size), lambda v: v),
+        ]
+        resolvers = [
+            ("deepcopy", _deepcopy_resolve_data),
+            ("copy-free", lambda data, maps: ConstantTemplate(data).resolve_data(maps)),
+        ]
+
+        for code, value_factory, consume in cases:
+            for name, resolver in resolvers:
+                cost, peak = self._benchmark(value_factory, resolver, consume, value_maps, repeat)
+                self.stdout.write(
+                    "{} x {} with {} resolve: {:.2f} ms per resolve, peak memory {:.2f} KB".format(
+                        code, size, name, cost * 1000 / repeat, peak / 1024.0
+                    )
+                )
+
+    @staticmethod
+    def _benchmark(value_factory, resolver, consume, value_maps, repeat):
+        values = [value_factory() for _ in range(repeat)]
+
+        tracemalloc.start()
+        start = time.time()
+        for value in values:
+            consume(resolver(value, value_maps))
+        cost = time.time() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return cost, peak
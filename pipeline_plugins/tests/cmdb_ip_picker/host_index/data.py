@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+# 大业务基准数据，拓扑为 业务 -> 中间层 -> 集群 -> 模块，另有空闲机池直接挂在业务下
+
+IDLE_MODULES = [(1, "空闲机"), (2, "故障机")]
+
+
+def make_biz_topo_tree(layers=10, sets=50, modules=10):
+    """
+    :param layers: 中间层数量
+    :param sets: 每个中间层下的集群数量
+    :param modules: 每个集群下的模块数量
+    :return: 业务拓扑树
+    """
+    set_id = 1000
+    module_id = 100000
+    biz = {
+        "bk_obj_id": "biz",
+        "bk_inst_id": 2,
+        "bk_inst_name": "benchmark",
+        "child": [
+            {
+                "bk_obj_id": "set",
+                "bk_inst_id": 1,
+                "bk_inst_name": "空闲机池",
+                "child": [
+                    {"bk_obj_id": "module", "bk_inst_id": mid, "bk_inst_name": name} for mid, name in IDLE_MODULES
+                ],
+            }
+        ],
+    }
+    for layer in range(layers):
+        layer_node = {"bk_obj_id": "layer", "bk_inst_id": layer, "bk_inst_name": "layer{}".format(layer), "child": []}
+        for s in range(sets):
+            set_id += 1
+            set_node = {"bk_obj_id": "set", "bk_inst_id": set_id, "bk_inst_name": "set{}".format(s), "child": []}
+            for m in range(modules):
+                module_id += 1
+                set_node["child"].append(
+                    {"bk_obj_id": "module", "bk_inst_id": module_id, "bk_inst_name": "module{}".format(m)}
+                )
+            layer_node["child"].append(set_node)
+        biz["child"].append(layer_node)
+    return biz
+
+
+def module_ids_of(biz_topo_tree):
+    if biz_topo_tree["bk_obj_id"] == "module":
+        return [biz_topo_tree["bk_inst_id"]]
+    ids = []
+    for child in biz_topo_tree.get("child", []):
+        ids += module_ids_of(child)
+    return ids
+
+
+def make_host_info(biz_topo_tree, hosts=50000):
+    """
+    :param biz_topo_tree: make_biz_topo_tree 返回的业务拓扑树
+    :param hosts: 主机数量，主机按顺序分布到各个模块中，部分主机同时属于两个模块
+    :return: cmdb.get_business_host_topo 格式的主机列表
+    """
+    modules_id = module_ids_of(biz_topo_tree)
+    host_info = []
+    for i in range(hosts):
+        module_id = modules_id[i % len(modules_id)]
+        modules = [{"bk_module_id": module_id, "bk_module_name": str(module_id)}]
+        if i % 7 == 0:
+            other = modules_id[(i * 31) % len(modules_id)]
+            modules.append({"bk_module_id": other, "bk_module_name": str(other)})
+        ip = "10.{}.{}.{}".format(i // 65536, i // 256 % 256, i % 256)
+        host_info.append(
+            {
+                "host": {
+                    "bk_host_id": i + 1,
+                    "bk_host_innerip": ip,
+                    "bk_host_outerip": "",
+                    "bk_host_name": "host{}".format(i),
+                    "bk_cloud_id": i % 2,
+                },
+                "module": modules,
+            }
+        )
+    return host_info
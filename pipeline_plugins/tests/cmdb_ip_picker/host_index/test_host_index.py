@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import random
+
+from django.test import TestCase
+
+from pipeline_plugins.cmdb_ip_picker.host_index import HostIndex
+from pipeline_plugins.cmdb_ip_picker.utils import format_condition_dict, get_modules_by_condition, get_modules_id
+from pipeline_plugins.tests.cmdb_ip_picker.host_index.data import make_biz_topo_tree, make_host_info
+
+
+def legacy_filter_hosts(filters, biz_topo_tree, hosts, comp_key):
+    # filter_hosts before host index was introduced, kept here for comparison
+    filters_dct = format_condition_dict(filters)
+    filter_host = set(filters_dct.pop("host", []))
+
+    if filters_dct:
+        filter_modules = get_modules_by_condition(biz_topo_tree, filters_dct, comp_key)
+        filter_modules_id = get_modules_id(filter_modules)
+        data = [host for host in hosts if set(host["host_modules_id"]) & set(filter_modules_id)]
+    else:
+        data = hosts
+
+    if filter_host:
+        data = [host for host in data if host["bk_host_innerip"] in filter_host]
+    return data
+
+
+class HostIndexTestCase(TestCase):
+    def setUp(self):
+        self.topo_tree = make_biz_topo_tree(layers=3, sets=4, modules=3)
+        self.host_info = make_host_info(self.topo_tree, hosts=500)
+        self.index = HostIndex(self.topo_tree, self.host_info)
+
+    def test_match_modules__same_as_get_modules_by_condition(self):
+        rand = random.Random(0)
+        choices = {
+            "biz": ["benchmark", "other"],
+            "layer": ["layer0", "layer1", "layer2", "other"],
+            "set": ["空闲机池", "set0", "set1", "set3", "other"],
+            "module": ["空闲机", "module0", "module2", "other"],
+            "unknown": ["other"],
+        }
+        for _ in range(500):
+            condition = {}
+            for field in rand.sample(list(choices.keys()), rand.randint(1, 4)):
+                condition[field] = rand.sample(choices[field], rand.randint(1, min(2, len(choices[field]))))
+
+            expect = set(get_modules_id(get_modules_by_condition(self.topo_tree, condition, "bk_inst_name")))
+            self.assertEqual(self.index.match_modules(condition, "bk_inst_name"), expect, condition)
+
+    def test_match_modules__by_inst_id(self):
+        for node in [{"biz": [2]}, {"layer": [1]}, {"set": [1]}, {"set": [1005]}, {"module": [100010]}]:
+            expect = set(get_modules_id(get_modules_by_condition(self.topo_tree, node, "bk_inst_id")))
+            self.assertTrue(expect)
+            self.assertEqual(self.index.match_modules(node, "bk_inst_id"), expect)
+
+    def test_filter_hosts(self):
+        filters = [{"field": "set", "value": ["set1"]}, {"field": "module", "value": ["module0\nmodule2"]}]
+        hosts = self.index.hosts[::3]
+
+        self.assertEqual(
+            self.index.filter_hosts(format_condition_dict(filters), "bk_inst_name", hosts),
+            legacy_filter_hosts(filters, self.topo_tree, hosts, "bk_inst_name"),
+        )
+        self.assertEqual(
+            self.index.filter_hosts(format_condition_dict(filters), "bk_inst_name"),
+            legacy_filter_hosts(filters, self.topo_tree, self.index.hosts, "bk_inst_name"),
+        )
+
+    def test_filter_hosts__host(self):
+        filters = [{"field": "host", "value": ["10.0.0.1", "10.0.0.8"]}, {"field": "layer", "value": ["layer1"]}]
+
+        self.assertEqual(
+            self.index.filter_hosts(format_condition_dict(filters), "bk_inst_name"),
+            legacy_filter_hosts(filters, self.topo_tree, self.index.hosts, "bk_inst_name"),
+        )
+        self.assertEqual(
+            [host["bk_host_innerip"] for host in self.index.filter_hosts({"host": ["10.0.0.1"]}, "bk_inst_name")],
+            ["10.0.0.1"],
+        )
+
+    def test_hosts_of_keys(self):
+        hosts = self.index.hosts_of_keys(["1:10.0.0.3", "0:10.0.0.2", "0:10.0.0.3", "1:10.0.0.3"])
+
+        self.assertEqual([host["bk_host_id"] for host in hosts], [3, 4])
+
+
+class HostIndexBenchmarkTestCase(TestCase):
+    def test_filter_hosts__large_business(self):
+        topo_tree = make_biz_topo_tree()
+        index = HostIndex(topo_tree, make_host_info(topo_tree, hosts=50000))
+        filters = [{"field": "layer", "value": ["layer3"]}, {"field": "set", "value": ["set7", "set9"]}]
+
+        data = index.filter_hosts(format_condition_dict(filters), "bk_inst_name")
+
+        self.assertTrue(data)
+        self.assertEqual(data, legacy_filter_hosts(filters, topo_tree, index.hosts, "bk_inst_name"))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Tencent is pleased to support the open source community by making 蓝鲸智云PaaS平台社区版 (BlueKing PaaS Community
+Edition) available.
+Copyright (C) 2017-2020 THL A29 Limited, a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License"); you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import threading
+
+from mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from pipeline_plugins.cmdb_ip_picker import topo_cache
+
+
+class GetOrFetchTestCase(TestCase):
+    def setUp(self):
+        topo_cache.local_cache.clear()
+
+    def test_get_or_fetch__hit(self):
+        fetch = MagicMock(return_value={"result": True, "data": []})
+
+        for _ in range(3):
+            result = topo_cache.get_or_fetch("topo", "admin", 2, 0, fetch, check=lambda r: r["result"])
+            self.assertEqual(result, {"result": True, "data": []})
+
+        fetch.assert_called_once()
+
+    def test_get_or_fetch__extra(self):
+        fetch = MagicMock(return_value=[1])
+
+        topo_cache.get_or_fetch("host", "admin", 2, 0, fetch, extra="bk_host_id")
+        topo_cache.get_or_fetch("host", "admin", 2, 0, fetch, extra="bk_host_id,bk_host_innerip")
+        topo_cache.get_or_fetch("host", "admin", 3, 0, fetch, extra="bk_host_id")
+
+        self.assertEqual(fetch.call_count, 3)
+
+    def test_get_or_fetch__user_isolated(self):
+        granted = MagicMock(return_value={"result": True, "data": [1]})
+        forbidden = MagicMock(return_value={"result": False, "code": 9900403, "data": []})
+
+        topo_cache.get_or_fetch("topo", "admin", 2, 0, granted, check=lambda r: r["result"])
+        result = topo_cache.get_or_fetch("topo", "guest", 2, 0, forbidden, check=lambda r: r["result"])
+
+        self.assertEqual(result, {"result": False, "code": 9900403, "data": []})
+        forbidden.assert_called_once()
+
+    def test_get_or_fetch__check_fail(self):
+        fetch = MagicMock(return_value={"result": False, "message": "error"})
+
+        topo_cache.get_or_fetch("topo", "admin", 2, 0, fetch, check=lambda r: r["result"])
+        result = topo_cache.get_or_fetch("topo", "admin", 2, 0, fetch, check=lambda r: r["result"])
+
+        self.assertEqual(result, {"result": False, "message": "error"})
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_get_or_fetch__invalidate(self):
+        fetch = MagicMock(return_value=[1])
+
+        topo_cache.get_or_fetch("host", "admin", 2, 0, fetch)
+        topo_cache.invalidate(3)
+        topo_cache.get_or_fetch("host", "admin", 2, 0, fetch)
+        self.assertEqual(fetch.call_count, 1)
+
+        topo_cache.invalidate(2)
+        topo_cache.get_or_fetch("host", "admin", 2, 0, fetch)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_current_version(self):
+        version = topo_cache.current_version(2)
+        self.assertEqual(topo_cache.current_version(2), version)
+
+        cache.delete(topo_cache.VERSION_KEY.format(bk_biz_id=2))
+        self.assertNotEqual(topo_cache.current_version(2), version)
+
+    def test_get_or_fetch__cache_disabled(self):
+        fetch = MagicMock(return_value=[1])
+
+        with patch("pipeline_plugins.cmdb_ip_picker.topo_cache.settings.DEFAULT_CACHE_TIME_FOR_CC", 0):
+            topo_cache.get_or_fetch("host", "admin", 2, 0, fetch)
+            topo_cache.get_or_fetch("host", "admin", 2, 0, fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_get_or_fetch__concurrent(self):
+        started = threading.Event()
+        release = threading.Event()
+        fetch = MagicMock()
+
+        def slow_fetch():
+            fetch()
+            started.set()
+            release.wait(5)
+            return [1]
+
+        results = []
+
+        def worker():
+            results.append(topo_cache.get_or_fetch("host", "admin", 2, 0, slow_fetch))
+
+        # worker threads do not share the test transaction, so keep them away from the version in db cache
+        with patch("pipeline_plugins.cmdb_ip_picker.topo_cache.current_version", MagicMock(return_value="v1")):
+            leader = threading.Thread(target=worker)
+            leader.start()
+            started.wait(5)
+            followers = [threading.Thread(target=worker) for _ in range(5)]
+            for t in followers:
+                t.start()
+            release.set()
+            for t in [leader] + followers:
+                t.join(5)
+
+        fetch.assert_called_once()
+        self.assertEqual(results, [[1]] * 6)
@@ -15,6 +15,7 @@ from mock import patch
 
 from django.test import TestCase
 
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 from pipeline_plugins.cmdb_ip_picker.utils import get_cmdb_topo_tree
 
 
@@ -128,6 +129,7 @@ def mock_get_client_by_user(username):
 
 class GetCMDBTopoTreeTestCase(TestCase):
     def setUp(self):
+        topo_cache.local_cache.clear()
         self.topo_tree = {
             "default": 0,
             "bk_obj_name": "业务",
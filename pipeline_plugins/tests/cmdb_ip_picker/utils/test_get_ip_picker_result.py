@@ -15,6 +15,7 @@ from mock import patch
 
 from django.test import TestCase
 
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 from pipeline_plugins.cmdb_ip_picker.utils import get_ip_picker_result
 
 
@@ -179,6 +180,7 @@ def mock_get_client_by_user(username):
 
 class GetIPPickerResultTestCase(TestCase):
     def setUp(self):
+        topo_cache.local_cache.clear()
         self.username = "admin"
         self.bk_biz_id = "2"
         self.bk_supplier_account = 0
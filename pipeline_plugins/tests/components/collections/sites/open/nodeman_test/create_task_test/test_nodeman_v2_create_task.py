@@ -14,7 +14,7 @@ specific language governing permissions and limitations under the License.
 import ujson as json
 
 from django.test import TestCase
-from mock import MagicMock
+from mock import MagicMock, patch
 
 from pipeline.component_framework.test import (
     Call,
@@ -25,7 +25,12 @@ from pipeline.component_framework.test import (
     ScheduleAssertion,
     Patcher,
 )
-from pipeline_plugins.components.collections.sites.open.nodeman.create_task.v2_0 import NodemanCreateTaskComponent
+from pipeline.core.data.base import DataObject
+from pipeline.core.flow.activity.service_activity import ScheduleNode
+from pipeline_plugins.components.collections.sites.open.nodeman.create_task.v2_0 import (
+    NodemanCreateTaskComponent,
+    NodemanCreateTaskService,
+)
 
 
 class NodemanCreateTaskComponentTest(TestCase, ComponentTestMixin):
@@ -572,3 +577,34 @@ REMOVE_SUCCESS_CASE = ComponentTestCase(
     ],
 
 )
+
+
+class NodemanCreateTaskScheduleBatchTest(TestCase):
+    def node(self, job_id):
+        return ScheduleNode(
+            NodemanCreateTaskService(),
+            DataObject({}, outputs={"job_id": job_id}),
+            DataObject({"executor": "tester"}),
+            None,
+        )
+
+    def test_schedule_batch_key(self):
+        node = self.node("1")
+        self.assertEqual(node.service.schedule_batch_key(node.data, node.parent_data), "tester")
+
+    def test_schedule_batch(self):
+        client = MockClient(details_return=INSTALL_OR_OPERATE_SUCCESS_CLIENT.nodeman.job_details.return_value)
+        client.nodeman.job_details.side_effect = [
+            client.nodeman.job_details.return_value,
+            Exception("job details error"),
+        ]
+        nodes = [self.node("1"), self.node("2"), self.node("")]
+
+        with patch(GET_CLIENT_BY_USER, MagicMock(return_value=client)) as get_client_by_user:
+            results = nodes[0].service.schedule_batch(nodes)
+
+        get_client_by_user.assert_called_once_with("tester")
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(nodes[0].data.get_one_of_outputs("success_num"), 1)
+        self.assertIn("job details error", nodes[1].data.get_one_of_outputs("ex_data"))
+        self.assertTrue(all(node.service.is_schedule_finished() for node in nodes))
@@ -13,8 +13,10 @@ specific language governing permissions and limitations under the License.
 
 from mock import MagicMock, patch
 
+from django.core.cache import cache
 from django.test import TestCase
 
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 from pipeline_plugins.variables.collections.sites.open.cc import VarCmdbAttributeQuery
 
 
@@ -102,3 +104,27 @@ class VarCmdbAttributeQueryTestCase(TestCase):
             ],
             ["1.1.1.1", "2.2.2.2", "3.3.3.3", "4.4.4.4"],
         )
+
+    def test_get__memo_invalidated_by_topo_change(self):
+        mock_get_business_host = MagicMock(return_value=self.get_business_host_return)
+        host_attrs_query = VarCmdbAttributeQuery(self.name, self.value, self.context, self.pipeline_data)
+        with patch("pipeline_plugins.variables.collections.sites.open.cc.get_business_host", mock_get_business_host):
+            host_attrs_query.get()
+            host_attrs_query.get()
+            self.assertEqual(mock_get_business_host.call_count, 1)
+
+            topo_cache.invalidate(self.bk_biz_id)
+            host_attrs_query.get()
+            self.assertEqual(mock_get_business_host.call_count, 2)
+
+    def test_get__memo_invalidated_after_version_lost(self):
+        mock_get_business_host = MagicMock(return_value=self.get_business_host_return)
+        host_attrs_query = VarCmdbAttributeQuery(self.name, self.value, self.context, self.pipeline_data)
+        with patch("pipeline_plugins.variables.collections.sites.open.cc.get_business_host", mock_get_business_host):
+            host_attrs_query.get()
+
+            # version key may expire or be culled after topology changed
+            topo_cache.invalidate(self.bk_biz_id)
+            cache.delete(topo_cache.VERSION_KEY.format(bk_biz_id=self.bk_biz_id))
+            host_attrs_query.get()
+            self.assertEqual(mock_get_business_host.call_count, 2)
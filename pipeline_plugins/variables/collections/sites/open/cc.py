@@ -19,6 +19,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from pipeline.core.data.var import LazyVariable
 
+from pipeline_plugins.cmdb_ip_picker import topo_cache
 from pipeline_plugins.cmdb_ip_picker.utils import get_ip_picker_result
 from pipeline_plugins.base.utils.inject import supplier_account_for_project
 from pipeline_plugins.base.utils.adapter import cc_get_inner_ip_by_module_id
@@ -33,12 +34,29 @@ from gcloud.utils.ip import get_ip_by_regex
 logger = logging.getLogger("root")
 
 
-class VarIpPickerVariable(LazyVariable):
+class CmdbTopoMemoizeMixin(object):
+    """
+    依赖业务拓扑的变量，缓存随业务拓扑缓存的版本失效，任务中修改了业务拓扑的插件执行后重新获取
+    """
+
+    def memoize_version(self):
+        project_id = self.pipeline_data["project_id"]
+        # 项目对应的业务不会变化，避免每次获取变量值都查询项目
+        memo_biz = getattr(self, "_memo_biz", None)
+        if memo_biz is None or memo_biz[0] != project_id:
+            project = Project.objects.get(id=project_id)
+            memo_biz = self._memo_biz = (project_id, project.bk_biz_id if project.from_cmdb else "")
+        return topo_cache.current_version(memo_biz[1])
+
+
+class VarIpPickerVariable(CmdbTopoMemoizeMixin, LazyVariable):
     code = "ip"
     name = _("IP选择器(即将下线，请用新版)")
     type = "general"
     tag = "var_ip_picker.ip_picker"
     form = "%svariables/cmdb/var_ip_picker.js" % settings.STATIC_URL
+    memoize = True
+    memoize_data_keys = ("executor", "project_id")
 
     def get_value(self):
         var_ip_picker = self.value
@@ -87,12 +105,14 @@ class VarIpPickerVariable(LazyVariable):
         return data
 
 
-class VarCmdbIpSelector(LazyVariable):
+class VarCmdbIpSelector(CmdbTopoMemoizeMixin, LazyVariable):
     code = "ip_selector"
     name = _("IP选择器")
     type = "general"
     tag = "var_cmdb_ip_selector.ip_selector"
     form = "%svariables/cmdb/var_cmdb_ip_selector.js" % settings.STATIC_URL
+    memoize = True
+    memoize_data_keys = ("executor", "project_id")
 
     def get_value(self):
         username = self.pipeline_data["executor"]
@@ -149,12 +169,14 @@ class VarCmdbSetAllocation(LazyVariable):
         return SetDetailData(self.value["data"])
 
 
-class VarCmdbAttributeQuery(LazyVariable):
+class VarCmdbAttributeQuery(CmdbTopoMemoizeMixin, LazyVariable):
     code = "attribute_query"
     name = _("主机属性查询器")
     type = "general"
     tag = "var_cmdb_attr_query.attr_query"
     form = "%svariables/cmdb/var_cmdb_attribute_query.js" % settings.STATIC_URL
+    memoize = True
+    memoize_data_keys = ("executor", "project_id")
 
     def get_value(self):
         """